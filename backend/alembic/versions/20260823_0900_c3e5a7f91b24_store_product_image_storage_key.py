@@ -0,0 +1,57 @@
+"""Move product photo bytes out of MySQL into object storage.
+
+Adds ``store_product_images.storage_key`` and makes ``data`` nullable: new
+uploads are written through the storage backend and leave ``data`` NULL.
+Existing rows keep their bytes until ``scripts/migrate_blobs_to_storage.py``
+copies them out (that is a data move against external storage, so it is a
+command an operator runs, not part of the schema upgrade).
+
+The table guard preserves the stamped-create_all bootstrap path, where Alembic
+runs before the ORM materializes tables.
+
+Revision ID: c3e5a7f91b24
+Revises: a17c4e9d2b61
+Create Date: 2026-08-23 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+revision = "c3e5a7f91b24"
+down_revision = "a17c4e9d2b61"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "store_product_images" not in inspector.get_table_names():
+        return
+
+    columns = {c["name"]: c for c in inspector.get_columns("store_product_images")}
+    if "storage_key" not in columns:
+        op.add_column(
+            "store_product_images",
+            sa.Column("storage_key", sa.String(length=500), nullable=True),
+        )
+    data = columns.get("data")
+    if data is not None and not data["nullable"]:
+        op.alter_column(
+            "store_product_images",
+            "data",
+            existing_type=mysql.MEDIUMBLOB(),
+            nullable=True,
+        )
+
+
+def downgrade() -> None:
+    # Rows whose bytes now live only in object storage would violate NOT NULL
+    # on ``data``; restoring it would fail or require pulling every object
+    # back into the database. Only the new column is dropped.
+    inspector = sa.inspect(op.get_bind())
+    if "store_product_images" not in inspector.get_table_names():
+        return
+    columns = {c["name"] for c in inspector.get_columns("store_product_images")}
+    if "storage_key" in columns:
+        op.drop_column("store_product_images", "storage_key")
@@ -0,0 +1,42 @@
+"""Record department message fan-out progress.
+
+Adds ``department_messages.delivery_status`` (JSON), written by
+``MessageDeliveryService`` as it delivers a message: state, audience size
+and per-channel counts. NULL for messages delivered before this revision.
+
+The table guard preserves the stamped-create_all bootstrap path, where Alembic
+runs before the ORM materializes tables.
+
+Revision ID: d8b2f6e1a435
+Revises: c3e5a7f91b24
+Create Date: 2026-08-30 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "d8b2f6e1a435"
+down_revision = "c3e5a7f91b24"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "department_messages" not in inspector.get_table_names():
+        return
+    columns = {c["name"] for c in inspector.get_columns("department_messages")}
+    if "delivery_status" not in columns:
+        op.add_column(
+            "department_messages",
+            sa.Column("delivery_status", sa.JSON(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "department_messages" not in inspector.get_table_names():
+        return
+    columns = {c["name"] for c in inspector.get_columns("department_messages")}
+    if "delivery_status" in columns:
+        op.drop_column("department_messages", "delivery_status")
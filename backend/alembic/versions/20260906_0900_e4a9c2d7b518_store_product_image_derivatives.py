@@ -0,0 +1,43 @@
+"""Track resized renditions of product photos.
+
+Adds ``store_product_images.derivatives`` (JSON): the thumbnail/card
+renditions written next to the full photo in object storage, with their byte
+sizes. NULL on photos uploaded before this revision, which keep serving the
+full image for every requested size.
+
+The table guard preserves the stamped-create_all bootstrap path, where Alembic
+runs before the ORM materializes tables.
+
+Revision ID: e4a9c2d7b518
+Revises: d8b2f6e1a435
+Create Date: 2026-09-06 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "e4a9c2d7b518"
+down_revision = "d8b2f6e1a435"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "store_product_images" not in inspector.get_table_names():
+        return
+    columns = {c["name"] for c in inspector.get_columns("store_product_images")}
+    if "derivatives" not in columns:
+        op.add_column(
+            "store_product_images",
+            sa.Column("derivatives", sa.JSON(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "store_product_images" not in inspector.get_table_names():
+        return
+    columns = {c["name"] for c in inspector.get_columns("store_product_images")}
+    if "derivatives" in columns:
+        op.drop_column("store_product_images", "derivatives")
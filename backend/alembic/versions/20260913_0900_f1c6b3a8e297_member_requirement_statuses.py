@@ -0,0 +1,68 @@
+"""Persist member x requirement compliance status.
+
+Adds ``member_requirement_statuses``: one row per member per training
+requirement with the evaluated status, latest completion/expiry and the
+evaluation window. Rows are recomputed on demand, so the table starts empty
+and fills on first read (or on the nightly reconcile).
+
+The table guard preserves the stamped-create_all bootstrap path, where Alembic
+runs before the ORM materializes tables.
+
+Revision ID: f1c6b3a8e297
+Revises: e4a9c2d7b518
+Create Date: 2026-09-13 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "f1c6b3a8e297"
+down_revision = "e4a9c2d7b518"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("member_requirement_statuses"):
+        return
+
+    op.create_table(
+        "member_requirement_statuses",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("organization_id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("requirement_id", sa.String(length=36), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("completion_date", sa.Date(), nullable=True),
+        sa.Column("expiration_date", sa.Date(), nullable=True),
+        sa.Column("window_start", sa.Date(), nullable=True),
+        sa.Column("window_end", sa.Date(), nullable=True),
+        sa.Column("evaluated_for", sa.Date(), nullable=False),
+        sa.Column(
+            "generated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["organization_id"], ["organizations.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["requirement_id"], ["training_requirements.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "requirement_id", name="uq_member_req_status"),
+        mysql_charset="utf8mb4",
+        mysql_collate="utf8mb4_unicode_ci",
+    )
+    op.create_index(
+        "idx_member_req_status_org_req",
+        "member_requirement_statuses",
+        ["organization_id", "requirement_id"],
+    )
+
+
+def downgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("member_requirement_statuses"):
+        op.drop_table("member_requirement_statuses")
@@ -0,0 +1,50 @@
+"""Record the verified schema fingerprint for fast startup.
+
+Adds the single-row ``schema_fingerprint`` table. Startup writes the Alembic
+head and a hash of the model metadata here after validating the schema, and
+skips schema reflection and column repair on later boots while both still
+match the running code.
+
+The table guard preserves the stamped-create_all bootstrap path, where
+Alembic runs before the ORM materializes tables.
+
+Revision ID: c3f8a1d6e254
+Revises: a7d3e9b4c162
+Create Date: 2026-09-21 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "c3f8a1d6e254"
+down_revision = "a7d3e9b4c162"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("schema_fingerprint"):
+        return
+
+    op.create_table(
+        "schema_fingerprint",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("head_revision", sa.String(length=64), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column(
+            "recorded_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        mysql_charset="utf8mb4",
+        mysql_collate="utf8mb4_unicode_ci",
+    )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("schema_fingerprint"):
+        op.drop_table("schema_fingerprint")
@@ -0,0 +1,75 @@
+"""Durable outbox for chat notifications and outbound webhooks.
+
+Adds ``integration_deliveries``: one row per queued Slack/Discord/Teams
+message or generic webhook, with its retry state. The delivery worker claims
+due rows by ``(status, next_attempt_at)``.
+
+The table guard preserves the stamped-create_all bootstrap path, where
+Alembic runs before the ORM materializes tables.
+
+Revision ID: d8b2f5e1a937
+Revises: c3f8a1d6e254
+Create Date: 2026-10-04 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "d8b2f5e1a937"
+down_revision = "c3f8a1d6e254"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("integration_deliveries"):
+        return
+
+    op.create_table(
+        "integration_deliveries",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("organization_id", sa.String(length=36), nullable=False),
+        sa.Column("integration_id", sa.String(length=36), nullable=False),
+        sa.Column("integration_type", sa.String(length=50), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.String(length=500), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.Column("delivered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["integration_id"], ["integrations.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        mysql_charset="utf8mb4",
+        mysql_collate="utf8mb4_unicode_ci",
+    )
+    op.create_index(
+        "ix_integration_deliveries_due",
+        "integration_deliveries",
+        ["status", "next_attempt_at"],
+    )
+    op.create_index(
+        "ix_integration_deliveries_integration",
+        "integration_deliveries",
+        ["integration_id", "created_at"],
+    )
+    op.create_index(
+        "ix_integration_deliveries_org_created",
+        "integration_deliveries",
+        ["organization_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("integration_deliveries"):
+        op.drop_table("integration_deliveries")
@@ -0,0 +1,55 @@
+"""Key imported shift calls by their ePCR incident number.
+
+Adds ``shift_calls.external_id`` with a unique key on
+``(organization_id, external_id)``, which the streaming ePCR import upserts
+on so re-importing an export updates calls instead of duplicating them.
+Calls entered by hand keep NULL, which the unique key does not constrain.
+
+Also makes the ``epcr-import`` integration connectable for organizations
+whose catalog row was seeded while it was still ``coming_soon``.
+
+The table guard preserves the stamped-create_all bootstrap path, where
+Alembic runs before the ORM materializes tables.
+
+Revision ID: e6c1a4f8b392
+Revises: d8b2f5e1a937
+Create Date: 2026-10-11 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "e6c1a4f8b392"
+down_revision = "d8b2f5e1a937"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "shift_calls" in inspector.get_table_names():
+        columns = {c["name"] for c in inspector.get_columns("shift_calls")}
+        if "external_id" not in columns:
+            op.add_column(
+                "shift_calls",
+                sa.Column("external_id", sa.String(length=100), nullable=True),
+            )
+            op.create_unique_constraint(
+                "uq_call_external", "shift_calls", ["organization_id", "external_id"]
+            )
+
+    if "integrations" in inspector.get_table_names():
+        op.execute(
+            "UPDATE integrations SET status = 'available' "
+            "WHERE integration_type = 'epcr-import' AND status = 'coming_soon'"
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "shift_calls" not in inspector.get_table_names():
+        return
+    columns = {c["name"] for c in inspector.get_columns("shift_calls")}
+    if "external_id" in columns:
+        op.drop_constraint("uq_call_external", "shift_calls", type_="unique")
+        op.drop_column("shift_calls", "external_id")
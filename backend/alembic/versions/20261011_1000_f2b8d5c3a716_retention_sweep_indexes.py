@@ -0,0 +1,70 @@
+"""Index the retention sweep's (organization, age) scans.
+
+Retention enforcement walks each record class per organization in
+timestamp order. ``message_history`` and ``notification_logs`` already have
+``(organization_id, <timestamp>)`` indexes; these add the same for the
+other org-scoped classes, with the row-filter column in between for the two
+classes that sweep only part of their table (practice skill tests, rolled-up
+analytics events).
+
+Each index is guarded independently: MySQL DDL is non-transactional, so a
+retry after a partial failure must create only what is missing.
+
+Revision ID: f2b8d5c3a716
+Revises: e6c1a4f8b392
+Create Date: 2026-10-11 10:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "f2b8d5c3a716"
+down_revision = "e6c1a4f8b392"
+branch_labels = None
+depends_on = None
+
+_INDEXES = [
+    ("error_logs", "ix_error_logs_org_created", ["organization_id", "created_at"]),
+    (
+        "form_submissions",
+        "idx_form_submissions_org_submitted",
+        ["organization_id", "submitted_at"],
+    ),
+    (
+        "event_external_attendees",
+        "ix_ext_attendees_org_created",
+        ["organization_id", "created_at"],
+    ),
+    (
+        "skill_tests",
+        "idx_skill_test_org_practice_created",
+        ["organization_id", "is_practice", "created_at"],
+    ),
+    (
+        "analytics_events",
+        "ix_analytics_org_rolled_created",
+        ["organization_id", "rolled_up", "created_at"],
+    ),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for table, name, columns in _INDEXES:
+        if table not in tables:
+            continue
+        existing = {ix["name"] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for table, name, _ in _INDEXES:
+        if table not in tables:
+            continue
+        existing = {ix["name"] for ix in inspector.get_indexes(table)}
+        if name in existing:
+            op.drop_index(name, table_name=table)
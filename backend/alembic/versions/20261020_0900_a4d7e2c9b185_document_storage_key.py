@@ -0,0 +1,41 @@
+"""Store uploaded documents through object storage.
+
+Adds ``documents.storage_key``: new uploads are written through the storage
+backend and record their key. Existing rows keep serving from ``file_path``.
+
+The table guard preserves the stamped-create_all bootstrap path, where Alembic
+runs before the ORM materializes tables.
+
+Revision ID: a4d7e2c9b185
+Revises: f2b8d5c3a716
+Create Date: 2026-10-20 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "a4d7e2c9b185"
+down_revision = "f2b8d5c3a716"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "documents" not in inspector.get_table_names():
+        return
+    columns = {c["name"] for c in inspector.get_columns("documents")}
+    if "storage_key" not in columns:
+        op.add_column(
+            "documents",
+            sa.Column("storage_key", sa.String(length=500), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "documents" not in inspector.get_table_names():
+        return
+    columns = {c["name"] for c in inspector.get_columns("documents")}
+    if "storage_key" in columns:
+        op.drop_column("documents", "storage_key")
@@ -0,0 +1,72 @@
+"""Guard persisted compliance statuses against stale upserts.
+
+Adds ``member_compliance_generations``, a per-member counter bumped by every
+write to a compliance input, and ``member_requirement_statuses.generation``,
+the counter value a status was computed from. A status whose generation is
+behind its member's is stale, so a reader that evaluated a member while a
+write was in flight can no longer persist a result that passes for current.
+
+Existing status rows start at generation 0, which matches members that have
+no counter row yet.
+
+The table guards preserve the stamped-create_all bootstrap path, where
+Alembic runs before the ORM materializes tables.
+
+Revision ID: b8e3f1a6c254
+Revises: a4d7e2c9b185
+Create Date: 2026-10-21 09:00:00
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "b8e3f1a6c254"
+down_revision = "a4d7e2c9b185"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    if "member_requirement_statuses" in tables:
+        columns = {
+            c["name"] for c in inspector.get_columns("member_requirement_statuses")
+        }
+        if "generation" not in columns:
+            op.add_column(
+                "member_requirement_statuses",
+                sa.Column(
+                    "generation", sa.Integer(), nullable=False, server_default="0"
+                ),
+            )
+
+    if "users" in tables and "member_compliance_generations" not in tables:
+        op.create_table(
+            "member_compliance_generations",
+            sa.Column("user_id", sa.String(length=36), nullable=False),
+            sa.Column("generation", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=True,
+            ),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("user_id"),
+            mysql_charset="utf8mb4",
+            mysql_collate="utf8mb4_unicode_ci",
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    if "member_compliance_generations" in tables:
+        op.drop_table("member_compliance_generations")
+    if "member_requirement_statuses" in tables:
+        columns = {
+            c["name"] for c in inspector.get_columns("member_requirement_statuses")
+        }
+        if "generation" in columns:
+            op.drop_column("member_requirement_statuses", "generation")
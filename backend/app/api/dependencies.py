@@ -15,9 +15,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.error_codes import CodedHTTPException, ErrorCode
-from app.core.permissions import get_rank_default_permissions, permission_matches
+from app.core.permissions import (
+    PermissionSet,
+    compile_permissions,
+    permission_matches,
+)
 from app.models.user import Organization, User
 from app.services.auth_service import AuthService
+from app.services.org_settings_cache import org_settings_cache
 from app.utils.db_retry import is_transient_db_error
 
 
@@ -49,24 +54,20 @@ class PaginationParams:
         self.limit = limit
 
 
-def _collect_user_permissions(user: User) -> set:
+def _collect_user_permissions(user: User) -> PermissionSet:
     """
     Aggregate all permissions for *user* by combining:
     1. Permissions from every assigned **position**.
     2. Default permissions from the user's operational **rank**.
-    """
-    perms: set = set()
 
+    The result is the compiled, shared set for that combination of
+    positions and rank — treat it as read-only.
+    """
     # Positions (the relationship is named `positions` but the
     # backward-compatible alias keeps `roles` working too)
-    for position in user.positions:
-        perms.update(position.permissions or [])
-
-    # Operational rank defaults
-    if user.rank:
-        perms.update(get_rank_default_permissions(user.rank))
-
-    return perms
+    return compile_permissions(
+        (position.permissions for position in user.positions), user.rank
+    )
 
 
 # Paths a user with must_change_password=True may still reach, so they can
@@ -178,11 +179,8 @@ async def get_current_user(
     # requires MFA may only reach the enrollment/session paths until they set
     # it up. The org lookup is skipped entirely for already-enrolled users.
     if not getattr(user, "mfa_enabled", False):
-        org_row = await db.execute(
-            select(Organization.settings).where(Organization.id == user.organization_id)
-        )
-        org_settings = org_row.scalar_one_or_none() or {}
-        if (org_settings.get("security") or {}).get("mfa_required"):
+        org = await org_settings_cache.get(db, user.organization_id)
+        if org and org.mfa_required:
             path = request.url.path.rstrip("/")
             if not any(path.endswith(s) for s in _MFA_ENROLL_ALLOWED_SUFFIXES):
                 raise CodedHTTPException(
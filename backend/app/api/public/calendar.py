@@ -13,14 +13,21 @@ from datetime import date, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import Response
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_manager
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.security_middleware import get_client_ip, public_rate_limit
-from app.models.user import Organization
 from app.services.integration_services.ical_service import generate_ical_feed
+from app.services.org_settings_cache import org_settings_cache
 from app.services.scheduling_service import SchedulingService
+from app.utils.http_caching import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
 
 router = APIRouter(prefix="/public/v1/calendar", tags=["public-calendar"])
 
@@ -29,6 +36,11 @@ router = APIRouter(prefix="/public/v1/calendar", tags=["public-calendar"])
 FEED_PAST_DAYS = 60
 FEED_FUTURE_DAYS = 365
 
+# Clients may reuse a response for five minutes, then must revalidate — which
+# the ETag turns into a 304 in the common case.
+FEED_CACHE_CONTROL = "private, max-age=300"
+FEED_CACHE_PREFIX = "ics_feed"
+
 
 def _shift_title(shift) -> str:
     title = "Duty Shift"
@@ -54,9 +66,19 @@ async def _rate_limit_feed(request: Request) -> None:
 @router.get("/{token}.ics", dependencies=[Depends(_rate_limit_feed)])
 async def get_personal_calendar_feed(
     token: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    """Return the member's shifts as an ICS feed (public, token-protected)."""
+    """Return the member's shifts as an ICS feed (public, token-protected).
+
+    Calendar apps poll this every few minutes and almost always get the same
+    answer, so the response carries an ETag built from a one-row version
+    stamp of the member's shifts (plus the org name/timezone and the day the
+    window is anchored to). A matching ``If-None-Match`` is answered 304
+    without loading a single shift; with ``ICS_FEED_CACHE_ENABLED`` the
+    rendered body is also kept in Redis under that stamp, so any change to
+    the member's shifts is a cache miss by construction.
+    """
     # Token is base64url from secrets.token_urlsafe(48); reject anything that
     # can't be one before touching the DB.
     if not token or len(token) < 32 or len(token) > 64:
@@ -71,21 +93,31 @@ async def get_personal_calendar_feed(
             status_code=status.HTTP_404_NOT_FOUND, detail="Feed not found"
         )
 
-    org = (
-        await db.execute(
-            select(Organization).where(Organization.id == str(user.organization_id))
-        )
-    ).scalar_one_or_none()
+    org = await org_settings_cache.get(db, user.organization_id)
     org_name = org.name if org and org.name else "The Logbook"
     tz_name = org.timezone if org and org.timezone else "UTC"
 
     # Wall-clock "today" is fine here; the window is deliberately wide.
     today = date.today()
-    shifts = await service.get_shifts_for_user_feed(
-        user,
-        today - timedelta(days=FEED_PAST_DAYS),
-        today + timedelta(days=FEED_FUTURE_DAYS),
-    )
+    window_start = today - timedelta(days=FEED_PAST_DAYS)
+    window_end = today + timedelta(days=FEED_FUTURE_DAYS)
+
+    version = await service.get_user_feed_version(user, window_start, window_end)
+    etag = make_etag(user.id, today, org_name, tz_name, *version)
+    headers = {
+        "Content-Disposition": 'inline; filename="shifts.ics"',
+        **validator_headers(etag, cache_control=FEED_CACHE_CONTROL),
+    }
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, cache_control=FEED_CACHE_CONTROL)
+
+    cache_key = f"{FEED_CACHE_PREFIX}:{user.id}:{etag.strip(chr(34))}"
+    if settings.ICS_FEED_CACHE_ENABLED:
+        cached = await cache_manager.get(cache_key)
+        if isinstance(cached, str):
+            return Response(content=cached, media_type="text/calendar", headers=headers)
+
+    shifts = await service.get_shifts_for_user_feed(user, window_start, window_end)
 
     events = [
         {
@@ -99,11 +131,6 @@ async def get_personal_calendar_feed(
     ]
 
     ics = generate_ical_feed(events, org_name=org_name, timezone_name=tz_name)
-    return Response(
-        content=ics,
-        media_type="text/calendar",
-        headers={
-            "Content-Disposition": 'inline; filename="shifts.ics"',
-            "Cache-Control": "private, max-age=300",
-        },
-    )
+    if settings.ICS_FEED_CACHE_ENABLED:
+        await cache_manager.set(cache_key, ics, ttl=settings.ICS_FEED_CACHE_TTL_SECONDS)
+    return Response(content=ics, media_type="text/calendar", headers=headers)
@@ -17,7 +17,7 @@ from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import require_permission
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.utils import utc_isoformat
 from app.models.audit import AuditLog
 from app.models.user import User
@@ -52,7 +52,7 @@ async def list_audit_logs(
     end_date: datetime | None = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_permission("audit.view")),
 ) -> dict[str, Any]:
     """List audit log entries scoped to the caller's organization.
@@ -111,7 +111,7 @@ async def list_audit_logs(
 
 @router.get("/stats")
 async def audit_log_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_permission("audit.view")),
 ) -> dict[str, Any]:
     """High-level counts for an admin overview card."""
@@ -151,7 +151,7 @@ async def audit_log_stats(
 @router.get("/{log_id}")
 async def get_audit_log_entry(
     log_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_permission("audit.view")),
 ) -> dict[str, Any]:
     """Fetch a single audit log entry. Org-scoped."""
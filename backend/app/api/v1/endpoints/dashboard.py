@@ -9,7 +9,6 @@ from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastapi import APIRouter, Depends, Query
-from loguru import logger
 from pydantic import BaseModel
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -49,14 +48,13 @@ from app.models.training import (
     Shift,
     ShiftEquipmentCheck,
     TrainingRecord,
-    TrainingStatus,
 )
 from app.models.user import Organization, User, UserStatus
 from app.services.apparatus_service import ApparatusService
-from app.services.dashboard_widget_service import PERIOD_LABELS, DashboardWidgetService
+from app.services.dashboard_summary_service import DashboardSummaryService
+from app.services.dashboard_widget_service import PERIOD_LABELS
 from app.services.inventory_service import InventoryService
 from app.services.organization_service import OrganizationService
-from app.services.training_compliance import compute_org_compliance_pct
 
 router = APIRouter()
 
@@ -784,7 +782,6 @@ async def get_main_dashboard_widgets(
     monetary totals require ``finance.manage``; fundraising totals require
     ``fundraising.view``; outreach totals require ``events.manage``.
     """
-    org_id = str(current_user.organization_id)
     enabled = set(
         (
             await OrganizationService(db).get_enabled_modules(
@@ -792,258 +789,50 @@ async def get_main_dashboard_widgets(
             )
         ).enabled_modules
     )
-    service = DashboardWidgetService(db)
-    finance = (
-        await service.finance(org_id, period)
-        if user_has_permission(current_user, "finance.manage")
-        else None
-    )
-    fundraising = (
-        await service.fundraising(org_id, period)
-        if "grants" in enabled and user_has_permission(current_user, "fundraising.view")
-        else None
-    )
-    community = (
-        await service.community(org_id, period)
-        if user_has_permission(current_user, "events.manage")
-        else None
+    sections = []
+    if user_has_permission(current_user, "finance.manage"):
+        sections.append("finance")
+    if "grants" in enabled and user_has_permission(current_user, "fundraising.view"):
+        sections.append("fundraising")
+    if user_has_permission(current_user, "events.manage"):
+        sections.append("community")
+    widgets = await DashboardSummaryService().widgets(
+        str(current_user.organization_id), period, sections
     )
     return MainDashboardWidgets(
-        period=period,
-        period_label=PERIOD_LABELS[period],
-        finance=finance,
-        fundraising=fundraising,
-        community=community,
+        period=period, period_label=PERIOD_LABELS[period], **widgets
     )
 
 
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
-    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> DashboardStats:
     """
     Get aggregated dashboard statistics for the current user's organization.
     """
-    org_id = current_user.organization_id
-
-    # Total members in organization
-    result = await db.execute(
-        select(func.count(User.id)).where(
-            User.organization_id == org_id,
-            User.deleted_at.is_(None),
-        )
-    )
-    total_members = result.scalar() or 0
-
-    # Active members
-    result = await db.execute(
-        select(func.count(User.id)).where(
-            User.organization_id == org_id,
-            User.status == UserStatus.ACTIVE,
-            User.deleted_at.is_(None),
-        )
-    )
-    active_members = result.scalar() or 0
-
-    # Recent events (last 30 days)
-    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
-    result = await db.execute(
-        select(func.count(Event.id)).where(
-            Event.organization_id == org_id,
-            Event.created_at >= cutoff,
-            Event.is_cancelled == False,  # noqa: E712
-        )
-    )
-    recent_events_count = result.scalar() or 0
-
-    return DashboardStats(
-        total_members=total_members,
-        active_members=active_members,
-        total_documents=0,
-        setup_percentage=100,
-        recent_events_count=recent_events_count,
-        pending_tasks_count=0,
-    )
+    stats = await DashboardSummaryService().stats(str(current_user.organization_id))
+    return DashboardStats(**stats)
 
 
 @router.get("/admin-summary", response_model=AdminSummary)
 async def get_admin_summary(
-    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_permission("settings.manage")),
 ) -> AdminSummary:
     """
     Department-wide admin summary for Chiefs and leaders.
     Aggregates key metrics across all modules.
 
-    Each query section is isolated so a failure in one module
-    (e.g. training, events) does not prevent member counts from
-    being returned.
+    Sections (members, training compliance, activity, action items) run
+    concurrently on their own sessions and the result is cached per
+    organization; see ``DashboardSummaryService``. A failure in one module
+    (e.g. training, events) does not prevent member counts from being
+    returned.
     """
-    org_id = current_user.organization_id
-
-    # ── Member counts (core — always required) ──
-    result = await db.execute(
-        select(func.count(User.id)).where(
-            User.organization_id == org_id,
-            User.deleted_at.is_(None),
-        )
-    )
-    total_members = result.scalar() or 0
-
-    result = await db.execute(
-        select(func.count(User.id)).where(
-            User.organization_id == org_id,
-            User.status == UserStatus.ACTIVE,
-            User.deleted_at.is_(None),
-        )
-    )
-    active_members = result.scalar() or 0
-    inactive_members = total_members - active_members
-
-    # ── Training compliance % ──
-    # Uses the same logic as the compliance-matrix endpoint: for each active
-    # member, evaluate every active training requirement and compute the
-    # percentage of members who are fully compliant.
-    training_pct = 0.0
-    try:
-        training_pct = await compute_org_compliance_pct(db, org_id)
-    except Exception as exc:
-        logger.warning("admin-summary: training compliance query failed: {}", exc)
-
-    # ── Upcoming events (rolling 30-day window) ──
-    upcoming_events = 0
-    try:
-        now_utc = datetime.now(timezone.utc)
-        result = await db.execute(
-            select(func.count(Event.id)).where(
-                Event.organization_id == org_id,
-                Event.start_datetime >= now_utc,
-                Event.start_datetime < now_utc + timedelta(days=30),
-                Event.is_cancelled == False,  # noqa: E712
-            )
-        )
-        upcoming_events = result.scalar() or 0
-    except Exception as exc:
-        logger.warning("admin-summary: upcoming events query failed: {}", exc)
-
-    # ── Action items (overdue + open) from meetings ──
-    overdue_meeting = 0
-    open_meeting = 0
-    try:
-        result = await db.execute(
-            select(func.count(MeetingActionItem.id)).where(
-                MeetingActionItem.organization_id == org_id,
-                MeetingActionItem.status.in_(
-                    [ActionItemStatus.OPEN.value, ActionItemStatus.IN_PROGRESS.value]
-                ),
-                MeetingActionItem.due_date < date.today(),
-            )
-        )
-        overdue_meeting = result.scalar() or 0
-
-        result = await db.execute(
-            select(func.count(MeetingActionItem.id)).where(
-                MeetingActionItem.organization_id == org_id,
-                MeetingActionItem.status.in_(
-                    [ActionItemStatus.OPEN.value, ActionItemStatus.IN_PROGRESS.value]
-                ),
-            )
-        )
-        open_meeting = result.scalar() or 0
-    except Exception as exc:
-        logger.warning("admin-summary: meeting action items query failed: {}", exc)
-
-    # ── Action items from minutes (scoped to organization via MeetingMinutes) ──
-    overdue_minutes = 0
-    open_minutes = 0
-    try:
-        result = await db.execute(
-            select(func.count(ActionItem.id))
-            .join(MeetingMinutes, ActionItem.minutes_id == MeetingMinutes.id)
-            .where(
-                MeetingMinutes.organization_id == org_id,
-                ActionItem.status.in_(
-                    [
-                        MinutesActionItemStatus.PENDING.value,
-                        MinutesActionItemStatus.IN_PROGRESS.value,
-                    ]
-                ),
-                ActionItem.due_date < datetime.now(timezone.utc),
-            )
-        )
-        overdue_minutes = result.scalar() or 0
-
-        result = await db.execute(
-            select(func.count(ActionItem.id))
-            .join(MeetingMinutes, ActionItem.minutes_id == MeetingMinutes.id)
-            .where(
-                MeetingMinutes.organization_id == org_id,
-                ActionItem.status.in_(
-                    [
-                        MinutesActionItemStatus.PENDING.value,
-                        MinutesActionItemStatus.IN_PROGRESS.value,
-                    ]
-                ),
-            )
-        )
-        open_minutes = result.scalar() or 0
-    except Exception as exc:
-        logger.warning("admin-summary: minutes action items query failed: {}", exc)
-
-    # ── Recent training hours (last 30 days) ──
-    recent_hours = 0.0
-    try:
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        result = await db.execute(
-            select(func.coalesce(func.sum(TrainingRecord.hours_completed), 0)).where(
-                TrainingRecord.organization_id == org_id,
-                TrainingRecord.status == TrainingStatus.COMPLETED,
-                TrainingRecord.completion_date >= thirty_days_ago.date(),
-            )
-        )
-        recent_hours = float(result.scalar() or 0)
-    except Exception as exc:
-        logger.warning("admin-summary: recent training hours query failed: {}", exc)
-
-    # ── Admin hours (last 30 days) ──
-    recent_admin_hours = 0.0
-    pending_admin_approvals = 0
-    try:
-        thirty_days_ago_admin = datetime.now(timezone.utc) - timedelta(days=30)
-        result = await db.execute(
-            select(func.coalesce(func.sum(AdminHoursEntry.duration_minutes), 0)).where(
-                AdminHoursEntry.organization_id == org_id,
-                AdminHoursEntry.status == AdminHoursEntryStatus.APPROVED,
-                AdminHoursEntry.clock_in_at >= thirty_days_ago_admin,
-                AdminHoursEntry.duration_minutes.isnot(None),
-            )
-        )
-        total_minutes = float(result.scalar() or 0)
-        recent_admin_hours = round(total_minutes / 60.0, 1)
-
-        result = await db.execute(
-            select(func.count(AdminHoursEntry.id)).where(
-                AdminHoursEntry.organization_id == org_id,
-                AdminHoursEntry.status == AdminHoursEntryStatus.PENDING,
-            )
-        )
-        pending_admin_approvals = result.scalar() or 0
-    except Exception as exc:
-        logger.warning("admin-summary: admin hours query failed: {}", exc)
-
-    return AdminSummary(
-        active_members=active_members,
-        inactive_members=inactive_members,
-        total_members=total_members,
-        training_completion_pct=round(training_pct, 1),
-        upcoming_events_count=upcoming_events,
-        overdue_action_items=overdue_meeting + overdue_minutes,
-        open_action_items=open_meeting + open_minutes,
-        recent_training_hours=recent_hours,
-        recent_admin_hours=recent_admin_hours,
-        pending_admin_hours_approvals=pending_admin_approvals,
+    summary = await DashboardSummaryService().admin_summary(
+        str(current_user.organization_id)
     )
+    return AdminSummary(**summary)
 
 
 @router.get("/action-items", response_model=list[ActionItemSummary])
@@ -5,13 +5,21 @@ Endpoints for document management including folders,
 document CRUD, and file uploads.
 """
 
-import asyncio
 import os
 import uuid as uuid_lib
 from uuid import UUID
 
-import magic
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import FileResponse
 from loguru import logger
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -20,6 +28,7 @@ from app.api.dependencies import PaginationParams, require_permission
 from app.core.audit import log_audit_event
 from app.core.database import get_db
 from app.core.error_codes import CodedHTTPException, ErrorCode
+from app.core.storage import get_storage, stored_object_response
 from app.core.utils import ensure_found, handle_service_errors, safe_error_detail
 from app.models.document import Document, DocumentStatus
 from app.models.user import User
@@ -34,10 +43,14 @@ from app.schemas.documents import (
     FoldersListResponse,
 )
 from app.services.documents_service import DocumentsService
+from app.utils.upload_spool import UploadTooLargeError, spool_upload
 
 router = APIRouter()
 
+# Pre-storage uploads were written here; their rows keep file_path only.
 UPLOAD_DIR = "/app/uploads/documents"
+DOCUMENT_STORAGE_PREFIX = "documents"
+MAX_DOCUMENT_SIZE = 50 * 1024 * 1024  # 50MB
 
 # Allowed MIME types for document uploads (validated via magic bytes, not HTTP headers)
 ALLOWED_DOCUMENT_MIME_TYPES = {
@@ -61,6 +74,25 @@ ALLOWED_DOCUMENT_MIME_TYPES = {
     "application/x-zip-compressed",
 }
 
+# Stored extension for each detected MIME type. Derived from the content, never
+# the user-supplied filename, to prevent double-extension attacks.
+DOCUMENT_MIME_TO_EXT = {
+    "application/pdf": ".pdf",
+    "application/msword": ".doc",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+    "application/vnd.ms-excel": ".xls",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
+    "application/vnd.ms-powerpoint": ".ppt",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation": ".pptx",
+    "text/plain": ".txt",
+    "text/csv": ".csv",
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "application/zip": ".zip",
+}
+
 
 # ============================================
 # Folder Endpoints
@@ -232,79 +264,68 @@ async def upload_document(
                 detail="Not authorized to upload to this folder",
             )
 
-    # Validate file size (50MB max)
-    max_size = 50 * 1024 * 1024
-    content = await file.read()
-    if len(content) > max_size:
+    # Stream the upload into storage (50MB max): size, SHA-256 and the
+    # magic-byte MIME sniff are computed chunk by chunk, so the body is never
+    # held in memory. Anything not committed below is discarded.
+    storage = get_storage()
+    key_prefix = f"{DOCUMENT_STORAGE_PREFIX}/{current_user.organization_id}"
+    stem = uuid_lib.uuid4().hex
+    try:
+        async with spool_upload(
+            file, storage.staging_dir(f"{key_prefix}/{stem}"), MAX_DOCUMENT_SIZE
+        ) as spooled:
+            # Validate MIME type using magic bytes (not the HTTP Content-Type header)
+            detected_mime = spooled.mime_type
+            if detected_mime not in ALLOWED_DOCUMENT_MIME_TYPES:
+                logger.warning(
+                    f"Document upload rejected: detected MIME type '{detected_mime}' "
+                    f"(claimed: '{file.content_type}') for file '{file.filename}'"
+                )
+                raise CodedHTTPException(
+                    status_code=400,
+                    detail=f"File type not allowed. Detected type: {detected_mime}. "
+                    "Allowed types: PDF, Word, Excel, PowerPoint, text, CSV, images, ZIP.",
+                    error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
+                )
+
+            # Derive file extension from detected MIME type (not user-supplied
+            # filename) to prevent double-extension attacks (e.g. report.pdf.exe)
+            ext = DOCUMENT_MIME_TO_EXT.get(detected_mime)
+            if not ext:
+                # Fallback to safe default — never use user-supplied filename
+                # extension to prevent double-extension attacks
+                logger.warning(
+                    f"No extension mapping for MIME type '{detected_mime}'; "
+                    f"using .bin fallback (filename: '{file.filename}')"
+                )
+                ext = ".bin"
+            unique_name = f"{stem}{ext}"
+            storage_key = f"{key_prefix}/{unique_name}"
+            await spooled.commit_to_storage(storage, storage_key, detected_mime)
+    except UploadTooLargeError:
         raise CodedHTTPException(
             status_code=400,
             detail="File too large. Maximum size is 50MB.",
             error_code=ErrorCode.UPLD_TOO_LARGE,
         )
-
-    # Validate MIME type using magic bytes (not the HTTP Content-Type header)
-    detected_mime = magic.from_buffer(content[:2048], mime=True)
-    if detected_mime not in ALLOWED_DOCUMENT_MIME_TYPES:
-        logger.warning(
-            f"Document upload rejected: detected MIME type '{detected_mime}' "
-            f"(claimed: '{file.content_type}') for file '{file.filename}'"
-        )
+    except RuntimeError:
+        logger.error("Document upload validation unavailable: libmagic missing")
         raise CodedHTTPException(
-            status_code=400,
-            detail=f"File type not allowed. Detected type: {detected_mime}. "
-            "Allowed types: PDF, Word, Excel, PowerPoint, text, CSV, images, ZIP.",
-            error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Upload validation is temporarily unavailable.",
+            error_code=ErrorCode.UPLD_VALIDATION_UNAVAILABLE,
         )
 
-    # Create upload directory
-    org_dir = os.path.join(UPLOAD_DIR, str(current_user.organization_id))
-    await asyncio.to_thread(os.makedirs, org_dir, exist_ok=True)
-
-    # Derive file extension from detected MIME type (not user-supplied filename)
-    # to prevent double-extension attacks (e.g. report.pdf.exe)
-    MIME_TO_EXT = {
-        "application/pdf": ".pdf",
-        "application/msword": ".doc",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
-        "application/vnd.ms-excel": ".xls",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
-        "application/vnd.ms-powerpoint": ".ppt",
-        "application/vnd.openxmlformats-officedocument.presentationml.presentation": ".pptx",
-        "text/plain": ".txt",
-        "text/csv": ".csv",
-        "image/jpeg": ".jpg",
-        "image/png": ".png",
-        "image/gif": ".gif",
-        "image/webp": ".webp",
-        "application/zip": ".zip",
-    }
-    ext = MIME_TO_EXT.get(detected_mime)
-    if not ext:
-        # Fallback to safe default — never use user-supplied filename extension
-        # to prevent double-extension attacks (e.g. report.pdf.exe)
-        logger.warning(
-            f"No extension mapping for MIME type '{detected_mime}'; "
-            f"using .bin fallback (filename: '{file.filename}')"
-        )
-        ext = ".bin"
-    unique_name = f"{uuid_lib.uuid4().hex}{ext}"
-    file_path = os.path.join(org_dir, unique_name)
-
-    # Save file
-    def _write_file(path: str, data: bytes) -> None:
-        with open(path, "wb") as f:
-            f.write(data)
-
-    await asyncio.to_thread(_write_file, file_path, content)
-
     # Create document record
     doc_data = {
         "name": name,
         "description": description,
         "folder_id": folder_id if folder_id else None,
         "file_name": file.filename or unique_name,
-        "file_path": file_path,
-        "file_size": len(content),
+        "storage_key": storage_key,
+        # Kept for readers of the older shape; None on non-local backends.
+        "file_path": storage.local_path(storage_key),
+        "file_size": spooled.size,
         "file_type": detected_mime,
         "tags": tags,
     }
@@ -316,10 +337,10 @@ async def upload_document(
     except Exception as e:
         # Clean up file on error
         try:
-            os.remove(file_path)
-        except OSError:
+            await storage.delete(storage_key)
+        except Exception:
             logger.warning(
-                f"Failed to clean up file after document creation error: {file_path}"
+                f"Failed to clean up file after document creation error: {storage_key}"
             )
         logger.error(f"Failed to create document record: {e}")
         raise HTTPException(
@@ -334,7 +355,8 @@ async def upload_document(
         event_data={
             "document_name": name,
             "file_type": detected_mime,
-            "file_size": len(content),
+            "file_size": spooled.size,
+            "sha256": spooled.sha256,
             "folder_id": folder_id,
         },
         user_id=str(current_user.id),
@@ -404,6 +426,51 @@ async def get_document(
     return document
 
 
+@router.get("/{document_id}/download")
+async def download_document(
+    document_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("documents.view")),
+):
+    """Download a document's file (same folder access rules as get_document)"""
+    service = DocumentsService(db)
+    document = await service.get_document_by_id(
+        document_id, current_user.organization_id
+    )
+    if document is None or not await service.can_access_document(
+        document, current_user.organization_id, current_user
+    ):
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    filename = document.file_name or document.name
+    # file_type is the MIME type sniffed at upload, never the client's claim.
+    media_type = document.file_type or "application/octet-stream"
+    if document.storage_key:
+        return await stored_object_response(
+            get_storage(),
+            document.storage_key,
+            media_type=media_type,
+            range_header=request.headers.get("range"),
+            filename=filename,
+            headers={"Cache-Control": "private, no-cache"},
+        )
+
+    # Documents uploaded before object storage recorded only a local path.
+    if not document.file_path:
+        raise HTTPException(status_code=404, detail="Document file not found")
+    resolved_path = os.path.realpath(document.file_path)
+    if not resolved_path.startswith(os.path.realpath(UPLOAD_DIR) + os.sep):
+        logger.warning(
+            f"Path traversal attempt blocked: {document.file_path} resolved to "
+            f"{resolved_path}"
+        )
+        raise HTTPException(status_code=403, detail="Access denied")
+    if not os.path.exists(resolved_path):
+        raise HTTPException(status_code=404, detail="Document file not found")
+    return FileResponse(path=resolved_path, filename=filename, media_type=media_type)
+
+
 @router.patch("/{document_id}", response_model=DocumentResponse)
 async def update_document(
     document_id: UUID,
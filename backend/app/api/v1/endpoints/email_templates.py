@@ -5,7 +5,6 @@ CRUD endpoints for managing email templates.
 Accessible by admins via the membership module admin area.
 """
 
-import asyncio
 import copy
 import os
 import uuid
@@ -45,11 +44,13 @@ from app.services.email_template_service import (
     EmailTemplateService,
 )
 from app.services.officer_service import OfficerService
-from app.utils.mime_validation import detect_mime_type
 from app.utils.org_scoping import assert_in_org
+from app.utils.upload_spool import UploadTooLargeError, spool_upload
 
 router = APIRouter()
 
+MAX_EMAIL_ATTACHMENT_SIZE = 10 * 1024 * 1024  # 10MB
+
 
 async def _footer_library_response(
     db: AsyncSession, organization_id: str
@@ -469,15 +470,6 @@ async def upload_attachment(
             detail="This template does not allow attachments",
         )
 
-    # Read file and enforce size limit (10MB)
-    contents = await file.read()
-    max_size = 10 * 1024 * 1024
-    if len(contents) > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="File exceeds 10MB limit",
-        )
-
     # Validate file extension — block executable and script types
     ALLOWED_EXTENSIONS = {
         ".pdf",
@@ -526,45 +518,48 @@ async def upload_attachment(
         "application/zip",
         "application/x-zip-compressed",
     }
+    # Stream to disk with a UUID name (prevents path traversal), enforcing the
+    # 10MB limit and sniffing magic bytes as the chunks arrive
+    attachment_dir = os.path.join(
+        "storage", "email_attachments", current_user.organization_id
+    )
+    file_id = str(uuid.uuid4())
     try:
-        detected_mime = detect_mime_type(contents)
+        async with spool_upload(
+            file, attachment_dir, MAX_EMAIL_ATTACHMENT_SIZE
+        ) as spooled:
+            detected_mime = spooled.mime_type
+            if detected_mime not in ALLOWED_EMAIL_MIME_TYPES:
+                logger.warning(
+                    "Email attachment rejected: detected MIME '{}' "
+                    "(claimed: '{}') for file '{}'",
+                    detected_mime,
+                    file.content_type,
+                    file.filename,
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"File content type '{detected_mime}' is not allowed.",
+                )
+
+            storage_filename = f"{file_id}{ext}"
+            storage_path = await spooled.commit(
+                os.path.join(attachment_dir, storage_filename)
+            )
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File exceeds 10MB limit",
+        )
     except RuntimeError:
         logger.error("Email attachment validation unavailable: libmagic missing")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Attachment validation is temporarily unavailable.",
         )
-    if detected_mime not in ALLOWED_EMAIL_MIME_TYPES:
-        logger.warning(
-            "Email attachment rejected: detected MIME '{}' "
-            "(claimed: '{}') for file '{}'",
-            detected_mime,
-            file.content_type,
-            file.filename,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File content type '{detected_mime}' is not allowed.",
-        )
-
-    # Store file with UUID name (prevents path traversal)
-    attachment_dir = os.path.join(
-        "storage", "email_attachments", current_user.organization_id
-    )
-    await asyncio.to_thread(os.makedirs, attachment_dir, exist_ok=True)
-
-    file_id = str(uuid.uuid4())
-    storage_filename = f"{file_id}{ext}"
-    storage_path = os.path.join(attachment_dir, storage_filename)
-
-    def _write_file(path: str, data: bytes) -> None:
-        with open(path, "wb") as f:
-            f.write(data)
-
-    await asyncio.to_thread(_write_file, storage_path, contents)
 
     # Human-readable file size
-    size = len(contents)
+    size = spooled.size
     if size < 1024:
         file_size = f"{size} B"
     elif size < 1024 * 1024:
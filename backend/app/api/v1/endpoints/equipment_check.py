@@ -69,7 +69,6 @@ from app.services.equipment_check_service import (
     EquipmentCheckService,
 )
 from app.services.equipment_readiness_service import EquipmentReadinessService
-from app.utils.image_processing import optimize_image
 
 router = APIRouter()
 
@@ -1070,6 +1069,8 @@ async def upload_check_item_photos(
     Accepts up to 3 images per item. Photos are optimized (resized,
     EXIF-stripped, converted to WebP) and stored as base64 data URIs.
     """
+    from app.utils.image_processing import optimize_image, run_image_task
+
     if len(files) > MAX_PHOTOS_PER_ITEM:
         raise HTTPException(
             status_code=400,
@@ -1144,7 +1145,8 @@ async def upload_check_item_photos(
 
         # Optimize: resize, strip EXIF, convert to WebP
         try:
-            optimized = optimize_image(
+            optimized = await run_image_task(
+                optimize_image,
                 contents,
                 max_size=(1920, 1080),
                 quality=80,
@@ -4,7 +4,6 @@ Event API Endpoints
 Endpoints for event management including events, RSVPs, and attendance tracking.
 """
 
-import asyncio
 import copy
 import os
 import uuid as uuid_lib
@@ -21,6 +20,7 @@ from fastapi import (
     Form,
     HTTPException,
     Query,
+    Request,
     UploadFile,
     status,
 )
@@ -34,6 +34,7 @@ from app.api.dependencies import get_current_user, require_permission
 from app.core.audit import log_audit_event
 from app.core.database import get_db
 from app.core.error_codes import CodedHTTPException, ErrorCode
+from app.core.storage import get_storage, stored_object_response
 from app.core.utils import generate_uuid, safe_error_detail
 from app.models.event import Event, EventExternalAttendee, EventType, RSVPStatus
 from app.models.notification import NotificationChannel
@@ -89,7 +90,14 @@ from app.services.integration_services.notification_dispatch import (
     notify_entity_created,
 )
 from app.services.notifications_service import NotificationsService
-from app.utils.mime_validation import detect_mime_type
+from app.services.qr_check_in_service import roster_cache
+from app.services.qr_check_in_service import self_check_in as qr_self_check_in
+from app.utils.http_caching import (
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+)
+from app.utils.upload_spool import UploadTooLargeError, spool_upload
 
 router = APIRouter()
 
@@ -1975,6 +1983,10 @@ async def get_qr_check_in_data(
     if error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
+    # The QR display polls this while the event is open: keep this worker's
+    # check-in roster loaded before the scans arrive.
+    await roster_cache.get(db, event_id, current_user.organization_id)
+
     return QRCheckInData(**data)
 
 
@@ -1998,16 +2010,21 @@ async def self_check_in(
 
     **Authentication required**
     """
-    service = EventService(db)
     is_checkout = check_in_data.is_checkout if check_in_data else False
 
-    rsvp, error, notice = await service.self_check_in(
-        event_id=event_id,
-        user_id=current_user.id,
-        organization_id=current_user.organization_id,
-        is_checkout=is_checkout,
-        override=override,
-    )
+    if is_checkout:
+        rsvp, error, notice = await EventService(db).self_check_in(
+            event_id=event_id,
+            user_id=current_user.id,
+            organization_id=current_user.organization_id,
+            is_checkout=True,
+        )
+    else:
+        # Check-ins take the fast path (app/services/qr_check_in_service.py),
+        # which writes the audit entry in the same batch as the check-in.
+        rsvp, error, notice = await qr_self_check_in(
+            db, event_id, current_user, override=override
+        )
 
     if error:
         # Soft pipeline phase gate — 409 the client can override (proceed anyway)
@@ -2032,18 +2049,16 @@ async def self_check_in(
 
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
-    await log_audit_event(
-        db=db,
-        event_type="event_checkout" if is_checkout else "event_checkin",
-        event_category="events",
-        severity="info",
-        event_data={
-            "event_id": str(event_id),
-            "action": "self_checkout" if is_checkout else "self_checkin",
-        },
-        user_id=str(current_user.id),
-        username=current_user.username,
-    )
+    if is_checkout:
+        await log_audit_event(
+            db=db,
+            event_type="event_checkout",
+            event_category="events",
+            severity="info",
+            event_data={"event_id": str(event_id), "action": "self_checkout"},
+            user_id=str(current_user.id),
+            username=current_user.username,
+        )
 
     response = _build_rsvp_response(rsvp, user=current_user)
     if notice:
@@ -2246,6 +2261,9 @@ async def create_recurring_event(
 # ============================================
 
 ATTACHMENT_UPLOAD_DIR = "/app/uploads/event-attachments"
+# Storage key prefix for new uploads (app/core/storage.py). On the local
+# backend this resolves under ATTACHMENT_UPLOAD_DIR.
+ATTACHMENT_STORAGE_PREFIX = "event-attachments"
 ALLOWED_EXTENSIONS = {
     ".pdf",
     ".doc",
@@ -2279,6 +2297,15 @@ ALLOWED_ATTACHMENT_MIME_TYPES = {
 MAX_ATTACHMENT_SIZE = 25 * 1024 * 1024  # 25MB
 
 
+def _attachment_media_type(attachment: dict) -> str:
+    """Type to serve an attachment as. Older rows stored the client's claimed
+    type, so anything outside the upload allow-list is served as a download."""
+    file_type = attachment.get("file_type")
+    if file_type in ALLOWED_ATTACHMENT_MIME_TYPES:
+        return file_type
+    return "application/octet-stream"
+
+
 @router.post("/{event_id}/attachments", response_model=AttachmentUploadResponse)
 async def upload_event_attachment(
     event_id: UUID,
@@ -2313,18 +2340,37 @@ async def upload_event_attachment(
             error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
         )
 
-    # Read and validate size
-    content = await file.read()
-    if len(content) > MAX_ATTACHMENT_SIZE:
+    # Stream into storage, validating size and content as the chunks arrive
+    storage = get_storage()
+    unique_name = f"{uuid_lib.uuid4().hex}{ext}"
+    storage_key = (
+        f"{ATTACHMENT_STORAGE_PREFIX}/{current_user.organization_id}/"
+        f"{event_id}/{unique_name}"
+    )
+    try:
+        async with spool_upload(
+            file, storage.staging_dir(storage_key), MAX_ATTACHMENT_SIZE
+        ) as spooled:
+            # SEC: Validate actual file content via magic bytes, not just extension
+            detected_mime = spooled.mime_type
+            if detected_mime not in ALLOWED_ATTACHMENT_MIME_TYPES:
+                logger.warning(
+                    f"Event attachment rejected: detected MIME '{detected_mime}' "
+                    f"(claimed: '{file.content_type}') for file '{file.filename}'"
+                )
+                raise CodedHTTPException(
+                    status_code=400,
+                    detail=f"File content type '{detected_mime}' not allowed.",
+                    error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
+                )
+
+            await spooled.commit_to_storage(storage, storage_key, detected_mime)
+    except UploadTooLargeError:
         raise CodedHTTPException(
             status_code=400,
             detail="File too large. Maximum size is 25MB.",
             error_code=ErrorCode.UPLD_TOO_LARGE,
         )
-
-    # SEC: Validate actual file content via magic bytes, not just extension
-    try:
-        detected_mime = detect_mime_type(content)
     except RuntimeError:
         logger.error("Event attachment validation unavailable: libmagic missing")
         raise CodedHTTPException(
@@ -2332,31 +2378,6 @@ async def upload_event_attachment(
             detail="Attachment validation is temporarily unavailable.",
             error_code=ErrorCode.UPLD_VALIDATION_UNAVAILABLE,
         )
-    if detected_mime not in ALLOWED_ATTACHMENT_MIME_TYPES:
-        logger.warning(
-            f"Event attachment rejected: detected MIME '{detected_mime}' "
-            f"(claimed: '{file.content_type}') for file '{file.filename}'"
-        )
-        raise CodedHTTPException(
-            status_code=400,
-            detail=f"File content type '{detected_mime}' not allowed.",
-            error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
-        )
-
-    # Save file
-    org_dir = os.path.join(
-        ATTACHMENT_UPLOAD_DIR, str(current_user.organization_id), str(event_id)
-    )
-    await asyncio.to_thread(os.makedirs, org_dir, exist_ok=True)
-
-    unique_name = f"{uuid_lib.uuid4().hex}{ext}"
-    file_path = os.path.join(org_dir, unique_name)
-
-    def _write_file(path: str, data: bytes) -> None:
-        with open(path, "wb") as f:
-            f.write(data)
-
-    await asyncio.to_thread(_write_file, file_path, content)
 
     # Update event attachments list (deep copy to ensure SQLAlchemy detects the change)
     attachments = copy.deepcopy(event.attachments or [])
@@ -2364,9 +2385,13 @@ async def upload_event_attachment(
         {
             "id": uuid_lib.uuid4().hex,
             "file_name": file.filename or unique_name,
-            "file_path": file_path,
-            "file_size": len(content),
-            "file_type": file.content_type,
+            "storage_key": storage_key,
+            # Kept for readers of the older shape; None on non-local backends.
+            "file_path": storage.local_path(storage_key),
+            "file_size": spooled.size,
+            # The sniffed type, never the client's claim: downloads serve it.
+            "file_type": spooled.mime_type,
+            "sha256": spooled.sha256,
             "description": description,
             "uploaded_by": str(current_user.id),
             "uploaded_at": datetime.now(dt_timezone.utc).isoformat(),
@@ -2412,6 +2437,7 @@ async def list_event_attachments(
 async def download_event_attachment(
     event_id: UUID,
     attachment_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -2436,6 +2462,22 @@ async def download_event_attachment(
     if not attachment:
         raise HTTPException(status_code=404, detail="Attachment not found")
 
+    if attachment.get("storage_key"):
+        # The upload's content hash is the validator, so revalidation never
+        # touches storage.
+        etag = f'"{attachment["sha256"]}"' if attachment.get("sha256") else None
+        if etag and is_not_modified(request, etag):
+            return not_modified_response(etag, cache_control="private, no-cache")
+        return await stored_object_response(
+            get_storage(),
+            attachment["storage_key"],
+            media_type=_attachment_media_type(attachment),
+            range_header=request.headers.get("range"),
+            filename=attachment.get("file_name", "download"),
+            headers=validator_headers(etag, cache_control="private, no-cache"),
+        )
+
+    # Attachments uploaded before object storage recorded only a local path.
     file_path = attachment["file_path"]
 
     # Security: Validate file_path is within the expected upload directory
@@ -2457,7 +2499,7 @@ async def download_event_attachment(
     return FileResponse(
         path=resolved_path,
         filename=attachment.get("file_name", "download"),
-        media_type=attachment.get("file_type", "application/octet-stream"),
+        media_type=_attachment_media_type(attachment),
     )
 
 
@@ -2492,38 +2534,47 @@ async def delete_event_attachment(
     if not attachment:
         raise HTTPException(status_code=404, detail="Attachment not found")
 
-    # Remove the file from disk — but only when no other event still
+    # Remove the stored file — but only when no other event still
     # references it. Recurring-occurrence generation and event duplication
-    # copy attachment metadata (same file_path) across events, so an
-    # unconditional remove would break downloads for the parent and every
+    # copy attachment metadata (same storage_key/file_path) across events, so
+    # an unconditional remove would break downloads for the parent and every
     # sibling occurrence.
-    file_path = attachment["file_path"]
+    storage_key = attachment.get("storage_key")
+    ref_field = "storage_key" if storage_key else "file_path"
+    reference = storage_key or attachment["file_path"]
     others = await db.execute(
         select(func.count())
         .select_from(Event)
         .where(
             Event.id != str(event_id),
-            cast(Event.attachments, String).contains(file_path, autoescape=True),
+            cast(Event.attachments, String).contains(reference, autoescape=True),
         )
     )
     still_in_this_event = any(
-        a.get("file_path") == file_path
+        a.get(ref_field) == reference
         for a in attachments
         if a.get("id") != attachment_id
     )
     if not still_in_this_event and (others.scalar() or 0) == 0:
-        # Same containment guard as the download endpoint: never remove a
-        # file outside the upload tree, even if the stored path was tampered
-        # with. The metadata row is removed regardless.
-        resolved_path = os.path.realpath(file_path)
-        allowed_base = os.path.realpath(ATTACHMENT_UPLOAD_DIR)
-        try:
-            if resolved_path.startswith(allowed_base + os.sep) and os.path.exists(
-                resolved_path
-            ):
-                os.remove(resolved_path)
-        except OSError as e:
-            logger.warning(f"Failed to remove attachment file {file_path}: {e}")
+        if storage_key:
+            try:
+                await get_storage().delete(storage_key)
+            except Exception as e:
+                logger.warning(f"Failed to remove attachment {storage_key}: {e}")
+        else:
+            # Same containment guard as the download endpoint: never remove a
+            # file outside the upload tree, even if the stored path was
+            # tampered with. The metadata row is removed regardless.
+            file_path = reference
+            resolved_path = os.path.realpath(file_path)
+            allowed_base = os.path.realpath(ATTACHMENT_UPLOAD_DIR)
+            try:
+                if resolved_path.startswith(allowed_base + os.sep) and os.path.exists(
+                    resolved_path
+                ):
+                    os.remove(resolved_path)
+            except OSError as e:
+                logger.warning(f"Failed to remove attachment file {file_path}: {e}")
 
     # Remove from attachments list
     event.attachments = [a for a in attachments if a.get("id") != attachment_id]
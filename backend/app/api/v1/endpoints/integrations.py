@@ -4,16 +4,31 @@ Integrations API Endpoints
 Endpoints for managing external integration configurations.
 """
 
+import os
 import re
+import tempfile
+import uuid
 from typing import Any
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    UploadFile,
+    status,
+)
+from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user, require_permission
 from app.core.audit import log_audit_event
 from app.core.database import get_db
+from app.core.error_codes import CodedHTTPException, ErrorCode
 from app.models.integration import Integration
 from app.models.user import User
 from app.schemas.integration import (
@@ -22,10 +37,17 @@ from app.schemas.integration import (
     IntegrationConnectRequest,
     IntegrationUpdateRequest,
 )
+from app.utils.upload_spool import UploadTooLargeError, spool_upload
 from app.utils.url_validator import validate_integration_url
 
 router = APIRouter()
 
+# State-level NEMSIS exports run to hundreds of MB; the import streams them
+# from a spooled temp file, deleted when the job finishes.
+MAX_EPCR_IMPORT_SIZE = 1024 * 1024 * 1024
+EPCR_IMPORT_DIR = os.path.join(tempfile.gettempdir(), "epcr-imports")
+_EPCR_IMPORT_MIME_TYPES = {"application/xml", "application/csv"}
+
 # Pattern for secret-like keys in config
 _SECRET_KEY_PATTERN = re.compile(
     r"(token|secret|key|password|api_key|auth|webhook_url|refresh_token|client_secret)",
@@ -121,12 +143,12 @@ INTEGRATION_CATALOG = [
         "name": "Generic ePCR Import",
         "description": (
             "Import run data from any ePCR vendor (ImageTrend, ESO, Zoll, "
-            "etc.) via CSV or NEMSIS XML file export. Not yet usable: the "
-            "NEMSIS parser exists but there is no upload route and no "
-            "incident record to import into."
+            "etc.) via CSV or NEMSIS XML file export. Runs are attached to "
+            "the shift on duty at dispatch; re-importing an export updates "
+            "the calls it already created."
         ),
         "category": "EMS",
-        "status": "coming_soon",
+        "status": "available",
         "contains_phi": True,
     },
     {
@@ -695,3 +717,120 @@ async def test_connection(
         return {"success": True, "message": result_msg}
     except Exception as e:
         return {"success": False, "message": str(e)}
+
+
+@router.post("/{integration_id}/epcr-import", status_code=status.HTTP_202_ACCEPTED)
+async def start_epcr_import(
+    integration_id: str,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_permission("integrations.manage")),
+):
+    """
+    Import a CSV or NEMSIS XML ePCR export into shift calls.
+
+    The file is spooled to disk and imported by a background job; poll
+    ``GET /integrations/epcr-import/{job_id}`` for progress.
+    """
+    from app.services.integration_services.epcr_import_service import (
+        ImportProgress,
+        run_import_job,
+        save_progress,
+    )
+
+    result = await db.execute(
+        select(Integration).where(
+            Integration.id == integration_id,
+            Integration.organization_id == str(current_user.organization_id),
+        )
+    )
+    integration = result.scalar_one_or_none()
+    if not integration or integration.integration_type != "epcr-import":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Integration not found"
+        )
+    config = integration.config or {}
+    if not integration.enabled or not config.get("import_format"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Connect the ePCR import and choose a format first",
+        )
+
+    job_id = uuid.uuid4().hex
+    try:
+        async with spool_upload(file, EPCR_IMPORT_DIR, MAX_EPCR_IMPORT_SIZE) as spooled:
+            mime = spooled.mime_type
+            if not (mime.startswith("text/") or mime in _EPCR_IMPORT_MIME_TYPES):
+                raise CodedHTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="File must be a CSV or NEMSIS XML export",
+                    error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
+                )
+            path = await spooled.commit(
+                os.path.join(EPCR_IMPORT_DIR, f"{job_id}.import")
+            )
+    except UploadTooLargeError:
+        raise CodedHTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File too large. Maximum size is 1GB.",
+            error_code=ErrorCode.UPLD_TOO_LARGE,
+        )
+    except RuntimeError:
+        logger.error("ePCR import validation unavailable: libmagic missing")
+        raise CodedHTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Upload validation is temporarily unavailable.",
+            error_code=ErrorCode.UPLD_VALIDATION_UNAVAILABLE,
+        )
+
+    progress = ImportProgress(
+        job_id=job_id,
+        organization_id=str(current_user.organization_id),
+        integration_id=integration.id,
+        import_format=config["import_format"],
+        bytes_total=spooled.size,
+    )
+    await save_progress(progress)
+    background_tasks.add_task(
+        run_import_job,
+        progress,
+        path,
+        config.get("field_mappings") or {},
+        config.get("auto_match_members", True),
+    )
+
+    await log_audit_event(
+        db,
+        "integration.epcr_import_started",
+        "integrations",
+        "info",
+        {
+            "user_id": current_user.id,
+            "organization_id": current_user.organization_id,
+            "integration_id": integration.id,
+            "job_id": job_id,
+            "import_format": progress.import_format,
+            "bytes": spooled.size,
+        },
+    )
+
+    return {"job_id": job_id, "status": progress.status}
+
+
+@router.get("/epcr-import/{job_id}")
+async def get_epcr_import_progress(
+    job_id: str,
+    current_user: User = Depends(require_permission("integrations.manage")),
+):
+    """Progress and totals for an ePCR import job."""
+    from app.services.integration_services.epcr_import_service import (
+        get_import_progress,
+    )
+
+    progress = await get_import_progress(job_id, current_user.organization_id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found"
+        )
+    return progress
@@ -11,9 +11,9 @@ import uuid as uuid_lib
 from datetime import datetime, timezone
 from uuid import UUID
 
-import magic
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     File,
     Form,
@@ -85,7 +85,12 @@ from app.schemas.membership_pipeline import (
     TransferProspectRequest,
     TransferProspectResponse,
 )
+from app.services.membership_pipeline_batch import (
+    PipelineNotification,
+    send_pipeline_notifications,
+)
 from app.services.membership_pipeline_service import MembershipPipelineService
+from app.utils.upload_spool import UploadTooLargeError, spool_upload
 
 # Applied router-wide, not per route: every endpoint that takes a
 # {prospect_id} path parameter — including ones added later — must refuse to
@@ -1257,6 +1262,7 @@ def _bulk_response(results: list[dict]) -> BulkActionResponse:
 @router.post("/prospects/bulk-advance", response_model=BulkActionResponse)
 async def bulk_advance_prospects(
     data: BulkAdvanceRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(
         require_permission("members.manage", "prospective_members.manage")
@@ -1274,13 +1280,23 @@ async def bulk_advance_prospects(
     **Requires permission: members.manage or prospective_members.manage**
     """
     service = MembershipPipelineService(db)
+    notifications: list[PipelineNotification] = []
     results = await service.bulk_advance_prospects(
         prospect_ids=[str(pid) for pid in data.prospect_ids],
         organization_id=current_user.organization_id,
         advanced_by=current_user.id,
         notes=data.notes,
         exclude_prospect_ids=hidden_prospect_ids,
+        notifications=notifications,
     )
+    if notifications:
+        # Stage and completion emails go out after the response, on their
+        # own session, instead of holding the request open per recipient.
+        background_tasks.add_task(
+            send_pipeline_notifications,
+            current_user.organization_id,
+            notifications,
+        )
     response = _bulk_response(results)
     if response.succeeded_count:
         await log_audit_event(
@@ -1565,35 +1581,6 @@ async def add_prospect_document(
 
     **Requires permission: members.manage or prospective_members.manage**
     """
-    content = await file.read()
-    if not content:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Uploaded file is empty."
-        )
-    if len(content) > MAX_PROSPECT_DOCUMENT_SIZE:
-        raise CodedHTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File too large. Maximum size is 50MB.",
-            error_code=ErrorCode.UPLD_TOO_LARGE,
-        )
-
-    # Validate the real content via magic bytes, not the client-supplied type.
-    detected_mime = magic.from_buffer(content[:2048], mime=True)
-    ext = PROSPECT_DOCUMENT_MIME_EXTENSIONS.get(detected_mime)
-    if ext is None:
-        logger.warning(
-            f"Prospect document rejected: detected MIME '{detected_mime}' "
-            f"(claimed: '{file.content_type}') for file '{file.filename}'"
-        )
-        raise CodedHTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=(
-                f"File type not allowed. Detected type: {detected_mime}. "
-                "Allowed: PDF, Word, JPEG, PNG, GIF."
-            ),
-            error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
-        )
-
     # Scope storage by org then prospect (mirrors event-attachments) so each
     # individual's files are grouped and the whole org is walkable for
     # accounting, export, or purge. Random UUID filename with a MIME-derived
@@ -1602,14 +1589,49 @@ async def add_prospect_document(
     prospect_dir = os.path.join(
         PROSPECT_DOCUMENT_DIR, str(current_user.organization_id), str(prospect_id)
     )
-    await asyncio.to_thread(os.makedirs, prospect_dir, exist_ok=True)
-    stored_path = os.path.join(prospect_dir, f"{uuid_lib.uuid4().hex}{ext}")
+    try:
+        async with spool_upload(
+            file, prospect_dir, MAX_PROSPECT_DOCUMENT_SIZE
+        ) as spooled:
+            if not spooled.size:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Uploaded file is empty.",
+                )
 
-    def _write_file(path: str, data: bytes) -> None:
-        with open(path, "wb") as fh:
-            fh.write(data)
+            # Validate the real content via magic bytes, not the client-supplied type.
+            detected_mime = spooled.mime_type
+            ext = PROSPECT_DOCUMENT_MIME_EXTENSIONS.get(detected_mime)
+            if ext is None:
+                logger.warning(
+                    f"Prospect document rejected: detected MIME '{detected_mime}' "
+                    f"(claimed: '{file.content_type}') for file '{file.filename}'"
+                )
+                raise CodedHTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        f"File type not allowed. Detected type: {detected_mime}. "
+                        "Allowed: PDF, Word, JPEG, PNG, GIF."
+                    ),
+                    error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
+                )
 
-    await asyncio.to_thread(_write_file, stored_path, content)
+            stored_path = await spooled.commit(
+                os.path.join(prospect_dir, f"{uuid_lib.uuid4().hex}{ext}")
+            )
+    except UploadTooLargeError:
+        raise CodedHTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File too large. Maximum size is 50MB.",
+            error_code=ErrorCode.UPLD_TOO_LARGE,
+        )
+    except RuntimeError:
+        logger.error("Prospect document validation unavailable: libmagic missing")
+        raise CodedHTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Upload validation is temporarily unavailable.",
+            error_code=ErrorCode.UPLD_VALIDATION_UNAVAILABLE,
+        )
 
     service = MembershipPipelineService(db)
     try:
@@ -1619,7 +1641,7 @@ async def add_prospect_document(
             document_type=document_type,
             file_name=file.filename or os.path.basename(stored_path),
             file_path=stored_path,
-            file_size=len(content),
+            file_size=spooled.size,
             mime_type=detected_mime,
             step_id=str(step_id) if step_id else None,
             uploaded_by=current_user.id,
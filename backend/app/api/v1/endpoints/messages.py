@@ -110,6 +110,7 @@ class MessageStatsResponse(BaseModel):
     total_targeted: int
     total_reads: int
     total_acknowledged: int
+    delivery: dict | None = None
 
 
 class AckReportRecipient(BaseModel):
@@ -13,7 +13,8 @@ from sqlalchemy import Date, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import require_permission
-from app.core.database import get_db
+from app.core.database import get_read_db
+from app.core.query_profiler import query_profiler
 from app.models.document import Document
 from app.models.election import Election
 from app.models.error_log import ErrorLog
@@ -27,6 +28,7 @@ from app.schemas.platform_analytics import (
     DailyCount,
     ModuleUsage,
     PlatformAnalyticsResponse,
+    QueryProfileResponse,
 )
 
 router = APIRouter()
@@ -34,7 +36,7 @@ router = APIRouter()
 
 @router.get("", response_model=PlatformAnalyticsResponse)
 async def get_platform_analytics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_permission("settings.manage")),
 ) -> PlatformAnalyticsResponse:
     """
@@ -335,3 +337,21 @@ async def get_platform_analytics(
         documents_last_30_days=documents_last_30,
         generated_at=now,
     )
+
+
+@router.get("/query-profile", response_model=QueryProfileResponse)
+async def get_query_profile(
+    reset: bool = False,
+    current_user: User = Depends(require_permission("settings.manage")),
+) -> QueryProfileResponse:
+    """
+    Per-route query counts, DB time and likely N+1 statements.
+
+    Collected only while QUERY_PROFILER_ENABLED is set, and per worker: each
+    call reports the worker that served it. ``reset=true`` starts a new
+    window after returning the current one.
+    """
+    snapshot = query_profiler.snapshot()
+    if reset:
+        query_profiler.reset()
+    return QueryProfileResponse(**snapshot)
@@ -13,7 +13,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import require_permission, user_has_permission
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.utils import ensure_found
 from app.models.analytics import SavedReport
 from app.models.user import User
@@ -60,7 +60,7 @@ def _enforce_report_pii_permission(current_user: User, report_type: str) -> None
 
 @router.get("/available")
 async def get_available_reports(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_permission("reports.view")),
 ):
     """Get list of available reports"""
@@ -87,7 +87,7 @@ async def get_available_reports(
 @router.post("/generate")
 async def generate_report(
     request: ReportRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_permission("reports.view")),
 ):
     """Generate a report"""
@@ -114,7 +114,7 @@ async def generate_report(
 
 @router.get("/saved", response_model=List[SavedReportResponse])
 async def list_saved_reports(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_permission("reports.view")),
 ):
     """List all saved report configurations for the organization"""
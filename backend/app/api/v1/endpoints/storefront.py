@@ -17,7 +17,7 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends
 from fastapi import File as FastAPIFile
-from fastapi import HTTPException, Query, Response, UploadFile, status
+from fastapi import HTTPException, Query, Request, Response, UploadFile, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -28,6 +28,7 @@ from app.api.dependencies import (
 )
 from app.core.audit import log_audit_event
 from app.core.database import get_db
+from app.core.storage import get_storage, stored_object_response
 from app.core.utils import safe_error_detail
 from app.models.storefront import (
     StoreOrder,
@@ -81,7 +82,12 @@ from app.services.storefront_preview_service import (
     StorefrontPreviewService,
 )
 from app.services.storefront_service import StorefrontService
-from app.utils.image_processing import optimize_image
+from app.utils.http_caching import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
 
 router = APIRouter()
 
@@ -249,6 +255,9 @@ def _window_summary(window: StoreOrderWindow) -> Dict[str, Any]:
 def _product_payload(product: StoreProduct, has_image: bool = False) -> Dict[str, Any]:
     return {
         "image_url": StorefrontService.resolve_image_url(product, has_image),
+        "thumbnail_url": StorefrontService.resolve_image_url(
+            product, has_image, size="thumbnail"
+        ),
         "has_image": has_image,
         **{
             field: getattr(product, field)
@@ -729,10 +738,19 @@ async def upload_product_image(
 ) -> Any:
     """Attach a photo to a catalog item.
 
-    The upload is re-encoded to WebP, which strips EXIF (including any GPS
-    tag on a phone photo) and bounds the stored size — the bytes are served
-    back to every member browsing the store.
+    The upload is re-encoded to WebP (or AVIF, per
+    ``IMAGE_DERIVATIVE_FORMAT``), which strips EXIF (including any GPS tag on
+    a phone photo) and bounds the stored size — the bytes are served
+    back to every member browsing the store. Thumbnail and card renditions
+    are stored alongside; the resizing runs in the image worker pool.
     """
+    from app.utils.image_processing import (
+        IMAGE_DERIVATIVES,
+        derivative_format,
+        render_derivatives,
+        run_image_task,
+    )
+
     contents = await file.read()
     if not contents:
         raise HTTPException(status_code=400, detail="The uploaded file is empty")
@@ -746,9 +764,14 @@ async def upload_product_image(
             status_code=400, detail="Invalid image type. Allowed: JPEG, PNG, WebP"
         )
 
+    output_format, media_type = derivative_format()
     try:
-        optimized = optimize_image(
-            contents, max_size=(1200, 1200), quality=82, output_format="WEBP"
+        renditions = await run_image_task(
+            render_derivatives,
+            contents,
+            IMAGE_DERIVATIVES,
+            quality=82,
+            output_format=output_format,
         )
     except Exception as exc:
         raise HTTPException(status_code=400, detail=safe_error_detail(exc))
@@ -758,9 +781,10 @@ async def upload_product_image(
         await service.set_product_image(
             product_id,
             str(current_user.organization_id),
-            optimized,
-            "image/webp",
+            renditions.pop("full"),
+            media_type,
             str(current_user.id),
+            derivatives=renditions,
         )
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=safe_error_detail(exc))
@@ -774,6 +798,8 @@ async def upload_product_image(
 @router.get("/products/{product_id}/image")
 async def get_product_image(
     product_id: str,
+    request: Request,
+    size: str = Query("full", pattern="^(thumbnail|card|full)$"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_permission("storefront.view")),
 ) -> Any:
@@ -782,6 +808,11 @@ async def get_product_image(
     Cached immutably: the URL carries a ``v=`` stamp from the product's
     update time, so a replaced photo arrives under a different URL rather
     than needing a revalidation round trip per image per page load.
+
+    Photos in object storage are streamed (or redirected to a pre-signed
+    URL); rows from before storage existed are served from the database.
+    ``size`` selects a rendition; photos uploaded before renditions existed
+    serve the full image for every size.
     """
     service = StorefrontService(db)
     image = await service.get_product_image(
@@ -789,11 +820,32 @@ async def get_product_image(
     )
     if image is None:
         raise HTTPException(status_code=404, detail="No image for this product")
-    return Response(
-        content=image.data,
-        media_type=image.content_type or "image/webp",
-        headers={"Cache-Control": "private, max-age=31536000, immutable"},
-    )
+    # The row (without its bytes) is the version stamp: a browser that
+    # revalidates anyway — reload, or a URL fetched without ``v=`` — gets a
+    # 304 before the photo is read from storage or the database.
+    key = image.storage_key
+    byte_size = image.byte_size
+    if key and size != "full" and size in (image.derivatives or {}):
+        key = service.derivative_key(key, size)
+        byte_size = image.derivatives[size]
+    cache_control = "private, max-age=31536000, immutable"
+    etag = make_etag(image.id, key, byte_size, image.updated_at)
+    if is_not_modified(request, etag, image.updated_at):
+        return not_modified_response(etag, image.updated_at, cache_control)
+    cache_headers = validator_headers(etag, image.updated_at, cache_control)
+    media_type = image.content_type or "image/webp"
+    if key:
+        return await stored_object_response(
+            get_storage(),
+            key,
+            media_type=media_type,
+            range_header=request.headers.get("range"),
+            headers=cache_headers,
+        )
+    data = await service.get_legacy_image_bytes(image)
+    if data is None:
+        raise HTTPException(status_code=404, detail="No image for this product")
+    return Response(content=data, media_type=media_type, headers=cache_headers)
 
 
 @router.delete("/products/{product_id}/image", status_code=status.HTTP_204_NO_CONTENT)
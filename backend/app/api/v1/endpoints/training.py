@@ -69,6 +69,7 @@ from app.schemas.training import (
     TrainingRequirementUpdate,
     UserTrainingStats,
 )
+from app.services.compliance_status_service import ComplianceStatusService
 from app.services.integration_services.notification_dispatch import (
     notify_entity_created,
     notify_summary,
@@ -2520,7 +2521,8 @@ async def get_compliance_matrix(
     Training compliance matrix: for each active member, shows status
     of each active training requirement (completed, expired, in_progress, not_started).
     Uses requirement-type-aware matching (hours, courses, certifications, etc.)
-    with frequency-based date windows.
+    with frequency-based date windows, read from the persisted
+    member x requirement status table.
     """
     org_id = current_user.organization_id
 
@@ -2555,30 +2557,15 @@ async def get_compliance_matrix(
             "generated_at": datetime.now(timezone.utc).isoformat(),
         }
 
-    # Get all training records for these members
-    records_result = await db.execute(
-        select(TrainingRecord).where(
-            TrainingRecord.organization_id == org_id,
-            TrainingRecord.user_id.in_([m.id for m in members]),
-        )
+    # Persisted member x requirement statuses; only members whose records,
+    # waivers or leave changed since the last read are re-evaluated.
+    statuses = await ComplianceStatusService(db).get_statuses(
+        str(org_id), [m.id for m in members], requirements
     )
-    all_records = records_result.scalars().all()
-
-    # Build lookup: user_id -> [records]
-    records_by_user = {}
-    for r in all_records:
-        records_by_user.setdefault(r.user_id, []).append(r)
-
-    # Batch-fetch all active waivers / leaves for the org
-    waivers_by_user = await fetch_org_waivers(db, str(org_id))
-
-    today = date.today()
-    org_include_current = await get_org_include_current_month(db, str(org_id))
     matrix = []
 
     for member in members:
-        member_records = records_by_user.get(member.id, [])
-        member_waivers = waivers_by_user.get(str(member.id), [])
+        member_statuses = statuses.get(str(member.id), {})
         member_membership_type = member.membership_type or "active"
         req_statuses = []
         completed_count = 0
@@ -2589,24 +2576,18 @@ async def get_compliance_matrix(
                 if member_membership_type not in req.required_membership_types:
                     continue
 
-            req_status, comp_date, exp_date = _evaluate_member_requirement(
-                req,
-                member_records,
-                today,
-                waivers=member_waivers,
-                org_include_current_month=org_include_current,
-            )
+            req_status = member_statuses[str(req.id)]
 
-            if req_status == TrainingStatus.COMPLETED.value:
+            if req_status.status == TrainingStatus.COMPLETED.value:
                 completed_count += 1
 
             req_statuses.append(
                 RequirementStatusItem(
                     requirement_id=req.id,
                     requirement_name=req.name,
-                    status=req_status,
-                    completion_date=comp_date,
-                    expiry_date=exp_date,
+                    status=req_status.status,
+                    completion_date=req_status.completion_date,
+                    expiry_date=req_status.expiry_date,
                 )
             )
 
@@ -743,49 +743,44 @@ async def upload_record_attachment(
     import os
     import uuid as uuid_lib
 
-    import magic
     from sqlalchemy.orm.attributes import flag_modified
 
+    from app.utils.upload_spool import UploadTooLargeError, spool_upload
+
     record = await _load_record_for_attachment(db, record_id, current_user)
 
-    content = await file.read()
-    if len(content) > MAX_ATTACHMENT_BYTES:
+    org_dir = os.path.join(TRAINING_ATTACHMENT_DIR, str(current_user.organization_id))
+    try:
+        async with spool_upload(file, org_dir, MAX_ATTACHMENT_BYTES) as spooled:
+            detected_mime = spooled.mime_type
+            ext = ALLOWED_ATTACHMENT_MIME.get(detected_mime)
+            if not ext:
+                raise CodedHTTPException(
+                    status_code=400,
+                    detail=(
+                        f"File type not allowed (detected: {detected_mime}). "
+                        "Allowed: PDF, Word, or image files."
+                    ),
+                    error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
+                )
+
+            # Use a server-generated name + magic-derived extension to prevent
+            # double-extension attacks (e.g. cert.pdf.exe).
+            stored_name = f"{uuid_lib.uuid4().hex}{ext}"
+            file_path = await spooled.commit(os.path.join(org_dir, stored_name))
+    except UploadTooLargeError:
         raise CodedHTTPException(
             status_code=400,
             detail="File too large. Maximum size is 25MB.",
             error_code=ErrorCode.UPLD_TOO_LARGE,
         )
 
-    detected_mime = magic.from_buffer(content[:2048], mime=True)
-    ext = ALLOWED_ATTACHMENT_MIME.get(detected_mime)
-    if not ext:
-        raise CodedHTTPException(
-            status_code=400,
-            detail=(
-                f"File type not allowed (detected: {detected_mime}). "
-                "Allowed: PDF, Word, or image files."
-            ),
-            error_code=ErrorCode.UPLD_TYPE_NOT_ALLOWED,
-        )
-
-    org_dir = os.path.join(TRAINING_ATTACHMENT_DIR, str(current_user.organization_id))
-    await asyncio.to_thread(os.makedirs, org_dir, exist_ok=True)
-    # Use a server-generated name + magic-derived extension to prevent
-    # double-extension attacks (e.g. cert.pdf.exe).
-    stored_name = f"{uuid_lib.uuid4().hex}{ext}"
-    file_path = os.path.join(org_dir, stored_name)
-
-    def _write_file(path: str, data: bytes) -> None:
-        with open(path, "wb") as f:
-            f.write(data)
-
-    await asyncio.to_thread(_write_file, file_path, content)
-
     attachment = {
         "file_name": file.filename or stored_name,
         "file_path": file_path,
         "file_type": detected_mime,
-        "file_size": len(content),
+        "file_size": spooled.size,
+        "sha256": spooled.sha256,
         "uploaded_at": datetime.now(timezone.utc).isoformat(),
         "uploaded_by": str(current_user.id),
     }
@@ -2002,9 +2002,14 @@ async def upload_photo(
 
     # Optimize image: resize, strip EXIF, convert to WebP (smaller files)
     try:
-        from app.utils.image_processing import IMAGE_SIZE_LIMITS, optimize_image
+        from app.utils.image_processing import (
+            IMAGE_SIZE_LIMITS,
+            optimize_image,
+            run_image_task,
+        )
 
-        clean_contents = optimize_image(
+        clean_contents = await run_image_task(
+            optimize_image,
             contents,
             max_size=IMAGE_SIZE_LIMITS["avatar"],  # 400x400 for profile photos
             quality=85,
@@ -46,7 +46,6 @@ from app.models.user import User
 from app.schemas.organization import OrganizationSetupCreate, OrganizationSetupResponse
 from app.services.auth_service import AuthService
 from app.services.onboarding import OnboardingService
-from app.utils.image_validator import validate_logo_image
 from app.utils.onboarding_security import find_system_owner
 
 router = APIRouter(prefix="/onboarding", tags=["onboarding"])
@@ -938,6 +937,8 @@ async def create_organization(
     (address, contact info, identifiers, etc.) are properly persisted
     and flow through to the auto-created headquarters facility.
     """
+    from app.utils.image_validator import validate_logo_image_async
+
     # Validate session
     await validate_session(request, db)
 
@@ -998,7 +999,7 @@ async def create_organization(
             # Additional info
             county=org_data.county,
             founded_year=org_data.founded_year,
-            logo=validate_logo_image(org_data.logo),
+            logo=await validate_logo_image_async(org_data.logo),
         )
 
         await db.commit()
@@ -1349,11 +1350,13 @@ async def save_department_info(
     Stores department name, logo (base64), and navigation layout preference.
     This data is safe to store as it contains no secrets.
     """
+    from app.utils.image_validator import validate_logo_image_async
+
     # Validate session
     session = await validate_session(request, db)
 
     # Validate and sanitize logo before storing
-    validated_logo = validate_logo_image(data.logo)
+    validated_logo = await validate_logo_image_async(data.logo)
 
     # Update session data with department info
     session.data = session.data or {}
@@ -1749,6 +1752,8 @@ async def save_session_organization(
     The organization is committed to the database at this step so that
     subsequent steps can reference it (e.g., role setup, admin user creation).
     """
+    from app.utils.image_validator import validate_logo_image_async
+
     # Validate session
     session = await validate_session(request, db)
 
@@ -1807,7 +1812,8 @@ async def save_session_organization(
             # Additional info
             county=data.county,
             founded_year=data.founded_year,
-            logo=validate_logo_image(data.logo),  # Validate and sanitize logo
+            # Validate and sanitize logo
+            logo=await validate_logo_image_async(data.logo),
         )
 
         # Store organization ID in session for subsequent steps
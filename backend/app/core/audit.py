@@ -5,6 +5,7 @@ Implements blockchain-inspired hash chain for immutable audit logs
 with cryptographic integrity verification.
 """
 
+import asyncio
 import gzip
 import hashlib
 import hmac
@@ -15,7 +16,7 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from loguru import logger
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -32,6 +33,12 @@ _CURRENT_HASH_VERSION = 3
 _KEYED_MIN_VERSION = 2
 _LEGACY_HASH_VERSION = 1
 
+# Retention archival streams the purge range in pages of this many rows and
+# deletes it in id chunks of this size, so neither memory nor a single
+# DELETE's lock footprint grows with the backlog.
+_ARCHIVE_PAGE_SIZE = 2000
+_ARCHIVE_DELETE_CHUNK = 5000
+
 
 def _get_audit_signing_key() -> str:
     """Return the HMAC key for the audit chain.
@@ -44,6 +51,40 @@ def _get_audit_signing_key() -> str:
     return settings.AUDIT_LOG_SIGNING_KEY or settings.SECRET_KEY
 
 
+class _ArchiveWriter:
+    """Appends pages of serialized audit rows to an archive file.
+
+    Each page becomes one complete gzip member; concatenated members are a
+    valid gzip stream (``gzip.open`` / ``zcat`` read them as one file). Runs
+    in a worker thread, so the SHA-256 of the file is accumulated here as
+    the bytes are written rather than by re-reading the archive.
+    """
+
+    def __init__(self, fh):
+        self._fh = fh
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write_page(self, records: list[dict[str, Any]]) -> None:
+        data = "".join(
+            json.dumps(record, sort_keys=True, default=str) + "\n" for record in records
+        )
+        member = gzip.compress(data.encode("utf-8"))
+        self.digest.update(member)
+        self._fh.write(member)
+        self.size += len(member)
+
+    def sync(self) -> None:
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def truncate(self, size: int) -> None:
+        """Drop everything written after ``size`` bytes and sync."""
+        self._fh.truncate(size)
+        self.size = size
+        self.sync()
+
+
 class AuditLogger:
     """
     Tamper-proof audit logger with cryptographic hash chains
@@ -143,6 +184,67 @@ class AuditLogger:
             "event_data": log.event_data,
         }
 
+    def _chain_row(
+        self,
+        previous_hash: str,
+        *,
+        event_type: str,
+        event_category: str,
+        severity: str,
+        event_data: dict[str, Any],
+        user_id: str | None = None,
+        username: str | None = None,
+        session_id: str | None = None,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+        geo_location: dict[str, Any] | None = None,
+        organization_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Column values of the entry that follows ``previous_hash``."""
+        # Create log entry data. Microseconds are zeroed on the STORED value,
+        # not just in the hash input: MySQL DATETIME(0) ROUNDS fractional
+        # seconds on insert, so storing 12.7s would read back as 13s and fail
+        # verification about half the time. timestamp_nanos preserves
+        # sub-second ordering losslessly.
+        timestamp = datetime.now(UTC).replace(microsecond=0)
+        timestamp_nanos = time.time_ns()
+
+        log_data = {
+            "timestamp": self._normalize_timestamp(timestamp),
+            "timestamp_nanos": timestamp_nanos,
+            "event_type": event_type,
+            "event_category": event_category,
+            "severity": severity.value if hasattr(severity, "value") else severity,
+            "user_id": user_id,
+            "organization_id": organization_id,
+            "ip_address": ip_address,
+            "event_data": event_data,
+        }
+
+        # Calculate current hash with the keyed (HMAC) algorithm.
+        current_hash = self.calculate_hash(
+            log_data, previous_hash, _CURRENT_HASH_VERSION
+        )
+
+        return {
+            "timestamp": timestamp,
+            "timestamp_nanos": timestamp_nanos,
+            "event_type": event_type,
+            "event_category": event_category,
+            "severity": severity,
+            "user_id": user_id,
+            "organization_id": organization_id,
+            "username": username,
+            "session_id": session_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "geo_location": geo_location,
+            "event_data": event_data,
+            "previous_hash": previous_hash,
+            "current_hash": current_hash,
+            "hash_version": _CURRENT_HASH_VERSION,
+        }
+
     async def create_log_entry(
         self,
         db: AsyncSession,
@@ -192,51 +294,21 @@ class AuditLogger:
                 last_log = result.scalar_one_or_none()
                 previous_hash = last_log.current_hash if last_log else "0" * 64
 
-                # Create log entry data. Microseconds are zeroed on the STORED
-                # value, not just in the hash input: MySQL DATETIME(0) ROUNDS
-                # fractional seconds on insert, so storing 12.7s would read
-                # back as 13s and fail verification about half the time.
-                # timestamp_nanos preserves sub-second ordering losslessly.
-                timestamp = datetime.now(UTC).replace(microsecond=0)
-                timestamp_nanos = time.time_ns()
-
-                log_data = {
-                    "timestamp": self._normalize_timestamp(timestamp),
-                    "timestamp_nanos": timestamp_nanos,
-                    "event_type": event_type,
-                    "event_category": event_category,
-                    "severity": (
-                        severity.value if hasattr(severity, "value") else severity
-                    ),
-                    "user_id": user_id,
-                    "organization_id": organization_id,
-                    "ip_address": ip_address,
-                    "event_data": event_data,
-                }
-
-                # Calculate current hash with the keyed (HMAC) algorithm.
-                current_hash = self.calculate_hash(
-                    log_data, previous_hash, _CURRENT_HASH_VERSION
-                )
-
-                # Create log entry
                 log_entry = AuditLog(
-                    timestamp=timestamp,
-                    timestamp_nanos=timestamp_nanos,
-                    event_type=event_type,
-                    event_category=event_category,
-                    severity=severity,
-                    user_id=user_id,
-                    organization_id=organization_id,
-                    username=username,
-                    session_id=session_id,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    geo_location=geo_location,
-                    event_data=event_data,
-                    previous_hash=previous_hash,
-                    current_hash=current_hash,
-                    hash_version=_CURRENT_HASH_VERSION,
+                    **self._chain_row(
+                        previous_hash,
+                        event_type=event_type,
+                        event_category=event_category,
+                        severity=severity,
+                        event_data=event_data,
+                        user_id=user_id,
+                        username=username,
+                        session_id=session_id,
+                        ip_address=ip_address,
+                        user_agent=user_agent,
+                        geo_location=geo_location,
+                        organization_id=organization_id,
+                    )
                 )
 
                 db.add(log_entry)
@@ -252,6 +324,52 @@ class AuditLogger:
             # without affecting the outer transaction.
             return None
 
+    async def create_log_entries(
+        self, db: AsyncSession, entries: list[dict[str, Any]]
+    ) -> int:
+        """
+        Append several entries to the chain at once; returns how many.
+
+        Each item takes ``create_log_entry``'s keyword arguments, with
+        ``organization_id`` given explicitly. The chain head is read once,
+        the entries are chained in list order and inserted in one
+        multi-row statement (ids, and so chain order, follow the list), all
+        within one savepoint. Like ``create_log_entry``, a failure is logged
+        and leaves the caller's transaction intact; nothing is written.
+        """
+        if not entries:
+            return 0
+        try:
+            async with db.begin_nested():
+                result = await db.execute(
+                    select(AuditLog).order_by(AuditLog.id.desc()).limit(1)
+                )
+                last_log = result.scalar_one_or_none()
+                previous_hash = last_log.current_hash if last_log else "0" * 64
+
+                rows = []
+                for entry in entries:
+                    organization_id = entry.get("organization_id")
+                    row = self._chain_row(
+                        previous_hash,
+                        **{
+                            **entry,
+                            "organization_id": (
+                                str(organization_id) if organization_id else None
+                            ),
+                        },
+                    )
+                    previous_hash = row["current_hash"]
+                    rows.append(row)
+
+                await db.execute(insert(AuditLog), rows)
+
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"Failed to create {len(entries)} audit logs: {e}")
+            return 0
+
     async def verify_integrity(
         self,
         db: AsyncSession,
@@ -571,6 +689,7 @@ class AuditLogger:
         db: AsyncSession,
         retention_days: int,
         archive_dir: str,
+        commit_ranges: bool = False,
     ) -> dict[str, Any]:
         """
         Enforce the audit retention period: export rows older than
@@ -580,15 +699,28 @@ class AuditLogger:
         - Only checkpoint-covered ranges are purged, and only whole
           checkpoint ranges — their Merkle roots stay in the DB as an index
           to the exported archive, so old entries remain provable offline.
-        - The range must pass integrity verification immediately before
-          export; a chain that doesn't verify is never purged.
-        - The boundary checkpoint records the last purged row's chain hash
-          plus a keyed attestation, so verification of the surviving chain
-          still passes — and unsanctioned deletions still fail.
+        - Each range must pass integrity verification as the chain head
+          immediately before export; a range that doesn't verify is never
+          purged, and neither is anything after it.
+        - Each purged checkpoint records its last row's chain hash plus a
+          keyed attestation, so verification of the surviving chain still
+          passes — and unsanctioned deletions still fail.
+
+        Rows are streamed a page at a time and appended to the archive as
+        independent gzip members (a valid multi-member gzip file), with JSON
+        encoding, compression and the file write done in a worker thread
+        while the next page is read. Each range is fsynced before its rows
+        are deleted, in id chunks of ``_ARCHIVE_DELETE_CHUNK``. With
+        ``commit_ranges`` the session is committed after every range, so
+        locks are held for one checkpoint range at a time and every
+        committed state verifies; an interrupted run leaves the rows it did
+        not purge for the next run, and its archive holds (and is named
+        after) only the ranges it committed.
         """
         results: dict[str, Any] = {
             "purged_entries": 0,
             "archive_file": None,
+            "archive_sha256": None,
             "purge_start_id": None,
             "purge_end_id": None,
             "skipped_reason": None,
@@ -600,17 +732,17 @@ class AuditLogger:
         if head is None:
             results["skipped_reason"] = "no audit rows"
             return results
+        head_id = head.id
 
         # Walk contiguous checkpoints from the head; a range qualifies only
         # if its newest covered row is already past retention.
         cp_result = await db.execute(
             select(AuditLogCheckpoint)
-            .where(AuditLogCheckpoint.last_log_id >= head.id)
+            .where(AuditLogCheckpoint.last_log_id >= head_id)
             .order_by(AuditLogCheckpoint.first_log_id)
         )
-        purge_end: int | None = None
-        boundary_cp: AuditLogCheckpoint | None = None
-        expected_next = head.id
+        ranges: list[AuditLogCheckpoint] = []
+        expected_next = head_id
         for cp in cp_result.scalars().all():
             if cp.first_log_id > expected_next:
                 break  # gap in checkpoint coverage — nothing beyond is safe
@@ -626,81 +758,160 @@ class AuditLogger:
                     newest_ts = newest_ts.replace(tzinfo=UTC)
                 if newest_ts >= cutoff:
                     break
-                purge_end = cp.last_log_id
-                boundary_cp = cp
+                ranges.append(cp)
             expected_next = max(expected_next, cp.last_log_id + 1)
 
-        if purge_end is None or boundary_cp is None:
+        if not ranges:
             results["skipped_reason"] = "no checkpoint-covered rows past retention"
             return results
 
-        integrity = await self.verify_integrity(db, end_id=purge_end)
-        if not integrity["verified"]:
-            results["skipped_reason"] = (
-                "integrity verification failed - refusing to purge"
-            )
-            logger.error(
-                f"Audit retention purge aborted: range {head.id}-{purge_end} "
-                "failed integrity verification"
-            )
-            return results
-
-        rows = (
-            (
-                await db.execute(
-                    select(AuditLog)
-                    .where(AuditLog.id <= purge_end)
-                    .order_by(AuditLog.id)
-                )
-            )
-            .scalars()
-            .all()
-        )
-        last_row = rows[-1]
-
         # Archives contain the complete, unredacted audit records.  Do not
         # rely on the process umask to keep either the directory or files
         # private, especially when the configured path is on a shared volume.
         os.makedirs(archive_dir, mode=0o700, exist_ok=True)
         os.chmod(archive_dir, 0o700)
         stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
-        filename = f"audit_archive_{rows[0].id:012d}-{purge_end:012d}_{stamp}.jsonl.gz"
-        archive_path = os.path.join(archive_dir, filename)
-        fd = os.open(archive_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+
+        def archive_name(end_id: int) -> str:
+            return os.path.join(
+                archive_dir,
+                f"audit_archive_{head_id:012d}-{end_id:012d}_{stamp}.jsonl.gz",
+            )
+
+        # Written under a provisional name and renamed once the run ends, so
+        # the file is always named after the last range actually purged —
+        # not the last one planned, which may abort.
+        partial_path = os.path.join(
+            archive_dir, f"audit_archive_{head_id:012d}_{stamp}.jsonl.gz.partial"
+        )
+        fd = os.open(partial_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
         # The mode passed to os.open is filtered by the process umask — a
         # hostile umask could leave the only remaining copy of the purged
         # rows unreadable (mode 0000). fchmod re-asserts the exact mode,
         # matching the explicit chmod on the directory above.
         os.fchmod(fd, 0o600)
+
+        purged_through = head_id - 1
+        committed_through, committed_size = purged_through, 0
         with os.fdopen(fd, "wb") as raw_fh:
-            with gzip.open(raw_fh, "wt", encoding="utf-8") as fh:
-                for row in rows:
-                    fh.write(
-                        json.dumps(self.serialize_row(row), sort_keys=True, default=str)
-                        + "\n"
+            archive = _ArchiveWriter(raw_fh)
+            try:
+                for cp in ranges:
+                    integrity = await self.verify_integrity(db, end_id=cp.last_log_id)
+                    if not integrity["verified"]:
+                        results["skipped_reason"] = (
+                            "integrity verification failed - refusing to purge"
+                        )
+                        logger.error(
+                            f"Audit retention purge aborted: range "
+                            f"{purged_through + 1}-{cp.last_log_id} failed "
+                            "integrity verification"
+                        )
+                        break
+
+                    exported, last_hash = await self._export_range(
+                        db, archive, purged_through, cp.last_log_id
                     )
+                    if not exported:
+                        continue
+                    await asyncio.to_thread(archive.sync)
+
+                    cp.archived_at = datetime.now(UTC)
+                    cp.last_log_hash = last_hash
+                    cp.archive_attestation = self.compute_archive_attestation(
+                        cp.first_log_id, cp.last_log_id, last_hash
+                    )
+                    for chunk_start in range(
+                        purged_through, cp.last_log_id, _ARCHIVE_DELETE_CHUNK
+                    ):
+                        chunk_end = min(
+                            chunk_start + _ARCHIVE_DELETE_CHUNK, cp.last_log_id
+                        )
+                        await db.execute(
+                            delete(AuditLog)
+                            .where(AuditLog.id > chunk_start)
+                            .where(AuditLog.id <= chunk_end)
+                        )
+                    await db.flush()
+                    if commit_ranges:
+                        await db.commit()
+                        committed_through = cp.last_log_id
+                        committed_size = archive.size
+
+                    purged_through = cp.last_log_id
+                    results["purged_entries"] += exported
+                    results["purge_end_id"] = cp.last_log_id
+            except BaseException:
+                # Ranges already committed are gone from the database, so
+                # keep exactly their rows under their own name; without one,
+                # every exported row is still in the table.
+                if committed_through >= head_id:
+                    archive.truncate(committed_size)
+                    os.rename(partial_path, archive_name(committed_through))
+                else:
+                    os.remove(partial_path)
+                raise
+
+        if not results["purged_entries"]:
+            os.remove(partial_path)
+            return results
 
-        boundary_cp.archived_at = datetime.now(UTC)
-        boundary_cp.last_log_hash = last_row.current_hash
-        boundary_cp.archive_attestation = self.compute_archive_attestation(
-            boundary_cp.first_log_id,
-            boundary_cp.last_log_id,
-            last_row.current_hash,
-        )
-
-        await db.execute(delete(AuditLog).where(AuditLog.id <= purge_end))
-        await db.flush()
-
-        results["purged_entries"] = len(rows)
+        archive_path = archive_name(results["purge_end_id"])
+        os.rename(partial_path, archive_path)
         results["archive_file"] = archive_path
-        results["purge_start_id"] = rows[0].id
-        results["purge_end_id"] = purge_end
+        results["archive_sha256"] = archive.digest.hexdigest()
+        results["purge_start_id"] = head_id
         logger.info(
-            f"Audit retention: exported and purged {len(rows)} entries "
-            f"({rows[0].id}-{purge_end}) to {archive_path}"
+            f"Audit retention: exported and purged {results['purged_entries']} "
+            f"entries ({head_id}-{results['purge_end_id']}) to {archive_path}"
         )
         return results
 
+    async def _export_range(
+        self,
+        db: AsyncSession,
+        archive: "_ArchiveWriter",
+        after_id: int,
+        last_id: int,
+    ) -> tuple[int, str | None]:
+        """Stream rows ``after_id < id <= last_id`` into ``archive``.
+
+        Pages are read as plain rows (not ORM instances, which the session
+        would keep in its identity map) and handed to the worker thread one
+        at a time, so the next page is read while the previous one is being
+        compressed and written. Returns the row count and the chain hash of
+        the last row.
+        """
+        count = 0
+        last_hash: str | None = None
+        pending: asyncio.Future | None = None
+        try:
+            while True:
+                rows = (
+                    await db.execute(
+                        select(AuditLog.__table__)
+                        .where(AuditLog.id > after_id)
+                        .where(AuditLog.id <= last_id)
+                        .order_by(AuditLog.id)
+                        .limit(_ARCHIVE_PAGE_SIZE)
+                    )
+                ).all()
+                if not rows:
+                    break
+                records = [self.serialize_row(row) for row in rows]
+                if pending is not None:
+                    await pending
+                pending = asyncio.ensure_future(
+                    asyncio.to_thread(archive.write_page, records)
+                )
+                count += len(rows)
+                after_id = rows[-1].id
+                last_hash = rows[-1].current_hash
+        finally:
+            if pending is not None:
+                await pending
+        return count, last_hash
+
     async def create_checkpoint(
         self,
         db: AsyncSession,
@@ -47,6 +47,11 @@ class Settings(BaseSettings):
     DB_POOL_MIN: int = 2
     DB_POOL_MAX: int = 10
     DB_ECHO: bool = False  # SQL logging
+    # Per-request query counts, DB time and N+1 detection
+    # (app/core/query_profiler.py). Off by default; adds a hook per statement.
+    QUERY_PROFILER_ENABLED: bool = False
+    # Repeats of one SELECT shape within a request that count as a likely N+1.
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD: int = 5
     DB_CHARSET: str = "utf8mb4"  # Use utf8mb4 for full Unicode support
     DB_CONNECT_TIMEOUT: int = 30  # Connection timeout in seconds
     DB_CONNECT_RETRIES: int = (
@@ -58,12 +63,31 @@ class Settings(BaseSettings):
     DB_CONNECT_RETRY_MAX_DELAY: int = (
         15  # Maximum delay between retries (caps exponential backoff) - optimized for faster startup
     )
+    # Skip schema reflection and column repair at startup while the stored
+    # schema fingerprint (Alembic head + model metadata hash) matches the code.
+    SCHEMA_FINGERPRINT_ENABLED: bool = True
+    # Optional read replica for reports, analytics, exports and audit log
+    # lists (``get_read_db``). Same credentials and database name as the
+    # primary; the DB user needs REPLICATION CLIENT to read the lag.
+    DB_REPLICA_HOST: str = ""
+    DB_REPLICA_PORT: int = 3306
+    # Reads go to the primary while the replica is further behind than this.
+    DB_REPLICA_MAX_LAG_SECONDS: int = 5
+    # How often each worker re-checks replica reachability and lag.
+    DB_REPLICA_CHECK_SECONDS: int = 5
 
     @property
     def DATABASE_URL(self) -> str:
         """Construct async MySQL database URL"""
         return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?charset={self.DB_CHARSET}"
 
+    @property
+    def DATABASE_REPLICA_URL(self) -> str | None:
+        """Construct async MySQL URL of the read replica, if one is configured"""
+        if not self.DB_REPLICA_HOST:
+            return None
+        return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_REPLICA_HOST}:{self.DB_REPLICA_PORT}/{self.DB_NAME}?charset={self.DB_CHARSET}"
+
     @property
     def SYNC_DATABASE_URL(self) -> str:
         """Construct synchronous MySQL database URL (for Alembic)"""
@@ -109,6 +133,22 @@ class Settings(BaseSettings):
     REDIS_CONNECT_RETRIES: int = 3  # Number of connection retry attempts
     REDIS_REQUIRED: bool = False  # If False, app starts even if Redis fails
 
+    # Keep rendered personal ICS feeds in Redis, keyed by a version stamp of
+    # the member's shifts (app/api/public/calendar.py). Off by default: the
+    # ETag/304 path already avoids most renders.
+    ICS_FEED_CACHE_ENABLED: bool = False
+    ICS_FEED_CACHE_TTL_SECONDS: int = 3600
+
+    # Upper bound on how long a cached dashboard aggregate may be served
+    # (app/services/dashboard_summary_service.py). Writes through the ORM
+    # invalidate immediately; the TTL covers rolling windows and raw SQL.
+    DASHBOARD_CACHE_TTL_SECONDS: int = 300
+
+    # Upper bound on how long cached organization settings may be served
+    # (app/services/org_settings_cache.py). ORM writes invalidate at once;
+    # the TTL only covers raw SQL edits of the organizations table.
+    ORG_SETTINGS_CACHE_TTL_SECONDS: int = 3600
+
     @property
     def REDIS_URL(self) -> str:
         """Construct Redis URL.
@@ -170,6 +210,14 @@ class Settings(BaseSettings):
     # archive), giving the audit trail a copy outside the database host.
     AUDIT_SHIP_WEBHOOK_URL: str | None = None
     AUDIT_SHIP_BATCH_SIZE: int = 500
+    # Shipping pipeline: batches in flight at once, gzip request bodies
+    # (the collector must accept Content-Encoding: gzip), the collector
+    # latency batch sizing aims under, and the largest batch catch-up mode
+    # (scripts/ship_audit_backlog.py) grows to.
+    AUDIT_SHIP_MAX_IN_FLIGHT: int = 4
+    AUDIT_SHIP_COMPRESS: bool = False
+    AUDIT_SHIP_TARGET_LATENCY_SECONDS: float = 2.0
+    AUDIT_SHIP_MAX_BATCH_SIZE: int = 5000
     # Explicit operator risk acceptance: allow AUDIT_SHIP_WEBHOOK_URL to
     # resolve to a private/internal address (RFC1918, internal DNS). A normal
     # on-prem SIEM topology puts the collector on the trusted network, which
@@ -184,6 +232,11 @@ class Settings(BaseSettings):
     # Org-scoped record classes are configured per organization instead —
     # see app/services/retention_service.py.
     RETENTION_BLOCKED_ATTEMPTS_DAYS: int = 365
+    # Retention enforcement sweeps up to this many record classes at once, each
+    # on its own connection, sharing a delete budget in rows per second
+    # (0 = unbounded). Lower both on a busy primary.
+    RETENTION_CONCURRENCY: int = 3
+    RETENTION_MAX_ROWS_PER_SECOND: int = 5000
 
     # Account lockout after repeated failed sign-ins (brute-force protection).
     # Tunable so small, trusted deployments can run a gentler policy. (These
@@ -282,6 +335,10 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
+    # In-process pre-filter in front of the Redis limiters: a key one worker
+    # alone sees at more than this multiple of its limit is refused without a
+    # Redis round trip. 0 disables the pre-filter.
+    RATE_LIMIT_LOCAL_BURST_FACTOR: float = 2.0
     # Per-form/day ceiling on unauthenticated public form submissions (bounds
     # DB flooding and integration/email abuse from a distributed spam flood).
     # 0 disables the cap.
@@ -618,6 +675,14 @@ class Settings(BaseSettings):
     # IP Logging
     IP_LOGGING_ENABLED: bool = True  # Log all request IPs with geo info
 
+    # Prometheus metrics at GET /metrics (app/core/metrics.py). A scrape must
+    # send "Authorization: Bearer <METRICS_TOKEN>"; without a token the
+    # endpoint is only served outside production. Each worker pushes its
+    # counts to Redis every METRICS_FLUSH_SECONDS.
+    METRICS_ENABLED: bool = False
+    METRICS_TOKEN: str = ""
+    METRICS_FLUSH_SECONDS: int = 10
+
     @field_validator("COOKIE_SECURE", mode="before")
     @classmethod
     def _empty_cookie_secure_means_auto(cls, v):
@@ -730,9 +795,24 @@ class Settings(BaseSettings):
     # ============================================
     # File Storage
     # ============================================
-    STORAGE_TYPE: str = "local"  # local, s3, azure, gcs
+    STORAGE_TYPE: str = "local"  # local, s3 (see app/core/storage.py)
     UPLOAD_DIR: str = "./uploads"
+    # Root of the local storage backend. Matches the /app/uploads volume the
+    # upload endpoints have always written under, so existing paths resolve.
+    STORAGE_LOCAL_ROOT: str = "/app/uploads"
+    # Answer downloads with a 307 to a short-lived pre-signed URL instead of
+    # proxying the bytes, when the backend can sign URLs (S3 only).
+    STORAGE_PRESIGNED_DOWNLOADS: bool = False
+    STORAGE_PRESIGNED_URL_TTL_SECONDS: int = 300
     MAX_FILE_SIZE: int = 52428800  # 50 MB
+    # Worker processes that decode and re-encode uploaded images
+    # (app/utils/image_processing.py). 0 runs the work on a thread instead.
+    IMAGE_PROCESS_WORKERS: int = 2
+    # Recycle each image worker after this many uploads (0 = never).
+    IMAGE_WORKER_MAX_TASKS: int = 200
+    # Encoding for stored image renditions: "webp", or "avif" (smaller, and
+    # falls back to WebP when Pillow was built without libavif).
+    IMAGE_DERIVATIVE_FORMAT: str = "webp"
 
     # Hard ceiling on any request body, enforced at the ASGI edge before the
     # body is buffered into memory (memory-exhaustion DoS backstop, independent
@@ -745,6 +825,9 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str | None = None
     AWS_REGION: str = "us-east-1"
     AWS_S3_BUCKET: str | None = None
+    # Set for S3-compatible services (e.g. http://minio:9000); None means AWS.
+    AWS_S3_ENDPOINT_URL: str | None = None
+    AWS_S3_PREFIX: str = ""
 
     # Azure Blob
     AZURE_STORAGE_ACCOUNT: str | None = None
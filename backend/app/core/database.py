@@ -3,14 +3,21 @@ Database Connection Manager
 
 Uses SQLAlchemy async with connection pooling for MySQL.
 Includes retry logic and connection timeouts for robust startup.
+
+An optional read replica (``DB_REPLICA_HOST``) serves ``get_read_db``
+sessions. Each worker checks the replica's lag at most every
+``DB_REPLICA_CHECK_SECONDS``; while it is unreachable or further behind
+than ``DB_REPLICA_MAX_LAG_SECONDS``, read sessions come from the primary.
 """
 
 import asyncio
+import time
 from collections.abc import AsyncGenerator
 from datetime import datetime, timezone
 
 from loguru import logger
-from sqlalchemy import DateTime, MetaData, event
+from sqlalchemy import DateTime, MetaData, event, text
+from sqlalchemy.exc import DBAPIError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm.attributes import set_committed_value
@@ -61,6 +68,13 @@ class DatabaseManager:
     def __init__(self):
         self.engine = None
         self.session_factory = None
+        self.read_engine = None
+        self.read_session_factory = None
+        # None until the first check, so a replica that is never usable
+        # is still reported once.
+        self._replica_fresh: bool | None = None
+        self._replica_checked_until = 0.0
+        self._replica_lock = asyncio.Lock()
 
     @property
     def is_connected(self) -> bool:
@@ -82,16 +96,7 @@ class DatabaseManager:
                     f"Database connection attempt {attempt}/{settings.DB_CONNECT_RETRIES}..."
                 )
 
-                # Create async engine with connection timeout and optional SSL
-                self.engine = create_async_engine(
-                    settings.DATABASE_URL,
-                    echo=settings.DB_ECHO,
-                    pool_size=settings.DB_POOL_MAX,
-                    max_overflow=settings.DB_POOL_MAX * 2,
-                    pool_pre_ping=True,  # Verify connections before using
-                    pool_recycle=3600,  # Recycle connections after 1 hour
-                    connect_args=settings.get_db_connect_args(),
-                )
+                self.engine = self._create_engine(settings.DATABASE_URL)
 
                 # Create session factory
                 self.session_factory = async_sessionmaker(
@@ -103,11 +108,10 @@ class DatabaseManager:
                 # Test connection with timeout
                 async with asyncio.timeout(settings.DB_CONNECT_TIMEOUT):
                     async with self.engine.begin() as conn:
-                        from sqlalchemy import text
-
                         await conn.execute(text("SELECT 1"))
 
                 logger.info("Database connection established")
+                self._connect_replica()
                 return  # Success - exit the retry loop
 
             except TimeoutError:
@@ -152,8 +156,120 @@ class DatabaseManager:
         )
         raise last_exception or ConnectionError("Failed to connect to database")
 
+    def _create_engine(self, url: str):
+        """Async engine with connection timeout, optional SSL and the
+        opt-in pool metrics and query profiler."""
+        engine_options = {}
+        if settings.METRICS_ENABLED:
+            from app.core.metrics import TimedQueuePool
+
+            engine_options["poolclass"] = TimedQueuePool
+
+        engine = create_async_engine(
+            url,
+            echo=settings.DB_ECHO,
+            pool_size=settings.DB_POOL_MAX,
+            max_overflow=settings.DB_POOL_MAX * 2,
+            pool_pre_ping=True,  # Verify connections before using
+            pool_recycle=3600,  # Recycle connections after 1 hour
+            connect_args=settings.get_db_connect_args(),
+            **engine_options,
+        )
+        if settings.QUERY_PROFILER_ENABLED:
+            from app.core.query_profiler import install_query_profiler
+
+            install_query_profiler(engine)
+        return engine
+
+    def _connect_replica(self):
+        """Create the read replica engine, if one is configured.
+
+        Engines connect lazily, so this never blocks startup; an unreachable
+        replica is found by the first freshness check and reads fall back to
+        the primary.
+        """
+        url = settings.DATABASE_REPLICA_URL
+        if not url:
+            return
+        self.read_engine = self._create_engine(url)
+        self.read_session_factory = async_sessionmaker(
+            self.read_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            info={"read_replica": True},
+        )
+        self._replica_checked_until = 0.0
+        logger.info(
+            f"Read replica configured at {settings.DB_REPLICA_HOST}:"
+            f"{settings.DB_REPLICA_PORT}"
+        )
+
+    async def _replica_lag(self, conn) -> float | None:
+        """Seconds the replica is behind the primary, or ``None`` if
+        replication is stopped."""
+        if conn.dialect.name != "mysql":
+            return 0.0
+        try:
+            result = await conn.execute(text("SHOW REPLICA STATUS"))
+            column = "Seconds_Behind_Source"
+        except DBAPIError:
+            # MySQL < 8.0.22 and MariaDB
+            result = await conn.execute(text("SHOW SLAVE STATUS"))
+            column = "Seconds_Behind_Master"
+        row = result.mappings().first()
+        if row is None:
+            # Not replicating (e.g. a proxy in front of the replica set)
+            return 0.0
+        lag = row.get(column)
+        return None if lag is None else float(lag)
+
+    def _mark_replica(self, fresh: bool, reason: str = "") -> None:
+        if fresh != self._replica_fresh:
+            if fresh:
+                logger.info("Read replica is current; routing reads to it")
+            else:
+                logger.warning(f"Reading from primary: read replica {reason}")
+        self._replica_fresh = fresh
+        self._replica_checked_until = (
+            time.monotonic() + settings.DB_REPLICA_CHECK_SECONDS
+        )
+
+    async def replica_is_fresh(self) -> bool:
+        """Whether read sessions should use the replica right now.
+
+        The check runs at most every ``DB_REPLICA_CHECK_SECONDS`` per
+        worker; requests arriving while it runs use the previous answer.
+        """
+        if self.read_engine is None:
+            return False
+        if (
+            time.monotonic() < self._replica_checked_until
+            or self._replica_lock.locked()
+        ):
+            return bool(self._replica_fresh)
+        async with self._replica_lock:
+            fresh, reason = False, ""
+            try:
+                async with asyncio.timeout(settings.DB_REPLICA_CHECK_SECONDS):
+                    async with self.read_engine.connect() as conn:
+                        lag = await self._replica_lag(conn)
+                if lag is None:
+                    reason = "is not replicating"
+                elif lag > settings.DB_REPLICA_MAX_LAG_SECONDS:
+                    reason = f"is {lag:.0f}s behind"
+                else:
+                    fresh = True
+            except Exception as e:
+                reason = f"check failed: {type(e).__name__}"
+            self._mark_replica(fresh, reason)
+        return fresh
+
     async def disconnect(self):
         """Close database connection"""
+        if self.read_engine:
+            await self.read_engine.dispose()
+            self.read_engine = None
+            self.read_session_factory = None
         if self.engine:
             await self.engine.dispose()
             logger.info("Database connection closed")
@@ -180,6 +296,36 @@ class DatabaseManager:
             finally:
                 await session.close()
 
+    async def get_read_session(self) -> AsyncGenerator[AsyncSession]:
+        """
+        Get a read-only database session: the replica while it is fresh,
+        otherwise the primary.
+
+        The session is always rolled back, so a write made through it is
+        discarded rather than committed; ``session.info["read_only"]`` tells
+        services to skip writes they would otherwise make along the way. A
+        connection error on the replica sends following requests to the
+        primary until the next check.
+        """
+        if not self.session_factory:
+            raise RuntimeError("Database not initialized. Call connect() first.")
+
+        use_replica = await self.replica_is_fresh()
+        factory = self.read_session_factory if use_replica else self.session_factory
+        async with factory() as session:
+            session.info["read_only"] = True
+            try:
+                yield session
+            except DBAPIError as e:
+                if use_replica and (
+                    e.connection_invalidated or isinstance(e, OperationalError)
+                ):
+                    self._mark_replica(False, f"failed: {type(e.orig).__name__}")
+                raise
+            finally:
+                await session.rollback()
+                await session.close()
+
 
 # Global database manager instance
 database_manager = DatabaseManager()
@@ -217,3 +363,14 @@ async def get_db() -> AsyncGenerator[AsyncSession]:
     """
     async for session in database_manager.get_session():
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession]:
+    """
+    FastAPI dependency for read-only report, analytics, export and list
+    endpoints; served by the read replica when one is configured and
+    current. Reads may trail the primary by up to
+    ``DB_REPLICA_MAX_LAG_SECONDS``.
+    """
+    async for session in database_manager.get_read_session():
+        yield session
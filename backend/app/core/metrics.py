@@ -0,0 +1,393 @@
+"""
+Prometheus Metrics
+
+Counters, histograms and gauges for request latency, database pool health,
+Redis round trips, scheduled tasks, websocket connections, notification
+sends and integration deliveries, exported in the Prometheus text format at
+``GET /metrics`` (``METRICS_ENABLED``).
+
+Recording is a dictionary update in the worker that observed the event.
+Every ``METRICS_FLUSH_SECONDS`` each worker's ``MetricsFlusher`` adds what
+changed since its last flush to one Redis hash with ``HINCRBYFLOAT`` — so a
+scrape answered by any worker sees the totals of all of them — and writes
+its current gauge readings to a per-worker hash that expires if the worker
+dies. Gauges are summed across live workers. Without Redis a scrape reports
+the answering worker only.
+
+Histograms follow the Prometheus convention of cumulative ``_bucket{le=...}``
+series plus ``_sum`` and ``_count``; every series is stored as one float,
+which is what makes the cross-worker sum a plain increment.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+
+_COUNTERS_KEY = "metrics:series"
+_GAUGES_PREFIX = "metrics:gauges:"
+
+# Request and task latencies, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+TASK_BUCKETS = (0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600)
+
+Labels = Tuple[Tuple[str, str], ...]
+SeriesKey = Tuple[str, str, Labels]  # (family, suffix, labels)
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class MetricsRegistry:
+    """Metric families and this worker's cumulative series values."""
+
+    def __init__(self) -> None:
+        self.families: Dict[str, Tuple[str, str]] = {}  # name → (type, help)
+        self._values: Dict[SeriesKey, float] = {}
+        self._flushed: Dict[SeriesKey, float] = {}
+        self._gauges: Dict[str, Callable[[], Iterable[Tuple[Dict, float]]]] = {}
+        # Histograms are observed from the pool's greenlet and threadpools too.
+        self._lock = threading.Lock()
+
+    def _add(self, key: SeriesKey, amount: float) -> None:
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def counter(self, name: str, help_text: str) -> "Counter":
+        self.families[name] = ("counter", help_text)
+        return Counter(self, name)
+
+    def histogram(
+        self, name: str, help_text: str, buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> "Histogram":
+        self.families[name] = ("histogram", help_text)
+        return Histogram(self, name, tuple(sorted(buckets)))
+
+    def gauge(
+        self,
+        name: str,
+        help_text: str,
+        read: Callable[[], Iterable[Tuple[Dict, float]]],
+    ) -> None:
+        """Register a gauge read at flush/scrape time; *read* yields
+        ``(labels, value)`` pairs and must be cheap and non-blocking."""
+        self.families[name] = ("gauge", help_text)
+        self._gauges[name] = read
+
+    def read_gauges(self) -> Dict[SeriesKey, float]:
+        values = {}
+        for name, read in self._gauges.items():
+            try:
+                for labels, value in read():
+                    values[(name, "", _labels(labels))] = float(value)
+            except Exception as e:
+                logger.debug(f"Gauge {name} unavailable: {e}")
+        return values
+
+    def snapshot(self) -> Dict[SeriesKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def take_deltas(self) -> Dict[SeriesKey, float]:
+        """What changed since the last call, marking it flushed."""
+        with self._lock:
+            deltas = {
+                key: value - self._flushed.get(key, 0.0)
+                for key, value in self._values.items()
+                if value != self._flushed.get(key, 0.0)
+            }
+            self._flushed.update((key, self._values[key]) for key in deltas)
+        return deltas
+
+    def restore_deltas(self, deltas: Dict[SeriesKey, float]) -> None:
+        """Undo ``take_deltas`` after a failed flush so nothing is lost."""
+        with self._lock:
+            for key, delta in deltas.items():
+                self._flushed[key] -= delta
+
+
+class Counter:
+    def __init__(self, registry: MetricsRegistry, name: str) -> None:
+        self.registry, self.name = registry, name
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = (self.name, "", _labels(labels))
+        with self.registry._lock:
+            self.registry._add(key, amount)
+
+
+class Histogram:
+    def __init__(
+        self, registry: MetricsRegistry, name: str, buckets: Tuple[float, ...]
+    ) -> None:
+        self.registry, self.name = registry, name
+        self.bounds = buckets + (float("inf"),)
+        self._le = [format_value(b) for b in self.bounds]
+
+    def observe(self, value: float, **labels) -> None:
+        base = _labels(labels)
+        first = bisect_left(self.bounds, value)
+        registry = self.registry
+        with registry._lock:
+            for le in self._le[first:]:
+                registry._add((self.name, "_bucket", base + (("le", le),)), 1.0)
+            registry._add((self.name, "_sum", base), value)
+            registry._add((self.name, "_count", base), 1.0)
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render(registry: MetricsRegistry, series: Dict[SeriesKey, float]) -> str:
+    """Prometheus text exposition (format 0.0.4) of *series*."""
+    by_family: Dict[str, List[Tuple[str, Labels, float]]] = {}
+    for (family, suffix, labels), value in series.items():
+        by_family.setdefault(family, []).append((suffix, labels, value))
+
+    lines = []
+    for family in sorted(by_family):
+        if family not in registry.families:
+            continue
+        kind, help_text = registry.families[family]
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} {kind}")
+        for suffix, labels, value in sorted(by_family[family], key=_series_order):
+            rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            label_part = f"{{{rendered}}}" if rendered else ""
+            lines.append(f"{family}{suffix}{label_part} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _series_order(series: Tuple[str, Labels, float]):
+    # Group a histogram's series by label set, buckets ascending by ``le``.
+    suffix, labels, _ = series
+    le = dict(labels).get("le")
+    return (
+        tuple(pair for pair in labels if pair[0] != "le"),
+        suffix,
+        float(le.replace("+Inf", "inf")) if le else 0.0,
+    )
+
+
+def _field(key: SeriesKey) -> str:
+    family, suffix, labels = key
+    return json.dumps([family, suffix, [list(pair) for pair in labels]])
+
+
+def _parse_field(raw) -> SeriesKey:
+    family, suffix, labels = json.loads(raw)
+    return family, suffix, tuple(tuple(pair) for pair in labels)
+
+
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status class.",
+)
+db_pool_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection.",
+    (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+redis_roundtrip_seconds = registry.histogram(
+    "redis_roundtrip_seconds",
+    "Redis PING round-trip time, sampled at every metrics flush.",
+    (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+)
+scheduled_task_seconds = registry.histogram(
+    "scheduled_task_duration_seconds",
+    "Scheduled task run time by task and outcome.",
+    TASK_BUCKETS,
+)
+notifications_sent = registry.counter(
+    "notifications_sent_total",
+    "Notification deliveries by channel (email, sms, push) and outcome.",
+)
+integration_deliveries = registry.counter(
+    "integration_deliveries_total",
+    "Outbox chat/webhook delivery attempts by integration and outcome.",
+)
+integration_delivery_seconds = registry.histogram(
+    "integration_delivery_duration_seconds",
+    "Outbox chat/webhook request time by integration type.",
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """The async engine's default pool, timing every checkout.
+
+    Installed by ``DatabaseManager`` only while metrics are enabled. The
+    time includes opening a new connection when the pool has to.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - started)
+
+
+def _pool_gauges():
+    from app.core.database import database_manager
+
+    engine = database_manager.engine
+    if engine is None:
+        return []
+    pool = engine.sync_engine.pool
+    return [
+        ({"state": "checked_out"}, pool.checkedout()),
+        ({"state": "overflow"}, max(pool.overflow(), 0)),
+        ({"state": "size"}, pool.size()),
+    ]
+
+
+def _websocket_gauges():
+    from app.core.websocket_manager import ws_manager
+
+    return [({}, ws_manager.connection_count())]
+
+
+registry.gauge(
+    "db_pool_connections", "SQLAlchemy pool connections by state.", _pool_gauges
+)
+registry.gauge(
+    "websocket_connections", "Open websocket connections.", _websocket_gauges
+)
+
+
+class MetricsFlusher:
+    """Per-worker loop that pushes this worker's metrics to Redis."""
+
+    def __init__(self, registry: MetricsRegistry = registry) -> None:
+        self.registry = registry
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if not settings.METRICS_ENABLED:
+            return
+        if not (cache_manager.is_connected and cache_manager.redis_client):
+            logger.info(
+                "Metrics flusher not started (Redis unavailable); /metrics "
+                "reports the worker that answers the scrape."
+            )
+            return
+        self._task = asyncio.create_task(self._loop())
+        logger.info("✓ Metrics flusher started")
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+            await self.flush()
+
+    async def flush(self) -> None:
+        client = cache_manager.redis_client
+        if not cache_manager.is_connected or client is None:
+            return
+        started = time.perf_counter()
+        try:
+            await client.ping()
+        except Exception as e:
+            logger.warning(f"Metrics flush skipped, Redis ping failed: {e}")
+            return
+        redis_roundtrip_seconds.observe(time.perf_counter() - started)
+
+        deltas = self.registry.take_deltas()
+        gauges = self.registry.read_gauges()
+        gauge_key = _GAUGES_PREFIX + self.worker
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, delta in deltas.items():
+                    pipe.hincrbyfloat(_COUNTERS_KEY, _field(key), delta)
+                pipe.delete(gauge_key)
+                if gauges:
+                    pipe.hset(
+                        gauge_key, mapping={_field(k): v for k, v in gauges.items()}
+                    )
+                    pipe.expire(gauge_key, settings.METRICS_FLUSH_SECONDS * 3)
+                await pipe.execute()
+        except Exception as e:
+            self.registry.restore_deltas(deltas)
+            logger.warning(f"Metrics flush failed: {e}")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+            await self.flush()
+
+
+metrics_flusher = MetricsFlusher()
+
+
+async def collect() -> Dict[SeriesKey, float]:
+    """All workers' series when Redis is available, else this worker's."""
+    client = cache_manager.redis_client
+    if not settings.METRICS_ENABLED or not cache_manager.is_connected or not client:
+        return {**registry.snapshot(), **registry.read_gauges()}
+
+    await metrics_flusher.flush()
+    series = {
+        _parse_field(raw): float(value)
+        for raw, value in (await client.hgetall(_COUNTERS_KEY)).items()
+    }
+    async for gauge_key in client.scan_iter(match=_GAUGES_PREFIX + "*", count=100):
+        for raw, value in (await client.hgetall(gauge_key)).items():
+            key = _parse_field(raw)
+            series[key] = series.get(key, 0.0) + float(value)
+    return series
+
+
+class MetricsMiddleware:
+    """Observe request latency per route template (pure ASGI).
+
+    The route template, not the raw path, keeps the label set bounded;
+    requests that match no route share ``<unmatched>``.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            http_request_seconds.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route,
+                status=f"{status // 100}xx",
+            )
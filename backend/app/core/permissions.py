@@ -14,7 +14,8 @@ Terminology
   (e.g., Active, Retired, Honorary, Administrative).
 """
 
-from collections.abc import Iterable
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
 from enum import Enum
 
 
@@ -708,6 +709,8 @@ def permission_matches(required: str, granted: set[str]) -> bool:
     2. Exact match: ``"settings.edit"`` matches ``"settings.edit"``.
     3. Module wildcard: ``"settings.*"`` matches any ``"settings.<action>"``.
     """
+    if type(granted) is PermissionSet:
+        return granted.allows(required)
     if "*" in granted:
         return True
     if required in granted:
@@ -724,6 +727,95 @@ def permission_matches_any(required: Iterable[str], granted: set[str]) -> bool:
     return any(permission_matches(p, granted) for p in required)
 
 
+# ============================================
+# Compiled Permission Sets
+# ============================================
+# Every known permission gets a bit; a member's positions and rank compile
+# to one int, so a check against a known permission is a single bit test
+# instead of set lookups and a string split per wildcard. "*" and module
+# wildcards are expanded into their bits when a set is compiled.
+
+_PERMISSION_BITS: dict[str, int] = {
+    p.name: 1 << i for i, p in enumerate(ALL_PERMISSIONS)
+}
+
+
+def _wildcard_bits() -> dict[str, int]:
+    table: dict[str, int] = {"*": (1 << len(ALL_PERMISSIONS)) - 1}
+    for name, bit in _PERMISSION_BITS.items():
+        wildcard = f"{name.split('.')[0]}.*"
+        table[wildcard] = table.get(wildcard, 0) | bit
+    return table
+
+
+_WILDCARD_BITS = _wildcard_bits()
+
+
+class PermissionSet(frozenset):
+    """
+    An immutable set of granted permission names with its bitset attached.
+
+    Behaves as the plain set ``_collect_user_permissions`` used to return
+    (membership, iteration, set algebra), while :func:`permission_matches`
+    answers from the bits. A required permission outside the registry falls
+    back to the string matching rules.
+    """
+
+    __slots__ = ("_bits",)
+
+    def __new__(cls, names: Iterable[str] = ()) -> "PermissionSet":
+        self = super().__new__(cls, names)
+        bits = 0
+        for name in self:
+            bits |= _PERMISSION_BITS.get(name, 0) | _WILDCARD_BITS.get(name, 0)
+        self._bits = bits
+        return self
+
+    def allows(self, required: str) -> bool:
+        bit = _PERMISSION_BITS.get(required)
+        if bit is not None:
+            return bool(self._bits & bit)
+        if "*" in self or required in self:
+            return True
+        return "." in required and f"{required.split('.')[0]}.*" in self
+
+
+# Compiled sets, keyed by the permission lists they were built from, so an
+# edited position simply stops matching its old entry. Least recently used
+# entries are dropped past _MAX_COMPILED.
+_MAX_COMPILED = 4096
+_compiled: OrderedDict[tuple, PermissionSet] = OrderedDict()
+
+
+def compile_permissions(
+    position_permissions: Iterable[Sequence[str] | None], rank: str | None = None
+) -> PermissionSet:
+    """
+    The interned :class:`PermissionSet` for a member holding positions with
+    ``position_permissions`` and operational ``rank``.
+    """
+    key = (rank, *(tuple(perms or ()) for perms in position_permissions))
+    compiled = _compiled.get(key)
+    if compiled is not None:
+        _compiled.move_to_end(key)
+        return compiled
+
+    names: list[str] = []
+    for perms in key[1:]:
+        names.extend(perms)
+    if rank:
+        names.extend(get_rank_default_permissions(rank))
+    compiled = _compiled[key] = PermissionSet(names)
+    if len(_compiled) > _MAX_COMPILED:
+        _compiled.popitem(last=False)
+    return compiled
+
+
+def clear_compiled_permissions() -> None:
+    """Drop every compiled permission set (called after roles are edited)."""
+    _compiled.clear()
+
+
 def get_permissions_by_category() -> dict[str, list[Permission]]:
     """Get permissions grouped by category"""
     categorized: dict[str, list[Permission]] = {}
@@ -0,0 +1,291 @@
+"""
+Request-Scoped Query Profiler
+
+Opt-in (``QUERY_PROFILER_ENABLED``) instrumentation of the SQLAlchemy engine
+that answers "which endpoints issue many small queries?" — something neither
+``DB_ECHO`` (every statement, no totals) nor ``IPLoggingMiddleware`` (request
+duration only) can.
+
+* ``install_query_profiler`` hooks ``before/after_cursor_execute`` on an
+  engine. Each statement is charged to the :class:`QueryProfile` in the
+  ``_current_profile`` context variable; outside a profile the hooks do
+  nothing. SQLAlchemy's async layer runs the hooks in the calling task's
+  context, so the profile follows the request into every ``await``.
+* ``QueryProfilerMiddleware`` opens a profile per HTTP request, tagged with
+  the ``request_id_ctx`` id, and on completion folds it into per-route
+  aggregates (``query_profiler.snapshot()``, served to admins at
+  ``GET /api/v1/platform-analytics/query-profile``). Outside production it
+  also adds ``X-DB-Query-Count`` / ``X-DB-Time-Ms`` / ``X-DB-N-Plus-One``
+  response headers.
+* A statement *shape* — the SQL text with placeholder lists collapsed, so
+  ``IN (%s, %s)`` and ``IN (%s, %s, %s)`` match — repeated
+  ``QUERY_PROFILER_N_PLUS_ONE_THRESHOLD`` times in one request is flagged as
+  a likely N+1 and logged with the request id.
+
+Aggregates are per worker and reset on restart. ``tests/query_budget.py``
+builds a pytest query-budget marker on :meth:`QueryProfiler.capture`.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logging import request_id_ctx
+
+# Longest statement shape kept in aggregates and log lines.
+_MAX_SHAPE_LENGTH = 300
+# Most N+1 suspects remembered per route.
+_MAX_SUSPECTS = 5
+# Guard against unbounded growth if route keys are ever not templates.
+_MAX_ROUTES = 1000
+
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_REPEATED_GROUPS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize *statement* so executions that differ only in the length
+    of an ``IN`` list or a multi-row ``VALUES`` compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    shape = _REPEATED_GROUPS.sub("(?)", shape)
+    return shape[:_MAX_SHAPE_LENGTH]
+
+
+@dataclass
+class QueryProfile:
+    """Queries charged to one request (or one profiled block)."""
+
+    label: str
+    request_id: str = "-"
+    count: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    @property
+    def db_ms(self) -> float:
+        return self.seconds * 1000
+
+    def n_plus_one(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """Statement shapes repeated at least *threshold* times."""
+        threshold = threshold or settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD
+        return {
+            shape: n
+            for shape, n in self.shapes.most_common()
+            if n >= threshold and shape.lstrip("(").upper().startswith("SELECT")
+        }
+
+
+@dataclass
+class RouteQueryStats:
+    """Running totals for one ``METHOD /route/template``."""
+
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    db_ms: float = 0.0
+    max_db_ms: float = 0.0
+    n_plus_one_requests: int = 0
+    suspects: Counter = field(default_factory=Counter)
+
+    def add(self, profile: QueryProfile, suspects: Dict[str, int]) -> None:
+        self.requests += 1
+        self.queries += profile.count
+        self.max_queries = max(self.max_queries, profile.count)
+        self.db_ms += profile.db_ms
+        self.max_db_ms = max(self.max_db_ms, profile.db_ms)
+        if suspects:
+            self.n_plus_one_requests += 1
+            for shape, n in suspects.items():
+                self.suspects[shape] = max(self.suspects[shape], n)
+            if len(self.suspects) > _MAX_SUSPECTS:
+                self.suspects = Counter(dict(self.suspects.most_common(_MAX_SUSPECTS)))
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar(
+    "query_profile", default=None
+)
+
+
+class QueryProfiler:
+    """Per-worker registry of completed request profiles."""
+
+    def __init__(self) -> None:
+        self.enabled = settings.QUERY_PROFILER_ENABLED
+        self._lock = threading.Lock()
+        self._routes: Dict[str, RouteQueryStats] = {}
+        self._since = datetime.now(timezone.utc)
+        # Completed profiles are also appended here while ``capture`` is open.
+        self._captures: List[List[QueryProfile]] = []
+
+    @contextmanager
+    def profile(self, label: str) -> Iterator[QueryProfile]:
+        """Charge the queries run inside the block to a fresh profile."""
+        profile = QueryProfile(label=label, request_id=request_id_ctx.get())
+        token = _current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            _current_profile.reset(token)
+
+    def finish(self, route: str, profile: QueryProfile) -> Dict[str, int]:
+        """Fold a completed request into the aggregates; returns its N+1s."""
+        profile.label = route
+        suspects = profile.n_plus_one()
+        if suspects:
+            shape, n = next(iter(suspects.items()))
+            logger.warning(
+                f"Possible N+1 on {route}: {n}x {shape!r} "
+                f"({profile.count} queries, {profile.db_ms:.0f}ms) "
+                f"[rid={profile.request_id}]"
+            )
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None and len(self._routes) < _MAX_ROUTES:
+                stats = self._routes[route] = RouteQueryStats()
+            if stats is not None:
+                stats.add(profile, suspects)
+            for captured in self._captures:
+                captured.append(profile)
+        return suspects
+
+    def snapshot(self) -> dict:
+        """Per-route aggregates, heaviest total query count first."""
+        with self._lock:
+            routes = [
+                {
+                    "route": route,
+                    "requests": s.requests,
+                    "avg_queries": round(s.queries / s.requests, 1),
+                    "max_queries": s.max_queries,
+                    "avg_db_ms": round(s.db_ms / s.requests, 1),
+                    "max_db_ms": round(s.max_db_ms, 1),
+                    "n_plus_one_requests": s.n_plus_one_requests,
+                    "n_plus_one_suspects": [
+                        {"statement": shape, "max_repeats": n}
+                        for shape, n in s.suspects.most_common()
+                    ],
+                }
+                for route, s in sorted(
+                    self._routes.items(), key=lambda item: -item[1].queries
+                )
+            ]
+        return {
+            "enabled": self.enabled,
+            "worker_pid": os.getpid(),
+            "since": self._since,
+            "routes": routes,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._since = datetime.now(timezone.utc)
+
+    @contextmanager
+    def capture(self) -> Iterator[List[QueryProfile]]:
+        """Collect request profiles completed inside the block.
+
+        Profiling is switched on for the duration. Queries run outside any
+        request are charged to an extra profile labelled ``"<block>"``, which
+        is the first element of the yielded list once the block exits.
+        """
+        captured: List[QueryProfile] = []
+        was_enabled, self.enabled = self.enabled, True
+        with self._lock:
+            self._captures.append(captured)
+        try:
+            with self.profile("<block>") as block:
+                yield captured
+        finally:
+            self.enabled = was_enabled
+            with self._lock:
+                self._captures.remove(captured)
+            captured.insert(0, block)
+
+
+query_profiler = QueryProfiler()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("query_profiler_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_profiler_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+
+
+def install_query_profiler(engine) -> None:
+    """Attach the profiler to *engine* (async or sync engine, or the Engine
+    class for every engine). Idempotent."""
+    target = getattr(engine, "sync_engine", engine)
+    for name, fn in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        # Already on the class counts too: instance and class listeners
+        # would both fire and charge every statement twice.
+        if not (event.contains(Engine, name, fn) or event.contains(target, name, fn)):
+            event.listen(target, name, fn)
+
+
+class QueryProfilerMiddleware:
+    """Profile each HTTP request while ``query_profiler.enabled`` is set.
+
+    Pure ASGI, like the other middleware in app/core/security_middleware.py.
+    Add it inside ``IPLoggingMiddleware`` so the request id is already bound.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.headers = settings.ENVIRONMENT != "production"
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not query_profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with query_profiler.profile(scope.get("path", "")) as profile:
+
+            async def send_with_counts(message) -> None:
+                if message["type"] == "http.response.start" and self.headers:
+                    headers = list(message.get("headers", []))
+                    headers += [
+                        (b"x-db-query-count", str(profile.count).encode()),
+                        (b"x-db-time-ms", f"{profile.db_ms:.1f}".encode()),
+                        (b"x-db-n-plus-one", str(len(profile.n_plus_one())).encode()),
+                    ]
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_counts)
+            finally:
+                route = scope.get("route")
+                template = getattr(route, "path", None) or "<unmatched>"
+                query_profiler.finish(f"{scope['method']} {template}", profile)
@@ -0,0 +1,185 @@
+"""
+Redis Primitives for Rate Limiting, Counters and Replay Protection
+
+Each check is one server-side Lua script, so it is atomic and costs a single
+round trip — the fixed-window counter no longer leaves a key without a TTL
+when the process dies between ``INCR`` and ``EXPIRE``, and concurrent
+sliding-window checks can't interleave between the trim and the count.
+
+* :class:`SlidingWindow` — requests on a key in the last N seconds
+  (``is_rate_limited``);
+* :class:`FixedWindowCounter` — a counter that expires with its window
+  (``daily_cap_exceeded``);
+* :class:`ReplayNonce` — whether a fingerprint was seen within a TTL
+  (``is_duplicate_webhook``).
+
+:func:`run_checks` sends any number of checks in one pipeline, so the checks
+made at one point of a request share a round trip. Scripts are invoked by
+SHA and loaded on first use after a Redis restart.
+
+:class:`LocalTokenBucket` is an in-process pre-filter in front of the sliding
+window: a key that spends its tokens faster than ``RATE_LIMIT_LOCAL_BURST_FACTOR``
+times its limit allows — in this process alone — is refused without asking
+Redis.
+"""
+
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, ClassVar, Sequence
+
+from redis.exceptions import NoScriptError
+
+
+class _Script:
+    def __init__(self, source: str):
+        self.source = source
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class SlidingWindow:
+    """Requests on ``key`` in the last ``window_seconds``. The result is the
+    count before this request, which is always recorded — a client that keeps
+    retrying while limited stays limited."""
+
+    key: str
+    limit: int
+    window_seconds: int
+
+    script: ClassVar[_Script] = _Script("""
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('EXPIRE', KEYS[1], window)
+return count
+""")
+
+    def args(self, now: float) -> tuple:
+        # A unique member: two requests in the same microsecond both count.
+        return now, self.window_seconds, f"{now}:{uuid.uuid4().hex[:8]}"
+
+    def denies(self, result: int) -> bool:
+        return result >= self.limit
+
+
+@dataclass(frozen=True)
+class FixedWindowCounter:
+    """Increments ``key``, which expires ``ttl_seconds`` after its first
+    increment. The result is the count including this request."""
+
+    key: str
+    limit: int
+    ttl_seconds: int
+
+    script: ClassVar[_Script] = _Script("""
+local count = redis.call('INCR', KEYS[1])
+if count == 1 or redis.call('TTL', KEYS[1]) == -1 then
+  redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+""")
+
+    def args(self, now: float) -> tuple:
+        return (self.ttl_seconds,)
+
+    def denies(self, result: int) -> bool:
+        return result > self.limit
+
+
+@dataclass(frozen=True)
+class ReplayNonce:
+    """Records ``key`` for ``ttl_seconds``. The result is 1 if it was already
+    recorded (a replay), else 0."""
+
+    key: str
+    ttl_seconds: int
+
+    script: ClassVar[_Script] = _Script("""
+if redis.call('SET', KEYS[1], '1', 'NX', 'EX', ARGV[1]) then
+  return 0
+end
+return 1
+""")
+
+    def args(self, now: float) -> tuple:
+        return (self.ttl_seconds,)
+
+    def denies(self, result: int) -> bool:
+        return bool(result)
+
+
+Check = SlidingWindow | FixedWindowCounter | ReplayNonce
+
+
+async def run_checks(redis_client: Any, checks: Sequence[Check]) -> list[int]:
+    """Run ``checks`` in one pipeline; returns each check's result.
+
+    Raises the first Redis error, if any, so callers keep their own
+    fail-open / fail-closed policy.
+    """
+    now = time.time()
+    pipe = redis_client.pipeline(transaction=False)
+    for check in checks:
+        pipe.evalsha(check.script.sha, 1, check.key, *check.args(now))
+    results = await pipe.execute(raise_on_error=False)
+
+    missing = [
+        i for i, result in enumerate(results) if isinstance(result, NoScriptError)
+    ]
+    if missing:
+        # First use since Redis started or its script cache was flushed. A
+        # NOSCRIPT reply means the check didn't run; EVAL runs it and caches
+        # the script for the next call.
+        pipe = redis_client.pipeline(transaction=False)
+        for i in missing:
+            check = checks[i]
+            pipe.eval(check.script.source, 1, check.key, *check.args(now))
+        for i, result in zip(missing, await pipe.execute(raise_on_error=False)):
+            results[i] = result
+
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return [int(result) for result in results]
+
+
+class LocalTokenBucket:
+    """Per-process token buckets keyed like the Redis limits they guard.
+
+    A bucket holds ``limit * burst_factor`` tokens and refills at that many
+    per window, so with ``burst_factor >= 1`` it only runs dry for a key this
+    process alone is seeing well past its limit; those requests are refused
+    here and never reach Redis. Least recently used buckets are dropped past
+    ``_MAX_KEYS``, bounding memory under a flood of distinct keys.
+    """
+
+    _MAX_KEYS = 10_000
+
+    def __init__(self) -> None:
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def allow(
+        self, key: str, limit: int, window_seconds: float, burst_factor: float
+    ) -> bool:
+        if burst_factor <= 0 or limit <= 0 or window_seconds <= 0:
+            return True
+        capacity = limit * burst_factor
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * capacity / window_seconds)
+        allowed = tokens >= 1
+        self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+        if len(self._buckets) > self._MAX_KEYS:
+            self._buckets.popitem(last=False)
+        return allowed
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+local_token_bucket = LocalTokenBucket()
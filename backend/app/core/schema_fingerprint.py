@@ -0,0 +1,141 @@
+"""
+Schema Fingerprint
+
+A schema fingerprint is a SHA-256 over the Alembic head revision and a
+canonical description of ``Base.metadata`` (tables, columns, types,
+nullability, defaults, keys and indexes). The worker that migrates or repairs
+the database records it in the single-row ``schema_fingerprint`` table once
+the schema has been validated.
+
+On later boots every worker computes the fingerprint from its own code. When
+the stored value matches and ``alembic_version`` is at head, nothing about
+the expected schema changed since it was last verified, so startup skips
+schema reflection and column repair entirely. Any model or migration change
+produces a different fingerprint and sends startup through the full path.
+
+All helpers here are synchronous; they run on the NullPool engine that
+``run_migrations`` uses before the async engine serves requests.
+"""
+
+import hashlib
+import json
+from typing import Optional
+
+from sqlalchemy import MetaData, UniqueConstraint, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+FINGERPRINT_TABLE = "schema_fingerprint"
+FINGERPRINT_ROW_ID = 1
+
+_DIALECT = mysql.dialect()
+
+
+def _type_signature(column) -> str:
+    """Render a column type the way MySQL DDL would, falling back to repr."""
+    try:
+        return str(column.type.compile(dialect=_DIALECT))
+    except Exception:
+        return repr(column.type)
+
+
+def _default_signature(column) -> Optional[str]:
+    default = column.server_default
+    if default is None:
+        return None
+    # DefaultClause keeps its SQL in ``arg``; Computed columns in ``sqltext``.
+    arg = getattr(default, "arg", None)
+    if arg is None:
+        arg = getattr(default, "sqltext", default)
+    return str(getattr(arg, "text", arg))
+
+
+def describe_metadata(metadata: MetaData) -> list:
+    """
+    Canonical, order-independent description of every table in ``metadata``.
+
+    Only properties that change the DDL are included, so refactoring a model
+    (moving it between modules, reordering attributes) leaves the fingerprint
+    unchanged.
+    """
+    tables = []
+    for name in sorted(metadata.tables):
+        table = metadata.tables[name]
+        columns = sorted(
+            [
+                col.name,
+                _type_signature(col),
+                bool(col.nullable),
+                bool(col.primary_key),
+                _default_signature(col),
+            ]
+            for col in table.columns
+        )
+        foreign_keys = sorted(
+            [fk.parent.name, fk.target_fullname, fk.ondelete or ""]
+            for fk in table.foreign_keys
+        )
+        indexes = sorted(
+            [idx.name or "", [c.name for c in idx.columns], bool(idx.unique)]
+            for idx in table.indexes
+        )
+        uniques = sorted(
+            [c.name or "", sorted(col.name for col in c.columns)]
+            for c in table.constraints
+            if isinstance(c, UniqueConstraint)
+        )
+        tables.append([name, columns, foreign_keys, indexes, uniques])
+    return tables
+
+
+def compute_schema_fingerprint(metadata: MetaData, head_revision: str) -> str:
+    """Hash the head revision together with the canonical metadata."""
+    payload = json.dumps(
+        [head_revision, describe_metadata(metadata)],
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def read_schema_fingerprint(conn) -> Optional[str]:
+    """
+    Return the stored fingerprint, or None when none has been recorded.
+
+    A missing table (databases that predate the fingerprint migration) reads
+    as "no fingerprint", which simply sends startup through the full path.
+    """
+    try:
+        return conn.execute(
+            text(f"SELECT fingerprint FROM {FINGERPRINT_TABLE} WHERE id = :id"),
+            {"id": FINGERPRINT_ROW_ID},
+        ).scalar()
+    except (ProgrammingError, OperationalError):
+        return None
+
+
+def record_schema_fingerprint(engine, head_revision: str, fingerprint: str) -> bool:
+    """
+    Store ``fingerprint`` as the verified schema. Returns False (and leaves
+    startup to fall back to the full path next time) if the table is missing.
+    """
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"INSERT INTO {FINGERPRINT_TABLE} "
+                    "(id, head_revision, fingerprint, recorded_at) "
+                    "VALUES (:id, :head, :fingerprint, UTC_TIMESTAMP()) "
+                    "ON DUPLICATE KEY UPDATE head_revision = VALUES(head_revision), "
+                    "fingerprint = VALUES(fingerprint), "
+                    "recorded_at = VALUES(recorded_at)"
+                ),
+                {
+                    "id": FINGERPRINT_ROW_ID,
+                    "head": head_revision,
+                    "fingerprint": fingerprint,
+                },
+            )
+        return True
+    except (ProgrammingError, OperationalError):
+        return False
@@ -900,7 +900,9 @@ async def is_rate_limited(
     """
     Check if a key has exceeded rate limit using Redis sliding window.
 
-    Uses Redis for distributed rate limiting across multiple instances.
+    Uses Redis for distributed rate limiting across multiple instances,
+    behind an in-process token bucket that sheds obvious floods first
+    (``RATE_LIMIT_LOCAL_BURST_FACTOR``).
 
     Args:
         key: Unique key to track (e.g., IP address, user ID)
@@ -916,9 +918,19 @@ async def is_rate_limited(
     Returns:
         True if rate limit exceeded, False otherwise
     """
-    import time
-
     from app.core.cache import cache_manager
+    from app.core.redis_primitives import (
+        SlidingWindow,
+        local_token_bucket,
+        run_checks,
+    )
+
+    # Traffic this worker alone sees far past the limit is refused without a
+    # Redis round trip.
+    if not local_token_bucket.allow(
+        key, limit, window_seconds, settings.RATE_LIMIT_LOCAL_BURST_FACTOR
+    ):
+        return True
 
     if not cache_manager.is_connected or not cache_manager.redis_client:
         if fail_closed:
@@ -930,33 +942,11 @@ async def is_rate_limited(
         return False
 
     try:
-        redis_client = cache_manager.redis_client
-        rate_limit_key = f"rate_limit:{key}"
-        current_time = time.time()
-        window_start = current_time - window_seconds
-
-        # Use a Redis pipeline for atomic operations
-        pipe = redis_client.pipeline()
-
-        # Remove old entries outside the window
-        pipe.zremrangebyscore(rate_limit_key, 0, window_start)
-
-        # Count requests in current window
-        pipe.zcard(rate_limit_key)
-
-        # Add current request with timestamp as score
-        pipe.zadd(rate_limit_key, {str(current_time): current_time})
-
-        # Set expiry on the key to auto-cleanup
-        pipe.expire(rate_limit_key, window_seconds)
-
-        # Execute pipeline
-        results = await pipe.execute()
-
-        # Get the count (second command result, before adding current request)
-        request_count = results[1]
+        # One atomic script: trim the window, count it, record this request.
+        check = SlidingWindow(f"rate_limit:{key}", limit, window_seconds)
+        (request_count,) = await run_checks(cache_manager.redis_client, [check])
 
-        if request_count >= limit:
+        if check.denies(request_count):
             logger.warning(
                 f"Rate limit exceeded for key: {key} ({request_count}/{limit} requests)"
             )
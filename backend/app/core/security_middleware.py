@@ -203,25 +203,25 @@ async def daily_cap_exceeded(scope: str, limit: int) -> bool:
     membership-pipeline prospects and send email. Per-IP rate limiting alone
     doesn't stop a distributed flood; this bounds the daily blast radius.
 
-    Backed by an atomic Redis INCR with a ~26h expiry. Fails OPEN when Redis is
-    unavailable (availability over the cap) — the per-IP limiter still applies.
+    Backed by an atomic Redis counter with a ~26h expiry, set in the same
+    script as the increment. Fails OPEN when Redis is unavailable
+    (availability over the cap) — the per-IP limiter still applies.
     """
     from datetime import datetime, timezone
 
     from loguru import logger
 
     from app.core.cache import cache_manager
+    from app.core.redis_primitives import FixedWindowCounter, run_checks
 
     if limit <= 0 or not (cache_manager.is_connected and cache_manager.redis_client):
         return False
 
     day = datetime.now(timezone.utc).strftime("%Y%m%d")
-    key = f"daily_cap:{scope}:{day}"
+    check = FixedWindowCounter(f"daily_cap:{scope}:{day}", limit, 93600)  # ~26h
     try:
-        count = await cache_manager.redis_client.incr(key)
-        if count == 1:
-            await cache_manager.redis_client.expire(key, 93600)  # ~26h
-        return count > limit
+        (count,) = await run_checks(cache_manager.redis_client, [check])
+        return check.denies(count)
     except Exception as exc:
         logger.warning("Daily-cap check failed (allowing): {}", exc)
         return False
@@ -0,0 +1,493 @@
+"""
+Object Storage
+
+Uploaded files (product photos, event attachments) are addressed by a
+storage *key* — a relative, ``/``-separated path such as
+``event-attachments/<org>/<event>/<uuid>.pdf`` — and written through a
+``StorageBackend`` selected by ``STORAGE_TYPE``:
+
+- ``local``: files under ``STORAGE_LOCAL_ROOT`` (``/app/uploads`` in the
+  container, the same tree the upload endpoints always wrote to, so a key
+  maps onto the path an older row recorded).
+- ``s3``: any S3-compatible bucket — AWS, or the bundled MinIO via
+  ``AWS_S3_ENDPOINT_URL``. boto3 is imported only when this backend is used.
+
+Reads stream in chunks and support byte ranges; ``stored_object_response``
+turns a key into a 200/206/416 response (or a pre-signed redirect when
+``STORAGE_PRESIGNED_DOWNLOADS`` is on and the backend can sign URLs), so no
+endpoint has to load a whole file into memory to serve it.
+"""
+
+import asyncio
+import os
+import re
+import shutil
+import tempfile
+import unicodedata
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Optional
+from urllib.parse import quote
+
+from fastapi import HTTPException
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+
+from app.core.config import settings
+
+STORAGE_CHUNK_SIZE = 256 * 1024
+
+_KEY_SEGMENT = re.compile(r"^[A-Za-z0-9._-]+$")
+_BYTE_RANGE = re.compile(r"^bytes=([0-9]*)-([0-9]*)$")
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """Metadata for one stored object."""
+
+    key: str
+    size: int
+    content_type: Optional[str] = None
+    last_modified: Optional[datetime] = None
+
+
+def validate_key(key: str) -> str:
+    """Reject keys that could escape the storage root or bucket prefix."""
+    segments = key.split("/")
+    if not key or any(
+        seg in ("", ".", "..") or not _KEY_SEGMENT.match(seg) for seg in segments
+    ):
+        raise ValueError(f"Invalid storage key: {key!r}")
+    return key
+
+
+class StorageBackend(ABC):
+    """Minimal object-store interface used by the upload/download paths."""
+
+    name: str = "abstract"
+
+    @abstractmethod
+    async def put_file(
+        self, key: str, source_path: str, content_type: Optional[str] = None
+    ) -> StoredObject:
+        """Store a local file under ``key``, consuming (moving) the source."""
+
+    @abstractmethod
+    async def put_bytes(
+        self, key: str, data: bytes, content_type: Optional[str] = None
+    ) -> StoredObject:
+        """Store ``data`` under ``key``, replacing any existing object."""
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        """Return object metadata, or None when the key does not exist."""
+
+    @abstractmethod
+    def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = STORAGE_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream bytes ``start``..``end`` (inclusive) of the object."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the object; a missing key is not an error."""
+
+    async def presigned_url(
+        self,
+        key: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> Optional[str]:
+        """A time-limited direct download URL, or None if unsupported."""
+        return None
+
+    def local_path(self, key: str) -> Optional[str]:
+        """The filesystem path backing ``key``, for backends that have one."""
+        return None
+
+    def staging_dir(self, key: str) -> str:
+        """Where to spool an upload bound for ``key`` before ``put_file``."""
+        return tempfile.gettempdir()
+
+    async def read_bytes(self, key: str) -> bytes:
+        """Read a whole (small) object — images and the like, never documents."""
+        chunks = [chunk async for chunk in self.iter_range(key)]
+        return b"".join(chunks)
+
+
+class LocalStorageBackend(StorageBackend):
+    """Files on the local (or volume-mounted) filesystem."""
+
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+
+    def local_path(self, key: str) -> str:
+        path = os.path.realpath(os.path.join(self.root, validate_key(key)))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid storage key: {key!r}")
+        return path
+
+    def staging_dir(self, key: str) -> str:
+        # Same directory as the destination, so put_file is a plain rename.
+        return os.path.dirname(self.local_path(key))
+
+    def _stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            st = os.stat(self.local_path(key))
+        except FileNotFoundError:
+            return None
+        return StoredObject(
+            key=key,
+            size=st.st_size,
+            last_modified=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+        )
+
+    def _put_file(self, key: str, source_path: str) -> Optional[StoredObject]:
+        dest = self.local_path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        try:
+            os.replace(source_path, dest)
+        except OSError:
+            # Different filesystem (e.g. the spool lived elsewhere): copy then
+            # remove, still landing the final name atomically.
+            tmp = f"{dest}.part"
+            shutil.copyfile(source_path, tmp)
+            os.replace(tmp, dest)
+            os.remove(source_path)
+        return self._stat(key)
+
+    def _put_bytes(self, key: str, data: bytes) -> Optional[StoredObject]:
+        dest = self.local_path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.part"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, dest)
+        return self._stat(key)
+
+    async def put_file(
+        self, key: str, source_path: str, content_type: Optional[str] = None
+    ) -> StoredObject:
+        obj = await asyncio.to_thread(self._put_file, key, source_path)
+        assert obj is not None
+        return obj
+
+    async def put_bytes(
+        self, key: str, data: bytes, content_type: Optional[str] = None
+    ) -> StoredObject:
+        obj = await asyncio.to_thread(self._put_bytes, key, data)
+        assert obj is not None
+        return obj
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        return await asyncio.to_thread(self._stat, key)
+
+    async def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = STORAGE_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        fh = await asyncio.to_thread(open, self.local_path(key), "rb")
+        try:
+            await asyncio.to_thread(fh.seek, start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await asyncio.to_thread(fh.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(fh.close)
+
+    async def delete(self, key: str) -> None:
+        def _remove() -> None:
+            try:
+                os.remove(self.local_path(key))
+            except FileNotFoundError:
+                pass
+
+        await asyncio.to_thread(_remove)
+
+
+class S3StorageBackend(StorageBackend):
+    """An S3-compatible bucket (AWS S3, MinIO, Ceph RGW, ...).
+
+    boto3 is synchronous, so every call runs in a worker thread. The client is
+    created once per backend and shared — boto3 clients are thread-safe.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        client: Any = None,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self._client = client
+        self._client_kwargs = {
+            "endpoint_url": endpoint_url,
+            "region_name": region,
+            "aws_access_key_id": access_key_id,
+            "aws_secret_access_key": secret_access_key,
+        }
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client(
+                "s3", **{k: v for k, v in self._client_kwargs.items() if v}
+            )
+        return self._client
+
+    def _object_key(self, key: str) -> str:
+        validate_key(key)
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    @staticmethod
+    def _is_missing(exc: Exception) -> bool:
+        response = getattr(exc, "response", None) or {}
+        code = str(response.get("Error", {}).get("Code", ""))
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    async def put_file(
+        self, key: str, source_path: str, content_type: Optional[str] = None
+    ) -> StoredObject:
+        extra = {"ContentType": content_type} if content_type else {}
+        await asyncio.to_thread(
+            self.client.upload_file,
+            source_path,
+            self.bucket,
+            self._object_key(key),
+            ExtraArgs=extra,
+        )
+        size = await asyncio.to_thread(os.path.getsize, source_path)
+        await asyncio.to_thread(os.remove, source_path)
+        return StoredObject(key=key, size=size, content_type=content_type)
+
+    async def put_bytes(
+        self, key: str, data: bytes, content_type: Optional[str] = None
+    ) -> StoredObject:
+        extra = {"ContentType": content_type} if content_type else {}
+        await asyncio.to_thread(
+            self.client.put_object,
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Body=data,
+            **extra,
+        )
+        return StoredObject(key=key, size=len(data), content_type=content_type)
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            head = await asyncio.to_thread(
+                self.client.head_object, Bucket=self.bucket, Key=self._object_key(key)
+            )
+        except Exception as exc:
+            if self._is_missing(exc):
+                return None
+            raise
+        return StoredObject(
+            key=key,
+            size=int(head.get("ContentLength", 0)),
+            content_type=head.get("ContentType"),
+            last_modified=head.get("LastModified"),
+        )
+
+    async def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = STORAGE_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        kwargs: dict[str, Any] = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if start or end is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        response = await asyncio.to_thread(self.client.get_object, **kwargs)
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            await asyncio.to_thread(body.close)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self.client.delete_object, Bucket=self.bucket, Key=self._object_key(key)
+        )
+
+    async def presigned_url(
+        self,
+        key: str,
+        expires_in: int,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> Optional[str]:
+        params: dict[str, Any] = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if filename:
+            params["ResponseContentDisposition"] = content_disposition(filename)
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return await asyncio.to_thread(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params=params,
+            ExpiresIn=expires_in,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+    """The process-wide backend configured by ``STORAGE_TYPE``."""
+    storage_type = (settings.STORAGE_TYPE or "local").lower()
+    if storage_type == "local":
+        return LocalStorageBackend(settings.STORAGE_LOCAL_ROOT)
+    if storage_type == "s3":
+        if not settings.AWS_S3_BUCKET:
+            raise RuntimeError("STORAGE_TYPE=s3 requires AWS_S3_BUCKET")
+        return S3StorageBackend(
+            settings.AWS_S3_BUCKET,
+            prefix=settings.AWS_S3_PREFIX,
+            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+            region=settings.AWS_REGION,
+            access_key_id=settings.AWS_ACCESS_KEY_ID,
+            secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        )
+    raise RuntimeError(
+        f"STORAGE_TYPE={storage_type!r} is not supported; use 'local' or 's3'"
+    )
+
+
+def parse_byte_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """Parse a single-range ``Range`` header into inclusive (start, end).
+
+    Returns None when there is no usable range (serve the whole object) and
+    raises ValueError when the range cannot be satisfied (HTTP 416). As RFC
+    9110 requires, a malformed header is ignored rather than refused; only
+    a well-formed range lying past the end of the object is unsatisfiable.
+    Multi-range requests are answered with the full object, which RFC 9110
+    permits.
+    """
+    match = _BYTE_RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if first == "":
+        if last == "":
+            return None
+        # Suffix range: the final N bytes.
+        length = int(last)
+        if length == 0:
+            raise ValueError("Unsatisfiable range")
+        if size == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None  # last-pos before first-pos: an invalid range-spec
+    if start >= size:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+def content_disposition(filename: str) -> str:
+    """``attachment`` header value for a user-supplied filename.
+
+    Headers are latin-1, so a non-ASCII name gets an ASCII ``filename=``
+    fallback plus the RFC 5987 ``filename*=UTF-8''...`` form, like
+    Starlette's ``FileResponse``. Control characters (CR/LF included),
+    quotes and backslashes are dropped first.
+    """
+    name = "".join(
+        ch for ch in filename if ch not in '"\\' and unicodedata.category(ch) != "Cc"
+    )
+    fallback = "".join(
+        ch if ch.isascii() else "_"
+        for ch in unicodedata.normalize("NFKD", name)
+        if not unicodedata.combining(ch)
+    )
+    value = f'attachment; filename="{fallback}"'
+    if fallback != name:
+        value += f"; filename*=UTF-8''{quote(name, safe='')}"
+    return value
+
+
+async def stored_object_response(
+    storage: StorageBackend,
+    key: str,
+    *,
+    media_type: str,
+    range_header: Optional[str] = None,
+    filename: Optional[str] = None,
+    headers: Optional[dict[str, str]] = None,
+    allow_redirect: bool = True,
+) -> Response:
+    """Serve a stored object: redirect, full stream, or a byte range."""
+    if allow_redirect and settings.STORAGE_PRESIGNED_DOWNLOADS:
+        url = await storage.presigned_url(
+            key,
+            settings.STORAGE_PRESIGNED_URL_TTL_SECONDS,
+            filename=filename,
+            content_type=media_type,
+        )
+        if url:
+            return RedirectResponse(url, status_code=307)
+
+    obj = await storage.stat(key)
+    if obj is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    response_headers = {"Accept-Ranges": "bytes", **(headers or {})}
+    if filename:
+        response_headers["Content-Disposition"] = content_disposition(filename)
+
+    try:
+        byte_range = parse_byte_range(range_header, obj.size)
+    except ValueError:
+        return Response(
+            status_code=416, headers={"Content-Range": f"bytes */{obj.size}"}
+        )
+
+    if byte_range is None:
+        response_headers["Content-Length"] = str(obj.size)
+        return StreamingResponse(
+            storage.iter_range(key), media_type=media_type, headers=response_headers
+        )
+
+    start, end = byte_range
+    response_headers["Content-Range"] = f"bytes {start}-{end}/{obj.size}"
+    response_headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        storage.iter_range(key, start, end),
+        status_code=206,
+        media_type=media_type,
+        headers=response_headers,
+    )
@@ -68,6 +68,10 @@ class ConnectionManager:
                 del self._connections[organization_id]
         logger.debug(f"WS disconnected: org={organization_id}")
 
+    def connection_count(self) -> int:
+        """Open connections on this worker, across all organizations."""
+        return sum(len(sockets) for sockets in self._connections.values())
+
     async def broadcast_to_org(self, organization_id: str, message: dict):
         """Send a message to all connections in an organization."""
         connections = self._connections.get(organization_id, set())
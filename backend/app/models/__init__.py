@@ -11,7 +11,7 @@ from app.models.admin_hours import (
     AdminHoursEntryStatus,
     EventHourMapping,
 )
-from app.models.analytics import AnalyticsEvent
+from app.models.analytics import AnalyticsEvent, AnalyticsRollup
 from app.models.apparatus import (
     Apparatus,
     ApparatusCategory,
@@ -178,7 +178,7 @@ from app.models.grant import (
     RecurringFrequency,
     ReportingFrequency,
 )
-from app.models.integration import Integration
+from app.models.integration import Integration, IntegrationDelivery
 from app.models.inventory import (
     AssignmentType,
     CheckOutRecord,
@@ -293,6 +293,7 @@ from app.models.public_portal import (
     PublicPortalDataWhitelist,
 )
 from app.models.scheduling_module_config import SchedulingModuleConfig
+from app.models.schema_fingerprint import SchemaFingerprint
 from app.models.security_alert import AlertType, SecurityAlertRecord, ThreatLevel
 from app.models.skills_testing import SkillTemplate, SkillTest
 from app.models.storefront import (
@@ -425,8 +426,10 @@ __all__ = [
     "MessageTargetType",
     # Integration models
     "Integration",
+    "IntegrationDelivery",
     # Analytics models
     "AnalyticsEvent",
+    "AnalyticsRollup",
     # Error log models
     "ErrorLog",
     # Apparatus models
@@ -513,6 +516,8 @@ __all__ = [
     "ShiftEquipmentCheckItem",
     # Scheduling module config
     "SchedulingModuleConfig",
+    # Startup schema fingerprint
+    "SchemaFingerprint",
     # Security alert models
     "SecurityAlertRecord",
     "AlertType",
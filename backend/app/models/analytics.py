@@ -10,11 +10,13 @@ from sqlalchemy import (
     Column,
     Date,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.sql import func
 
@@ -37,10 +39,69 @@ class AnalyticsEvent(Base):
     device_type = Column(String(20), nullable=True)
     event_metadata = Column("metadata", JSON, default=dict)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set once the row has been folded into analytics_rollups; rolled-up rows
+    # are what the analytics_events retention class may prune.
+    rolled_up = Column(Boolean, nullable=False, default=False, server_default="0")
 
     __table_args__ = (
         Index("ix_analytics_org_event", "organization_id", "event_id"),
         Index("ix_analytics_created", "created_at"),
+        Index("ix_analytics_rollup_pending", "rolled_up", "created_at"),
+        # Retention sweep: rolled-up rows per organization in age order.
+        Index(
+            "ix_analytics_org_rolled_created",
+            "organization_id",
+            "rolled_up",
+            "created_at",
+        ),
+    )
+
+
+class AnalyticsRollup(Base):
+    """
+    Pre-aggregated analytics event counts
+
+    One row per organization x event x event type x device x failure reason
+    per hour or day bucket, maintained incrementally from analytics_events by
+    the analytics_rollup task. Dimension columns store "" rather than NULL so
+    the unique key can drive additive upserts.
+    """
+
+    __tablename__ = "analytics_rollups"
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    organization_id = Column(
+        String(36),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    granularity = Column(String(10), nullable=False)  # hour, day
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    event_id = Column(String(36), nullable=False, default="", server_default="")
+    event_type = Column(String(50), nullable=False)
+    device_type = Column(String(20), nullable=False, default="", server_default="")
+    error_reason = Column(String(100), nullable=False, default="", server_default="")
+    event_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Scan -> successful check-in pairs whose check-in falls in this bucket
+    check_in_pairs = Column(Integer, nullable=False, default=0, server_default="0")
+    check_in_seconds = Column(Float, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id",
+            "granularity",
+            "bucket_start",
+            "event_id",
+            "event_type",
+            "device_type",
+            "error_reason",
+            name="uq_analytics_rollup_bucket",
+        ),
+        Index("ix_analytics_rollup_org_event", "organization_id", "event_id"),
     )
 
 
@@ -341,6 +341,9 @@ class Document(Base):
     description = Column(Text)
     file_name = Column(String(255))
     file_path = Column(String(500))
+    # Object storage key (app.core.storage). Rows uploaded before object
+    # storage have only file_path.
+    storage_key = Column(String(500), nullable=True)
     file_size = Column(BigInteger, default=0)  # Size in bytes
     file_type = Column(String(100))  # MIME type
     document_type = Column(
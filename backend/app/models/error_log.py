@@ -40,4 +40,6 @@ class ErrorLog(Base):
     __table_args__ = (
         Index("ix_error_logs_org_type", "organization_id", "error_type"),
         Index("ix_error_logs_created", "created_at"),
+        # Retention sweep: expired rows per organization in age order.
+        Index("ix_error_logs_org_created", "organization_id", "created_at"),
     )
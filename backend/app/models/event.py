@@ -511,6 +511,8 @@ class EventExternalAttendee(Base):
         Index("ix_ext_attendees_org_id", "organization_id"),
         Index("ix_ext_attendees_email", "email"),
         Index("ix_ext_attendees_prospect_id", "prospect_id"),
+        # Retention sweep: expired rows per organization in age order.
+        Index("ix_ext_attendees_org_created", "organization_id", "created_at"),
     )
 
 
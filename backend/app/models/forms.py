@@ -293,6 +293,8 @@ class FormSubmission(Base):
     __table_args__ = (
         Index("idx_form_submissions_org_form", "organization_id", "form_id"),
         Index("idx_form_submissions_org_user", "organization_id", "submitted_by"),
+        # Retention sweep: expired rows per organization in age order.
+        Index("idx_form_submissions_org_submitted", "organization_id", "submitted_at"),
     )
 
 
@@ -8,7 +8,17 @@ import json
 from typing import Any, Optional
 
 from loguru import logger
-from sqlalchemy import JSON, Boolean, Column, DateTime, Index, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -89,3 +99,44 @@ class Integration(Base):
                 "Failed to decrypt encrypted_config for integration {}", self.id
             )
             return {}
+
+
+class IntegrationDelivery(Base):
+    """
+    Outbound chat notification or webhook awaiting (or past) delivery
+
+    Written when a notification is queued and sent by the delivery worker
+    (app/services/integration_services/delivery_outbox.py), which retries
+    failures with exponential backoff. The message is formatted from
+    ``kind`` + ``payload`` at send time, so the destination URL stays
+    encrypted on the integration.
+    """
+
+    __tablename__ = "integration_deliveries"
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    organization_id = Column(String(36), nullable=False)
+    integration_id = Column(
+        String(36),
+        ForeignKey("integrations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    integration_type = Column(String(50), nullable=False)
+    kind = Column(String(20), nullable=False)  # event, shift, training, summary
+    payload = Column(JSON, nullable=False)
+    status = Column(
+        String(20), nullable=False, default="pending"
+    )  # pending, delivered, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    # Due time while pending; pushed forward by the lease while a send is in
+    # flight, so a worker that dies mid-send leaves the row to be retried.
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(String(500), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_integration_deliveries_due", "status", "next_attempt_at"),
+        Index("ix_integration_deliveries_integration", "integration_id", "created_at"),
+        Index("ix_integration_deliveries_org_created", "organization_id", "created_at"),
+    )
@@ -345,6 +345,9 @@ class DepartmentMessage(Base):
     # (hidden from inboxes, not yet escalated); the publish task clears this to
     # NULL when it goes live, so NULL == published/immediate.
     scheduled_at = Column(DateTime(timezone=True), nullable=True)
+    # Fan-out progress written by MessageDeliveryService: state, audience size
+    # and per-channel counts. NULL until delivery starts.
+    delivery_status = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
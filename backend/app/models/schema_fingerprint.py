@@ -0,0 +1,30 @@
+"""
+Schema Fingerprint Model
+
+Single-row record of the last schema verified at startup. See
+``app.core.schema_fingerprint`` for how the fingerprint is computed and used.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, String, func
+
+from app.core.database import Base
+
+
+class SchemaFingerprint(Base):
+    """
+    The Alembic head and metadata hash the database was last verified
+    against. A single row (id=1), rewritten by whichever worker migrated or
+    repaired the schema.
+    """
+
+    __tablename__ = "schema_fingerprint"
+
+    id = Column(Integer, primary_key=True)
+    head_revision = Column(String(64), nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    recorded_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self):
+        return f"<SchemaFingerprint(head_revision={self.head_revision})>"
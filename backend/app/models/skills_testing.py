@@ -389,6 +389,13 @@ class SkillTest(Base):
         # Sweep index for the practice-attempt purge job, which scans by
         # is_practice + age.
         Index("idx_skill_test_practice_created", "is_practice", "created_at"),
+        # ...and the per-organization retention sweep of the same rows.
+        Index(
+            "idx_skill_test_org_practice_created",
+            "organization_id",
+            "is_practice",
+            "created_at",
+        ),
         # The officer review queue scans for official tests awaiting validation.
         Index(
             "idx_skill_test_org_validation",
@@ -39,7 +39,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -452,10 +452,21 @@ class StoreProductImage(Base):
     content_type = Column(
         String(100), nullable=False, default="image/webp", server_default="image/webp"
     )
+    # Where the photo lives in object storage (app/core/storage.py). New
+    # uploads are written there; ``data`` is only populated on rows uploaded
+    # before storage existed, until scripts/migrate_blobs_to_storage.py moves
+    # them out of the database.
+    storage_key = Column(String(500), nullable=True)
     # 16MB MEDIUMBLOB: MySQL's default BLOB caps at 64KB, which silently
-    # truncates an optimized product photo (a few hundred KB).
-    data = Column(LargeBinary(length=16_777_215), nullable=False)
+    # truncates an optimized product photo (a few hundred KB). Deferred so
+    # looking a photo up never drags the bytes along unless asked.
+    data = deferred(Column(LargeBinary(length=16_777_215), nullable=True))
     byte_size = Column(Integer, nullable=False, default=0, server_default="0")
+    # Smaller renditions stored beside ``storage_key`` (see
+    # StorefrontService.derivative_key), as {"thumbnail": bytes, "card": bytes}.
+    # NULL on photos uploaded before derivatives existed; those serve the
+    # full image for every size.
+    derivatives = Column(JSON, nullable=True)
 
     uploaded_by = Column(
         String(36), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
@@ -3053,12 +3053,17 @@ class ShiftCall(Base):
     # Notes
     notes = Column(Text)
 
+    # Incident number from the ePCR import that created this call; NULL for
+    # calls entered by hand. Re-imports upsert on (organization_id, external_id).
+    external_id = Column(String(100))
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     __table_args__ = (
         Index("idx_call_shift", "shift_id"),
         Index("idx_call_type", "incident_type"),
+        UniqueConstraint("organization_id", "external_id", name="uq_call_external"),
     )
 
     def __repr__(self):
@@ -3589,6 +3594,85 @@ class TrainingWaiver(Base):
     )
 
 
+class MemberRequirementStatus(Base):
+    """
+    Persisted Compliance Status
+
+    One row per member per training requirement holding the result of
+    ``evaluate_member_requirement`` as of ``evaluated_for`` and the
+    member's ``MemberComplianceGeneration`` it was computed from. A row is
+    stale once that generation moves on — whenever a record, waiver, leave,
+    requirement or compliance config it depends on changes — and is
+    recomputed for just the affected members the next time it is read, and
+    refreshed for everyone by the nightly ``compliance_status_reconcile``
+    task. See app/services/compliance_status_service.py.
+    """
+
+    __tablename__ = "member_requirement_statuses"
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    organization_id = Column(
+        String(36),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id = Column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    requirement_id = Column(
+        String(36),
+        ForeignKey("training_requirements.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # completed, in_progress, expired, not_started
+    status = Column(String(20), nullable=False)
+    completion_date = Column(Date, nullable=True)
+    expiration_date = Column(Date, nullable=True)
+    # Evaluation window the status was computed over (NULL = unbounded)
+    window_start = Column(Date, nullable=True)
+    window_end = Column(Date, nullable=True)
+
+    # The calendar day the status is valid for; windows and expiry roll
+    # over at midnight, so rows from an earlier day are stale.
+    evaluated_for = Column(Date, nullable=False)
+    # Member generation read before the inputs were loaded; a later bump
+    # means a write may have been missed, so the row is stale.
+    generation = Column(Integer, nullable=False, default=0, server_default="0")
+    generated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "requirement_id", name="uq_member_req_status"),
+        Index("idx_member_req_status_org_req", "organization_id", "requirement_id"),
+    )
+
+
+class MemberComplianceGeneration(Base):
+    """
+    Compliance Input Generation
+
+    Per-member counter bumped, in the writer's transaction, by every flush
+    that changes an input of the member's compliance statuses. Readers
+    stamp the value they saw before loading the inputs onto the statuses
+    they write, so a status computed while a write was in flight never
+    passes for current. Members without a row are at generation 0.
+    """
+
+    __tablename__ = "member_compliance_generations"
+
+    user_id = Column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    generation = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 # ============================================
 # Recertification Pathways
 # ============================================
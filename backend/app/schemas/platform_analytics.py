@@ -66,3 +66,38 @@ class PlatformAnalyticsResponse(UTCResponseBase):
     documents_last_30_days: int = 0
 
     generated_at: datetime
+
+
+class QueryProfileSuspect(BaseModel):
+    """A statement shape repeated often enough in one request to be an N+1."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    statement: str
+    max_repeats: int
+
+
+class QueryProfileRoute(BaseModel):
+    """Query totals for one ``METHOD /route/template``."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    route: str
+    requests: int
+    avg_queries: float
+    max_queries: int
+    avg_db_ms: float
+    max_db_ms: float
+    n_plus_one_requests: int
+    n_plus_one_suspects: List[QueryProfileSuspect] = []
+
+
+class QueryProfileResponse(UTCResponseBase):
+    """Per-route query profile of the worker that served the request."""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    enabled: bool
+    worker_pid: int
+    since: datetime
+    routes: List[QueryProfileRoute] = []
@@ -326,6 +326,8 @@ class StoreProductResponse(UTCResponseBase):
     sku: Optional[str] = None
     description: Optional[str] = None
     image_url: Optional[str] = None
+    # Small rendition for list rows; same as image_url for external images.
+    thumbnail_url: Optional[str] = None
     category: Optional[str] = None
     inventory_item_id: Optional[str] = None
     price: Decimal
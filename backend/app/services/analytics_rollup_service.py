@@ -0,0 +1,464 @@
+"""
+Analytics Rollup Service
+
+Bulk ingestion of QR check-in analytics events and the pre-aggregated
+``analytics_rollups`` behind ``GET /analytics/metrics``.
+
+Ingestion
+---------
+The browser buffers events and posts them in batches; ``record`` writes a
+batch as one multi-row INSERT. Each event carries the time it happened on the
+client (clamped to the last ``_MAX_BACKDATE``), so buffering does not collapse
+a scan and the check-in that followed it onto one timestamp.
+
+Rollups
+-------
+``roll_up_batch`` (run by the ``analytics_rollup`` task) takes the oldest
+un-rolled raw rows, folds them into hourly and daily buckets per organization
+x event x event type x device x failure reason with additive upserts, and
+marks them ``rolled_up`` in the same transaction, so each row is counted
+exactly once. ``SKIP LOCKED`` keeps concurrent runs on disjoint rows.
+
+Metrics read the rollups plus whatever raw rows are still pending, so the
+counts are exact even while the task is behind. Pending rows are counted
+with GROUP BY in SQL, never loaded, so a large backlog (right after the
+rollups were introduced, or while the task lags) costs an index scan rather
+than the raw history in memory. Their check-in times are paired only for
+the last ``_PENDING_PAIR_WINDOW``; older pending check-ins join the average
+once rolled up. Rolled-up raw rows are pruned by the
+``analytics_events`` retention class.
+
+Time to check-in
+----------------
+``pair_check_ins`` makes one ordered pass per (organization, event, member):
+a successful check-in pairs with the latest earlier scan that no earlier
+check-in claimed, within ``_PAIR_WINDOW``. This replaces a scan x check-in
+self-join that paired every check-in with every earlier scan.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, extract, func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import (
+    ANALYTICS_CHECK_IN_FAILURE,
+    ANALYTICS_CHECK_IN_SUCCESS,
+    ANALYTICS_QR_SCAN,
+)
+from app.models.analytics import AnalyticsEvent, AnalyticsRollup
+
+GRANULARITIES = ("hour", "day")
+
+ROLLUP_BATCH_SIZE = 5000
+
+# Client clocks are not trusted further back than this.
+_MAX_BACKDATE = timedelta(hours=24)
+
+# A scan more than this long before a check-in is not its scan.
+_PAIR_WINDOW = timedelta(hours=24)
+
+# Pending check-ins metrics pair in place, newest first, at most this many.
+_PENDING_PAIR_WINDOW = timedelta(hours=24)
+_PENDING_PAIR_LIMIT = ROLLUP_BATCH_SIZE
+
+_PAIR_COLUMNS = (
+    AnalyticsEvent.id,
+    AnalyticsEvent.organization_id,
+    AnalyticsEvent.event_id,
+    AnalyticsEvent.user_id,
+    AnalyticsEvent.event_type,
+    AnalyticsEvent.created_at,
+)
+_RAW_COLUMNS = _PAIR_COLUMNS + (
+    AnalyticsEvent.device_type,
+    AnalyticsEvent.event_metadata,
+)
+
+# (organization, granularity, bucket, event, type, device, reason)
+RollupKey = Tuple[str, str, datetime, str, str, str, str]
+
+
+def _utc(value: datetime) -> datetime:
+    """MySQL hands back naive UTC datetimes from column selects."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def bucket_start(value: datetime, granularity: str) -> datetime:
+    """Start of the hour or day bucket holding *value* (UTC)."""
+    start = _utc(value).replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        start = start.replace(hour=0)
+    return start
+
+
+def error_reason(event_type: str, metadata: Any) -> str:
+    """Failure reason a check-in failure is counted under ("" otherwise)."""
+    if event_type != ANALYTICS_CHECK_IN_FAILURE:
+        return ""
+    if not metadata or not isinstance(metadata, dict):
+        return ""
+    reason = metadata.get("error_reason") or metadata.get("reason") or "unknown"
+    return str(reason)[:100]
+
+
+def _error_reason_sql():
+    """``error_reason`` as a SQL expression, for counting unloaded rows."""
+    metadata = AnalyticsEvent.event_metadata
+    reason = func.coalesce(
+        func.nullif(metadata["error_reason"].as_string(), ""),
+        func.nullif(metadata["reason"].as_string(), ""),
+        "unknown",
+    )
+    return case(
+        (
+            and_(
+                AnalyticsEvent.event_type == ANALYTICS_CHECK_IN_FAILURE,
+                func.json_type(metadata) == "OBJECT",
+                func.json_length(metadata) > 0,
+            ),
+            func.left(reason, 100),
+        ),
+        else_="",
+    )
+
+
+def pair_check_ins(rows: Iterable[Any]) -> Dict[str, float]:
+    """Seconds from scan to check-in, keyed by check-in row id.
+
+    Rows need ``id``, ``organization_id``, ``event_id``, ``user_id``,
+    ``event_type`` and ``created_at``. A check-in never pairs with a scan
+    stamped at the same instant.
+    """
+    relevant = [
+        row
+        for row in rows
+        if row.event_type in (ANALYTICS_QR_SCAN, ANALYTICS_CHECK_IN_SUCCESS)
+        and row.event_id
+        and row.user_id
+        and row.created_at
+    ]
+    relevant.sort(
+        key=lambda row: (_utc(row.created_at), row.event_type == ANALYTICS_QR_SCAN)
+    )
+    durations: Dict[str, float] = {}
+    last_scan: Dict[Tuple[str, str, str], datetime] = {}
+    for row in relevant:
+        key = (row.organization_id, row.event_id, row.user_id)
+        at = _utc(row.created_at)
+        if row.event_type == ANALYTICS_QR_SCAN:
+            last_scan[key] = at
+            continue
+        scanned = last_scan.pop(key, None)
+        if scanned is not None and at - scanned <= _PAIR_WINDOW:
+            durations[row.id] = (at - scanned).total_seconds()
+    return durations
+
+
+def fold(
+    rows: Iterable[Any], durations: Mapping[str, float]
+) -> Dict[RollupKey, List[float]]:
+    """Aggregate raw rows into ``[count, check-in pairs, check-in seconds]``
+    per rollup key, for every granularity."""
+    totals: Dict[RollupKey, List[float]] = {}
+    for row in rows:
+        reason = error_reason(row.event_type, row.event_metadata)
+        seconds = durations.get(row.id)
+        for granularity in GRANULARITIES:
+            key = (
+                row.organization_id,
+                granularity,
+                bucket_start(row.created_at, granularity),
+                row.event_id or "",
+                row.event_type,
+                row.device_type or "",
+                reason,
+            )
+            acc = totals.setdefault(key, [0, 0, 0.0])
+            acc[0] += 1
+            if seconds is not None:
+                acc[1] += 1
+                acc[2] += seconds
+    return totals
+
+
+class AnalyticsRollupService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ----- ingestion -----------------------------------------------------
+
+    async def record(
+        self,
+        organization_id: str,
+        user_id: str,
+        events: Sequence[Mapping[str, Any]],
+        now: Optional[datetime] = None,
+    ) -> int:
+        """Insert a batch of tracked events in one statement.
+
+        Each event is a mapping with ``event_type``, ``event_id``,
+        ``metadata`` and optionally ``occurred_at``.
+        """
+        now = now or datetime.now(timezone.utc)
+        earliest = now - _MAX_BACKDATE
+        rows = []
+        for item in events:
+            metadata = item.get("metadata") or {}
+            occurred = item.get("occurred_at")
+            occurred = min(max(_utc(occurred), earliest), now) if occurred else now
+            device = metadata.get("deviceType")
+            rows.append(
+                {
+                    "organization_id": str(organization_id),
+                    "event_type": item.get("event_type") or "unknown",
+                    "event_id": item.get("event_id"),
+                    "user_id": str(user_id),
+                    "device_type": str(device)[:20] if device else None,
+                    "metadata": metadata,
+                    "created_at": occurred,
+                }
+            )
+        if rows:
+            await self.db.execute(insert(AnalyticsEvent.__table__), rows)
+        return len(rows)
+
+    # ----- rollups -------------------------------------------------------
+
+    async def roll_up_batch(self, limit: int = ROLLUP_BATCH_SIZE) -> int:
+        """Fold the oldest *limit* un-rolled events into the rollups.
+
+        Returns how many raw rows were rolled up; fewer than *limit* means
+        the backlog is drained. The caller commits.
+        """
+        rows = (
+            await self.db.execute(
+                select(*_RAW_COLUMNS)
+                .where(AnalyticsEvent.rolled_up.is_(False))
+                .order_by(AnalyticsEvent.created_at, AnalyticsEvent.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+        if not rows:
+            return 0
+
+        totals = fold(rows, await self._check_in_durations(rows))
+        stmt = mysql_insert(AnalyticsRollup.__table__)
+        stmt = stmt.on_duplicate_key_update(
+            event_count=AnalyticsRollup.event_count + stmt.inserted.event_count,
+            check_in_pairs=AnalyticsRollup.check_in_pairs
+            + stmt.inserted.check_in_pairs,
+            check_in_seconds=AnalyticsRollup.check_in_seconds
+            + stmt.inserted.check_in_seconds,
+            updated_at=func.now(),
+        )
+        await self.db.execute(
+            stmt,
+            [
+                {
+                    "organization_id": org_id,
+                    "granularity": granularity,
+                    "bucket_start": bucket,
+                    "event_id": event_id,
+                    "event_type": event_type,
+                    "device_type": device_type,
+                    "error_reason": reason,
+                    "event_count": count,
+                    "check_in_pairs": pairs,
+                    "check_in_seconds": seconds,
+                }
+                for (
+                    org_id,
+                    granularity,
+                    bucket,
+                    event_id,
+                    event_type,
+                    device_type,
+                    reason,
+                ), (count, pairs, seconds) in totals.items()
+            ],
+        )
+        await self.db.execute(
+            update(AnalyticsEvent)
+            .where(AnalyticsEvent.id.in_([row.id for row in rows]))
+            .values(rolled_up=True)
+        )
+        return len(rows)
+
+    async def _check_in_durations(self, rows: Sequence[Any]) -> Dict[str, float]:
+        """Scan-to-check-in seconds for the successful check-ins in *rows*.
+
+        A check-in's scan (or an earlier check-in that claimed it) may sit in
+        an earlier batch, so the ordered pass runs over every scan and
+        check-in of the same members and events from ``_PAIR_WINDOW`` before
+        the first check-in onward.
+        """
+        check_ins = [
+            row
+            for row in rows
+            if row.event_type == ANALYTICS_CHECK_IN_SUCCESS
+            and row.event_id
+            and row.user_id
+        ]
+        if not check_ins:
+            return {}
+        keys = {(r.organization_id, r.event_id, r.user_id) for r in check_ins}
+        first = min(_utc(r.created_at) for r in check_ins)
+        last = max(_utc(r.created_at) for r in check_ins)
+        history = (
+            await self.db.execute(
+                select(*_PAIR_COLUMNS).where(
+                    AnalyticsEvent.organization_id.in_({k[0] for k in keys}),
+                    AnalyticsEvent.event_id.in_({k[1] for k in keys}),
+                    AnalyticsEvent.user_id.in_({k[2] for k in keys}),
+                    AnalyticsEvent.event_type.in_(
+                        [ANALYTICS_QR_SCAN, ANALYTICS_CHECK_IN_SUCCESS]
+                    ),
+                    AnalyticsEvent.created_at >= first - _PAIR_WINDOW,
+                    AnalyticsEvent.created_at <= last,
+                )
+            )
+        ).all()
+        merged = {row.id: row for row in history}
+        merged.update((row.id, row) for row in check_ins)
+        durations = pair_check_ins(
+            row
+            for row in merged.values()
+            if (row.organization_id, row.event_id, row.user_id) in keys
+        )
+        wanted = {row.id for row in check_ins}
+        return {rid: s for rid, s in durations.items() if rid in wanted}
+
+    # ----- metrics -------------------------------------------------------
+
+    async def metrics(
+        self,
+        organization_id: str,
+        event_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """QR check-in metrics from the rollups plus still-pending raw rows."""
+        now = now or datetime.now(timezone.utc)
+        filters = [AnalyticsRollup.organization_id == str(organization_id)]
+        raw_filters = [
+            AnalyticsEvent.organization_id == str(organization_id),
+            AnalyticsEvent.rolled_up.is_(False),
+        ]
+        if event_id:
+            filters.append(AnalyticsRollup.event_id == event_id)
+            raw_filters.append(AnalyticsEvent.event_id == event_id)
+
+        by_type: Dict[str, int] = {}
+        devices: Dict[str, int] = {}
+        reasons: Dict[str, int] = {}
+        hourly = [0] * 24
+        pairs = 0
+        seconds = 0.0
+
+        def add(event_type, device, reason, count, n_pairs, n_seconds):
+            nonlocal pairs, seconds
+            by_type[event_type] = by_type.get(event_type, 0) + count
+            device = device or "unknown"
+            devices[device] = devices.get(device, 0) + count
+            if reason:
+                reasons[reason] = reasons.get(reason, 0) + count
+            pairs += n_pairs
+            seconds += n_seconds
+
+        daily = await self.db.execute(
+            select(
+                AnalyticsRollup.event_type,
+                AnalyticsRollup.device_type,
+                AnalyticsRollup.error_reason,
+                func.sum(AnalyticsRollup.event_count),
+                func.sum(AnalyticsRollup.check_in_pairs),
+                func.sum(AnalyticsRollup.check_in_seconds),
+            )
+            .where(*filters, AnalyticsRollup.granularity == "day")
+            .group_by(
+                AnalyticsRollup.event_type,
+                AnalyticsRollup.device_type,
+                AnalyticsRollup.error_reason,
+            )
+        )
+        for event_type, device, reason, count, n_pairs, n_seconds in daily.all():
+            add(
+                event_type,
+                device,
+                reason,
+                int(count or 0),
+                int(n_pairs or 0),
+                float(n_seconds or 0),
+            )
+
+        hour_of_day = extract("hour", AnalyticsRollup.bucket_start).label("hour")
+        by_hour = await self.db.execute(
+            select(hour_of_day, func.sum(AnalyticsRollup.event_count))
+            .where(*filters, AnalyticsRollup.granularity == "hour")
+            .group_by(hour_of_day)
+        )
+        for hour, count in by_hour.all():
+            hourly[int(hour)] += int(count or 0)
+
+        reason = _error_reason_sql().label("reason")
+        raw_hour = extract("hour", AnalyticsEvent.created_at).label("hour")
+        pending = await self.db.execute(
+            select(
+                AnalyticsEvent.event_type,
+                AnalyticsEvent.device_type,
+                reason,
+                raw_hour,
+                func.count(),
+            )
+            .where(*raw_filters)
+            .group_by(
+                AnalyticsEvent.event_type,
+                AnalyticsEvent.device_type,
+                reason,
+                raw_hour,
+            )
+        )
+        for event_type, device, error, hour, count in pending.all():
+            add(event_type, device, error, int(count), 0, 0.0)
+            hourly[int(hour)] += int(count)
+
+        recent_check_ins = (
+            await self.db.execute(
+                select(*_PAIR_COLUMNS)
+                .where(
+                    *raw_filters,
+                    AnalyticsEvent.event_type == ANALYTICS_CHECK_IN_SUCCESS,
+                    AnalyticsEvent.created_at >= now - _PENDING_PAIR_WINDOW,
+                )
+                .order_by(AnalyticsEvent.created_at.desc())
+                .limit(_PENDING_PAIR_LIMIT)
+            )
+        ).all()
+        if recent_check_ins:
+            durations = await self._check_in_durations(recent_check_ins)
+            pairs += len(durations)
+            seconds += sum(durations.values())
+
+        total_scans = by_type.get(ANALYTICS_QR_SCAN, 0)
+        successful = by_type.get(ANALYTICS_CHECK_IN_SUCCESS, 0)
+        failed = by_type.get(ANALYTICS_CHECK_IN_FAILURE, 0)
+        attempts = successful + failed
+        return {
+            "total_scans": total_scans,
+            "successful_check_ins": successful,
+            "failed_check_ins": failed,
+            "success_rate": (
+                round((successful / attempts) * 100, 2) if attempts > 0 else 0
+            ),
+            "avg_time_to_check_in": round(seconds / pairs, 1) if pairs else 0.0,
+            "device_breakdown": devices,
+            "error_breakdown": reasons,
+            "hourly_activity": [
+                {"hour": hour, "count": count} for hour, count in enumerate(hourly)
+            ],
+        }
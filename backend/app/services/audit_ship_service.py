@@ -13,21 +13,43 @@ signing key) so the collector can authenticate the sender. The high-water
 mark (``audit_ship_state``) advances only after the collector acknowledges
 with a 2xx — failed deliveries are simply retried next run.
 
+Batches are pipelined: the next batch is read and encoded while earlier
+ones are in flight, up to ``AUDIT_SHIP_MAX_IN_FLIGHT`` at once, and the
+watermark only ever advances in id order — a batch acknowledged out of order
+waits for those before it. When a batch fails, later batches that were
+already delivered are sent again next run, so the collector should
+de-duplicate on row id (``X-Logbook-First-Id`` / ``X-Logbook-Last-Id``).
+The watermark UPDATE is conditional (``last_shipped_id < :new_id``), so two
+runs that overlap can re-send the same rows but never move it backwards.
+With ``AUDIT_SHIP_COMPRESS`` the body is gzipped (``Content-Encoding:
+gzip``) and the signature covers the compressed bytes as sent.
+
+Batch size follows the collector's latency: halved when a response takes
+longer than ``AUDIT_SHIP_TARGET_LATENCY_SECONDS``, doubled back when
+responses are quick. Scheduled runs never exceed ``AUDIT_SHIP_BATCH_SIZE``
+and stop after ``_MAX_BATCHES_PER_RUN``; catch-up mode
+(scripts/ship_audit_backlog.py) grows batches up to
+``AUDIT_SHIP_MAX_BATCH_SIZE`` and runs until the backlog is drained or its
+deadline passes.
+
 Rows purged by retention before ever being shipped are skipped by the
 watermark; with the default cadences (shipping every 30 minutes, retention
 after 7 years) that never happens in practice.
 """
 
 import asyncio
+import gzip
 import hashlib
 import hmac
 import json
+import time
+from collections import deque
 from datetime import UTC, datetime
 from typing import Any
 
 import httpx
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.audit import _get_audit_signing_key, audit_logger
@@ -55,14 +77,71 @@ def _sign(payload: bytes) -> str:
     ).hexdigest()
 
 
+class _BatchSizer:
+    """Next batch size from the collector's latency: halve on a slow
+    response, double after a quick one that was full, within
+    ``[floor, ceiling]``."""
+
+    def __init__(self, initial: int, ceiling: int, target_latency: float):
+        self.size = max(1, min(initial, ceiling))
+        self._floor = max(1, min(self.size, 50))
+        self._ceiling = ceiling
+        self._target = target_latency
+
+    def observe(self, latency: float, full: bool) -> None:
+        if latency > self._target:
+            self.size = max(self._floor, self.size // 2)
+        elif full and latency < self._target / 2:
+            self.size = min(self._ceiling, self.size * 2)
+
+
+def _encode(records: list[dict[str, Any]], compress: bool) -> bytes:
+    payload = "".join(
+        json.dumps(record, sort_keys=True, default=str) + "\n" for record in records
+    ).encode("utf-8")
+    return gzip.compress(payload, compresslevel=6) if compress else payload
+
+
+async def _deliver(
+    client: httpx.AsyncClient,
+    url: str,
+    body: bytes,
+    first_id: int,
+    last_id: int,
+    compress: bool,
+) -> tuple[int, float]:
+    """POST one batch; returns the status code and the round-trip time."""
+    headers = {
+        "Content-Type": "application/x-ndjson",
+        "X-Logbook-Signature": f"sha256={_sign(body)}",
+        "X-Logbook-First-Id": str(first_id),
+        "X-Logbook-Last-Id": str(last_id),
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    started = time.monotonic()
+    response = await client.post(url, content=body, headers=headers)
+    return response.status_code, time.monotonic() - started
+
+
 async def ship_new_audit_logs(
     db: AsyncSession,
     client: httpx.AsyncClient | None = None,
+    *,
+    catch_up: bool = False,
+    deadline_seconds: float | None = None,
 ) -> dict[str, Any]:
-    """Deliver audit rows past the watermark to the configured collector."""
+    """Deliver audit rows past the watermark to the configured collector.
+
+    ``catch_up`` lifts the per-run batch cap and lets batches grow past
+    ``AUDIT_SHIP_BATCH_SIZE``; ``deadline_seconds`` stops starting new
+    batches once that much time has passed (in-flight ones still finish
+    and are acknowledged).
+    """
     results: dict[str, Any] = {
         "shipped_entries": 0,
         "batches": 0,
+        "batch_size": None,
         "skipped_reason": None,
         "error": None,
     }
@@ -72,9 +151,27 @@ async def ship_new_audit_logs(
         return results
 
     state = await _get_or_create_state(db)
+    compress = settings.AUDIT_SHIP_COMPRESS
+    max_in_flight = max(1, settings.AUDIT_SHIP_MAX_IN_FLIGHT)
+    max_batches = None if catch_up else _MAX_BATCHES_PER_RUN
+    sizer = _BatchSizer(
+        settings.AUDIT_SHIP_BATCH_SIZE,
+        (
+            max(settings.AUDIT_SHIP_MAX_BATCH_SIZE, settings.AUDIT_SHIP_BATCH_SIZE)
+            if catch_up
+            else settings.AUDIT_SHIP_BATCH_SIZE
+        ),
+        settings.AUDIT_SHIP_TARGET_LATENCY_SECONDS,
+    )
+    stop_at = (
+        time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+    )
+
     own_client = client is None
     if own_client:
         client = httpx.AsyncClient(timeout=30.0)
+    # (last_id, rows, requested size, delivery task), oldest first.
+    in_flight: deque[tuple[int, int, int, asyncio.Future]] = deque()
     try:
         # Validate the collector URL once per run: it is identical for every
         # batch, and the guard's DNS resolution is blocking, so it runs in a
@@ -89,52 +186,68 @@ async def ship_new_audit_logs(
             url,
             allow_private=settings.AUDIT_SHIP_ALLOW_PRIVATE_DESTINATION,
         )
-        for _ in range(_MAX_BATCHES_PER_RUN):
-            rows = (
-                (
-                    await db.execute(
-                        select(AuditLog)
-                        .where(AuditLog.id > state.last_shipped_id)
-                        .order_by(AuditLog.id)
-                        .limit(settings.AUDIT_SHIP_BATCH_SIZE)
+        cursor = state.last_shipped_id
+        started = 0
+        exhausted = False
+        while True:
+            # Keep the pipeline full: read and encode the next batches while
+            # the ones already sent are in flight. The session is only ever
+            # used from this loop, never concurrently.
+            while (
+                not exhausted
+                and len(in_flight) < max_in_flight
+                and (max_batches is None or started < max_batches)
+                and (stop_at is None or time.monotonic() < stop_at)
+            ):
+                size = sizer.size
+                rows = (
+                    (
+                        await db.execute(
+                            select(AuditLog)
+                            .where(AuditLog.id > cursor)
+                            .order_by(AuditLog.id)
+                            .limit(size)
+                        )
                     )
+                    .scalars()
+                    .all()
                 )
-                .scalars()
-                .all()
-            )
-            if not rows:
+                if not rows:
+                    exhausted = True
+                    break
+                records = [audit_logger.serialize_row(row) for row in rows]
+                body = await asyncio.to_thread(_encode, records, compress)
+                first_id, cursor = rows[0].id, rows[-1].id
+                task = asyncio.ensure_future(
+                    _deliver(client, url, body, first_id, cursor, compress)
+                )
+                in_flight.append((cursor, len(rows), size, task))
+                started += 1
+            if not in_flight:
                 break
 
-            payload = (
-                "\n".join(
-                    json.dumps(
-                        audit_logger.serialize_row(row), sort_keys=True, default=str
-                    )
-                    for row in rows
-                )
-                + "\n"
-            ).encode("utf-8")
-
-            response = await client.post(
-                url,
-                content=payload,
-                headers={
-                    "Content-Type": "application/x-ndjson",
-                    "X-Logbook-Signature": f"sha256={_sign(payload)}",
-                    "X-Logbook-First-Id": str(rows[0].id),
-                    "X-Logbook-Last-Id": str(rows[-1].id),
-                },
-            )
-            if response.status_code < 200 or response.status_code >= 300:
-                results["error"] = f"collector returned HTTP {response.status_code}"
+            last_id, count, size, task = in_flight.popleft()
+            status_code, latency = await task
+            if status_code < 200 or status_code >= 300:
+                results["error"] = f"collector returned HTTP {status_code}"
                 break
+            sizer.observe(latency, full=count >= size)
 
-            # Advance the watermark durably per acknowledged batch, so a
-            # failure mid-run never re-ships confirmed rows.
-            state.last_shipped_id = rows[-1].id
-            state.last_shipped_at = datetime.now(UTC)
+            # Advance the watermark durably per acknowledged batch, in id
+            # order, so a failure mid-run never re-ships confirmed rows. The
+            # UPDATE only ever raises it: a concurrent run (the catch-up
+            # script alongside the scheduled task) that has already shipped
+            # further is never moved back.
+            await db.execute(
+                update(AuditShipState)
+                .where(
+                    AuditShipState.id == state.id,
+                    AuditShipState.last_shipped_id < last_id,
+                )
+                .values(last_shipped_id=last_id, last_shipped_at=datetime.now(UTC))
+            )
             await db.commit()
-            results["shipped_entries"] += len(rows)
+            results["shipped_entries"] += count
             results["batches"] += 1
     except ValueError as exc:
         results["error"] = f"unsafe collector URL: {exc}"
@@ -143,9 +256,15 @@ async def ship_new_audit_logs(
         results["error"] = f"delivery failed: {exc.__class__.__name__}"
         logger.warning(f"Audit shipping delivery failed: {exc!r}")
     finally:
+        # Anything still in flight is behind the failed batch; its rows stay
+        # above the watermark and go out again next run.
+        for *_, task in in_flight:
+            task.cancel()
+        await asyncio.gather(*(task for *_, task in in_flight), return_exceptions=True)
         if own_client:
             await client.aclose()
 
+    results["batch_size"] = sizer.size
     if results["error"]:
         logger.warning(
             f"Audit shipping stopped after {results['batches']} batch(es): "
@@ -52,7 +52,7 @@ class CallTrackingService:
     async def get_settings(self, organization_id: str) -> Dict[str, Any]:
         """Return ``{"mode", "call_types"}`` for the org (never raises)."""
         eligibility = ShiftEligibilityService(self.db)
-        org = await eligibility._get_org(str(organization_id))
+        org = await eligibility._get_org_settings(str(organization_id))
         if not org:
             return {"mode": CallTrackingMode.DETAILED, "call_types": []}
         return eligibility.get_call_tracking_settings(org)
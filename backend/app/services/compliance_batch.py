@@ -0,0 +1,444 @@
+"""
+Batch Compliance Evaluation
+
+``evaluate_member_requirement`` answers one member x one requirement and
+re-filters that member's record list on every call, which is fine for a
+single member view but dominates org-wide recomputes (the nightly status
+reconcile, year rollovers, a requirement edit invalidating every member).
+
+``BatchComplianceEvaluator`` lays an organization's training records out
+once as compact columns (``array`` ordinals and hours, parallel lists for
+match keys) with, per member, completed records sorted by completion date
+and bucketed by training type, plus running hour totals. Evaluating a
+requirement for every member is then a pair of binary searches for the date
+window and recency cutoff and a prefix-sum difference for hours — no
+per-pair list filtering.
+
+Results are identical to ``evaluate_member_requirement`` (see
+tests/test_compliance_batch.py for the property-based parity checks):
+
+- Ties on "latest completion" resolve to the earliest record in input
+  order, as ``max()`` does, by sorting equal dates in reverse input order.
+- Hour totals near a threshold (or near zero) are re-summed in input order
+  so float rounding from the prefix sums can never flip a status.
+- Certification matching delegates to ``certification_record_matches``.
+
+Training types are compared by value (``TrainingType`` members and their
+string values are interchangeable, as they are with ``==``).
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from app.models.training import (
+    RequirementFrequency,
+    RequirementType,
+    TrainingStatus,
+)
+from app.services.training_compliance import (
+    certification_record_matches,
+    get_requirement_date_window,
+    recency_cutoff,
+)
+from app.services.training_period import (
+    effective_include_current_month,
+    resolve_as_of_date,
+)
+from app.services.training_waiver_service import (
+    adjust_required,
+    get_rolling_period_months,
+)
+
+# Ordinal for a record with no completion date: below every real date
+# (date.min.toordinal() == 1), so any window or recency bound excludes it.
+_NO_DATE = 0
+_MAX_ORDINAL = date.max.toordinal()
+
+# Prefix-sum totals this close to the requirement (or to zero) are re-summed
+# in input order before comparing, matching the scalar evaluator exactly.
+_EXACT_SUM_TOLERANCE = 1e-6
+
+Result = Tuple[str, Optional[str], Optional[str]]
+
+
+def _key(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _iso(value: Optional[date]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class _Group:
+    """One member's records of one kind, sorted for range queries."""
+
+    __slots__ = ("rows", "ordinals", "hours")
+
+    def __init__(self, rows: List[int], ordinals: array, hours: array):
+        # Equal dates sort in reverse input order so the last row of any
+        # range is the one ``max()`` would pick over the original list.
+        rows.sort(key=lambda r: (ordinals[r], -r))
+        self.rows = array("l", rows)
+        self.ordinals = array("l", (ordinals[r] for r in rows))
+        prefix = array("d", [0.0])
+        running = 0.0
+        for r in rows:
+            running += hours[r]
+            prefix.append(running)
+        self.hours = prefix
+
+    def span(self, lo: int, hi: int) -> Tuple[int, int]:
+        return bisect_left(self.ordinals, lo), bisect_right(self.ordinals, hi)
+
+
+class _Member:
+    __slots__ = ("completed", "by_type", "in_progress")
+
+    def __init__(self):
+        self.completed: Optional[_Group] = None
+        self.by_type: Dict[Any, _Group] = {}
+        self.in_progress: List[int] = []
+
+
+@dataclass(frozen=True)
+class RequirementPlan:
+    """Everything about a requirement that is the same for every member."""
+
+    req: Any
+    req_id: str
+    req_type: str
+    biannual: bool
+    today: date
+    start: Optional[date]
+    end: Optional[date]
+    # Completion-ordinal bounds: frequency window narrowed by recency
+    lo: int
+    hi: int
+    # Certification ignores the frequency window but not recency
+    recency_lo: int
+    type_key: Any
+    categories: Optional[frozenset]
+    name: Optional[str]
+
+
+class BatchComplianceEvaluator:
+    """Evaluate requirements for many members against columnar records."""
+
+    def __init__(self, records_by_user: Mapping[str, Sequence[Any]]):
+        self._records: List[Any] = []
+        ordinals = array("l")
+        hours = array("d")
+        self._type: List[Any] = []
+        self._category: List[Any] = []
+        self._course: List[Any] = []
+        self._course_name: List[Optional[str]] = []
+        self._members: Dict[str, _Member] = {}
+
+        for user_id, records in records_by_user.items():
+            member = _Member()
+            completed: List[int] = []
+            by_type: Dict[Any, List[int]] = {}
+            for record in records:
+                row = len(self._records)
+                self._records.append(record)
+                completion = record.completion_date
+                ordinals.append(completion.toordinal() if completion else _NO_DATE)
+                hours.append(record.hours_completed or 0)
+                type_key = _key(record.training_type)
+                self._type.append(type_key)
+                self._category.append(getattr(record, "category_id", None))
+                self._course.append(getattr(record, "course_id", None))
+                name = getattr(record, "course_name", None)
+                self._course_name.append(name.lower() if name else None)
+
+                if record.status == TrainingStatus.COMPLETED:
+                    completed.append(row)
+                    by_type.setdefault(type_key, []).append(row)
+                elif record.status == TrainingStatus.IN_PROGRESS:
+                    member.in_progress.append(row)
+            member.completed = _Group(completed, ordinals, hours)
+            member.by_type = {
+                k: _Group(rows, ordinals, hours) for k, rows in by_type.items()
+            }
+            self._members[str(user_id)] = member
+
+        self._empty = _Member()
+        self._empty.completed = _Group([], ordinals, hours)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def evaluate(
+        self,
+        req,
+        user_ids: Iterable[str],
+        today: date,
+        waivers_by_user: Optional[Mapping[str, list]] = None,
+        org_include_current_month: bool = True,
+    ) -> Dict[str, Result]:
+        """``evaluate_member_requirement`` for each of *user_ids*.
+
+        Returns ``{user_id: (status, completion_iso, expiry_iso)}``.
+        """
+        return self.evaluate_plan(
+            self.plan(req, today, org_include_current_month),
+            user_ids,
+            waivers_by_user,
+        )
+
+    def evaluate_plan(
+        self,
+        plan: RequirementPlan,
+        user_ids: Iterable[str],
+        waivers_by_user: Optional[Mapping[str, list]] = None,
+    ) -> Dict[str, Result]:
+        """``evaluate`` for a requirement already resolved with ``plan``."""
+        waivers_by_user = waivers_by_user or {}
+        return {
+            str(uid): self._evaluate(
+                plan,
+                self._members.get(str(uid), self._empty),
+                waivers_by_user.get(str(uid)),
+            )
+            for uid in user_ids
+        }
+
+    @staticmethod
+    def plan(
+        req, today: date, org_include_current_month: bool = True
+    ) -> RequirementPlan:
+        """Resolve a requirement's evaluation date, window and match keys."""
+        today = resolve_as_of_date(
+            today,
+            effective_include_current_month(
+                getattr(req, "include_current_month", None),
+                org_include_current_month,
+            ),
+        )
+        start, end = get_requirement_date_window(req, today)
+        cutoff = recency_cutoff(req, today)
+        recency_lo = cutoff.toordinal() if cutoff else _NO_DATE
+        if start and end:
+            lo, hi = max(start.toordinal(), recency_lo), end.toordinal()
+        else:
+            lo, hi = recency_lo, _MAX_ORDINAL
+        return RequirementPlan(
+            req=req,
+            req_id=str(req.id),
+            req_type=_key(req.requirement_type),
+            biannual=_key(req.frequency) == RequirementFrequency.BIANNUAL.value,
+            today=today,
+            start=start,
+            end=end,
+            lo=lo,
+            hi=hi,
+            recency_lo=recency_lo,
+            type_key=_key(req.training_type) if req.training_type else None,
+            categories=(
+                frozenset(req.category_ids)
+                if getattr(req, "category_ids", None)
+                else None
+            ),
+            name=req.name.lower() if req.name else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def _evaluate(self, p: RequirementPlan, member: _Member, waivers) -> Result:
+        if p.req_type == RequirementType.HOURS.value:
+            return self._hours_status(p, member, waivers)
+        if p.req_type == RequirementType.COURSES.value:
+            return self._courses_status(p, member)
+        if p.req_type == RequirementType.CERTIFICATION.value:
+            return self._certification_status(p, member)
+        if p.req_type == RequirementType.SHIFTS.value:
+            return self._count_status(p, member, waivers, p.req.required_shifts)
+        if p.req_type == RequirementType.CALLS.value:
+            return self._count_status(p, member, waivers, p.req.required_calls)
+        return self._fallback_status(p, member)
+
+    def _typed_group(self, p: RequirementPlan, member: _Member) -> Optional[_Group]:
+        if p.type_key is None:
+            return member.completed
+        return member.by_type.get(p.type_key)
+
+    def _required(self, p: RequirementPlan, base, waivers) -> float:
+        required = base or 0
+        if required > 0 and p.start and p.end and waivers:
+            required, _, _ = adjust_required(
+                required,
+                p.start,
+                p.end,
+                waivers,
+                p.req_id,
+                period_months=get_rolling_period_months(p.req),
+            )
+        return required
+
+    def _exact_hours(self, rows: Iterable[int]) -> float:
+        return sum(self._records[r].hours_completed or 0 for r in sorted(rows))
+
+    def _latest(self, row: Optional[int]) -> Tuple[Optional[str], Optional[str]]:
+        if row is None:
+            return None, None
+        record = self._records[row]
+        return _iso(record.completion_date), _iso(record.expiration_date)
+
+    def _expired_biannual(
+        self, p: RequirementPlan, rows: Iterable[int], latest_comp: Optional[str]
+    ) -> Optional[Result]:
+        """The biannual "newest certificate has lapsed" check."""
+        newest = None
+        for r in sorted(rows):
+            exp = self._records[r].expiration_date
+            if exp and (newest is None or exp > newest.expiration_date):
+                newest = self._records[r]
+        if newest is not None and newest.expiration_date < p.today:
+            comp = (
+                newest.completion_date.isoformat()
+                if newest.completion_date
+                else latest_comp
+            )
+            return "expired", comp, newest.expiration_date.isoformat()
+        return None
+
+    def _hours_status(self, p: RequirementPlan, member: _Member, waivers) -> Result:
+        group = self._typed_group(p, member)
+        if group is None:
+            rows: Sequence[int] = ()
+            total = 0
+        else:
+            i, j = group.span(p.lo, p.hi)
+            rows = group.rows[i:j]
+            if p.categories is not None:
+                rows = [
+                    r
+                    for r in rows
+                    if self._category[r] and self._category[r] in p.categories
+                ]
+                total = self._exact_hours(rows)
+            else:
+                total = group.hours[j] - group.hours[i]
+        required = self._required(p, p.req.required_hours, waivers)
+
+        if rows and p.categories is None:
+            near_threshold = required > 0 and (
+                abs(total - required) <= _EXACT_SUM_TOLERANCE
+            )
+            if near_threshold or abs(total) <= _EXACT_SUM_TOLERANCE:
+                total = self._exact_hours(rows)
+
+        latest_comp, latest_exp = self._latest(rows[-1] if rows else None)
+        if p.biannual and rows:
+            expired = self._expired_biannual(p, rows, latest_comp)
+            if expired:
+                return expired
+
+        if required > 0 and total >= required:
+            return "completed", latest_comp, latest_exp
+        elif total > 0:
+            return "in_progress", latest_comp, latest_exp
+        return "not_started", None, None
+
+    def _courses_status(self, p: RequirementPlan, member: _Member) -> Result:
+        course_ids = p.req.required_courses or []
+        if not course_ids:
+            return "not_started", None, None
+
+        group = member.completed
+        i, j = group.span(p.lo, p.hi)
+        rows = group.rows[i:j]
+        completed_course_ids = {str(self._course[r]) for r in rows if self._course[r]}
+        matched_count = sum(1 for cid in course_ids if cid in completed_course_ids)
+
+        latest_comp, latest_exp = self._latest(rows[-1] if rows else None)
+        if p.biannual and rows:
+            expired = self._expired_biannual(p, rows, latest_comp)
+            if expired:
+                return expired
+
+        if matched_count >= len(course_ids):
+            return "completed", latest_comp, latest_exp
+        elif matched_count > 0:
+            return "in_progress", latest_comp, latest_exp
+        return "not_started", None, None
+
+    def _certification_status(self, p: RequirementPlan, member: _Member) -> Result:
+        group = member.completed
+        i, j = group.span(p.recency_lo, _MAX_ORDINAL)
+        # Newest first: the first match is the one max() would return.
+        for k in range(j - 1, i - 1, -1):
+            record = self._records[group.rows[k]]
+            if certification_record_matches(p.req, record):
+                latest_comp = _iso(record.completion_date)
+                latest_exp = _iso(record.expiration_date)
+                if record.expiration_date and record.expiration_date < p.today:
+                    return "expired", latest_comp, latest_exp
+                return "completed", latest_comp, latest_exp
+        return "not_started", None, None
+
+    def _count_status(
+        self, p: RequirementPlan, member: _Member, waivers, base
+    ) -> Result:
+        group = self._typed_group(p, member)
+        count, latest_row = 0, None
+        if group is not None:
+            i, j = group.span(p.lo, p.hi)
+            count = j - i
+            latest_row = group.rows[j - 1] if count else None
+        required = self._required(p, base, waivers)
+        latest_comp = (
+            _iso(self._records[latest_row].completion_date)
+            if latest_row is not None
+            else None
+        )
+
+        if required > 0 and count >= required:
+            return "completed", latest_comp, None
+        elif count > 0:
+            return "in_progress", latest_comp, None
+        return "not_started", None, None
+
+    def _fallback_status(self, p: RequirementPlan, member: _Member) -> Result:
+        latest_row = None
+        if p.type_key is not None:
+            group = member.by_type.get(p.type_key)
+            if group is not None:
+                i, j = group.span(p.lo, p.hi)
+                if j > i:
+                    latest_row = group.rows[j - 1]
+        if latest_row is None and p.name:
+            group = member.completed
+            i, j = group.span(p.lo, p.hi)
+            for k in range(j - 1, i - 1, -1):
+                course_name = self._course_name[group.rows[k]]
+                if course_name and p.name in course_name:
+                    latest_row = group.rows[k]
+                    break
+
+        if latest_row is not None:
+            record = self._records[latest_row]
+            latest_comp = _iso(record.completion_date)
+            latest_exp = _iso(record.expiration_date)
+            if record.expiration_date and record.expiration_date < p.today:
+                return "expired", latest_comp, latest_exp
+            return "completed", latest_comp, latest_exp
+
+        in_progress = member.in_progress
+        matched = p.type_key is not None and any(
+            self._type[r] == p.type_key for r in in_progress
+        )
+        if not matched and p.name:
+            matched = any(
+                self._course_name[r] and p.name in self._course_name[r]
+                for r in in_progress
+            )
+        if matched:
+            return "in_progress", None, None
+        return "not_started", None, None
@@ -35,11 +35,7 @@ from app.models.training import (
     TrainingStatus,
 )
 from app.models.user import User, UserStatus
-from app.services.training_compliance import (
-    evaluate_member_requirement,
-    get_org_include_current_month,
-)
-from app.services.training_waiver_service import fetch_org_waivers
+from app.services.compliance_status_service import ComplianceStatusService
 
 # ISO/FSRS training hour requirements per category (annual, per member).
 #
@@ -781,9 +777,6 @@ class AnnualComplianceReportService:
         start_date = date(year, 1, 1)
         end_date = date(year, 12, 31)
         today = date.today()
-        org_include_current = await get_org_include_current_month(
-            self.db, organization_id
-        )
 
         # Get active members (exclude compliance-exempt)
         members_result = await self.db.execute(
@@ -841,8 +834,11 @@ class AnnualComplianceReportService:
         for r in year_records:
             year_records_by_user[r.user_id].append(r)
 
-        # Fetch waivers
-        waivers_by_user = await fetch_org_waivers(self.db, organization_id)
+        # Current member x requirement statuses (persisted; see
+        # compliance_status_service)
+        statuses = await ComplianceStatusService(self.db).get_statuses(
+            organization_id, member_ids, requirements, today=today
+        )
 
         # Evaluate member compliance
         fully_compliant = 0
@@ -854,23 +850,17 @@ class AnnualComplianceReportService:
         for member in members:
             user_records = records_by_user.get(member.id, [])
             user_year_records = year_records_by_user.get(member.id, [])
-            user_waivers = waivers_by_user.get(str(member.id), [])
+            member_statuses = statuses.get(str(member.id), {})
 
             hours = sum(r.hours_completed or 0 for r in user_year_records)
             total_hours += hours
 
-            met_count = 0
             req_total = len(requirements)
-            for req in requirements:
-                status, _, _ = evaluate_member_requirement(
-                    req,
-                    user_records,
-                    today,
-                    waivers=user_waivers,
-                    org_include_current_month=org_include_current,
-                )
-                if status == "completed":
-                    met_count += 1
+            met_count = sum(
+                1
+                for req in requirements
+                if member_statuses[str(req.id)].status == "completed"
+            )
 
             compliance_pct = (
                 round(met_count / req_total * 100, 1) if req_total > 0 else 100.0
@@ -937,19 +927,11 @@ class AnnualComplianceReportService:
         # Requirement analysis
         requirement_analysis: List[Dict[str, Any]] = []
         for req in requirements:
-            req_compliant = 0
-            for member in members:
-                user_records = records_by_user.get(member.id, [])
-                user_waivers = waivers_by_user.get(str(member.id), [])
-                status, _, _ = evaluate_member_requirement(
-                    req,
-                    user_records,
-                    today,
-                    waivers=user_waivers,
-                    org_include_current_month=org_include_current,
-                )
-                if status == "completed":
-                    req_compliant += 1
+            req_compliant = sum(
+                1
+                for member in members
+                if statuses[str(member.id)][str(req.id)].status == "completed"
+            )
 
             req_type = (
                 req.requirement_type.value
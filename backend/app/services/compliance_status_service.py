@@ -0,0 +1,375 @@
+"""
+Compliance Status Service
+
+Maintains ``member_requirement_statuses``, the persisted result of
+``evaluate_member_requirement`` for every member x requirement pair, so the
+compliance matrix, the dashboard admin summary and the annual compliance
+report read one indexed table instead of re-evaluating every active member
+against every requirement and every training record on each request.
+
+Freshness
+---------
+A row is current when its ``evaluated_for`` date is today — windows,
+proration and expiry all roll over at midnight — and its ``generation``
+matches the member's ``member_compliance_generations`` counter. Between
+nights the counters are kept honest by ``_invalidate_compliance_statuses``
+below, an ``after_flush`` hook that bumps — in the writer's own
+transaction — the members a flush could have affected:
+
+  - training record / waiver / leave of absence  → that member
+  - training requirement                         → the organization's members
+  - compliance config (include_current_month)    → the organization's members
+
+Readers capture the counters *before* loading records, waivers and leave
+and stamp them onto the rows they upsert. A reader that evaluates a member
+while a write is in flight therefore writes a row at the old generation,
+which the next read recomputes whichever transaction commits first; deleting
+the rows instead would let that reader write its stale result back after
+the writer's delete had committed.
+
+``get_statuses`` recomputes only the pairs it finds missing or stale, which
+after a single record change means one member. On a read session
+(``get_read_db``: a replica, or a primary session that is always rolled
+back) it still evaluates those pairs but does not write them back. The nightly
+``compliance_status_reconcile`` task refreshes every organization and prunes
+rows for members and requirements that are no longer active, which also
+repairs anything changed outside the ORM (raw SQL, bulk UPDATE statements).
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+from sqlalchemy import delete, event, func, inspect, literal, or_, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.compliance_config import ComplianceConfig
+from app.models.training import (
+    MemberComplianceGeneration,
+    MemberRequirementStatus,
+    TrainingRecord,
+    TrainingRequirement,
+    TrainingWaiver,
+)
+from app.models.user import MemberLeaveOfAbsence, User, UserStatus
+from app.services.compliance_batch import BatchComplianceEvaluator
+from app.services.training_compliance import get_org_include_current_month
+from app.services.training_waiver_service import (
+    fetch_org_waivers,
+    fetch_user_waivers,
+)
+
+# Bound IN-lists and executemany batches for large departments.
+_MEMBER_CHUNK = 500
+_UPSERT_CHUNK = 1000
+
+
+@dataclass(frozen=True)
+class RequirementStatus:
+    """One member's standing on one requirement, as the readers consume it."""
+
+    status: str
+    completion_date: Optional[str] = None  # ISO date
+    expiry_date: Optional[str] = None  # ISO date
+
+
+# user_id -> requirement_id -> status
+StatusMap = Dict[str, Dict[str, RequirementStatus]]
+# user_id -> member_compliance_generations.generation (absent = 0)
+Generations = Dict[str, int]
+
+
+def _iso(value: Optional[date]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+class ComplianceStatusService:
+    """Reads and maintains the persisted member x requirement statuses."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Read sessions never commit, and a replica must not be written to;
+        # statuses evaluated there are returned but not persisted.
+        self.persist = not (
+            db.info.get("read_replica") is True or db.info.get("read_only") is True
+        )
+
+    async def get_statuses(
+        self,
+        organization_id: str,
+        user_ids: Iterable[str],
+        requirements: Iterable[TrainingRequirement],
+        today: Optional[date] = None,
+    ) -> StatusMap:
+        """Current status of each member on each requirement.
+
+        Pairs with no row for *today* at the member's current generation
+        are evaluated now and written back (unless ``persist`` is off), so
+        repeated reads cost two indexed queries.
+        """
+        today = today or date.today()
+        org_id = str(organization_id)
+        reqs_by_id = {str(r.id): r for r in requirements}
+        statuses: StatusMap = {str(uid): {} for uid in user_ids}
+        if not statuses or not reqs_by_id:
+            return statuses
+
+        generations: Generations = {}
+        for chunk in _chunks(list(statuses), _MEMBER_CHUNK):
+            generations.update(await self._generations(chunk))
+            result = await self.db.execute(
+                select(
+                    MemberRequirementStatus.user_id,
+                    MemberRequirementStatus.requirement_id,
+                    MemberRequirementStatus.status,
+                    MemberRequirementStatus.completion_date,
+                    MemberRequirementStatus.expiration_date,
+                    MemberRequirementStatus.generation,
+                ).where(
+                    MemberRequirementStatus.organization_id == org_id,
+                    MemberRequirementStatus.user_id.in_(chunk),
+                    MemberRequirementStatus.requirement_id.in_(list(reqs_by_id)),
+                    MemberRequirementStatus.evaluated_for == today,
+                )
+            )
+            for row in result.all():
+                if row.generation != generations.get(row.user_id, 0):
+                    continue
+                statuses[row.user_id][row.requirement_id] = RequirementStatus(
+                    row.status, _iso(row.completion_date), _iso(row.expiration_date)
+                )
+
+        stale = {
+            uid: [req for rid, req in reqs_by_id.items() if rid not in have]
+            for uid, have in statuses.items()
+            if len(have) < len(reqs_by_id)
+        }
+        if stale:
+            fresh = await self._recompute(org_id, stale, today, generations)
+            for uid, by_req in fresh.items():
+                statuses[uid].update(by_req)
+        return statuses
+
+    async def reconcile_organization(
+        self, organization_id: str, today: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """Re-evaluate every active member on every active requirement.
+
+        Also prunes rows that were not refreshed — members who left and
+        requirements that were deactivated — so the table only ever holds
+        today's view of the organization.
+        """
+        today = today or date.today()
+        org_id = str(organization_id)
+        member_ids = (
+            (
+                await self.db.execute(
+                    select(User.id).where(
+                        User.organization_id == org_id,
+                        User.status == UserStatus.ACTIVE,
+                        User.deleted_at.is_(None),
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        requirements = (
+            (
+                await self.db.execute(
+                    select(TrainingRequirement).where(
+                        TrainingRequirement.organization_id == org_id,
+                        TrainingRequirement.active.is_(True),
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+        evaluated = 0
+        if requirements:
+            for chunk in _chunks([str(m) for m in member_ids], _MEMBER_CHUNK):
+                fresh = await self._recompute(
+                    org_id,
+                    {uid: list(requirements) for uid in chunk},
+                    today,
+                    await self._generations(chunk),
+                )
+                evaluated += sum(len(by_req) for by_req in fresh.values())
+
+        pruned = await self.db.execute(
+            delete(MemberRequirementStatus).where(
+                MemberRequirementStatus.organization_id == org_id,
+                MemberRequirementStatus.evaluated_for < today,
+            )
+        )
+        return {
+            "members": len(member_ids),
+            "statuses": evaluated,
+            "pruned": pruned.rowcount or 0,
+        }
+
+    async def _generations(self, user_ids: List[str]) -> Generations:
+        result = await self.db.execute(
+            select(
+                MemberComplianceGeneration.user_id,
+                MemberComplianceGeneration.generation,
+            ).where(MemberComplianceGeneration.user_id.in_(user_ids))
+        )
+        return {row.user_id: row.generation for row in result.all()}
+
+    async def _recompute(
+        self,
+        org_id: str,
+        pending: Dict[str, List[TrainingRequirement]],
+        today: date,
+        generations: Generations,
+    ) -> StatusMap:
+        """Evaluate the given (member -> requirements) pairs and, when
+        ``persist`` is on, upsert them.
+
+        *generations* must have been read before this loads any input; the
+        rows are stamped with it, so a write that lands meanwhile leaves
+        them stale rather than current.
+        """
+        user_ids = list(pending)
+        records_by_user: Dict[str, list] = {}
+        for chunk in _chunks(user_ids, _MEMBER_CHUNK):
+            result = await self.db.execute(
+                select(TrainingRecord).where(
+                    TrainingRecord.organization_id == org_id,
+                    TrainingRecord.user_id.in_(chunk),
+                )
+            )
+            for record in result.scalars().all():
+                records_by_user.setdefault(str(record.user_id), []).append(record)
+
+        if len(user_ids) == 1:
+            waivers_by_user = {
+                user_ids[0]: await fetch_user_waivers(self.db, org_id, user_ids[0])
+            }
+        else:
+            waivers_by_user = await fetch_org_waivers(self.db, org_id)
+        org_include_current = await get_org_include_current_month(self.db, org_id)
+
+        # Evaluate requirement by requirement across all pending members on
+        # the columnar batch evaluator (same results as the scalar one).
+        evaluator = BatchComplianceEvaluator(records_by_user)
+        members_by_req: Dict[str, List[str]] = {}
+        reqs_by_id: Dict[str, TrainingRequirement] = {}
+        for uid, reqs in pending.items():
+            for req in reqs:
+                reqs_by_id[str(req.id)] = req
+                members_by_req.setdefault(str(req.id), []).append(uid)
+
+        fresh: StatusMap = {uid: {} for uid in pending}
+        rows: List[Dict[str, Any]] = []
+        for req_id, members in members_by_req.items():
+            req = reqs_by_id[req_id]
+            plan = evaluator.plan(req, today, org_include_current)
+            results = evaluator.evaluate_plan(plan, members, waivers_by_user)
+            for uid, (status, completed, expires) in results.items():
+                fresh[uid][req_id] = RequirementStatus(status, completed, expires)
+                rows.append(
+                    {
+                        "organization_id": org_id,
+                        "user_id": uid,
+                        "requirement_id": req_id,
+                        "status": status,
+                        "completion_date": (
+                            date.fromisoformat(completed) if completed else None
+                        ),
+                        "expiration_date": (
+                            date.fromisoformat(expires) if expires else None
+                        ),
+                        "window_start": plan.start,
+                        "window_end": plan.end,
+                        "evaluated_for": today,
+                        "generation": generations.get(uid, 0),
+                    }
+                )
+
+        if rows and self.persist:
+            table = MemberRequirementStatus.__table__
+            stmt = mysql_insert(table)
+            stmt = stmt.on_duplicate_key_update(
+                organization_id=stmt.inserted.organization_id,
+                status=stmt.inserted.status,
+                completion_date=stmt.inserted.completion_date,
+                expiration_date=stmt.inserted.expiration_date,
+                window_start=stmt.inserted.window_start,
+                window_end=stmt.inserted.window_end,
+                evaluated_for=stmt.inserted.evaluated_for,
+                generation=stmt.inserted.generation,
+                generated_at=func.now(),
+            )
+            for i in range(0, len(rows), _UPSERT_CHUNK):
+                await self.db.execute(stmt, rows[i : i + _UPSERT_CHUNK])
+            logger.debug(
+                "Recomputed {} compliance statuses for {} member(s) in org {}",
+                len(rows),
+                len(pending),
+                org_id,
+            )
+        return fresh
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+_MEMBER_SCOPED = (TrainingRecord, TrainingWaiver, MemberLeaveOfAbsence)
+
+
+def _attribute_values(obj, key: str) -> set:
+    """Current and pre-flush values of *key* (a re-assigned record moves
+    between members, and both lose their cached status)."""
+    history = inspect(obj).attrs[key].history
+    return {v for v in chain(history.sum(), [getattr(obj, key, None)]) if v}
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_compliance_statuses(session, _flush_context):
+    """Bump the generation of every member whose statuses this flush could
+    have changed, inside the same transaction.
+
+    A requirement or compliance config edit is rare and can touch anyone in
+    the organization, so it bumps every member there. Going through
+    ``users`` skips members deleted in the same flush.
+    """
+    user_ids: set = set()
+    org_ids: set = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, _MEMBER_SCOPED):
+            user_ids |= _attribute_values(obj, "user_id")
+        elif isinstance(obj, TrainingRequirement):
+            if obj not in session.new:
+                org_ids |= _attribute_values(obj, "organization_id")
+        elif isinstance(obj, ComplianceConfig):
+            org_ids |= _attribute_values(obj, "organization_id")
+
+    users = User.__table__
+    criteria = []
+    if user_ids:
+        criteria.append(users.c.id.in_(sorted(user_ids)))
+    if org_ids:
+        criteria.append(users.c.organization_id.in_(sorted(org_ids)))
+    if criteria:
+        table = MemberComplianceGeneration.__table__
+        stmt = mysql_insert(table).from_select(
+            ["user_id", "generation"],
+            select(users.c.id, literal(1)).where(or_(*criteria)),
+        )
+        session.connection().execute(
+            stmt.on_duplicate_key_update(generation=table.c.generation + 1)
+        )
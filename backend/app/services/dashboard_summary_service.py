@@ -0,0 +1,508 @@
+"""
+Dashboard Summary Service
+
+Builds the organization-level aggregates behind ``/dashboard/admin-summary``,
+``/dashboard/stats`` and ``/dashboard/widgets``.
+
+Each response is split into independent sections (member counts, training
+compliance, activity, action items; finance, fundraising, community). A
+section is one combined aggregate query — scalar subqueries in a single
+``SELECT`` instead of a round trip per count — and sections run concurrently,
+each on its own pooled session, so a page costs roughly its slowest section
+rather than the sum of a dozen sequential queries. A failing section is
+logged and reported with zeros, as before, and never fails the others.
+
+Caching
+-------
+Results are cached in Redis per organization under a generation number::
+
+    dashboard:{org_id}:gen                      → n
+    dashboard:{org_id}:{n}:admin-summary        → payload
+    dashboard:{org_id}:{n}:widgets:finance:month → payload
+
+``_collect_dashboard_changes`` (``after_flush``) notes which organizations a
+flush touched; once that transaction commits, ``_bump_dashboard_generations``
+(``after_commit``) increments their generation, which orphans every cached
+payload at once. A reader that computed from pre-commit data can only store
+under the old generation, so an invalidation is never lost to a race. Rolling
+windows ("next 30 days") and changes made outside the ORM are bounded by
+``DASHBOARD_CACHE_TTL_SECONDS``. Without Redis every request computes.
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+from sqlalchemy import case, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.models.admin_hours import AdminHoursEntry, AdminHoursEntryStatus
+from app.models.compliance_config import ComplianceConfig
+from app.models.event import Event, EventExternalAttendee, EventRSVP
+from app.models.event_request import EventRequest
+from app.models.finance import (
+    Budget,
+    DuesPayment,
+    ExpenseReport,
+    FiscalYear,
+    MemberDues,
+)
+from app.models.grant import (
+    Donation,
+    FundraisingCampaign,
+    GrantApplication,
+    GrantOpportunity,
+)
+from app.models.meeting import ActionItemStatus, MeetingActionItem
+from app.models.minute import ActionItem, MeetingMinutes, MinutesActionItemStatus
+from app.models.training import (
+    TrainingRecord,
+    TrainingRequirement,
+    TrainingStatus,
+    TrainingWaiver,
+)
+from app.models.user import MemberLeaveOfAbsence, User, UserStatus
+from app.services.dashboard_widget_service import DashboardWidgetService
+from app.services.training_compliance import compute_org_compliance_pct
+
+_KEY_PREFIX = "dashboard"
+
+WIDGET_SECTIONS = ("finance", "fundraising", "community")
+
+# Section value reported when its query failed; the result is not cached.
+_FAILED = object()
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+def _generation_key(organization_id: str) -> str:
+    return f"{_KEY_PREFIX}:{organization_id}:gen"
+
+
+class DashboardSummaryService:
+    """Concurrent, cached dashboard aggregates for one organization."""
+
+    def __init__(self, session_factory: SessionFactory = async_session_factory):
+        self.session_factory = session_factory
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def admin_summary(self, organization_id: str) -> Dict[str, Any]:
+        """Department-wide summary for Chiefs and admins."""
+        return await self._cached(
+            organization_id,
+            "admin-summary",
+            lambda: self._build_admin_summary(organization_id),
+        )
+
+    async def stats(self, organization_id: str) -> Dict[str, Any]:
+        """Member and recent event counts for the main dashboard."""
+        return await self._cached(
+            organization_id, "stats", lambda: self._build_stats(organization_id)
+        )
+
+    async def widgets(
+        self, organization_id: str, period: str, sections: Iterable[str]
+    ) -> Dict[str, Optional[dict]]:
+        """Widget aggregates for the requested *sections*, run concurrently.
+
+        Callers pass only the sections the user may see; the others come back
+        as ``None``.
+        """
+        requested = [s for s in WIDGET_SECTIONS if s in set(sections)]
+        values = await asyncio.gather(
+            *(
+                self._cached(
+                    organization_id,
+                    f"widgets:{section}:{period}",
+                    lambda section=section: self._build_widget(
+                        organization_id, section, period
+                    ),
+                )
+                for section in requested
+            )
+        )
+        result: Dict[str, Optional[dict]] = dict.fromkeys(WIDGET_SECTIONS)
+        result.update(zip(requested, values))
+        return result
+
+    # ------------------------------------------------------------------
+    # Builders
+    # ------------------------------------------------------------------
+
+    async def _build_admin_summary(
+        self, organization_id: str
+    ) -> Tuple[Dict[str, Any], bool]:
+        now = datetime.now(timezone.utc)
+        members, training_pct, activity, action_items = await asyncio.gather(
+            self._section(
+                "member counts", member_counts, organization_id, required=True
+            ),
+            self._section(
+                "training compliance", compute_org_compliance_pct, organization_id
+            ),
+            self._section("activity", activity_counts, organization_id, now),
+            self._section(
+                "action items", action_item_counts, organization_id, now.date()
+            ),
+        )
+        complete = all(
+            value is not _FAILED for value in (training_pct, activity, action_items)
+        )
+        if training_pct is _FAILED:
+            training_pct = 0.0
+        if activity is _FAILED:
+            activity = (0, 0.0, 0.0, 0)
+        if action_items is _FAILED:
+            action_items = (0, 0)
+
+        total, active = members
+        upcoming_events, training_hours, admin_minutes, pending_admin = activity
+        overdue, open_items = action_items
+        summary = {
+            "active_members": active,
+            "inactive_members": total - active,
+            "total_members": total,
+            "training_completion_pct": round(training_pct, 1),
+            "upcoming_events_count": upcoming_events,
+            "overdue_action_items": overdue,
+            "open_action_items": open_items,
+            "recent_training_hours": training_hours,
+            "recent_admin_hours": round(admin_minutes / 60.0, 1),
+            "pending_admin_hours_approvals": pending_admin,
+        }
+        return summary, complete
+
+    async def _build_stats(self, organization_id: str) -> Tuple[Dict[str, Any], bool]:
+        total, active, recent_events = await self._section(
+            "stats", stats_counts, organization_id, required=True
+        )
+        stats = {
+            "total_members": total,
+            "active_members": active,
+            "total_documents": 0,
+            "setup_percentage": 100,
+            "recent_events_count": recent_events,
+            "pending_tasks_count": 0,
+        }
+        return stats, True
+
+    async def _build_widget(
+        self, organization_id: str, section: str, period: str
+    ) -> Tuple[Optional[dict], bool]:
+        async def run(db: AsyncSession) -> dict:
+            widget = getattr(DashboardWidgetService(db), section)
+            return jsonable_encoder(await widget(organization_id, period))
+
+        value = await self._section(section, run, required=True)
+        return value, True
+
+    # ------------------------------------------------------------------
+    # Plumbing
+    # ------------------------------------------------------------------
+
+    async def _section(
+        self,
+        label: str,
+        query: Callable[..., Awaitable[Any]],
+        *args: Any,
+        required: bool = False,
+    ) -> Any:
+        """Run *query(db, *args)* on a session of its own.
+
+        The session is committed: the compliance section upserts the
+        statuses it had to recompute. A failure in an optional section is
+        logged and returned as ``_FAILED``.
+        """
+        try:
+            async with self.session_factory() as db:
+                value = await query(db, *args)
+                await db.commit()
+                return value
+        except Exception as exc:
+            if required:
+                raise
+            logger.warning("dashboard: {} query failed: {}", label, exc)
+            return _FAILED
+
+    async def _cached(
+        self,
+        organization_id: str,
+        name: str,
+        build: Callable[[], Awaitable[Tuple[Any, bool]]],
+    ) -> Any:
+        generation = await cache_manager.get(_generation_key(organization_id)) or 0
+        key = f"{_KEY_PREFIX}:{organization_id}:{generation}:{name}"
+        cached = await cache_manager.get(key)
+        if cached is not None:
+            return cached
+        value, complete = await build()
+        if complete:
+            await cache_manager.set(
+                key, value, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS
+            )
+        return value
+
+
+# ---------------------------------------------------------------------------
+# Section queries — one round trip each
+# ---------------------------------------------------------------------------
+
+
+def _member_totals(organization_id: str):
+    """One-row derived table of ``total`` and ``active`` non-deleted members."""
+    return (
+        select(
+            func.count(User.id).label("total"),
+            func.coalesce(
+                func.sum(case((User.status == UserStatus.ACTIVE, 1), else_=0)), 0
+            ).label("active"),
+        )
+        .where(
+            User.organization_id == organization_id,
+            User.deleted_at.is_(None),
+        )
+        .subquery("members")
+    )
+
+
+async def member_counts(db: AsyncSession, organization_id: str) -> Tuple[int, int]:
+    """``(total, active)`` non-deleted members."""
+    members = _member_totals(organization_id)
+    row = (await db.execute(select(members.c.total, members.c.active))).one()
+    return int(row[0] or 0), int(row[1] or 0)
+
+
+async def stats_counts(db: AsyncSession, organization_id: str) -> Tuple[int, int, int]:
+    """``(total, active, events created in the last 30 days)``."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+    recent_events = select(func.count(Event.id)).where(
+        Event.organization_id == organization_id,
+        Event.created_at >= cutoff,
+        Event.is_cancelled == False,  # noqa: E712
+    )
+    members = _member_totals(organization_id)
+    row = (
+        await db.execute(
+            select(members.c.total, members.c.active, recent_events.scalar_subquery())
+        )
+    ).one()
+    return int(row[0] or 0), int(row[1] or 0), int(row[2] or 0)
+
+
+async def activity_counts(
+    db: AsyncSession, organization_id: str, now: datetime
+) -> Tuple[int, float, float, int]:
+    """``(upcoming events, training hours, admin minutes, pending approvals)``.
+
+    Events look 30 days ahead; training and admin hours 30 days back.
+    """
+    since = now - timedelta(days=30)
+    upcoming = select(func.count(Event.id)).where(
+        Event.organization_id == organization_id,
+        Event.start_datetime >= now,
+        Event.start_datetime < now + timedelta(days=30),
+        Event.is_cancelled == False,  # noqa: E712
+    )
+    training_hours = select(
+        func.coalesce(func.sum(TrainingRecord.hours_completed), 0)
+    ).where(
+        TrainingRecord.organization_id == organization_id,
+        TrainingRecord.status == TrainingStatus.COMPLETED,
+        TrainingRecord.completion_date >= since.date(),
+    )
+    admin_minutes = select(
+        func.coalesce(func.sum(AdminHoursEntry.duration_minutes), 0)
+    ).where(
+        AdminHoursEntry.organization_id == organization_id,
+        AdminHoursEntry.status == AdminHoursEntryStatus.APPROVED,
+        AdminHoursEntry.clock_in_at >= since,
+        AdminHoursEntry.duration_minutes.isnot(None),
+    )
+    pending = select(func.count(AdminHoursEntry.id)).where(
+        AdminHoursEntry.organization_id == organization_id,
+        AdminHoursEntry.status == AdminHoursEntryStatus.PENDING,
+    )
+    row = (
+        await db.execute(
+            select(
+                upcoming.scalar_subquery(),
+                training_hours.scalar_subquery(),
+                admin_minutes.scalar_subquery(),
+                pending.scalar_subquery(),
+            )
+        )
+    ).one()
+    return int(row[0] or 0), float(row[1] or 0), float(row[2] or 0), int(row[3] or 0)
+
+
+async def action_item_counts(
+    db: AsyncSession, organization_id: str, today: date
+) -> Tuple[int, int]:
+    """``(overdue, open)`` action items from meetings and from minutes."""
+    meeting_open = MeetingActionItem.status.in_(
+        [ActionItemStatus.OPEN.value, ActionItemStatus.IN_PROGRESS.value]
+    )
+    meeting = (
+        select(
+            func.coalesce(
+                func.sum(case((MeetingActionItem.due_date < today, 1), else_=0)), 0
+            ),
+            func.count(MeetingActionItem.id),
+        )
+        .where(MeetingActionItem.organization_id == organization_id, meeting_open)
+        .subquery()
+    )
+    minutes_open = ActionItem.status.in_(
+        [
+            MinutesActionItemStatus.PENDING.value,
+            MinutesActionItemStatus.IN_PROGRESS.value,
+        ]
+    )
+    now = datetime.now(timezone.utc)
+    minutes = (
+        select(
+            func.coalesce(func.sum(case((ActionItem.due_date < now, 1), else_=0)), 0),
+            func.count(ActionItem.id),
+        )
+        .join(MeetingMinutes, ActionItem.minutes_id == MeetingMinutes.id)
+        .where(MeetingMinutes.organization_id == organization_id, minutes_open)
+        .subquery()
+    )
+    row = (await db.execute(select(meeting, minutes))).one()
+    overdue = int(row[0] or 0) + int(row[2] or 0)
+    open_items = int(row[1] or 0) + int(row[3] or 0)
+    return overdue, open_items
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+# Rows whose insert, update or delete can change a cached aggregate of their
+# ``organization_id``.
+_ORG_SCOPED = (
+    Event,
+    EventRSVP,
+    EventExternalAttendee,
+    EventRequest,
+    MeetingActionItem,
+    TrainingRecord,
+    TrainingRequirement,
+    TrainingWaiver,
+    MemberLeaveOfAbsence,
+    ComplianceConfig,
+    AdminHoursEntry,
+    DuesPayment,
+    ExpenseReport,
+    MemberDues,
+    Budget,
+    FiscalYear,
+    GrantOpportunity,
+    GrantApplication,
+    FundraisingCampaign,
+    Donation,
+)
+
+# A member only moves the counts through these columns — logins and profile
+# edits leave the cache alone.
+_USER_COLUMNS = (
+    "organization_id",
+    "status",
+    "deleted_at",
+    "compliance_exempt",
+    "membership_type",
+)
+
+_STALE_KEY = "dashboard_stale_orgs"
+
+# Strong references to in-flight generation bumps (the loop keeps only weak
+# ones).
+_pending_bumps: set = set()
+
+
+def _organization_values(obj) -> set:
+    history = inspect(obj).attrs["organization_id"].history
+    return {
+        v for v in chain(history.sum(), [getattr(obj, "organization_id", None)]) if v
+    }
+
+
+def _user_changed(session, user: User) -> bool:
+    if user in session.new or user in session.deleted:
+        return True
+    attrs = inspect(user).attrs
+    return any(attrs[column].history.has_changes() for column in _USER_COLUMNS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dashboard_changes(session, _flush_context):
+    """Remember which organizations' dashboards this flush made stale."""
+    org_ids: set = set()
+    minutes_ids: set = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, _ORG_SCOPED):
+            org_ids |= _organization_values(obj)
+        elif isinstance(obj, User):
+            if _user_changed(session, obj):
+                org_ids |= _organization_values(obj)
+        elif isinstance(obj, ActionItem) and obj.minutes_id:
+            minutes_ids.add(obj.minutes_id)
+
+    if minutes_ids:
+        org_ids.update(
+            session.connection()
+            .execute(
+                select(MeetingMinutes.organization_id).where(
+                    MeetingMinutes.id.in_(sorted(minutes_ids))
+                )
+            )
+            .scalars()
+        )
+    if org_ids:
+        session.info.setdefault(_STALE_KEY, set()).update(str(o) for o in org_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_dashboard_changes(session, previous_transaction):
+    # A rolled-back savepoint leaves the outer transaction's marks in place.
+    if previous_transaction.parent is None:
+        session.info.pop(_STALE_KEY, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_dashboard_generations(session):
+    """Invalidate the collected organizations once their data is visible."""
+    org_ids = session.info.pop(_STALE_KEY, None)
+    if not org_ids:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:  # synchronous session (scripts, migrations)
+        return
+    task = loop.create_task(invalidate_dashboard_cache(org_ids))
+    _pending_bumps.add(task)
+    task.add_done_callback(_pending_bumps.discard)
+
+
+async def invalidate_dashboard_cache(organization_ids: Iterable[str]) -> None:
+    """Orphan every cached dashboard payload of *organization_ids*."""
+    client = cache_manager.redis_client
+    if not cache_manager.is_connected or client is None:
+        return
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for organization_id in sorted(organization_ids):
+                pipe.incr(_generation_key(organization_id))
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning("dashboard cache invalidation failed: {}", exc)
@@ -64,96 +64,138 @@ class DashboardWidgetService:
     async def finance(self, organization_id: str, period: str) -> dict:
         start, end = period_bounds(period)
         now = datetime.now(timezone.utc)
-        paid = await self.db.scalar(
-            select(func.coalesce(func.sum(DuesPayment.amount), 0)).where(
-                DuesPayment.organization_id == organization_id,
-                DuesPayment.received_at >= start,
-                DuesPayment.received_at < end,
-            )
+        paid = select(func.coalesce(func.sum(DuesPayment.amount), 0)).where(
+            DuesPayment.organization_id == organization_id,
+            DuesPayment.received_at >= start,
+            DuesPayment.received_at < end,
         )
-        expenses = await self.db.scalar(
-            select(func.coalesce(func.sum(ExpenseReport.total_amount), 0)).where(
-                ExpenseReport.organization_id == organization_id,
-                ExpenseReport.status == ExpenseReportStatus.PAID.value,
-                ExpenseReport.paid_at >= start,
-                ExpenseReport.paid_at < end,
-            )
+        expenses = select(func.coalesce(func.sum(ExpenseReport.total_amount), 0)).where(
+            ExpenseReport.organization_id == organization_id,
+            ExpenseReport.status == ExpenseReportStatus.PAID.value,
+            ExpenseReport.paid_at >= start,
+            ExpenseReport.paid_at < end,
         )
         dues = (
-            await self.db.execute(
-                select(
-                    func.coalesce(func.sum(MemberDues.amount_due), 0),
-                    func.coalesce(func.sum(MemberDues.amount_paid), 0),
-                ).where(
-                    MemberDues.organization_id == organization_id,
-                    MemberDues.due_date >= start,
-                    MemberDues.due_date < end,
-                )
-            )
-        ).one()
-        overdue = await self.db.scalar(
             select(
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (
-                                MemberDues.status.in_(
-                                    [
-                                        DuesStatus.PENDING.value,
-                                        DuesStatus.PARTIAL.value,
-                                        DuesStatus.OVERDUE.value,
-                                    ]
-                                ),
-                                1,
-                            ),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                )
-            ).where(
+                func.coalesce(func.sum(MemberDues.amount_due), 0).label("due"),
+                func.coalesce(func.sum(MemberDues.amount_paid), 0).label("paid"),
+            )
+            .where(
                 MemberDues.organization_id == organization_id,
-                MemberDues.due_date < min(now, end),
+                MemberDues.due_date >= start,
+                MemberDues.due_date < end,
+            )
+            .subquery("dues")
+        )
+        overdue = select(
+            func.coalesce(
+                func.sum(
+                    case(
+                        (
+                            MemberDues.status.in_(
+                                [
+                                    DuesStatus.PENDING.value,
+                                    DuesStatus.PARTIAL.value,
+                                    DuesStatus.OVERDUE.value,
+                                ]
+                            ),
+                            1,
+                        ),
+                        else_=0,
+                    )
+                ),
+                0,
             )
+        ).where(
+            MemberDues.organization_id == organization_id,
+            MemberDues.due_date < min(now, end),
         )
         budget = (
+            select(
+                func.coalesce(func.sum(Budget.amount_budgeted), 0).label("budgeted"),
+                func.coalesce(func.sum(Budget.amount_spent), 0).label("spent"),
+                func.coalesce(func.sum(Budget.amount_encumbered), 0).label(
+                    "encumbered"
+                ),
+            )
+            .join(FiscalYear, FiscalYear.id == Budget.fiscal_year_id)
+            .where(
+                Budget.organization_id == organization_id,
+                FiscalYear.organization_id == organization_id,
+                FiscalYear.status == FiscalYearStatus.ACTIVE.value,
+            )
+            .subquery("budget")
+        )
+        # One round trip: each aggregate is a one-row derived table or a
+        # scalar subquery.
+        row = (
             await self.db.execute(
                 select(
-                    func.coalesce(func.sum(Budget.amount_budgeted), 0),
-                    func.coalesce(func.sum(Budget.amount_spent), 0),
-                    func.coalesce(func.sum(Budget.amount_encumbered), 0),
-                )
-                .join(FiscalYear, FiscalYear.id == Budget.fiscal_year_id)
-                .where(
-                    Budget.organization_id == organization_id,
-                    FiscalYear.organization_id == organization_id,
-                    FiscalYear.status == FiscalYearStatus.ACTIVE.value,
+                    paid.scalar_subquery(),
+                    expenses.scalar_subquery(),
+                    overdue.scalar_subquery(),
+                    dues.c.due,
+                    dues.c.paid,
+                    budget.c.budgeted,
+                    budget.c.spent,
+                    budget.c.encumbered,
                 )
             )
         ).one()
+        cash_in, cash_out = row[0], row[1]
         return {
-            "dues_due": dues[0],
-            "dues_paid": dues[1],
-            "overdue_dues": overdue or 0,
-            "cash_in": paid,
-            "cash_out": expenses,
-            "net_cash_flow": Decimal(paid) - Decimal(expenses),
-            "budgeted": budget[0],
-            "spent": budget[1],
-            "encumbered": budget[2],
+            "dues_due": row[3],
+            "dues_paid": row[4],
+            "overdue_dues": row[2] or 0,
+            "cash_in": cash_in,
+            "cash_out": cash_out,
+            "net_cash_flow": Decimal(cash_in) - Decimal(cash_out),
+            "budgeted": row[5],
+            "spent": row[6],
+            "encumbered": row[7],
         }
 
     async def fundraising(self, organization_id: str, period: str) -> dict:
         start, end = period_bounds(period)
         today = datetime.now(timezone.utc).date()
-        deadlines = await self.db.scalar(
-            select(func.count(GrantOpportunity.id)).where(
-                GrantOpportunity.organization_id == organization_id,
-                GrantOpportunity.is_active.is_(True),
-                GrantOpportunity.deadline_date >= max(today, start.date()),
-                GrantOpportunity.deadline_date < end.date(),
+        deadlines = select(func.count(GrantOpportunity.id)).where(
+            GrantOpportunity.organization_id == organization_id,
+            GrantOpportunity.is_active.is_(True),
+            GrantOpportunity.deadline_date >= max(today, start.date()),
+            GrantOpportunity.deadline_date < end.date(),
+        )
+        campaign_goal = select(
+            func.coalesce(func.sum(FundraisingCampaign.goal_amount), 0)
+        ).where(
+            FundraisingCampaign.organization_id == organization_id,
+            FundraisingCampaign.status == CampaignStatus.ACTIVE.value,
+            FundraisingCampaign.active.is_(True),
+            FundraisingCampaign.start_date < end.date(),
+            (
+                FundraisingCampaign.end_date.is_(None)
+                | (FundraisingCampaign.end_date >= start.date())
+            ),
+        )
+        campaign_raised = (
+            select(func.coalesce(func.sum(Donation.amount), 0))
+            .join(FundraisingCampaign, FundraisingCampaign.id == Donation.campaign_id)
+            .where(
+                Donation.organization_id == organization_id,
+                FundraisingCampaign.organization_id == organization_id,
+                Donation.payment_status == PaymentStatus.COMPLETED.value,
+                Donation.donation_date >= start,
+                Donation.donation_date < end,
             )
         )
+        totals = (
+            await self.db.execute(
+                select(
+                    deadlines.scalar_subquery(),
+                    campaign_goal.scalar_subquery(),
+                    campaign_raised.scalar_subquery(),
+                )
+            )
+        ).one()
         stages = dict(
             (
                 await self.db.execute(
@@ -170,36 +212,13 @@ class DashboardWidgetService:
                 )
             ).all()
         )
-        campaign_goal = await self.db.scalar(
-            select(func.coalesce(func.sum(FundraisingCampaign.goal_amount), 0)).where(
-                FundraisingCampaign.organization_id == organization_id,
-                FundraisingCampaign.status == CampaignStatus.ACTIVE.value,
-                FundraisingCampaign.active.is_(True),
-                FundraisingCampaign.start_date < end.date(),
-                (
-                    FundraisingCampaign.end_date.is_(None)
-                    | (FundraisingCampaign.end_date >= start.date())
-                ),
-            )
-        )
-        campaign_raised = await self.db.scalar(
-            select(func.coalesce(func.sum(Donation.amount), 0))
-            .join(FundraisingCampaign, FundraisingCampaign.id == Donation.campaign_id)
-            .where(
-                Donation.organization_id == organization_id,
-                FundraisingCampaign.organization_id == organization_id,
-                Donation.payment_status == PaymentStatus.COMPLETED.value,
-                Donation.donation_date >= start,
-                Donation.donation_date < end,
-            )
-        )
         return {
-            "grant_deadlines_30_days": deadlines or 0,
+            "grant_deadlines_30_days": totals[0] or 0,
             "application_stages": {
                 str(getattr(k, "value", k)): v for k, v in stages.items()
             },
-            "campaign_raised": campaign_raised or 0,
-            "campaign_goal": campaign_goal or 0,
+            "campaign_raised": totals[2] or 0,
+            "campaign_goal": totals[1] or 0,
         }
 
     async def community(self, organization_id: str, period: str) -> dict:
@@ -211,38 +230,40 @@ class DashboardWidgetService:
             Event.start_datetime < end,
             Event.is_cancelled.is_(False),
         )
-        events = await self.db.scalar(
-            select(func.count()).select_from(public_ids.subquery())
+        events = select(func.count()).select_from(public_ids.subquery())
+        members = select(func.count(EventRSVP.id)).where(
+            EventRSVP.organization_id == organization_id,
+            EventRSVP.checked_in.is_(True),
+            EventRSVP.event_id.in_(public_ids),
         )
-        members = await self.db.scalar(
-            select(func.count(EventRSVP.id)).where(
-                EventRSVP.organization_id == organization_id,
-                EventRSVP.checked_in.is_(True),
-                EventRSVP.event_id.in_(public_ids),
-            )
+        external = select(func.count(EventExternalAttendee.id)).where(
+            EventExternalAttendee.organization_id == organization_id,
+            EventExternalAttendee.checked_in.is_(True),
+            EventExternalAttendee.event_id.in_(public_ids),
         )
-        external = await self.db.scalar(
-            select(func.count(EventExternalAttendee.id)).where(
-                EventExternalAttendee.organization_id == organization_id,
-                EventExternalAttendee.checked_in.is_(True),
-                EventExternalAttendee.event_id.in_(public_ids),
-            )
+        pending = select(func.count(EventRequest.id)).where(
+            EventRequest.organization_id == organization_id,
+            EventRequest.status.in_(
+                [
+                    EventRequestStatus.SUBMITTED.value,
+                    EventRequestStatus.IN_PROGRESS.value,
+                    EventRequestStatus.POSTPONED.value,
+                ]
+            ),
         )
-        pending = await self.db.scalar(
-            select(func.count(EventRequest.id)).where(
-                EventRequest.organization_id == organization_id,
-                EventRequest.status.in_(
-                    [
-                        EventRequestStatus.SUBMITTED.value,
-                        EventRequestStatus.IN_PROGRESS.value,
-                        EventRequestStatus.POSTPONED.value,
-                    ]
-                ),
+        row = (
+            await self.db.execute(
+                select(
+                    events.scalar_subquery(),
+                    members.scalar_subquery(),
+                    external.scalar_subquery(),
+                    pending.scalar_subquery(),
+                )
             )
-        )
+        ).one()
         return {
-            "public_events": events or 0,
-            "member_attendees": members or 0,
-            "external_attendees": external or 0,
-            "pending_public_requests": pending or 0,
+            "public_events": row[0] or 0,
+            "member_attendees": row[1] or 0,
+            "external_attendees": row[2] or 0,
+            "pending_public_requests": row[3] or 0,
         }
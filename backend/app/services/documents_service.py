@@ -20,6 +20,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.constants import FOLDER_EVENTS, FOLDER_FACILITIES
+from app.core.storage import get_storage
 from app.models.document import (
     Document,
     DocumentFolder,
@@ -51,6 +52,22 @@ def _is_leadership(user_permissions: Set[str]) -> bool:
     return bool(user_permissions & LEADERSHIP_PERMISSIONS)
 
 
+async def _remove_document_file(
+    storage_key: Optional[str], file_path: Optional[str], label: str
+) -> None:
+    """Best-effort removal of a document's stored object, or of the local
+    file of a document uploaded before object storage."""
+    try:
+        if storage_key:
+            await get_storage().delete(storage_key)
+        elif file_path:
+            await asyncio.to_thread(os.remove, file_path)
+    except Exception:
+        logger.warning(
+            f"Could not remove backing file for {label}: {storage_key or file_path}"
+        )
+
+
 class DocumentsService:
     """Service for document management used by the documents endpoint"""
 
@@ -301,26 +318,22 @@ class DocumentsService:
             frontier = new_ids
 
         file_rows = await self.db.execute(
-            select(Document.file_path).where(
+            select(Document.storage_key, Document.file_path).where(
                 Document.organization_id == str(organization_id),
                 Document.folder_id.in_(subtree_ids),
             )
         )
-        file_paths = [row[0] for row in file_rows.all() if row[0]]
+        files = file_rows.all()
 
         await self.db.delete(folder)
         await self.db.commit()
 
         # Best-effort file cleanup — a missing file is not an error, and the DB
         # rows are already gone.
-        for file_path in file_paths:
-            try:
-                await asyncio.to_thread(os.remove, file_path)
-            except OSError:
-                logger.warning(
-                    "Could not remove backing file for a document in deleted "
-                    f"folder {folder_id}: {file_path}"
-                )
+        for storage_key, file_path in files:
+            await _remove_document_file(
+                storage_key, file_path, f"a document in deleted folder {folder_id}"
+            )
         return True
 
     # ============================================
@@ -490,21 +503,16 @@ class DocumentsService:
         if not document:
             return False
 
-        file_path = document.file_path
+        storage_key, file_path = document.storage_key, document.file_path
         await self.db.delete(document)
         await self.db.commit()
 
         # Remove the backing file so a delete doesn't leave the (potentially
-        # sensitive) upload orphaned on disk. Best-effort — a missing file is
-        # not an error, and the DB row is already gone.
-        if file_path:
-            try:
-                await asyncio.to_thread(os.remove, file_path)
-            except OSError:
-                logger.warning(
-                    f"Could not remove backing file for deleted document "
-                    f"{document_id}: {file_path}"
-                )
+        # sensitive) upload orphaned. Best-effort — a missing file is not an
+        # error, and the DB row is already gone.
+        await _remove_document_file(
+            storage_key, file_path, f"deleted document {document_id}"
+        )
         return True
 
     # ============================================
@@ -49,6 +49,7 @@ from app.schemas.election import (
 )
 from app.services.email_service import EmailService
 from app.services.email_theme import TABLE_STYLE, TD_STYLE, TH_STYLE
+from app.services.org_settings_cache import org_settings_cache
 
 # " - Runoff Round 2" and friends, only at the very end of a title.
 _RUNOFF_SUFFIX = re.compile(r"\s*-\s*Runoff Round\s+\d+\s*$", re.IGNORECASE)
@@ -106,13 +107,8 @@ class ElectionService:
 
     async def get_feature_flags(self, organization_id: UUID) -> Dict[str, bool]:
         """Resolve the org's election feature toggles (missing keys = ON)."""
-        result = await self.db.execute(
-            select(Organization).where(Organization.id == str(organization_id))
-        )
-        org = result.scalar_one_or_none()
-        features = ((org.settings or {}) if org else {}).get("election_features", {})
-        if not isinstance(features, dict):
-            features = {}
+        org = await org_settings_cache.get(self.db, organization_id)
+        features = org.section("election_features") if org else {}
         return {
             key: (
                 value
@@ -124,13 +120,8 @@ class ElectionService:
 
     async def get_required_attestations(self, organization_id: UUID) -> int:
         """How many officers must attest a paper-ballot batch (0 = off)."""
-        result = await self.db.execute(
-            select(Organization).where(Organization.id == str(organization_id))
-        )
-        org = result.scalar_one_or_none()
-        features = ((org.settings or {}) if org else {}).get("election_features", {})
-        if not isinstance(features, dict):
-            features = {}
+        org = await org_settings_cache.get(self.db, organization_id)
+        features = org.section("election_features") if org else {}
         try:
             required = int(
                 features.get(
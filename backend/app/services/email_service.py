@@ -24,11 +24,12 @@ from zoneinfo import ZoneInfo
 from loguru import logger
 
 from app.core.config import settings
+from app.core.metrics import notifications_sent
 from app.models.email_template import EmailTemplateType
 from app.models.user import Organization
-from app.schemas.organization import decrypt_settings_secrets
 from app.services.email_template_service import EmailTemplateService
 from app.services.email_theme import build_email_document
+from app.services.org_settings_cache import org_settings_cache
 
 # Header injection control characters that must never appear in
 # RFC 5322 unstructured fields (Subject, From display-name, etc.).
@@ -439,9 +440,10 @@ class EmailService:
         """
         # Check if organization has custom email settings
         if self.organization and self.organization.settings:
-            # Decrypt secret fields (smtp_password, etc.) before reading
-            decrypted = decrypt_settings_secrets(self.organization.settings)
-            org_email_config = decrypted.get("email_service", {})
+            # Secret fields (smtp_password, etc.) come back decrypted
+            org_email_config = org_settings_cache.email_service_config(
+                self.organization
+            )
             if org_email_config.get("enabled"):
                 encryption = org_email_config.get("smtp_encryption", "tls")
                 return {
@@ -474,8 +476,7 @@ class EmailService:
         signalling that the SMTP path should be used instead.
         """
         if self.organization and self.organization.settings:
-            decrypted = decrypt_settings_secrets(self.organization.settings)
-            org_email = decrypted.get("email_service", {})
+            org_email = org_settings_cache.email_service_config(self.organization)
             if org_email.get("enabled") and org_email.get("platform") == "cloudflare":
                 account_id = org_email.get("cloudflare_account_id")
                 api_token = org_email.get("cloudflare_api_token")
@@ -1081,6 +1082,8 @@ class EmailService:
             except Exception as e:
                 logger.warning("Failed to log message history: {}", e)
 
+        notifications_sent.inc(success_count, channel="email", outcome="sent")
+        notifications_sent.inc(failure_count, channel="email", outcome="failed")
         return success_count, failure_count
 
     async def _log_message_history(
@@ -39,7 +39,7 @@ from app.models.user import Organization, User
 from app.services.inventory_service import InventoryService
 from app.utils.apparatus_ref import resolve_apparatus_labels, resolve_apparatus_ref
 from app.utils.model_updates import apply_updates
-from app.utils.name_matching import best_matches
+from app.utils.name_matching import NameIndex
 from app.utils.org_scoping import is_in_org
 
 
@@ -3121,11 +3121,11 @@ class EquipmentCheckService:
                 InventoryItem.active.is_(True),
             )
         )
-        candidates = [(cid, cname) for cid, cname in catalog.all() if cname]
+        index = NameIndex((cid, cname) for cid, cname in catalog.all() if cname)
 
         matches: List[Dict[str, Any]] = []
         for item in unlinked:
-            suggestions = best_matches(item.name, candidates, limit=limit_per_item)
+            suggestions = index.best_matches(item.name, limit=limit_per_item)
             matches.append(
                 {
                     "template_item_id": item.id,
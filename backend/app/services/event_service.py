@@ -729,6 +729,13 @@ class EventService:
                 )
             ).scalar_one_or_none()
 
+        return self._phase_warning_message(session_phase, current_phase)
+
+    @staticmethod
+    def _phase_warning_message(session_phase, current_phase) -> Optional[str]:
+        """The phase-gate warning for a member in ``current_phase`` (None if
+        not yet in a phase) checking in to a ``session_phase`` session, or
+        None when the session is not ahead of them."""
         current_number = current_phase.phase_number if current_phase else 0
         if session_phase.phase_number <= current_number:
             return None
@@ -2130,32 +2137,11 @@ class EventService:
             if existing_record:
                 return  # Record already exists
 
-            # Create training record
-            training_record = TrainingRecord(
-                organization_id=organization_id,
-                user_id=user_id,
-                course_id=training_session.course_id,
-                category_id=training_session.category_id,
-                course_name=training_session.course_name,
-                course_code=training_session.course_code,
-                training_type=training_session.training_type,
-                scheduled_date=event.start_datetime.date(),
-                completion_date=None,
-                status=TrainingStatus.IN_PROGRESS,
-                hours_completed=0.0,
-                credit_hours=training_session.credit_hours,
-                instructor=training_session.instructor,
-                location=event.location,
-                certification_number=None,
-                issuing_agency=(
-                    training_session.issuing_agency
-                    if training_session.issues_certification
-                    else None
-                ),
-                created_by=user_id,
+            self.db.add(
+                self._check_in_training_record(
+                    training_session, event, user_id, organization_id
+                )
             )
-
-            self.db.add(training_record)
             await self.db.commit()
         except Exception:
             logger.opt(exception=True).error(
@@ -2168,6 +2154,39 @@ class EventService:
             )
             await self.db.rollback()
 
+    @staticmethod
+    def _check_in_training_record(
+        training_session: TrainingSession,
+        event: Event,
+        user_id: UUID,
+        organization_id: UUID,
+    ) -> TrainingRecord:
+        """The in-progress TrainingRecord a check-in to an auto-create
+        training session starts for the member."""
+        return TrainingRecord(
+            organization_id=organization_id,
+            user_id=user_id,
+            course_id=training_session.course_id,
+            category_id=training_session.category_id,
+            course_name=training_session.course_name,
+            course_code=training_session.course_code,
+            training_type=training_session.training_type,
+            scheduled_date=event.start_datetime.date(),
+            completion_date=None,
+            status=TrainingStatus.IN_PROGRESS,
+            hours_completed=0.0,
+            credit_hours=training_session.credit_hours,
+            instructor=training_session.instructor,
+            location=event.location,
+            certification_number=None,
+            issuing_agency=(
+                training_session.issuing_agency
+                if training_session.issues_certification
+                else None
+            ),
+            created_by=user_id,
+        )
+
     async def get_check_in_monitoring_stats(
         self, event_id: UUID, organization_id: UUID
     ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
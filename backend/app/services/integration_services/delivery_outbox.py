@@ -0,0 +1,386 @@
+"""
+Integration Delivery Outbox
+
+Durable, retried delivery of chat notifications (Slack, Discord, Teams) and
+generic outbound webhooks, off the request path.
+
+``enqueue_notification`` / ``enqueue_summary`` add one ``IntegrationDelivery``
+row per enabled destination; the caller commits. ``DeliveryWorker`` (started
+by main.py in each worker process) claims due rows, sends them and records
+the outcome:
+
+* Claiming pushes ``next_attempt_at`` forward by ``LEASE_SECONDS`` and
+  commits before anything is sent, so processes can share the table and one
+  that dies mid-send leaves the row to be retried (at-least-once delivery).
+* Each destination host gets one pooled ``httpx.AsyncClient`` for the life
+  of the worker instead of a client per message.
+* The SSRF check (``assert_outbound_url_safe``, which resolves DNS) runs in
+  a thread, and its verdict is cached per host for
+  ``URL_CHECK_TTL_SECONDS``.
+* Failures are retried after 30s, 1m, 2m, ... (plus jitter) up to
+  ``MAX_ATTEMPTS``; a 4xx other than 408/425/429 fails at once.
+* ``integration_deliveries_total`` and
+  ``integration_delivery_duration_seconds`` (app/core/metrics.py) count
+  outcomes per integration.
+
+Finished rows are purged by the ``integration_delivery_cleanup`` task.
+"""
+
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import integration_deliveries, integration_delivery_seconds
+from app.models.integration import Integration, IntegrationDelivery
+from app.services.integration_services.base import create_integration_client
+from app.services.integration_services.notification_dispatch import (
+    GENERIC_WEBHOOK_TYPE,
+    MESSAGING_TYPES,
+    OutboundRequest,
+    build_notification_request,
+    build_summary_request,
+)
+from app.utils.url_validator import assert_outbound_url_safe
+
+PENDING = "pending"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+MAX_ATTEMPTS = 8
+BASE_BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 3600
+# Longer than the integration client's 10s timeout, with room to spare.
+LEASE_SECONDS = 120
+BATCH_SIZE = 50
+CONCURRENCY = 8
+POLL_SECONDS = 15
+URL_CHECK_TTL_SECONDS = 60
+DELIVERED_RETENTION_DAYS = 7
+FAILED_RETENTION_DAYS = 30
+
+# Client errors worth retrying; any other 4xx means the request or the
+# webhook itself is bad (e.g. Slack's 404 for a revoked webhook).
+_RETRYABLE_4XX = frozenset({408, 425, 429})
+_MAX_CLIENTS = 32
+_BLOCKED = "destination failed safety validation"
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after the *attempts*-th failed attempt."""
+    delay = min(BASE_BACKOFF_SECONDS * 2 ** (attempts - 1), MAX_BACKOFF_SECONDS)
+    return delay * random.uniform(1.0, 1.2)
+
+
+async def _destinations(
+    db: AsyncSession, organization_id: str, types: Iterable[str]
+) -> List[Integration]:
+    result = await db.execute(
+        select(Integration).where(
+            Integration.organization_id == str(organization_id),
+            Integration.enabled.is_(True),
+            Integration.integration_type.in_(list(types)),
+        )
+    )
+    return list(result.scalars().all())
+
+
+def _add(
+    db: AsyncSession,
+    organization_id: str,
+    integrations: List[Integration],
+    kind: str,
+    payload: Dict[str, Any],
+) -> int:
+    # Round-trip through JSON so dates etc. are stored the way they are sent.
+    payload = json.loads(json.dumps(payload, default=str))
+    now = datetime.now(timezone.utc)
+    for integration in integrations:
+        db.add(
+            IntegrationDelivery(
+                organization_id=str(organization_id),
+                integration_id=integration.id,
+                integration_type=integration.integration_type,
+                kind=kind,
+                payload=payload,
+                status=PENDING,
+                attempts=0,
+                next_attempt_at=now,
+            )
+        )
+    return len(integrations)
+
+
+async def enqueue_notification(
+    db: AsyncSession, organization_id: str, kind: str, payload: Dict[str, Any]
+) -> int:
+    """Queue a per-entity notification for every enabled chat integration and
+    generic webhook that accepts it. Returns the number queued."""
+    integrations = [
+        integration
+        for integration in await _destinations(
+            db, organization_id, (*MESSAGING_TYPES, GENERIC_WEBHOOK_TYPE)
+        )
+        if build_notification_request(integration, kind, payload) is not None
+    ]
+    return _add(db, organization_id, integrations, kind, payload)
+
+
+async def enqueue_summary(
+    db: AsyncSession, organization_id: str, title: str, message: str
+) -> int:
+    """Queue a bulk-operation summary for every enabled chat integration."""
+    integrations = [
+        integration
+        for integration in await _destinations(db, organization_id, MESSAGING_TYPES)
+        if build_summary_request(integration, title, message) is not None
+    ]
+    payload = {"title": title, "message": message}
+    return _add(db, organization_id, integrations, "summary", payload)
+
+
+def _build(
+    delivery: IntegrationDelivery, integration: Integration
+) -> Optional[OutboundRequest]:
+    payload = delivery.payload or {}
+    if delivery.kind == "summary":
+        return build_summary_request(
+            integration, payload.get("title", ""), payload.get("message", "")
+        )
+    return build_notification_request(integration, delivery.kind, payload)
+
+
+async def purge_finished(db: AsyncSession) -> int:
+    """Delete delivered and failed rows past retention; the caller commits."""
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        delete(IntegrationDelivery).where(
+            or_(
+                and_(
+                    IntegrationDelivery.status == DELIVERED,
+                    IntegrationDelivery.created_at
+                    < now - timedelta(days=DELIVERED_RETENTION_DAYS),
+                ),
+                and_(
+                    IntegrationDelivery.status == FAILED,
+                    IntegrationDelivery.created_at
+                    < now - timedelta(days=FAILED_RETENTION_DAYS),
+                ),
+            )
+        )
+    )
+    return result.rowcount or 0
+
+
+class DeliveryWorker:
+    """Per-process sender for the delivery outbox."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        # Per-host clients, least recently used first.
+        self._clients: Dict[Tuple[str, str, Optional[int]], httpx.AsyncClient] = {}
+        # Evicted clients, closed once the batch that may still use them ends.
+        self._retired: List[httpx.AsyncClient] = []
+        self._url_checks: Dict[Tuple[str, str], Tuple[float, Optional[str]]] = {}
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+            logger.info("Integration delivery worker started")
+
+    def wake(self) -> None:
+        """Run a pass now instead of at the next poll."""
+        self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        clients, self._clients = list(self._clients.values()), {}
+        self._retired.extend(clients)
+        await self._close_retired()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                while await self.run_once() == BATCH_SIZE:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Integration delivery pass failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), POLL_SECONDS)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def run_once(self) -> int:
+        """Claim and send one batch of due deliveries; returns the batch size."""
+        from app.core.database import async_session_factory
+
+        async with async_session_factory() as db:
+            claimed = await self._claim(db)
+            if not claimed:
+                return 0
+            result = await db.execute(
+                select(Integration).where(
+                    Integration.id.in_({d.integration_id for d in claimed})
+                )
+            )
+            integrations = {i.id: i for i in result.scalars().all()}
+            # Release the connection: nothing is held open during the sends.
+            await db.commit()
+
+            semaphore = asyncio.Semaphore(CONCURRENCY)
+
+            async def deliver(delivery: IntegrationDelivery) -> None:
+                async with semaphore:
+                    await self._deliver(
+                        delivery, integrations.get(delivery.integration_id)
+                    )
+
+            try:
+                await asyncio.gather(*(deliver(d) for d in claimed))
+            finally:
+                await self._close_retired()
+            await db.commit()
+        return len(claimed)
+
+    async def _claim(self, db: AsyncSession) -> List[IntegrationDelivery]:
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(IntegrationDelivery)
+            .where(
+                IntegrationDelivery.status == PENDING,
+                IntegrationDelivery.next_attempt_at <= now,
+            )
+            .order_by(IntegrationDelivery.next_attempt_at)
+            .limit(BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = list(result.scalars().all())
+        for delivery in claimed:
+            delivery.attempts += 1
+            delivery.next_attempt_at = now + timedelta(seconds=LEASE_SECONDS)
+        return claimed
+
+    async def _deliver(
+        self, delivery: IntegrationDelivery, integration: Optional[Integration]
+    ) -> None:
+        labels = {
+            "integration_type": delivery.integration_type,
+            "integration": delivery.integration_id,
+        }
+        if integration is None or not integration.enabled:
+            self._fail(delivery, "integration disabled or removed", labels)
+            return
+        request = _build(delivery, integration)
+        if request is None:
+            self._fail(delivery, "integration no longer accepts this message", labels)
+            return
+        blocked = await self._check_url(request.url)
+        if blocked:
+            self._retry(delivery, blocked, labels)
+            return
+
+        started = time.perf_counter()
+        try:
+            client = await self._client(request.url)
+            response = await client.post(
+                request.url, content=request.content, headers=request.headers
+            )
+        except Exception as exc:
+            self._retry(delivery, type(exc).__name__, labels)
+            return
+        finally:
+            integration_delivery_seconds.observe(
+                time.perf_counter() - started,
+                integration_type=delivery.integration_type,
+            )
+
+        status = response.status_code
+        if status in request.ok_statuses:
+            delivery.status = DELIVERED
+            delivery.delivered_at = datetime.now(timezone.utc)
+            delivery.last_error = None
+            integration_deliveries.inc(outcome="delivered", **labels)
+        elif 400 <= status < 500 and status not in _RETRYABLE_4XX:
+            self._fail(delivery, f"HTTP {status}", labels)
+        else:
+            self._retry(delivery, f"HTTP {status}", labels)
+
+    def _retry(self, delivery: IntegrationDelivery, error: str, labels) -> None:
+        if delivery.attempts >= MAX_ATTEMPTS:
+            self._fail(delivery, error, labels)
+            return
+        delivery.last_error = error
+        delivery.next_attempt_at = datetime.now(timezone.utc) + timedelta(
+            seconds=retry_delay(delivery.attempts)
+        )
+        integration_deliveries.inc(outcome="retry", **labels)
+
+    def _fail(self, delivery: IntegrationDelivery, error: str, labels) -> None:
+        delivery.status = FAILED
+        delivery.last_error = error
+        integration_deliveries.inc(outcome="failed", **labels)
+        # No URL in the message: webhook URLs carry their credentials.
+        logger.warning(
+            "Delivery {} to {} integration {} failed after {} attempt(s): {}",
+            delivery.id,
+            delivery.integration_type,
+            delivery.integration_id,
+            delivery.attempts,
+            error,
+        )
+
+    async def _check_url(self, url: str) -> Optional[str]:
+        """``None`` if *url* may be sent to, else the reason it may not."""
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.hostname or "")
+        now = time.monotonic()
+        cached = self._url_checks.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        try:
+            await asyncio.to_thread(assert_outbound_url_safe, url)
+            verdict = None
+        except ValueError:
+            verdict = _BLOCKED
+        self._url_checks[key] = (now + URL_CHECK_TTL_SECONDS, verdict)
+        return verdict
+
+    async def _client(self, url: str) -> httpx.AsyncClient:
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.hostname or "", parsed.port)
+        client = self._clients.pop(key, None)
+        if client is None:
+            if len(self._clients) >= _MAX_CLIENTS:
+                # The least recently used client may still be mid-send for
+                # another delivery in this batch, so it is only retired here.
+                lru = next(iter(self._clients))
+                self._retired.append(self._clients.pop(lru))
+            client = create_integration_client()
+        self._clients[key] = client
+        return client
+
+    async def _close_retired(self) -> None:
+        retired, self._retired = self._retired, []
+        for client in retired:
+            await client.aclose()
+
+
+delivery_worker = DeliveryWorker()
@@ -5,6 +5,7 @@ Sends notifications to Discord channels via webhook URLs
 using Discord embed formatting.
 """
 
+import asyncio
 from typing import Any
 
 from loguru import logger
@@ -19,6 +20,16 @@ COLOR_ORANGE = 0xE67E22
 COLOR_RED = 0xE74C3C
 
 
+def build_discord_payload(
+    content: str, embeds: list[dict[str, Any]] | None = None
+) -> dict[str, Any]:
+    """Webhook body for a message with optional embeds."""
+    payload: dict[str, Any] = {"content": content}
+    if embeds:
+        payload["embeds"] = embeds
+    return payload
+
+
 async def send_discord_notification(
     webhook_url: str,
     content: str,
@@ -32,17 +43,15 @@ async def send_discord_notification(
     # SSRF: re-validate the destination at send time (config-save validation
     # can't defend against DNS-rebinding). Fail closed on an unsafe URL.
     try:
-        assert_outbound_url_safe(webhook_url)
+        await asyncio.to_thread(assert_outbound_url_safe, webhook_url)
     except ValueError:
         logger.warning("Blocked outbound Discord webhook: URL failed safety validation")
         return False
 
-    payload: dict[str, Any] = {"content": content}
-    if embeds:
-        payload["embeds"] = embeds
-
     async with create_integration_client() as client:
-        response = await client.post(webhook_url, json=payload)
+        response = await client.post(
+            webhook_url, json=build_discord_payload(content, embeds)
+        )
         if response.status_code == 204:
             return True
         logger.warning(
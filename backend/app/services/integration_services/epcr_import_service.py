@@ -9,25 +9,161 @@ HIPAA note: This service deliberately discards clinical fields (vitals,
 medications, patient demographics) during parsing. Only dispatch/response
 fields that map to ShiftCall are extracted. Uploaded files should be
 deleted after processing.
+
+Streaming
+---------
+State-level NEMSIS exports run to hundreds of MB, so nothing here holds a
+whole file. ``iter_csv_records`` reads the CSV through a text wrapper a
+buffer at a time; ``iter_nemsis_records`` walks the XML with defusedxml's
+``iterparse`` (same XXE / entity-expansion protection as before) and detaches
+each ``PatientCareReport`` from the tree once its dispatch fields are read.
+``parse_csv_file`` / ``parse_nemsis_xml`` remain as list-returning wrappers
+for small in-memory payloads.
+
+``run_import_job`` is the background job behind
+``POST /integrations/{id}/epcr-import``: it pulls ``IMPORT_BATCH_SIZE``
+records at a time (parsing off the event loop), attaches each run to the
+shift on duty at dispatch, and writes the batch with one
+``INSERT ... ON DUPLICATE KEY UPDATE`` keyed on
+``(organization_id, external_id)``, so re-importing a corrected export
+updates calls instead of duplicating them. Progress is published to Redis
+(and kept in-process for the most recent jobs) after every batch for
+``get_import_progress``.
 """
 
+import asyncio
+import bisect
 import csv
 import io
-from typing import Any
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Iterator, Optional
 
 # xml.etree.ElementTree is used only for the Element TYPE in annotations. All
 # actual PARSING of untrusted XML goes through defusedxml (below) to block XXE
 # and entity-expansion (billion-laughs) attacks.
 from xml.etree import ElementTree
+from zoneinfo import ZoneInfo
 
 import defusedxml.ElementTree as safe_etree
 from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_manager
+from app.core.utils import generate_uuid
 from app.schemas.integration import EPCRImportRow
+from app.utils.name_matching import normalize_name
 
 # NEMSIS namespace
 NEMSIS_NS = "http://www.nemsis.org"
 
+IMPORT_BATCH_SIZE = 500
+PROGRESS_TTL_SECONDS = 24 * 3600
+# Longest shift a run can be attached to; bounds the per-batch shift query.
+MAX_SHIFT_HOURS = 48
+# Shifts without an end time are treated as this long.
+DEFAULT_SHIFT_HOURS = 24
+
+_PROGRESS_KEY = "epcr_import:{}"
+# In-process fallback for when Redis is unavailable, least recently updated
+# first; capped so a long-lived worker only keeps its most recent jobs.
+_LOCAL_PROGRESS_MAX = 100
+_local_progress: dict[str, dict[str, Any]] = {}
+
+
+@dataclass
+class ParseStats:
+    """Running totals for one pass over an import file."""
+
+    parsed: int = 0
+    skipped: int = 0
+
+
+def _validated(mapped: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """Validate through the schema (discards unknown fields)."""
+    try:
+        validated = EPCRImportRow(**mapped)
+    except Exception:
+        return None
+    record = {k: v for k, v in validated.model_dump().items() if v is not None}
+    return record if record.get("incident_number") else None
+
+
+def iter_csv_records(
+    stream: BinaryIO,
+    field_mappings: dict[str, str],
+    stats: Optional[ParseStats] = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield validated dispatch/response records from a binary CSV stream.
+
+    Args:
+        stream: Binary file object positioned at the start of the CSV.
+        field_mappings: Map of CSV column names to ShiftCall field names.
+            e.g. {"Run Number": "incident_number", "Unit": "unit"}
+        stats: Optional totals updated as rows are read.
+    """
+    stats = stats if stats is not None else ParseStats()
+    # utf-8-sig handles the BOM from Excel exports
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        for row in csv.DictReader(text):
+            mapped = {
+                logbook_field: row[csv_col]
+                for csv_col, logbook_field in field_mappings.items()
+                if csv_col in row
+            }
+            record = _validated(mapped)
+            if record is None:
+                stats.skipped += 1
+                continue
+            stats.parsed += 1
+            yield record
+    finally:
+        # Hand the stream back to the caller rather than closing it.
+        text.detach()
+
+
+def iter_nemsis_records(
+    stream: BinaryIO, stats: Optional[ParseStats] = None
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield validated dispatch/response records from a NEMSIS 3.5 XML stream.
+
+    Clinical fields (ePatient, eVitals, eMedications, eProcedures) are
+    deliberately skipped — only eTimes, eResponse, eDisposition, eCrew
+    are extracted. Each PatientCareReport is removed from the tree once
+    read, so memory is bounded by the largest single report.
+    """
+    stats = stats if stats is not None else ParseStats()
+    ns = {"n": NEMSIS_NS}
+    # Open elements from the root down, so a finished report can be detached
+    # from its parent (clearing it alone would leave an empty shell per PCR).
+    open_elements: list[ElementTree.Element] = []
+
+    for event, element in safe_etree.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            open_elements.append(element)
+            continue
+        open_elements.pop()
+        # Handle both namespaced and non-namespaced XML
+        if element.tag.rsplit("}", 1)[-1] != "PatientCareReport":
+            continue
+
+        record = _validated(_extract_pcr_dispatch_fields(element, ns))
+        if open_elements:
+            open_elements[-1].remove(element)
+        element.clear()
+        if record is None:
+            stats.skipped += 1
+            continue
+        stats.parsed += 1
+        yield record
+
 
 def parse_csv_file(
     file_content: bytes,
@@ -39,37 +175,15 @@ def parse_csv_file(
     Args:
         file_content: Raw CSV bytes.
         field_mappings: Map of CSV column names to ShiftCall field names.
-            e.g. {"Run Number": "incident_number", "Unit": "unit"}
 
     Returns:
         List of validated record dicts (clinical fields discarded).
     """
-    text = file_content.decode("utf-8-sig")  # Handle BOM from Excel exports
-    reader = csv.DictReader(io.StringIO(text))
-
-    records: list[dict[str, Any]] = []
-    skipped = 0
-
-    for row in reader:
-        mapped: dict[str, Any] = {}
-        for csv_col, logbook_field in field_mappings.items():
-            if csv_col in row:
-                mapped[logbook_field] = row[csv_col]
-
-        # Validate through the schema (discards unknown fields)
-        try:
-            validated = EPCRImportRow(**mapped)
-            record = {k: v for k, v in validated.model_dump().items() if v is not None}
-            if record.get("incident_number"):
-                records.append(record)
-            else:
-                skipped += 1
-        except Exception:
-            skipped += 1
-            continue
+    stats = ParseStats()
+    records = list(iter_csv_records(io.BytesIO(file_content), field_mappings, stats))
 
     # Never log file contents or parsed row data (HIPAA)
-    logger.info("Parsed {} records from CSV ({} skipped)", len(records), skipped)
+    logger.info("Parsed {} records from CSV ({} skipped)", stats.parsed, stats.skipped)
     return records
 
 
@@ -77,35 +191,13 @@ def parse_nemsis_xml(file_content: bytes) -> list[dict[str, Any]]:
     """
     Parse a NEMSIS 3.5 XML file and extract dispatch/response fields only.
 
-    Clinical fields (ePatient, eVitals, eMedications, eProcedures) are
-    deliberately skipped — only eTimes, eResponse, eDisposition, eCrew
-    are extracted.
-
     Args:
         file_content: Raw XML bytes.
 
     Returns:
         List of validated record dicts.
     """
-    root = safe_etree.fromstring(file_content)
-    records: list[dict[str, Any]] = []
-
-    # Handle both namespaced and non-namespaced XML
-    ns = {"n": NEMSIS_NS}
-    pcr_tags = root.findall(".//n:PatientCareReport", ns) or root.findall(
-        ".//PatientCareReport"
-    )
-
-    for pcr in pcr_tags:
-        record = _extract_pcr_dispatch_fields(pcr, ns)
-        try:
-            validated = EPCRImportRow(**record)
-            result = {k: v for k, v in validated.model_dump().items() if v is not None}
-            if result.get("incident_number"):
-                records.append(result)
-        except Exception:
-            continue
-
+    records = list(iter_nemsis_records(io.BytesIO(file_content)))
     logger.info("Parsed {} records from NEMSIS XML", len(records))
     return records
 
@@ -185,3 +277,345 @@ def _find_text_direct(
     if el is not None and el.text:
         return el.text.strip()
     return None
+
+
+# ============================================
+# Writing to ShiftCall
+# ============================================
+
+
+def _parse_timestamp(value: Optional[str], tz: ZoneInfo) -> Optional[datetime]:
+    """ISO 8601 -> aware UTC datetime; naive values are in the org's zone."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=tz)
+    return parsed.astimezone(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # MySQL hands DATETIME columns back naive; they are stored in UTC.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _clip(value: Optional[str], length: int = 100) -> Optional[str]:
+    return value[:length] if value else None
+
+
+def _name_keys(name: str) -> list[frozenset]:
+    tokens = normalize_name(name).split()
+    return [frozenset(tokens)] if tokens else []
+
+
+class ShiftCallImporter:
+    """
+    Writes validated ePCR records into ``shift_calls`` a batch at a time.
+
+    A run is attached to the one shift whose window covers its dispatch
+    time; runs with no dispatch time, no covering shift, or more than one
+    (two stations on duty at once) are counted as unmatched rather than
+    guessed at. Crew names are resolved to member IDs when they identify
+    exactly one member ("Jane Smith" or "Smith, J").
+    """
+
+    def __init__(
+        self, db: AsyncSession, organization_id: str, match_members: bool = True
+    ):
+        self.db = db
+        self.organization_id = str(organization_id)
+        self.match_members = match_members
+        self.tz = ZoneInfo("UTC")
+        self._members: dict[frozenset, Optional[str]] = {}
+
+    async def prepare(self) -> None:
+        """Load the org's timezone and (optionally) its member name index."""
+        from app.models.user import Organization, User
+
+        tz_name = await self.db.scalar(
+            select(Organization.timezone).where(Organization.id == self.organization_id)
+        )
+        try:
+            self.tz = ZoneInfo(tz_name or "UTC")
+        except Exception:
+            self.tz = ZoneInfo("UTC")
+
+        if not self.match_members:
+            return
+        result = await self.db.execute(
+            select(User.id, User.first_name, User.last_name).where(
+                User.organization_id == self.organization_id,
+                User.deleted_at.is_(None),
+            )
+        )
+        for user_id, first, last in result.all():
+            first, last = first or "", last or ""
+            keys = _name_keys(f"{first} {last}")
+            if first and last:
+                keys += _name_keys(f"{last} {first[0]}")
+            for key in keys:
+                # An ambiguous name maps to None so it is never guessed.
+                self._members[key] = (
+                    None if self._members.get(key, user_id) != user_id else user_id
+                )
+
+    def _resolve_members(self, names: Optional[list[str]]) -> Optional[list[str]]:
+        if not self.match_members or not names:
+            return None
+        ids: list[str] = []
+        for name in names:
+            for key in _name_keys(name):
+                user_id = self._members.get(key)
+                if user_id and user_id not in ids:
+                    ids.append(user_id)
+        return ids or None
+
+    async def _shift_windows(
+        self, earliest: datetime, latest: datetime
+    ) -> list[tuple[datetime, datetime, str]]:
+        from app.models.training import Shift
+
+        result = await self.db.execute(
+            select(Shift.start_time, Shift.end_time, Shift.id)
+            .where(
+                Shift.organization_id == self.organization_id,
+                Shift.start_time <= latest,
+                Shift.start_time > earliest - timedelta(hours=MAX_SHIFT_HOURS),
+            )
+            .order_by(Shift.start_time)
+        )
+        windows = []
+        for start, end, shift_id in result.all():
+            start = _as_utc(start)
+            end = _as_utc(end) if end else start + timedelta(hours=DEFAULT_SHIFT_HOURS)
+            windows.append((start, end, shift_id))
+        return windows
+
+    async def write(self, records: list[dict[str, Any]]) -> tuple[int, int]:
+        """Upsert one batch; returns ``(written, unmatched)``. Caller commits."""
+        timed = []
+        for record in records:
+            dispatched = _parse_timestamp(record.get("dispatched_at"), self.tz)
+            if dispatched is not None:
+                timed.append((dispatched, record))
+        if not timed:
+            return 0, len(records)
+
+        windows = await self._shift_windows(
+            min(t for t, _ in timed), max(t for t, _ in timed)
+        )
+        starts = [start for start, _, _ in windows]
+
+        rows = []
+        for dispatched, record in timed:
+            # Only shifts starting in (dispatched - MAX_SHIFT_HOURS, dispatched]
+            # can cover the run.
+            hi = bisect.bisect_right(starts, dispatched)
+            lo = bisect.bisect_right(
+                starts, dispatched - timedelta(hours=MAX_SHIFT_HOURS)
+            )
+            covering = [
+                shift_id
+                for start, end, shift_id in windows[lo:hi]
+                if start <= dispatched < end
+            ]
+            if len(covering) != 1:
+                continue
+            rows.append(
+                {
+                    "id": generate_uuid(),
+                    "shift_id": covering[0],
+                    "organization_id": self.organization_id,
+                    "external_id": _clip(record["incident_number"]),
+                    "incident_number": _clip(record["incident_number"]),
+                    "incident_type": _clip(record.get("incident_type")),
+                    "dispatched_at": dispatched,
+                    "on_scene_at": _parse_timestamp(record.get("on_scene_at"), self.tz),
+                    "cleared_at": _parse_timestamp(record.get("cleared_at"), self.tz),
+                    "cancelled_en_route": bool(record.get("cancelled_en_route")),
+                    "medical_refusal": bool(record.get("medical_refusal")),
+                    "responding_members": self._resolve_members(
+                        record.get("responding_members")
+                    ),
+                    "notes": record.get("notes"),
+                }
+            )
+        if rows:
+            await self.db.execute(_upsert_statement(), rows)
+        return len(rows), len(records) - len(rows)
+
+
+def _upsert_statement():
+    from app.models.training import ShiftCall
+
+    stmt = mysql_insert(ShiftCall.__table__)
+    inserted = stmt.inserted
+    # A column the export did not carry arrives as NULL and keeps what the
+    # call already has; the disposition flags are always authoritative.
+    return stmt.on_duplicate_key_update(
+        shift_id=inserted.shift_id,
+        incident_number=inserted.incident_number,
+        incident_type=func.coalesce(inserted.incident_type, ShiftCall.incident_type),
+        dispatched_at=inserted.dispatched_at,
+        on_scene_at=func.coalesce(inserted.on_scene_at, ShiftCall.on_scene_at),
+        cleared_at=func.coalesce(inserted.cleared_at, ShiftCall.cleared_at),
+        cancelled_en_route=inserted.cancelled_en_route,
+        medical_refusal=inserted.medical_refusal,
+        responding_members=func.coalesce(
+            inserted.responding_members, ShiftCall.responding_members
+        ),
+        notes=func.coalesce(inserted.notes, ShiftCall.notes),
+    )
+
+
+# ============================================
+# Background job
+# ============================================
+
+
+@dataclass
+class ImportProgress:
+    """What ``GET /integrations/epcr-import/{job_id}`` reports."""
+
+    job_id: str
+    organization_id: str
+    integration_id: str
+    import_format: str
+    status: str = "queued"  # queued, running, completed, failed
+    bytes_total: int = 0
+    bytes_read: int = 0
+    records_parsed: int = 0
+    records_skipped: int = 0
+    records_imported: int = 0
+    records_unmatched: int = 0
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+
+
+async def save_progress(progress: ImportProgress) -> None:
+    data = asdict(progress)
+    _local_progress.pop(progress.job_id, None)
+    _local_progress[progress.job_id] = data
+    while len(_local_progress) > _LOCAL_PROGRESS_MAX:
+        # A running job re-saves after every batch, so the oldest entry is
+        # a finished (or abandoned) one.
+        del _local_progress[next(iter(_local_progress))]
+    await cache_manager.set(
+        _PROGRESS_KEY.format(progress.job_id), data, ttl=PROGRESS_TTL_SECONDS
+    )
+
+
+async def get_import_progress(
+    job_id: str, organization_id: str
+) -> Optional[dict[str, Any]]:
+    """Progress for *job_id*, or ``None`` if unknown to this organization."""
+    data = await cache_manager.get(_PROGRESS_KEY.format(job_id))
+    if data is None:
+        data = _local_progress.get(job_id)
+    if not data or data.get("organization_id") != str(organization_id):
+        return None
+    return data
+
+
+def _next_batch(records: Iterator[dict[str, Any]]) -> list[dict[str, Any]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            break
+    return batch
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+async def run_import_job(
+    progress: ImportProgress,
+    path: str,
+    field_mappings: dict[str, str],
+    match_members: bool = True,
+) -> None:
+    """
+    Import the spooled file at *path* into ShiftCall, then delete it.
+
+    Runs after the upload response (``BackgroundTasks``) with its own
+    session; each batch is committed, so an interrupted job keeps what it
+    wrote and a re-run of the same file converges on the same rows.
+    """
+    from app.core.database import async_session_factory
+    from app.models.integration import Integration
+
+    stats = ParseStats()
+    started = time.monotonic()
+    progress.status = "running"
+    progress.started_at = datetime.now(timezone.utc).isoformat()
+    try:
+        with open(path, "rb") as stream:
+            progress.bytes_total = os.fstat(stream.fileno()).st_size
+            if progress.import_format == "nemsis_xml":
+                records = iter_nemsis_records(stream, stats)
+            else:
+                records = iter_csv_records(stream, field_mappings, stats)
+
+            async with async_session_factory() as db:
+                importer = ShiftCallImporter(
+                    db, progress.organization_id, match_members
+                )
+                await importer.prepare()
+                await save_progress(progress)
+                while True:
+                    # Reading and parsing are blocking; keep them off the loop.
+                    batch = await asyncio.to_thread(_next_batch, records)
+                    if not batch:
+                        break
+                    written, unmatched = await importer.write(batch)
+                    await db.commit()
+                    progress.bytes_read = stream.tell()
+                    progress.records_parsed = stats.parsed
+                    progress.records_skipped = stats.skipped
+                    progress.records_imported += written
+                    progress.records_unmatched += unmatched
+                    await save_progress(progress)
+
+                integration = await db.get(Integration, progress.integration_id)
+                if integration is not None:
+                    integration.last_sync_at = datetime.now(timezone.utc)
+                    await db.commit()
+
+        progress.bytes_read = progress.bytes_total
+        progress.records_parsed = stats.parsed
+        progress.records_skipped = stats.skipped
+        progress.status = "completed"
+    except Exception as e:
+        progress.status = "failed"
+        # Exception text from the parsers can quote file content (HIPAA).
+        progress.error = type(e).__name__
+        logger.error(
+            "ePCR import {} failed after {} records: {}",
+            progress.job_id,
+            progress.records_imported,
+            type(e).__name__,
+        )
+    finally:
+        await asyncio.to_thread(_remove_quietly, path)
+        progress.finished_at = datetime.now(timezone.utc).isoformat()
+        await save_progress(progress)
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        "ePCR import {} {}: {} imported, {} unmatched, {} skipped in {:.1f}s",
+        progress.job_id,
+        progress.status,
+        progress.records_imported,
+        progress.records_unmatched,
+        progress.records_skipped,
+        elapsed,
+    )
@@ -9,8 +9,15 @@ Callers pass a plain ``payload`` dict describing the entity; each platform's
 formatter reads the fields it needs (title/event_type/start_time/location for
 events, type/start/end/crew for shifts, etc.), so callers don't need to know
 platform-specific shapes.
+
+The ``notify_*`` background entrypoints queue messages in the delivery outbox
+(delivery_outbox.py), which sends and retries them off the request path;
+``build_*_request`` format a message for that worker. The ``dispatch_*``
+functions still send immediately.
 """
 
+import json
+from dataclasses import dataclass, field
 from typing import Any
 
 from loguru import logger
@@ -22,6 +29,10 @@ from app.models.integration import Integration
 # integration_type values that are chat/messaging platforms.
 MESSAGING_TYPES = ("slack", "discord", "microsoft-teams")
 
+# Outbound webhooks also receive per-entity notifications (as
+# "<kind>.created" events), but only through the delivery outbox.
+GENERIC_WEBHOOK_TYPE = "generic-webhook"
+
 # Non-empty Discord content per kind (Discord rejects a fully empty message).
 _DISCORD_CONTENT = {
     "event": "📅 New event",
@@ -36,6 +47,160 @@ def _webhook_url(integration: Integration) -> str:
     )
 
 
+def _formatter(itype: str, kind: str):
+    """The platform formatter for an entity ``kind``, or None."""
+    if itype == "discord":
+        from app.services.integration_services.discord_service import (
+            format_event_embed,
+            format_shift_embed,
+            format_training_embed,
+        )
+
+        formatters = {
+            "event": format_event_embed,
+            "shift": format_shift_embed,
+            "training": format_training_embed,
+        }
+    elif itype == "slack":
+        from app.services.integration_services.slack_service import (
+            format_event_notification,
+            format_shift_notification,
+            format_training_notification,
+        )
+
+        formatters = {
+            "event": format_event_notification,
+            "shift": format_shift_notification,
+            "training": format_training_notification,
+        }
+    elif itype == "microsoft-teams":
+        from app.services.integration_services.teams_service import (
+            format_event_card,
+            format_shift_card,
+            format_training_card,
+        )
+
+        formatters = {
+            "event": format_event_card,
+            "shift": format_shift_card,
+            "training": format_training_card,
+        }
+    else:
+        return None
+    return formatters.get(kind)
+
+
+@dataclass(frozen=True)
+class OutboundRequest:
+    """One formatted POST to a chat platform or webhook endpoint."""
+
+    url: str
+    content: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    # Statuses the platform returns on success
+    ok_statuses: tuple[int, ...] = (200,)
+
+
+def _chat_request(
+    integration: Integration, body: dict[str, Any]
+) -> OutboundRequest | None:
+    url = _webhook_url(integration)
+    if not url:
+        return None
+    # Discord answers 204 (200 with ?wait=true); Slack and Teams answer 200.
+    ok = (200, 204) if integration.integration_type == "discord" else (200,)
+    return OutboundRequest(
+        url=url,
+        content=json.dumps(body, default=str).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        ok_statuses=ok,
+    )
+
+
+def build_notification_request(
+    integration: Integration, kind: str, payload: dict[str, Any]
+) -> OutboundRequest | None:
+    """Format a per-entity notification for one integration (chat platform
+    or generic webhook); None when there is nothing to send."""
+    itype = integration.integration_type
+    if itype == GENERIC_WEBHOOK_TYPE:
+        from app.services.integration_services.webhook_service import (
+            build_webhook_request,
+        )
+
+        config = integration.config or {}
+        url = integration.get_secret("url") or config.get("url", "")
+        event_type = f"{kind}.created"
+        wanted = config.get("event_types") or []
+        if not url or (wanted and event_type not in wanted):
+            return None
+        content, headers = build_webhook_request(
+            event_type, payload, integration.get_secret("secret")
+        )
+        return OutboundRequest(
+            url=url,
+            content=content,
+            headers=headers,
+            ok_statuses=tuple(range(200, 300)),
+        )
+
+    formatter = _formatter(itype, kind)
+    if formatter is None:
+        return None
+    formatted = formatter(payload)
+    if itype == "discord":
+        from app.services.integration_services.discord_service import (
+            build_discord_payload,
+        )
+
+        body = build_discord_payload(
+            _DISCORD_CONTENT.get(kind, "The Logbook"), [formatted]
+        )
+    elif itype == "slack":
+        from app.services.integration_services.slack_service import (
+            build_slack_payload,
+        )
+
+        body = build_slack_payload(formatted.get("text", ""), formatted.get("blocks"))
+    else:
+        from app.services.integration_services.teams_service import (
+            build_teams_payload,
+        )
+
+        body = build_teams_payload(
+            formatted.get("title", "The Logbook"), formatted.get("message", "")
+        )
+    return _chat_request(integration, body)
+
+
+def build_summary_request(
+    integration: Integration, title: str, message: str
+) -> OutboundRequest | None:
+    """Format a bulk-operation summary for one chat integration."""
+    itype = integration.integration_type
+    if itype == "discord":
+        from app.services.integration_services.discord_service import (
+            build_discord_payload,
+        )
+
+        body = build_discord_payload(f"**{title}**\n{message}")
+    elif itype == "slack":
+        from app.services.integration_services.slack_service import (
+            build_slack_payload,
+        )
+
+        body = build_slack_payload(f"{title}\n{message}")
+    elif itype == "microsoft-teams":
+        from app.services.integration_services.teams_service import (
+            build_teams_payload,
+        )
+
+        body = build_teams_payload(title, message)
+    else:
+        return None
+    return _chat_request(integration, body)
+
+
 async def send_integration_notification(
     integration: Integration, kind: str, payload: dict[str, Any]
 ) -> bool:
@@ -51,21 +216,15 @@ async def send_integration_notification(
     if not webhook_url:
         return False
 
+    formatter = _formatter(itype, kind)
+    if formatter is None:
+        return False
+
     if itype == "discord":
         from app.services.integration_services.discord_service import (
-            format_event_embed,
-            format_shift_embed,
-            format_training_embed,
             send_discord_notification,
         )
 
-        formatter = {
-            "event": format_event_embed,
-            "shift": format_shift_embed,
-            "training": format_training_embed,
-        }.get(kind)
-        if formatter is None:
-            return False
         return await send_discord_notification(
             webhook_url,
             content=_DISCORD_CONTENT.get(kind, "The Logbook"),
@@ -74,19 +233,9 @@ async def send_integration_notification(
 
     if itype == "slack":
         from app.services.integration_services.slack_service import (
-            format_event_notification,
-            format_shift_notification,
-            format_training_notification,
             send_slack_notification,
         )
 
-        formatter = {
-            "event": format_event_notification,
-            "shift": format_shift_notification,
-            "training": format_training_notification,
-        }.get(kind)
-        if formatter is None:
-            return False
         msg = formatter(payload)
         return await send_slack_notification(
             webhook_url, msg.get("text", ""), msg.get("blocks")
@@ -94,19 +243,9 @@ async def send_integration_notification(
 
     if itype == "microsoft-teams":
         from app.services.integration_services.teams_service import (
-            format_event_card,
-            format_shift_card,
-            format_training_card,
             send_teams_notification,
         )
 
-        formatter = {
-            "event": format_event_card,
-            "shift": format_shift_card,
-            "training": format_training_card,
-        }.get(kind)
-        if formatter is None:
-            return False
         card = formatter(payload)
         return await send_teams_notification(
             webhook_url, card.get("title", "The Logbook"), card.get("message", "")
@@ -228,13 +367,20 @@ async def notify_entity_created(
 
     Intended for ``BackgroundTasks.add_task`` so it runs AFTER the HTTP response.
     It therefore must NOT reuse the request-scoped DB session (already closed by
-    then) — it opens its own. Fully self-contained and never raises.
+    then) — it opens its own. Queues the message in the delivery outbox and
+    wakes this worker's sender; fully self-contained and never raises.
     """
     from app.core.database import async_session_factory
+    from app.services.integration_services.delivery_outbox import (
+        delivery_worker,
+        enqueue_notification,
+    )
 
     try:
         async with async_session_factory() as db:
-            await dispatch_chat_notifications(db, organization_id, kind, payload)
+            if await enqueue_notification(db, organization_id, kind, payload):
+                await db.commit()
+                delivery_worker.wake()
     except Exception as exc:
         logger.warning("Background chat notification failed: {}", exc)
 
@@ -246,9 +392,15 @@ async def notify_summary(organization_id: str, title: str, message: str) -> None
     ``notify_entity_created``.
     """
     from app.core.database import async_session_factory
+    from app.services.integration_services.delivery_outbox import (
+        delivery_worker,
+        enqueue_summary,
+    )
 
     try:
         async with async_session_factory() as db:
-            await dispatch_chat_summary(db, organization_id, title, message)
+            if await enqueue_summary(db, organization_id, title, message):
+                await db.commit()
+                delivery_worker.wake()
     except Exception as exc:
         logger.warning("Background chat summary failed: {}", exc)
@@ -5,6 +5,7 @@ Sends notifications to Slack channels via incoming webhook URLs
 using Slack Block Kit formatting.
 """
 
+import asyncio
 from typing import Any
 
 from loguru import logger
@@ -13,6 +14,16 @@ from app.services.integration_services.base import create_integration_client
 from app.utils.url_validator import assert_outbound_url_safe
 
 
+def build_slack_payload(
+    text: str, blocks: list[dict[str, Any]] | None = None
+) -> dict[str, Any]:
+    """Incoming-webhook body for a message with optional Block Kit blocks."""
+    payload: dict[str, Any] = {"text": text}
+    if blocks:
+        payload["blocks"] = blocks
+    return payload
+
+
 async def send_slack_notification(
     webhook_url: str,
     text: str,
@@ -32,17 +43,15 @@ async def send_slack_notification(
     # SSRF: re-validate the destination at send time (config-save validation
     # can't defend against DNS-rebinding). Fail closed on an unsafe URL.
     try:
-        assert_outbound_url_safe(webhook_url)
+        await asyncio.to_thread(assert_outbound_url_safe, webhook_url)
     except ValueError:
         logger.warning("Blocked outbound Slack webhook: URL failed safety validation")
         return False
 
-    payload: dict[str, Any] = {"text": text}
-    if blocks:
-        payload["blocks"] = blocks
-
     async with create_integration_client() as client:
-        response = await client.post(webhook_url, json=payload)
+        response = await client.post(
+            webhook_url, json=build_slack_payload(text, blocks)
+        )
         if response.status_code == 200:
             return True
         logger.warning(
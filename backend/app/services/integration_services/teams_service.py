@@ -5,6 +5,7 @@ Sends notifications to Teams channels via incoming webhook URLs
 using Adaptive Card formatting.
 """
 
+import asyncio
 from typing import Any
 
 from loguru import logger
@@ -13,33 +14,9 @@ from app.services.integration_services.base import create_integration_client
 from app.utils.url_validator import assert_outbound_url_safe
 
 
-async def send_teams_notification(
-    webhook_url: str,
-    title: str,
-    message: str,
-    color: str = "0076D7",
-) -> bool:
-    """
-    POST an Adaptive Card to a Teams incoming webhook.
-
-    Args:
-        webhook_url: The Teams webhook URL (stored encrypted).
-        title: Card title.
-        message: Card body text.
-        color: Theme color hex string (without #).
-
-    Returns:
-        True if the message was sent successfully.
-    """
-    # SSRF: re-validate the destination at send time (config-save validation
-    # can't defend against DNS-rebinding). Fail closed on an unsafe URL.
-    try:
-        assert_outbound_url_safe(webhook_url)
-    except ValueError:
-        logger.warning("Blocked outbound Teams webhook: URL failed safety validation")
-        return False
-
-    payload = {
+def build_teams_payload(title: str, message: str) -> dict[str, Any]:
+    """Incoming-webhook body carrying a title + message Adaptive Card."""
+    return {
         "type": "message",
         "attachments": [
             {
@@ -67,8 +44,37 @@ async def send_teams_notification(
         ],
     }
 
+
+async def send_teams_notification(
+    webhook_url: str,
+    title: str,
+    message: str,
+    color: str = "0076D7",
+) -> bool:
+    """
+    POST an Adaptive Card to a Teams incoming webhook.
+
+    Args:
+        webhook_url: The Teams webhook URL (stored encrypted).
+        title: Card title.
+        message: Card body text.
+        color: Theme color hex string (without #).
+
+    Returns:
+        True if the message was sent successfully.
+    """
+    # SSRF: re-validate the destination at send time (config-save validation
+    # can't defend against DNS-rebinding). Fail closed on an unsafe URL.
+    try:
+        await asyncio.to_thread(assert_outbound_url_safe, webhook_url)
+    except ValueError:
+        logger.warning("Blocked outbound Teams webhook: URL failed safety validation")
+        return False
+
     async with create_integration_client() as client:
-        response = await client.post(webhook_url, json=payload)
+        response = await client.post(
+            webhook_url, json=build_teams_payload(title, message)
+        )
         if response.status_code == 200:
             return True
         logger.warning(
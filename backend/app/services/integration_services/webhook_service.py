@@ -5,6 +5,7 @@ Sends HTTP POST webhooks to arbitrary URLs when app events occur.
 Includes HMAC-SHA256 signature for payload verification.
 """
 
+import asyncio
 import hashlib
 import hmac
 import json
@@ -57,24 +58,12 @@ def verify_shared_secret(provided: str, expected: str) -> bool:
     return hmac.compare_digest(provided, expected)
 
 
-async def send_webhook(
-    url: str,
+def build_webhook_request(
     event_type: str,
     payload: dict[str, Any],
     secret: str | None = None,
-) -> bool:
-    """
-    Send an outbound webhook with optional HMAC signature.
-
-    Args:
-        url: Destination URL.
-        event_type: Event type string (e.g. "event.created").
-        payload: JSON-serializable payload.
-        secret: Optional HMAC secret for X-Webhook-Signature header.
-
-    Returns:
-        True if the webhook was delivered (2xx response).
-    """
+) -> tuple[bytes, dict[str, str]]:
+    """Body and headers of an outbound webhook, signed when *secret* is set."""
     body = json.dumps(
         {
             "event_type": event_type,
@@ -91,18 +80,43 @@ async def send_webhook(
     }
     if secret:
         headers["X-Webhook-Signature"] = f"sha256={_sign_payload(body, secret)}"
+    return body, headers
+
+
+async def send_webhook(
+    url: str,
+    event_type: str,
+    payload: dict[str, Any],
+    secret: str | None = None,
+) -> bool:
+    """
+    Send an outbound webhook with optional HMAC signature.
+
+    Retries inline, so the caller waits out the backoff; event deliveries go
+    through the delivery outbox (delivery_outbox.py) instead.
+
+    Args:
+        url: Destination URL.
+        event_type: Event type string (e.g. "event.created").
+        payload: JSON-serializable payload.
+        secret: Optional HMAC secret for X-Webhook-Signature header.
+
+    Returns:
+        True if the webhook was delivered (2xx response).
+    """
+    body, headers = build_webhook_request(event_type, payload, secret)
 
     # SSRF: re-validate the destination at send time (defends against
     # DNS-rebinding since validation happened at config-save time). Fail closed.
     try:
-        assert_outbound_url_safe(url)
+        await asyncio.to_thread(assert_outbound_url_safe, url)
     except ValueError as exc:
         logger.warning("Blocked outbound webhook to unsafe URL {}: {}", url, exc)
         return False
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            async with create_integration_client() as client:
+    async with create_integration_client() as client:
+        for attempt in range(MAX_RETRIES):
+            try:
                 response = await client.post(url, content=body, headers=headers)
                 if 200 <= response.status_code < 300:
                     return True
@@ -113,17 +127,15 @@ async def send_webhook(
                     attempt + 1,
                     MAX_RETRIES,
                 )
-        except Exception:
-            logger.opt(exception=True).warning(
-                "Webhook to {} failed (attempt {}/{})",
-                url,
-                attempt + 1,
-                MAX_RETRIES,
-            )
-        if attempt < MAX_RETRIES - 1:
-            import asyncio
-
-            await asyncio.sleep(BACKOFF_SECONDS[attempt])
+            except Exception:
+                logger.opt(exception=True).warning(
+                    "Webhook to {} failed (attempt {}/{})",
+                    url,
+                    attempt + 1,
+                    MAX_RETRIES,
+                )
+            if attempt < MAX_RETRIES - 1:
+                await asyncio.sleep(BACKOFF_SECONDS[attempt])
 
     logger.error("Webhook to {} failed after {} attempts", url, MAX_RETRIES)
     return False
@@ -67,7 +67,6 @@ from app.models.user import (
     UserStatus,
     user_positions,
 )
-from app.utils.impact_plan_pdf import render_impact_plan_pdf
 from app.utils.label_renderer import LabelSpec, render_labels, sanitize_barcode_value
 from app.utils.model_updates import apply_updates
 from app.utils.name_matching import normalize_name
@@ -7169,6 +7168,8 @@ class InventoryService:
             "show_existing": bool(filters.get("related_category_id")),
             "show_contact": show_contact,
         }
+        from app.utils.impact_plan_pdf import render_impact_plan_pdf
+
         return render_impact_plan_pdf(data, meta)
 
     async def get_impact_planner_options(self, organization_id) -> Dict[str, Any]:
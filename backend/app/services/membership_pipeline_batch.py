@@ -0,0 +1,491 @@
+"""
+Membership Pipeline Batch Processing
+
+Moves many prospects through their pipelines in one pass. A recruiting drive
+brings in hundreds of applicants at once, and coordinators then move the
+cohort stage by stage; bulk advancing used to run ``advance_prospect`` per
+prospect — two full prospect loads, the stage gate's own lookups, the
+transition writes, a commit and a reload each, with notification emails sent
+inline before the commit. :class:`PipelineBatchProcessor` instead, per chunk
+of up to ``CHUNK_SIZE`` prospects:
+
+* loads and locks the prospects with their progress rows and interviews, and
+  the pipeline definitions they reference, once;
+* gathers what the stage gates read (uploaded documents, passed screenings)
+  in one query per gate type and grades every prospect through the same
+  ``_validate_step_completion`` the single-prospect path uses;
+* writes the transitions in bulk — progress rows, current stages, activity
+  entries and auto-linked meetings — and commits once;
+* queues the emails those transitions owe as :class:`PipelineNotification`
+  entries rather than sending them inside the transaction.
+  :func:`send_pipeline_notifications` delivers them; endpoints run it as a
+  background task after the response.
+
+Leaving a final stage that auto-transfers to membership creates a member
+account, so those prospects still go through ``complete_step`` one at a time
+after their chunk commits.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.membership_pipeline import (
+    MembershipPipeline,
+    MembershipPipelineStep,
+    ProspectActivityLog,
+    ProspectEventLink,
+    ProspectiveMember,
+    ProspectStepProgress,
+    StepProgressStatus,
+)
+from app.models.user import generate_uuid
+from app.services.membership_pipeline_service import MembershipPipelineService
+
+# Prospects per transaction. Bounds the IN lists, the multi-row INSERTs and
+# how long the chunk's row locks are held.
+CHUNK_SIZE = 500
+
+STEP_COMPLETED = "step_completed"
+STAGE_EMAIL = "stage_email"
+
+
+@dataclass(frozen=True)
+class PipelineNotification:
+    """An email owed to a prospect by a committed transition: the completion
+    notice for ``step_id`` (``STEP_COMPLETED``) or the automated email of the
+    stage ``step_id`` they entered (``STAGE_EMAIL``)."""
+
+    kind: str
+    prospect_id: str
+    step_id: str
+
+
+# (prospect, step being completed, step being entered)
+_Move = Tuple[ProspectiveMember, MembershipPipelineStep, MembershipPipelineStep]
+
+
+def _outcome(
+    prospect_id: str, name: Optional[str], error: Optional[str] = None
+) -> Dict[str, Any]:
+    return {
+        "prospect_id": prospect_id,
+        "name": name,
+        "succeeded": error is None,
+        "error": error,
+    }
+
+
+class PipelineBatchProcessor:
+    """Batch counterpart of the per-prospect progression in
+    :class:`MembershipPipelineService`. ``notifications`` collects the emails
+    owed by every chunk committed so far."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.service = MembershipPipelineService(db)
+        self.notifications: List[PipelineNotification] = []
+
+    async def advance(
+        self,
+        prospect_ids: Iterable[str],
+        organization_id: str,
+        advanced_by: str,
+        notes: Optional[str] = None,
+        exclude_prospect_ids: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Complete each prospect's current stage and move them to the next.
+
+        Returns one outcome per id, in order, shaped like ``_bulk_apply``'s:
+        a prospect refused by its stage gate or already at the final stage is
+        itemized with the same message ``advance_prospect`` raises, and ids
+        that are unknown, in another organization or in
+        ``exclude_prospect_ids`` are all reported as "Prospect not found".
+        """
+        # Local import: app.api imports the service layer.
+        from app.api.prospect_privacy import normalize_prospect_id
+
+        ids = [str(i) for i in prospect_ids]
+        hidden = {str(i) for i in (exclude_prospect_ids or []) if i}
+        pending = list(
+            dict.fromkeys(i for i in ids if normalize_prospect_id(i) not in hidden)
+        )
+
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        deferred: List[str] = []
+        names: Dict[str, str] = {}
+        for start in range(0, len(pending), CHUNK_SIZE):
+            chunk = pending[start : start + CHUNK_SIZE]
+            try:
+                deferred += await self._advance_chunk(
+                    chunk, organization_id, advanced_by, notes, outcomes, names
+                )
+            except Exception as exc:
+                # Nothing in the chunk was written; leave the session usable
+                # for the chunks behind it, as _bulk_apply does per prospect.
+                await self.db.rollback()
+                logger.exception(
+                    f"Batch advance failed for {len(chunk)} prospects in org "
+                    f"{organization_id}: {exc}"
+                )
+                for prospect_id in chunk:
+                    if prospect_id not in outcomes:
+                        outcomes[prospect_id] = _outcome(
+                            prospect_id, names.get(prospect_id), "Action failed"
+                        )
+
+        if deferred:
+
+            async def _advance(prospect: ProspectiveMember) -> None:
+                await self.service.advance_prospect(
+                    prospect_id=str(prospect.id),
+                    organization_id=organization_id,
+                    advanced_by=advanced_by,
+                    notes=notes,
+                )
+
+            for result in await self.service._bulk_apply(
+                deferred, organization_id, _advance
+            ):
+                outcomes[result["prospect_id"]] = result
+
+        return [outcomes.get(i) or _outcome(i, None, "Prospect not found") for i in ids]
+
+    async def _advance_chunk(
+        self,
+        prospect_ids: List[str],
+        organization_id: str,
+        advanced_by: str,
+        notes: Optional[str],
+        outcomes: Dict[str, Dict[str, Any]],
+        names: Dict[str, str],
+    ) -> List[str]:
+        """Advance one chunk in one transaction, recording each prospect's
+        outcome and name. Returns the ids left for the per-prospect path."""
+        result = await self.db.execute(
+            select(ProspectiveMember)
+            .where(
+                ProspectiveMember.id.in_(prospect_ids),
+                ProspectiveMember.organization_id == organization_id,
+            )
+            .options(
+                selectinload(ProspectiveMember.pipeline).selectinload(
+                    MembershipPipeline.steps
+                ),
+                selectinload(ProspectiveMember.step_progress),
+                selectinload(ProspectiveMember.interviews),
+            )
+            # Same serialization as complete_step's locked read; a stable lock
+            # order keeps two overlapping batches from deadlocking.
+            .order_by(ProspectiveMember.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        prospects = result.scalars().all()
+
+        sorted_steps: Dict[str, List[MembershipPipelineStep]] = {}
+        candidates: List[_Move] = []
+        deferred: List[str] = []
+        for prospect in prospects:
+            prospect_id = str(prospect.id)
+            names[prospect_id] = prospect.full_name
+            pipeline = prospect.pipeline
+            steps: List[MembershipPipelineStep] = []
+            if pipeline is not None:
+                if str(pipeline.id) not in sorted_steps:
+                    sorted_steps[str(pipeline.id)] = sorted(
+                        pipeline.steps, key=lambda s: s.sort_order
+                    )
+                steps = sorted_steps[str(pipeline.id)]
+            current_idx = next(
+                (
+                    i
+                    for i, s in enumerate(steps)
+                    if str(s.id) == str(prospect.current_step_id)
+                ),
+                -1,
+            )
+            if current_idx < 0:
+                outcomes[prospect_id] = _outcome(
+                    prospect_id,
+                    prospect.full_name,
+                    "Prospect has no current stage to advance from",
+                )
+            elif current_idx >= len(steps) - 1:
+                outcomes[prospect_id] = _outcome(
+                    prospect_id,
+                    prospect.full_name,
+                    "Prospect is already at the final stage",
+                )
+            elif (
+                steps[current_idx].is_final_step and pipeline.auto_transfer_on_approval
+            ):
+                deferred.append(prospect_id)
+            else:
+                candidates.append(
+                    (prospect, steps[current_idx], steps[current_idx + 1])
+                )
+
+        evidence = await self.service._load_step_evidence(
+            (prospect, step) for prospect, step, _ in candidates
+        )
+        moves: List[_Move] = []
+        for prospect, step, next_step in candidates:
+            try:
+                await self.service._validate_step_completion(
+                    prospect, step, None, evidence
+                )
+            except ValueError as exc:
+                outcomes[str(prospect.id)] = _outcome(
+                    str(prospect.id), prospect.full_name, str(exc)
+                )
+                continue
+            moves.append((prospect, step, next_step))
+
+        if moves:
+            await self._write_transitions(moves, organization_id, advanced_by, notes)
+        # Commits the transitions, or just releases the row locks.
+        await self.db.commit()
+
+        for prospect, step, next_step in moves:
+            outcomes[str(prospect.id)] = _outcome(str(prospect.id), prospect.full_name)
+            if step.notify_prospect_on_completion and prospect.email:
+                self.notifications.append(
+                    PipelineNotification(STEP_COMPLETED, str(prospect.id), str(step.id))
+                )
+            if self.service._is_email_step(next_step):
+                self.notifications.append(
+                    PipelineNotification(
+                        STAGE_EMAIL, str(prospect.id), str(next_step.id)
+                    )
+                )
+        return deferred
+
+    async def _write_transitions(
+        self,
+        moves: List[_Move],
+        organization_id: str,
+        advanced_by: str,
+        notes: Optional[str],
+    ) -> None:
+        """Stage every move's writes: the same rows ``complete_step`` and
+        ``_advance_current_step`` write for one prospect, as a handful of
+        multi-row statements."""
+        now = datetime.now(timezone.utc)
+        completed_ids: List[str] = []
+        started_ids: List[str] = []
+        new_progress: List[Dict[str, Any]] = []
+        entering: Dict[str, List[str]] = defaultdict(list)
+        activity: List[Dict[str, Any]] = []
+
+        for prospect, step, next_step in moves:
+            progress = {str(p.step_id): p for p in prospect.step_progress}
+            current = progress.get(str(step.id))
+            if current is not None:
+                completed_ids.append(current.id)
+            else:
+                new_progress.append(
+                    {
+                        "id": generate_uuid(),
+                        "prospect_id": prospect.id,
+                        "step_id": step.id,
+                        "status": StepProgressStatus.COMPLETED,
+                        "completed_at": now,
+                        "completed_by": advanced_by,
+                        "notes": notes,
+                    }
+                )
+            following = progress.get(str(next_step.id))
+            if following is not None:
+                started_ids.append(following.id)
+            entering[str(next_step.id)].append(prospect.id)
+            activity.append(
+                {
+                    "id": generate_uuid(),
+                    "prospect_id": prospect.id,
+                    "action": "step_completed",
+                    "details": {"step_id": str(step.id), "notes": notes},
+                    "performed_by": advanced_by,
+                }
+            )
+            activity.append(
+                {
+                    "id": generate_uuid(),
+                    "prospect_id": prospect.id,
+                    "action": "prospect_advanced",
+                    "details": {
+                        "to_step_id": str(next_step.id),
+                        "to_step_name": next_step.name,
+                        "notes": notes,
+                    },
+                    "performed_by": advanced_by,
+                }
+            )
+
+        if completed_ids:
+            values: Dict[str, Any] = {
+                "status": StepProgressStatus.COMPLETED,
+                "completed_at": now,
+                "completed_by": advanced_by,
+            }
+            if notes:
+                values["notes"] = notes
+            await self.db.execute(
+                update(ProspectStepProgress)
+                .where(ProspectStepProgress.id.in_(completed_ids))
+                .values(**values)
+            )
+        if new_progress:
+            await self.db.execute(insert(ProspectStepProgress), new_progress)
+        if started_ids:
+            await self.db.execute(
+                update(ProspectStepProgress)
+                .where(ProspectStepProgress.id.in_(started_ids))
+                .values(status=StepProgressStatus.IN_PROGRESS)
+            )
+        # One UPDATE per stage being entered — a cohort moves together, so
+        # this is one or two statements, not one per prospect.
+        for step_id, ids in entering.items():
+            await self.db.execute(
+                update(ProspectiveMember)
+                .where(ProspectiveMember.id.in_(ids))
+                .values(current_step_id=step_id)
+            )
+        activity += await self._link_events(moves, organization_id)
+        await self.db.execute(insert(ProspectActivityLog), activity)
+
+    async def _link_events(
+        self, moves: List[_Move], organization_id: str
+    ) -> List[Dict[str, Any]]:
+        """Auto-link entered meeting stages to their next event, as
+        ``_auto_link_event_for_step`` does one prospect at a time: one event
+        lookup per linked event type and category, one query for existing
+        links. Returns the activity entries for the links written."""
+        wanted: Dict[Tuple[str, Optional[str]], List[_Move]] = defaultdict(list)
+        for move in moves:
+            config = move[2].config
+            if isinstance(config, dict) and config.get("linked_event_type"):
+                key = (config["linked_event_type"], config.get("linked_event_category"))
+                wanted[key].append(move)
+
+        links: List[Dict[str, Any]] = []
+        activity: List[Dict[str, Any]] = []
+        for (event_type, event_category), group in wanted.items():
+            event = await self.service._next_linkable_event(
+                organization_id, event_type, event_category
+            )
+            if not event:
+                continue
+            result = await self.db.execute(
+                select(ProspectEventLink.prospect_id).where(
+                    ProspectEventLink.event_id == event.id,
+                    ProspectEventLink.prospect_id.in_([p.id for p, _, _ in group]),
+                )
+            )
+            already_linked = {str(pid) for pid in result.scalars().all()}
+            for prospect, _, next_step in group:
+                if str(prospect.id) in already_linked:
+                    continue
+                already_linked.add(str(prospect.id))
+                links.append(
+                    {
+                        "id": generate_uuid(),
+                        "prospect_id": prospect.id,
+                        "event_id": event.id,
+                        "notes": f"Auto-linked: next {event_type}"
+                        + (f" ({event_category})" if event_category else ""),
+                    }
+                )
+                activity.append(
+                    {
+                        "id": generate_uuid(),
+                        "prospect_id": prospect.id,
+                        "action": "event_auto_linked",
+                        "details": {
+                            "event_id": event.id,
+                            "event_title": event.title,
+                            "step_id": next_step.id,
+                            "step_name": next_step.name,
+                        },
+                        "performed_by": None,
+                    }
+                )
+        if links:
+            await self.db.execute(insert(ProspectEventLink), links)
+        return activity
+
+
+async def deliver_pipeline_notifications(
+    db: AsyncSession,
+    organization_id: str,
+    notifications: Sequence[PipelineNotification],
+) -> int:
+    """Send queued pipeline emails on ``db``; returns how many went out.
+
+    The prospects and steps involved are loaded in one query each, and each
+    email is built by the same ``_send_*`` helper the per-prospect path uses.
+    A prospect or step deleted since the transition is skipped.
+    """
+    if not notifications:
+        return 0
+    result = await db.execute(
+        select(ProspectiveMember).where(
+            ProspectiveMember.id.in_({n.prospect_id for n in notifications}),
+            ProspectiveMember.organization_id == organization_id,
+        )
+        # The stage email reads the pipeline's public-status setting.
+        .options(selectinload(ProspectiveMember.pipeline))
+    )
+    prospects = {str(p.id): p for p in result.scalars().all()}
+    result = await db.execute(
+        select(MembershipPipelineStep).where(
+            MembershipPipelineStep.id.in_({n.step_id for n in notifications})
+        )
+    )
+    steps = {str(s.id): s for s in result.scalars().all()}
+
+    service = MembershipPipelineService(db)
+    sent = 0
+    for notification in notifications:
+        prospect = prospects.get(notification.prospect_id)
+        step = steps.get(notification.step_id)
+        if prospect is None or step is None:
+            continue
+        if notification.kind == STEP_COMPLETED:
+            delivered = await service._send_step_completion_notification(prospect, step)
+        else:
+            delivered = await service._send_stage_email(prospect, step)
+        sent += bool(delivered)
+    # Persist the message-history rows the sends recorded.
+    await db.commit()
+    return sent
+
+
+async def send_pipeline_notifications(
+    organization_id: str, notifications: Sequence[PipelineNotification]
+) -> None:
+    """Background-task entrypoint for :func:`deliver_pipeline_notifications`.
+
+    Intended for ``BackgroundTasks.add_task`` so it runs AFTER the HTTP
+    response, and therefore opens its own session (the request's is closed
+    by then). Never raises: the transitions are already committed.
+    """
+    from app.core.database import async_session_factory
+
+    try:
+        async with async_session_factory() as db:
+            sent = await deliver_pipeline_notifications(
+                db, organization_id, notifications
+            )
+        logger.info(
+            f"Pipeline notifications for org {organization_id}: "
+            f"{sent} of {len(notifications)} sent"
+        )
+    except Exception as exc:
+        logger.warning(f"Background pipeline notifications failed: {exc}")
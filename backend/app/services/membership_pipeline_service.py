@@ -13,7 +13,7 @@ import secrets
 import unicodedata
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from loguru import logger
 from sqlalchemy import and_, delete, func, or_, select, update
@@ -60,6 +60,24 @@ class _ActivityEvent:
     details: Optional[Dict[str, Any]] = None
 
 
+@dataclass
+class _StepEvidence:
+    """What the document-upload and medical-screening gates read, loaded for
+    many prospects at once by ``_load_step_evidence``."""
+
+    # (prospect_id, step_id) -> normalized types uploaded to that stage
+    document_types: Dict[Tuple[str, str], Set[str]]
+    # prospect_id -> screening types passed or completed
+    passed_screenings: Dict[str, Set[str]]
+
+
+def _normalize_document_type(value: Any) -> str:
+    # Document type labels are coordinator-defined free text. Grade both
+    # configured labels and uploaded values using the same Unicode/case/
+    # whitespace normalization.
+    return unicodedata.normalize("NFKC", str(value)).strip().casefold()
+
+
 class MembershipPipelineService:
     """Service for membership pipeline management"""
 
@@ -1101,11 +1119,76 @@ class MembershipPipelineService:
         )
         return {**stored, **(submitted or {})}
 
+    async def _load_step_evidence(
+        self,
+        pairs: Iterable[Tuple[ProspectiveMember, MembershipPipelineStep]],
+    ) -> _StepEvidence:
+        """Load the uploaded documents and passed screenings the gates of
+        every ``(prospect, step)`` pair read — one query per gate type, and
+        none when no pair has such a gate."""
+        evidence = _StepEvidence(document_types={}, passed_screenings={})
+        document_pairs: Set[Tuple[str, str]] = set()
+        screening_prospects: Set[str] = set()
+        screening_types: Set[str] = set()
+        for prospect, step in pairs:
+            config = step.config or {}
+            if step.step_type == PipelineStepType.DOCUMENT_UPLOAD and config.get(
+                "required_document_types"
+            ):
+                document_pairs.add((str(prospect.id), str(step.id)))
+            elif (
+                step.step_type == PipelineStepType.MEDICAL_SCREENING
+                and config.get("required_screenings")
+                and config.get("require_all_passed", True)
+            ):
+                screening_prospects.add(str(prospect.id))
+                screening_types.update(config["required_screenings"])
+
+        if document_pairs:
+            result = await self.db.execute(
+                select(
+                    ProspectDocument.prospect_id,
+                    ProspectDocument.step_id,
+                    ProspectDocument.document_type,
+                ).where(
+                    ProspectDocument.prospect_id.in_({p for p, _ in document_pairs}),
+                    ProspectDocument.step_id.in_({s for _, s in document_pairs}),
+                )
+            )
+            for prospect_id, step_id, document_type in result.all():
+                key = (str(prospect_id), str(step_id))
+                if key in document_pairs:
+                    evidence.document_types.setdefault(key, set()).add(
+                        _normalize_document_type(document_type)
+                    )
+
+        if screening_prospects:
+            from app.models.medical_screening import ScreeningRecord, ScreeningStatus
+
+            result = await self.db.execute(
+                select(
+                    ScreeningRecord.prospect_id, ScreeningRecord.screening_type
+                ).where(
+                    ScreeningRecord.prospect_id.in_(screening_prospects),
+                    ScreeningRecord.screening_type.in_(screening_types),
+                    ScreeningRecord.status.in_(
+                        [ScreeningStatus.PASSED, ScreeningStatus.COMPLETED]
+                    ),
+                )
+            )
+            for prospect_id, screening_type in result.all():
+                evidence.passed_screenings.setdefault(str(prospect_id), set()).add(
+                    screening_type.value
+                )
+
+        return evidence
+
     async def _validate_step_completion(
         self,
         prospect: ProspectiveMember,
         step: MembershipPipelineStep,
         action_result: Optional[Dict[str, Any]] = None,
+        evidence: Optional[_StepEvidence] = None,
     ) -> None:
         """
         Validate that stage-specific requirements are met before allowing
@@ -1113,7 +1196,8 @@ class MembershipPipelineService:
 
         ``action_result`` is the payload submitted with the completion
         request; gates that read action_result grade it merged over the
-        stored progress row (see _effective_action_result).
+        stored progress row (see _effective_action_result). ``evidence`` is
+        preloaded by batch callers; without it the gate loads its own.
         """
         config = step.config or {}
         step_type = step.step_type
@@ -1193,29 +1277,16 @@ class MembershipPipelineService:
         elif step_type == PipelineStepType.DOCUMENT_UPLOAD:
             required_document_types = config.get("required_document_types", [])
             if required_document_types:
-                # Document type labels are coordinator-defined free text. Grade
-                # both configured labels and uploaded values using the same
-                # Unicode/case/whitespace normalization, while retaining the
-                # configured spelling in the error shown to the coordinator.
-                def normalize_document_type(value: Any) -> str:
-                    return unicodedata.normalize("NFKC", str(value)).strip().casefold()
-
-                result = await self.db.execute(
-                    select(ProspectDocument).where(
-                        and_(
-                            ProspectDocument.prospect_id == prospect.id,
-                            ProspectDocument.step_id == step.id,
-                        )
-                    )
+                if evidence is None:
+                    evidence = await self._load_step_evidence([(prospect, step)])
+                uploaded_types = evidence.document_types.get(
+                    (str(prospect.id), str(step.id)), set()
                 )
-                uploaded_types = {
-                    normalize_document_type(document.document_type)
-                    for document in result.scalars().all()
-                }
+                # The error keeps the configured spelling of each missing type.
                 missing = [
                     str(document_type)
                     for document_type in required_document_types
-                    if normalize_document_type(document_type) not in uploaded_types
+                    if _normalize_document_type(document_type) not in uploaded_types
                 ]
                 if missing:
                     raise ValueError(
@@ -1226,27 +1297,9 @@ class MembershipPipelineService:
             required_screenings = config.get("required_screenings", [])
             require_all_passed = config.get("require_all_passed", True)
             if required_screenings and require_all_passed:
-                from app.models.medical_screening import (
-                    ScreeningRecord,
-                    ScreeningStatus,
-                )
-
-                result = await self.db.execute(
-                    select(ScreeningRecord).where(
-                        and_(
-                            ScreeningRecord.prospect_id == prospect.id,
-                            ScreeningRecord.screening_type.in_(required_screenings),
-                            ScreeningRecord.status.in_(
-                                [
-                                    ScreeningStatus.PASSED,
-                                    ScreeningStatus.COMPLETED,
-                                ]
-                            ),
-                        )
-                    )
-                )
-                records = result.scalars().all()
-                passed_types = {r.screening_type.value for r in records}
+                if evidence is None:
+                    evidence = await self._load_step_evidence([(prospect, step)])
+                passed_types = evidence.passed_screenings.get(str(prospect.id), set())
                 missing = [s for s in required_screenings if s not in passed_types]
                 if missing:
                     raise ValueError(
@@ -1897,20 +1950,37 @@ class MembershipPipelineService:
         advanced_by: str,
         notes: Optional[str] = None,
         exclude_prospect_ids: Optional[Iterable[str]] = None,
+        notifications: Optional[List[Any]] = None,
     ) -> List[Dict[str, Any]]:
-        """Advance several prospects, reporting each one's outcome."""
+        """Advance several prospects, reporting each one's outcome.
 
-        async def _advance(prospect: ProspectiveMember) -> None:
-            await self.advance_prospect(
-                prospect_id=str(prospect.id),
-                organization_id=organization_id,
-                advanced_by=advanced_by,
-                notes=notes,
-            )
+        Runs through :class:`PipelineBatchProcessor`, which advances the
+        whole selection in a few queries per chunk. The emails the moves owe
+        are appended to ``notifications`` for the caller to send after its
+        response (``send_pipeline_notifications``); without a list they are
+        sent on this session once the moves are committed.
+        """
+        # Local import: the batch module builds on this one.
+        from app.services.membership_pipeline_batch import (
+            PipelineBatchProcessor,
+            deliver_pipeline_notifications,
+        )
 
-        return await self._bulk_apply(
-            prospect_ids, organization_id, _advance, exclude_prospect_ids
+        processor = PipelineBatchProcessor(self.db)
+        results = await processor.advance(
+            prospect_ids,
+            organization_id,
+            advanced_by,
+            notes=notes,
+            exclude_prospect_ids=exclude_prospect_ids,
         )
+        if notifications is not None:
+            notifications.extend(processor.notifications)
+        elif processor.notifications:
+            await deliver_pipeline_notifications(
+                self.db, organization_id, processor.notifications
+            )
+        return results
 
     async def bulk_set_prospect_status(
         self,
@@ -5339,26 +5409,9 @@ class MembershipPipelineService:
             return
 
         event_category = step.config.get("linked_event_category")
-        now = datetime.now(timezone.utc)
-
-        # Build query for next upcoming event matching type (and category)
-        conditions = [
-            Event.organization_id == prospect.organization_id,
-            Event.event_type == event_type,
-            Event.end_datetime > now,
-            Event.is_cancelled.is_(False),
-        ]
-        if event_category:
-            conditions.append(Event.custom_category == event_category)
-
-        query = (
-            select(Event)
-            .where(and_(*conditions))
-            .order_by(Event.start_datetime.asc())
-            .limit(1)
+        event = await self._next_linkable_event(
+            prospect.organization_id, event_type, event_category
         )
-        result = await self.db.execute(query)
-        event = result.scalar_one_or_none()
         if not event:
             return
 
@@ -5394,3 +5447,28 @@ class MembershipPipelineService:
             },
             performed_by=None,
         )
+
+    async def _next_linkable_event(
+        self,
+        organization_id: str,
+        event_type: str,
+        event_category: Optional[str] = None,
+    ) -> Optional[Event]:
+        """The next upcoming, uncancelled event of ``event_type`` (and
+        ``event_category``, when given) — what a meeting stage auto-links."""
+        conditions = [
+            Event.organization_id == organization_id,
+            Event.event_type == event_type,
+            Event.end_datetime > datetime.now(timezone.utc),
+            Event.is_cancelled.is_(False),
+        ]
+        if event_category:
+            conditions.append(Event.custom_category == event_category)
+
+        result = await self.db.execute(
+            select(Event)
+            .where(and_(*conditions))
+            .order_by(Event.start_datetime.asc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
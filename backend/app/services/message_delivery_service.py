@@ -29,18 +29,29 @@ The fan-out is dispatched to FastAPI ``BackgroundTasks`` so the HTTP response
 returns immediately, and runs on its own database session (the request's
 session is closed by then). It is fire-and-forget: a delivery failure must never
 undo or block the message that was already created.
+
+Fan-out is sized for whole-roster messages. Recipients are resolved as contact
+columns only (``MessagingService._targeted_recipients``), in-app rows are
+written with one multi-row INSERT per chunk, and every database lookup the
+external channels need (SMS consent, push subscriptions) is done up front on
+the session. Email, SMS and push then go out concurrently, each through its own
+bounded worker pool, with progress recorded on
+``DepartmentMessage.delivery_status``.
 """
 
+import asyncio
 import html as _html
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.utils import generate_uuid
 from app.models.notification import DepartmentMessage, NotificationLog
-from app.models.user import Organization, User
+from app.models.user import Organization
+from app.services.messaging_service import MessageRecipient, MessagingService
 
 # Free-form NotificationLog category (matches how other features tag theirs,
 # e.g. "security", "scheduling").
@@ -49,6 +60,11 @@ MESSAGE_CATEGORY = "department_message"
 # SMS bodies are billed per segment, so keep the escalation text short.
 _SMS_MAX_LEN = 300
 
+# Rows per multi-row INSERT when writing in-app notifications. Keeps a single
+# statement well under max_allowed_packet for an 800-member roster with long
+# message bodies.
+_IN_APP_INSERT_CHUNK = 500
+
 # Per-org escalation throttle. Caps how many email/SMS *broadcasts* an
 # organization can fire within the window, so a runaway loop or a compromised
 # admin account can't blast the whole department (SMS especially costs money).
@@ -72,8 +88,12 @@ def _text_to_html(text: str) -> str:
     return _html.escape(text or "").replace("\n", "<br>")
 
 
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
 class MessageDeliveryService:
-    """Fan a posted department message out to in-app / email / SMS channels."""
+    """Fan a posted department message out to in-app / email / SMS / push."""
 
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -86,23 +106,25 @@ class MessageDeliveryService:
         halt a batch of other messages being published, and each channel is
         additionally best-effort so a failure in one doesn't suppress the rest.
         """
+        progress: Dict[str, Any] = {"state": "delivering", "started_at": _now_iso()}
         try:
             # Reuse the exact targeting the inbox uses so escalation and in-app
             # visibility never disagree about who the audience is.
-            from app.services.messaging_service import MessagingService
-
-            recipients = await MessagingService(self.db)._targeted_users(
+            recipients = await MessagingService(self.db)._targeted_recipients(
                 message, str(message.organization_id)
             )
             # Don't notify the author about their own post.
             recipients = [u for u in recipients if str(u.id) != str(message.posted_by)]
+            progress["recipients"] = len(recipients)
             if not recipients:
+                progress.update(state="delivered", completed_at=_now_iso())
+                await self._record_progress(message, progress)
                 return
 
-            priority = _priority_value(message)
-            is_urgent = priority == "urgent"
+            is_urgent = _priority_value(message) == "urgent"
 
-            await self._create_in_app(message, recipients)
+            progress["in_app"] = await self._create_in_app(message, recipients)
+            await self._record_progress(message, progress)
 
             org_result = await self.db.execute(
                 select(Organization).where(
@@ -111,60 +133,113 @@ class MessageDeliveryService:
             )
             org = org_result.scalar_one_or_none()
 
-            # Unconditional: email is the channel of record (see module
-            # docstring). It must run before the SMS branch so that a member
-            # whose SMS is suppressed for want of consent has already been
-            # reached by email.
-            await self._send_email(message, recipients, org)
-
-            if is_urgent:
-                await self._send_sms(message, recipients, org)
+            # Everything below that needs the session runs here, serially: an
+            # AsyncSession cannot be shared by the concurrent sends. Email's
+            # message-history write is the only session use left inside the
+            # gather.
+            numbers = await self._sms_numbers(message, recipients) if is_urgent else []
+            push_subs = await self._push_subscriptions(message, recipients)
+
+            # Email is unconditional — the channel of record (see module
+            # docstring). It runs alongside SMS rather than after it, but it
+            # never depends on the SMS outcome: a member whose text was
+            # suppressed for want of consent is still emailed, and each channel
+            # swallows its own failures so one cannot cancel another.
+            email, sms_sent, (push_sent, stale) = await asyncio.gather(
+                self._send_email(message, recipients, org),
+                self._send_sms(message, numbers, org),
+                self._send_push(message, push_subs),
+            )
+            if stale:
+                from app.services.push_service import PushService
+
+                await PushService(self.db).prune_stale(stale)
+
+            progress.update(
+                state="delivered",
+                completed_at=_now_iso(),
+                email=({"sent": email[0], "failed": email[1]} if email else None),
+                sms=({"numbers": len(numbers), "sent": sms_sent} if numbers else None),
+                push=(
+                    {"devices": len(push_subs), "sent": push_sent}
+                    if push_subs
+                    else None
+                ),
+            )
+            await self._record_progress(message, progress)
         except Exception as e:  # pragma: no cover - defensive
             logger.warning(
                 "Department message delivery failed for {}: {}",
                 getattr(message, "id", "?"),
                 e,
             )
+            progress.update(state="failed", completed_at=_now_iso())
+            await self._record_progress(message, progress)
 
-    async def _create_in_app(
-        self, message: DepartmentMessage, recipients: List[User]
+    async def _record_progress(
+        self, message: DepartmentMessage, progress: Dict[str, Any]
     ) -> None:
-        """Write one in-app NotificationLog per recipient in a single commit."""
+        """Persist fan-out progress on the message. Best-effort."""
+        try:
+            await self.db.execute(
+                update(DepartmentMessage)
+                .where(DepartmentMessage.id == str(message.id))
+                .values(delivery_status=dict(progress))
+            )
+            await self.db.commit()
+        except Exception as e:  # pragma: no cover - defensive
+            await self.db.rollback()
+            logger.warning("Could not record delivery progress: {}", e)
+
+    async def _create_in_app(
+        self, message: DepartmentMessage, recipients: Sequence[MessageRecipient]
+    ) -> int:
+        """Write one in-app NotificationLog per recipient in a single commit.
+
+        Rows go out as multi-row INSERTs of ``_IN_APP_INSERT_CHUNK`` rather than
+        one ORM object (and one INSERT) per member. Returns the rows written.
+        """
         try:
             priority = _priority_value(message)
-            for user in recipients:
-                self.db.add(
-                    NotificationLog(
-                        id=generate_uuid(),
-                        organization_id=str(message.organization_id),
-                        recipient_id=str(user.id),
-                        channel="in_app",
-                        category=MESSAGE_CATEGORY,
-                        subject=message.title,
-                        message=message.body,
-                        action_url="/messages",
-                        delivered=True,
-                        expires_at=message.expires_at,
-                        notification_metadata={
-                            "message_id": str(message.id),
-                            "priority": priority,
-                            "requires_acknowledgment": bool(
-                                message.requires_acknowledgment
-                            ),
-                        },
-                    )
+            metadata = {
+                "message_id": str(message.id),
+                "priority": priority,
+                "requires_acknowledgment": bool(message.requires_acknowledgment),
+            }
+            rows = [
+                {
+                    "id": generate_uuid(),
+                    "organization_id": str(message.organization_id),
+                    "recipient_id": str(user.id),
+                    "channel": "in_app",
+                    "category": MESSAGE_CATEGORY,
+                    "subject": message.title,
+                    "message": message.body,
+                    "action_url": "/messages",
+                    "delivered": True,
+                    "expires_at": message.expires_at,
+                    "notification_metadata": metadata,
+                }
+                for user in recipients
+            ]
+            for i in range(0, len(rows), _IN_APP_INSERT_CHUNK):
+                await self.db.execute(
+                    insert(NotificationLog), rows[i : i + _IN_APP_INSERT_CHUNK]
                 )
             await self.db.commit()
+            return len(rows)
         except Exception as e:  # pragma: no cover - defensive
             await self.db.rollback()
             logger.warning("Department message in-app fan-out failed: {}", e)
+            return 0
 
     async def _send_email(
         self,
         message: DepartmentMessage,
-        recipients: List[User],
+        recipients: Sequence[MessageRecipient],
         org: Optional[Organization],
-    ) -> None:
+    ) -> Optional[Tuple[int, int]]:
+        """Email every addressable recipient; ``(sent, failed)`` or None if skipped."""
         try:
             # Deliberately NOT filtered by the email_notifications preference
             # or by consent: this is the record-of-notice channel, so a member
@@ -172,7 +247,7 @@ class MessageDeliveryService:
             # SMS and the in-app inbox.
             to_emails = [u.email for u in recipients if u.email]
             if not to_emails:
-                return
+                return None
 
             from app.core.security import is_rate_limited
 
@@ -187,7 +262,7 @@ class MessageDeliveryService:
                     message.organization_id,
                     message.id,
                 )
-                return
+                return None
 
             from app.services.email_service import EmailService, wrap_email_body
 
@@ -205,7 +280,9 @@ class MessageDeliveryService:
                 header_color=header_color,
             )
             email_svc = EmailService(organization=org)
-            await email_svc.send_email(
+            # One call for the whole list: the SMTP path already sends the
+            # batch over a single connection on a worker thread.
+            return await email_svc.send_email(
                 to_emails=to_emails,
                 subject=subject,
                 html_body=html_body,
@@ -214,19 +291,20 @@ class MessageDeliveryService:
             )
         except Exception as e:  # pragma: no cover - defensive
             logger.warning("Department message email escalation failed: {}", e)
+            return None
 
-    async def _send_sms(
+    async def _sms_numbers(
         self,
         message: DepartmentMessage,
-        recipients: List[User],
-        org: Optional[Organization],
-    ) -> None:
+        recipients: Sequence[MessageRecipient],
+    ) -> List[str]:
+        """Numbers that may be texted for this urgent message, after throttling."""
         try:
             # Twilio configuration, TCPA consent (fails closed — a member who
             # was never asked counts as having refused) and the member's own
             # sms_notifications preference are all applied here. Everyone
-            # dropped has already received this message by email (see
-            # deliver()), which is the invariant that makes the filter safe.
+            # dropped is emailed regardless (see deliver()), which is the
+            # invariant that makes the filter safe.
             from app.services.notification_channels import (
                 SmsAlert,
                 resolve_sms_recipients,
@@ -236,7 +314,7 @@ class MessageDeliveryService:
                 self.db, recipients, SmsAlert.URGENT_DEPARTMENT_MESSAGE
             )
             if not numbers:
-                return
+                return []
 
             from app.core.security import is_rate_limited
 
@@ -251,8 +329,22 @@ class MessageDeliveryService:
                     message.organization_id,
                     message.id,
                 )
-                return
+                return []
+            return numbers
+        except Exception as e:  # pragma: no cover - defensive
+            logger.warning("Department message SMS escalation failed: {}", e)
+            return []
 
+    async def _send_sms(
+        self,
+        message: DepartmentMessage,
+        numbers: List[str],
+        org: Optional[Organization],
+    ) -> int:
+        """Text ``numbers`` (already consent-filtered); returns sends that succeeded."""
+        if not numbers:
+            return 0
+        try:
             org_name = (org.name if org and org.name else "Department").strip()
             body = f"{org_name} URGENT: {message.title}"
             if len(body) > _SMS_MAX_LEN:
@@ -260,9 +352,44 @@ class MessageDeliveryService:
 
             from app.services.sms_service import SMSService
 
-            await SMSService().send_bulk_sms(numbers, body)
+            return await SMSService().send_bulk_sms(numbers, body)
         except Exception as e:  # pragma: no cover - defensive
             logger.warning("Department message SMS escalation failed: {}", e)
+            return 0
+
+    async def _push_subscriptions(
+        self,
+        message: DepartmentMessage,
+        recipients: Sequence[MessageRecipient],
+    ) -> List[Any]:
+        """Every recipient device registered for web push, in bulk."""
+        try:
+            from app.services.push_service import PushService
+
+            if not PushService.is_configured():
+                return []
+            return await PushService(self.db).subscriptions_for_users(
+                message.organization_id, [str(u.id) for u in recipients]
+            )
+        except Exception as e:  # pragma: no cover - defensive
+            logger.warning("Department message push lookup failed: {}", e)
+            return []
+
+    async def _send_push(
+        self, message: DepartmentMessage, subs: List[Any]
+    ) -> Tuple[int, List[str]]:
+        """Push the in-app notification to ``subs``; ``(sent, stale_hashes)``."""
+        if not subs:
+            return 0, []
+        from app.services.push_service import PushService
+
+        return await PushService(self.db).send_to_subscriptions(
+            subs,
+            title=message.title,
+            body=message.body or "",
+            url="/messages",
+            tag=MESSAGE_CATEGORY,
+        )
 
 
 async def deliver_department_message(message_id: str, organization_id: str) -> None:
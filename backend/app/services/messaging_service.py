@@ -5,6 +5,7 @@ Business logic for internal department messages/announcements.
 Handles creation, targeting, delivery, and read tracking.
 """
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -19,7 +20,22 @@ from app.models.notification import (
     MessagePriority,
     MessageTargetType,
 )
-from app.models.user import Role, User, UserStatus
+from app.models.user import Role, User, UserStatus, user_roles
+
+
+@dataclass(frozen=True)
+class MessageRecipient:
+    """The contact columns delivery needs for one targeted member.
+
+    Deliberately not a ``User``: fan-out to a whole roster should not hydrate
+    hundreds of ORM objects (and their roles) just to read an address.
+    """
+
+    id: str
+    email: Optional[str]
+    mobile: Optional[str]
+    phone: Optional[str]
+    notification_preferences: Optional[Dict[str, Any]]
 
 
 class MessagingService:
@@ -814,6 +830,68 @@ class MessagingService:
                 targeted.append(u)
         return targeted
 
+    async def _targeted_recipients(
+        self, message: DepartmentMessage, organization_id: str
+    ) -> List[MessageRecipient]:
+        """Column-only equivalent of ``_targeted_users`` for delivery.
+
+        Selects just the contact columns, plus the role assignments when the
+        message is role-targeted, and applies the same ``_is_targeted`` rule,
+        so the audience is identical without loading full ``User`` rows.
+        """
+        users_result = await self.db.execute(
+            select(
+                User.id,
+                User.email,
+                User.mobile,
+                User.phone,
+                User.notification_preferences,
+                User.status,
+            ).where(
+                User.organization_id == organization_id,
+                User.is_active,
+            )
+        )
+        rows = users_result.all()
+        if not rows:
+            return []
+
+        target = (
+            message.target_type.value
+            if hasattr(message.target_type, "value")
+            else str(message.target_type)
+        )
+        roles_by_user: Dict[str, Tuple[List[str], List[str]]] = {}
+        if target == "roles":
+            roles_result = await self.db.execute(
+                select(user_roles.c.user_id, Role.id, Role.name)
+                .join(Role, Role.id == user_roles.c.position_id)
+                .where(Role.organization_id == organization_id)
+            )
+            for user_id, role_id, role_name in roles_result.all():
+                ids, names = roles_by_user.setdefault(str(user_id), ([], []))
+                ids.append(str(role_id))
+                names.append(role_name)
+
+        targeted = []
+        for row in rows:
+            user_id = str(row.id)
+            role_ids, role_names = roles_by_user.get(user_id, ([], []))
+            status = (
+                row.status.value if hasattr(row.status, "value") else str(row.status)
+            )
+            if self._is_targeted(message, user_id, role_ids, role_names, status):
+                targeted.append(
+                    MessageRecipient(
+                        id=user_id,
+                        email=row.email,
+                        mobile=row.mobile,
+                        phone=row.phone,
+                        notification_preferences=row.notification_preferences,
+                    )
+                )
+        return targeted
+
     async def get_message_stats(
         self, message_id: str, organization_id: str
     ) -> Dict[str, Any]:
@@ -837,13 +915,14 @@ class MessagingService:
                 DepartmentMessageRead.acknowledged_at.isnot(None),
             )
         )
-        targeted = await self._targeted_users(message, organization_id)
+        targeted = await self._targeted_recipients(message, organization_id)
 
         return {
             "message_id": message_id,
             "total_targeted": len(targeted),
             "total_reads": read_count.scalar() or 0,
             "total_acknowledged": ack_count.scalar() or 0,
+            "delivery": message.delivery_status,
         }
 
     async def get_acknowledgment_report(
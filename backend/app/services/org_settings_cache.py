@@ -0,0 +1,337 @@
+"""
+Organization Settings Cache
+
+Hot paths — authentication (the org-wide MFA requirement), election feature
+flags, shift eligibility, pattern generation, the ICS feed — each used to
+load the ``Organization`` row just to read one key of its settings JSON or its
+timezone. ``org_settings_cache.get(db, organization_id)`` returns a parsed,
+read-only :class:`OrgSettings` instead, from three layers:
+
+* **in-process** — the parsed object, reused for up to
+  ``_LOCAL_RECHECK_SECONDS`` before its version is checked again;
+* **Redis** — the raw settings under a per-organization generation::
+
+      org_settings:{org_id}:gen   → n
+      org_settings:{org_id}:{n}   → {"name": ..., "timezone": ..., "settings": ...}
+
+* **database** — on a miss, stored back under the generation read before the
+  load, so a reader racing a write can only fill a slot that write orphans.
+
+Invalidation
+------------
+``_collect_org_settings_changes`` (``after_flush``) notes organizations whose
+``settings``, ``timezone`` or ``name`` a flush changed — whoever the writer is,
+``OrganizationService`` or any of the modules that edit their own section. Once
+the transaction commits, ``_invalidate_org_settings`` (``after_commit``) drops
+the local entries, increments the generations and publishes the ids on
+``org_settings:invalidate``; every worker's
+:class:`OrgSettingsInvalidationListener` drops its own entries. A missed
+message is bounded by the version recheck; raw SQL writes by
+``ORG_SETTINGS_CACHE_TTL_SECONDS``.
+
+Without Redis there is nothing to invalidate other workers with, so every
+lookup reads the database as before.
+"""
+
+import asyncio
+import copy
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import chain
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from loguru import logger
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+from app.models.user import Organization
+
+_KEY_PREFIX = "org_settings"
+
+ORG_SETTINGS_INVALIDATION_CHANNEL = "org_settings:invalidate"
+
+DEFAULT_TIMEZONE = "America/New_York"
+
+# How long a worker trusts its parsed copy before re-reading the generation.
+# Invalidation messages normally arrive well before this.
+_LOCAL_RECHECK_SECONDS = 30.0
+
+# Columns whose change makes a cached entry stale.
+_CACHED_COLUMNS = ("settings", "timezone", "name")
+
+
+def _generation_key(organization_id: str) -> str:
+    return f"{_KEY_PREFIX}:{organization_id}:gen"
+
+
+def _payload_key(organization_id: str, generation: int) -> str:
+    return f"{_KEY_PREFIX}:{organization_id}:{generation}"
+
+
+@dataclass(frozen=True)
+class OrgSettings:
+    """Parsed, read-only view of an organization's settings.
+
+    Exposes ``id``, ``name``, ``timezone`` and ``settings`` like the model, so
+    helpers written against ``Organization`` accept it. ``settings`` is shared
+    between requests and must not be mutated; writers load the ORM row.
+    """
+
+    id: str
+    name: Optional[str]
+    timezone: Optional[str]
+    settings: Mapping[str, Any] = field(default_factory=dict)
+    version: int = 0
+
+    @classmethod
+    def from_organization(cls, org, version: int = 0) -> "OrgSettings":
+        raw = getattr(org, "settings", None)
+        return cls(
+            id=str(org.id),
+            name=getattr(org, "name", None),
+            timezone=getattr(org, "timezone", None),
+            settings=copy.deepcopy(dict(raw)) if isinstance(raw, Mapping) else {},
+            version=version,
+        )
+
+    @classmethod
+    def from_payload(
+        cls, organization_id: str, payload: dict, version: int
+    ) -> "OrgSettings":
+        return cls(
+            id=organization_id,
+            name=payload.get("name"),
+            timezone=payload.get("timezone"),
+            settings=payload.get("settings") or {},
+            version=version,
+        )
+
+    def to_payload(self) -> dict:
+        return {"name": self.name, "timezone": self.timezone, "settings": self.settings}
+
+    def section(self, key: str) -> Mapping[str, Any]:
+        """One settings section, or an empty mapping if absent or malformed."""
+        value = self.settings.get(key)
+        return value if isinstance(value, Mapping) else {}
+
+    @property
+    def mfa_required(self) -> bool:
+        return bool(self.section("security").get("mfa_required"))
+
+    @cached_property
+    def zoneinfo(self) -> ZoneInfo:
+        return ZoneInfo(self.timezone or DEFAULT_TIMEZONE)
+
+
+class OrgSettingsCache:
+    """Per-worker front of the Redis org-settings cache (see module docstring)."""
+
+    def __init__(self) -> None:
+        self._local: Dict[str, Tuple[float, OrgSettings]] = {}
+        # Bumped by ``forget`` so a load that started before an invalidation
+        # does not repopulate the local layer with what it read.
+        self._epochs: Dict[str, int] = {}
+        # Decrypted email sections keyed by org id, with the raw section they
+        # came from. Process memory only; secrets never go to Redis decrypted.
+        self._email: Dict[str, Tuple[Any, dict]] = {}
+
+    async def get(self, db: AsyncSession, organization_id) -> Optional[OrgSettings]:
+        """Settings of *organization_id*, or ``None`` if it does not exist."""
+        organization_id = str(organization_id)
+        if not cache_manager.is_connected:
+            return await self._load(db, organization_id, 0)
+
+        entry = self._local.get(organization_id)
+        now = time.monotonic()
+        if entry and now < entry[0]:
+            return entry[1]
+
+        epoch = self._epochs.get(organization_id, 0)
+        generation = await cache_manager.get(_generation_key(organization_id)) or 0
+        if entry and entry[1].version == generation:
+            value = entry[1]
+        else:
+            payload = await cache_manager.get(_payload_key(organization_id, generation))
+            if isinstance(payload, dict):
+                value = OrgSettings.from_payload(organization_id, payload, generation)
+            else:
+                value = await self._load(db, organization_id, generation)
+                if value is None:
+                    return None
+                if db.info.get("read_replica") is True:
+                    # May predate the change that bumped the generation.
+                    return value
+                await cache_manager.set(
+                    _payload_key(organization_id, generation),
+                    value.to_payload(),
+                    ttl=settings.ORG_SETTINGS_CACHE_TTL_SECONDS,
+                )
+        if self._epochs.get(organization_id, 0) == epoch:
+            self._local[organization_id] = (now + _LOCAL_RECHECK_SECONDS, value)
+        return value
+
+    async def _load(
+        self, db: AsyncSession, organization_id: str, version: int
+    ) -> Optional[OrgSettings]:
+        result = await db.execute(
+            select(Organization).where(Organization.id == organization_id)
+        )
+        org = result.scalar_one_or_none()
+        return OrgSettings.from_organization(org, version) if org else None
+
+    def forget(self, organization_ids: Iterable[str]) -> None:
+        """Drop this worker's copies of *organization_ids*."""
+        for organization_id in organization_ids:
+            self._local.pop(organization_id, None)
+            self._email.pop(organization_id, None)
+            self._epochs[organization_id] = self._epochs.get(organization_id, 0) + 1
+
+    def email_service_config(self, org) -> dict:
+        """The decrypted ``email_service`` section of *org* (model or view).
+
+        ``EmailService`` is constructed per message, often in a loop; this
+        decrypts the SMTP secrets once per change of the section.
+        """
+        from app.schemas.organization import decrypt_settings_secrets
+
+        section = (getattr(org, "settings", None) or {}).get("email_service")
+        if not isinstance(section, dict):
+            return {}
+        organization_id = str(org.id)
+        cached = self._email.get(organization_id)
+        if cached and cached[0] == section:
+            return cached[1]
+        decrypted = decrypt_settings_secrets({"email_service": section})[
+            "email_service"
+        ]
+        self._email[organization_id] = (copy.deepcopy(section), decrypted)
+        return decrypted
+
+
+org_settings_cache = OrgSettingsCache()
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+_STALE_KEY = "org_settings_stale"
+
+# Strong references to in-flight invalidations (the loop keeps only weak ones).
+_pending_invalidations: set = set()
+
+
+def _settings_changed(session, org: Organization) -> bool:
+    if org in session.deleted:
+        return True
+    attrs = inspect(org).attrs
+    return any(attrs[column].history.has_changes() for column in _CACHED_COLUMNS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_org_settings_changes(session, _flush_context):
+    """Remember which organizations' cached settings this flush made stale."""
+    org_ids = {
+        str(obj.id)
+        for obj in chain(session.dirty, session.deleted)
+        if isinstance(obj, Organization) and _settings_changed(session, obj)
+    }
+    if org_ids:
+        session.info.setdefault(_STALE_KEY, set()).update(org_ids)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_org_settings_changes(session, previous_transaction):
+    # A rolled-back savepoint leaves the outer transaction's marks in place.
+    if previous_transaction.parent is None:
+        session.info.pop(_STALE_KEY, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_org_settings(session):
+    """Invalidate the collected organizations once their change is visible."""
+    org_ids = session.info.pop(_STALE_KEY, None)
+    if not org_ids:
+        return
+    org_settings_cache.forget(org_ids)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:  # synchronous session (scripts, migrations)
+        return
+    task = loop.create_task(invalidate_org_settings(org_ids))
+    _pending_invalidations.add(task)
+    task.add_done_callback(_pending_invalidations.discard)
+
+
+async def invalidate_org_settings(organization_ids: Iterable[str]) -> None:
+    """Orphan the cached settings of *organization_ids* on every worker."""
+    client = cache_manager.redis_client
+    if not cache_manager.is_connected or client is None:
+        return
+    org_ids = sorted(organization_ids)
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for organization_id in org_ids:
+                pipe.incr(_generation_key(organization_id))
+            pipe.publish(ORG_SETTINGS_INVALIDATION_CHANNEL, ",".join(org_ids))
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning("org settings cache invalidation failed: {}", exc)
+
+
+class OrgSettingsInvalidationListener:
+    """Per-worker subscriber that drops local copies on invalidation."""
+
+    def __init__(self) -> None:
+        self._pubsub = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if not (cache_manager.is_connected and cache_manager.redis_client):
+            logger.info(
+                "Org settings invalidation listener not started (Redis "
+                "unavailable); settings are read from the database."
+            )
+            return
+        self._pubsub = cache_manager.redis_client.pubsub()
+        await self._pubsub.subscribe(ORG_SETTINGS_INVALIDATION_CHANNEL)
+        self._task = asyncio.create_task(self._listen())
+        logger.info("✓ Org settings invalidation listener started")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=5.0
+                )
+                if message is None:
+                    continue
+                data = message.get("data")
+                if isinstance(data, bytes):
+                    data = data.decode()
+                org_settings_cache.forget(i for i in str(data).split(",") if i)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Org settings invalidation listener error: {e}")
+                await asyncio.sleep(1)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._pubsub:
+            try:
+                await self._pubsub.unsubscribe()
+                await self._pubsub.close()
+            except Exception:  # pragma: no cover - shutdown best effort
+                pass
+            self._pubsub = None
+
+
+org_settings_invalidation_listener = OrgSettingsInvalidationListener()
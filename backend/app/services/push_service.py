@@ -8,34 +8,39 @@ surface as an error on the action that triggered it.
 
 import asyncio
 import hashlib
+import importlib.util
 import ipaddress
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 from uuid import UUID
 
-import requests
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.metrics import notifications_sent
 from app.models.notification import PushSubscription
 from app.utils.url_validator import assert_outbound_url_safe
 
 logger = logging.getLogger(__name__)
 
-# pywebpush is optional: deployments with PUSH_ENABLED=false should not be
-# forced to install it. Import failure degrades to "push unavailable" rather
-# than breaking application start.
-try:  # pragma: no cover - import guard
-    from pywebpush import WebPushException, webpush
+# Devices pushed to at once by ``send_to_subscriptions``. Each send is a
+# blocking pywebpush call on a worker thread, so this also bounds how much of
+# the default thread pool a roster-wide fan-out can occupy.
+PUSH_SEND_CONCURRENCY = 8
+
+# Member ids per IN (...) when loading subscriptions for a roster.
+_SUBSCRIPTION_LOOKUP_CHUNK = 500
 
-    PYWEBPUSH_AVAILABLE = True
-except ImportError:  # pragma: no cover - import guard
-    webpush = None  # type: ignore[assignment]
-    WebPushException = Exception  # type: ignore[misc,assignment]
-    PYWEBPUSH_AVAILABLE = False
+# pywebpush is optional: deployments with PUSH_ENABLED=false should not be
+# forced to install it. A missing package degrades to "push unavailable"
+# rather than breaking application start. It also drags in requests and
+# aiohttp, so it is imported on the first send rather than at start-up;
+# ``webpush`` stays None until then.
+PYWEBPUSH_AVAILABLE = importlib.util.find_spec("pywebpush") is not None
+webpush = None  # type: ignore[assignment]
 
 
 def hash_endpoint(endpoint: str) -> str:
@@ -183,7 +188,10 @@ class PushService:
         # allowance already baked into the URL validator.
         if settings.ENVIRONMENT in ("production", "staging"):
             assert_outbound_url_safe(sub_info["endpoint"])
-        webpush(
+        send = webpush
+        if send is None:
+            from pywebpush import webpush as send
+        send(
             subscription_info=sub_info,
             data=payload,
             vapid_private_key=settings.VAPID_PRIVATE_KEY,
@@ -225,63 +233,127 @@ class PushService:
         if not subs:
             return 0
 
+        sent, stale = await self.send_to_subscriptions(
+            subs, title=title, body=body, url=url, tag=tag
+        )
+        await self.prune_stale(stale)
+        return sent
+
+    async def subscriptions_for_users(
+        self, organization_id: UUID, user_ids: Sequence[str]
+    ) -> List[PushSubscription]:
+        """Every registered device for ``user_ids``, in one query per chunk.
+
+        The roster-wide counterpart to the per-user lookup in
+        ``send_to_user``, for fan-out callers that would otherwise issue one
+        query per member.
+        """
+        ids = [str(u) for u in user_ids]
+        subs: List[PushSubscription] = []
+        for i in range(0, len(ids), _SUBSCRIPTION_LOOKUP_CHUNK):
+            result = await self.db.execute(
+                select(PushSubscription).where(
+                    PushSubscription.organization_id == str(organization_id),
+                    PushSubscription.user_id.in_(
+                        ids[i : i + _SUBSCRIPTION_LOOKUP_CHUNK]
+                    ),
+                )
+            )
+            subs.extend(result.scalars().all())
+        return subs
+
+    async def send_to_subscriptions(
+        self,
+        subs: Sequence[PushSubscription],
+        title: str,
+        body: str,
+        url: str = "/notifications?tab=inbox",
+        tag: Optional[str] = None,
+        concurrency: int = PUSH_SEND_CONCURRENCY,
+    ) -> Tuple[int, List[str]]:
+        """Push one payload to ``subs``, at most ``concurrency`` at a time.
+
+        Returns ``(sent, stale_endpoint_hashes)``. Touches no database state,
+        so it can overlap other work on the caller's session; pass the stale
+        hashes to ``prune_stale`` afterwards. Never raises.
+        """
+        if not subs or not self.is_configured():
+            return 0, []
+
         payload = json.dumps(
             {"title": title, "body": body, "url": url, "tag": tag or "logbook"}
         )
+        gate = asyncio.Semaphore(max(1, concurrency))
 
-        sent = 0
-        stale: List[str] = []
-        for sub in subs:
-            sub_info = {
-                "endpoint": sub.endpoint,
-                "keys": {"p256dh": sub.p256dh, "auth": sub.auth},
-            }
-            try:
-                # pywebpush is synchronous and does network I/O; running it
-                # inline would block the event loop for every device.
-                await asyncio.to_thread(self._send_one, sub_info, payload)
-                sent += 1
-            except ValueError as e:
-                # NOTIF2-3: the endpoint now resolves to a non-public host
-                # (DNS rebinding, or a subscription that has gone bad). Skip it
-                # — never dispatch to an internal target — but keep the row: a
-                # transient mis-resolution shouldn't permanently drop a device.
-                logger.warning(
-                    "Skipping web push to a non-public endpoint (subscription %s): %s",
-                    sub.id,
-                    e,
-                )
-            except WebPushException as e:
-                status = getattr(getattr(e, "response", None), "status_code", None)
-                # 404/410 mean the browser dropped the subscription — the app
-                # was uninstalled or site data cleared. There is no unsubscribe
-                # callback, so pruning on send is the only way these go away.
-                if status in (404, 410):
-                    stale.append(sub.endpoint_hash)
-                else:
-                    logger.warning(
-                        "Web push failed (status=%s) for subscription %s",
-                        status,
-                        sub.id,
-                    )
-            except requests.exceptions.RequestException as e:
-                # pywebpush does not wrap transport errors in
-                # WebPushException, so a push service outage arrives as a raw
-                # requests error. It affects every device at once, so logging a
-                # traceback per subscription per notification would flood ERROR
-                # for a condition that is transient and non-fatal by design.
-                logger.warning(
-                    "Web push transport error for subscription %s: %s",
-                    sub.id,
-                    type(e).__name__,
-                )
-            except Exception:
-                logger.exception("Unexpected error sending web push")
+        async def _bounded(sub: PushSubscription) -> Tuple[bool, Optional[str]]:
+            async with gate:
+                return await self._push_one(sub, payload)
 
-        if stale:
-            try:
-                await self._delete_by_hashes(stale)
-            except Exception:
-                logger.exception("Failed to prune stale push subscriptions")
+        outcomes = await asyncio.gather(*(_bounded(sub) for sub in subs))
+        sent = sum(1 for ok, _ in outcomes if ok)
+        stale = [h for _, h in outcomes if h]
+        notifications_sent.inc(sent, channel="push", outcome="sent")
+        notifications_sent.inc(len(outcomes) - sent, channel="push", outcome="failed")
+        return sent, stale
 
-        return sent
+    async def prune_stale(self, hashes: List[str]) -> None:
+        """Drop subscriptions the push service reported gone. Never raises."""
+        if not hashes:
+            return
+        try:
+            await self._delete_by_hashes(hashes)
+        except Exception:
+            logger.exception("Failed to prune stale push subscriptions")
+
+    async def _push_one(
+        self, sub: PushSubscription, payload: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Send to one device: ``(delivered, stale_endpoint_hash_or_None)``."""
+        from pywebpush import WebPushException
+        from requests.exceptions import RequestException
+
+        sub_info = {
+            "endpoint": sub.endpoint,
+            "keys": {"p256dh": sub.p256dh, "auth": sub.auth},
+        }
+        try:
+            # pywebpush is synchronous and does network I/O; running it
+            # inline would block the event loop for every device.
+            await asyncio.to_thread(self._send_one, sub_info, payload)
+            return True, None
+        except ValueError as e:
+            # NOTIF2-3: the endpoint now resolves to a non-public host
+            # (DNS rebinding, or a subscription that has gone bad). Skip it
+            # — never dispatch to an internal target — but keep the row: a
+            # transient mis-resolution shouldn't permanently drop a device.
+            logger.warning(
+                "Skipping web push to a non-public endpoint (subscription %s): %s",
+                sub.id,
+                e,
+            )
+        except WebPushException as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            # 404/410 mean the browser dropped the subscription — the app
+            # was uninstalled or site data cleared. There is no unsubscribe
+            # callback, so pruning on send is the only way these go away.
+            if status in (404, 410):
+                return False, sub.endpoint_hash
+            logger.warning(
+                "Web push failed (status=%s) for subscription %s",
+                status,
+                sub.id,
+            )
+        except RequestException as e:
+            # pywebpush does not wrap transport errors in
+            # WebPushException, so a push service outage arrives as a raw
+            # requests error. It affects every device at once, so logging a
+            # traceback per subscription per notification would flood ERROR
+            # for a condition that is transient and non-fatal by design.
+            logger.warning(
+                "Web push transport error for subscription %s: %s",
+                sub.id,
+                type(e).__name__,
+            )
+        except Exception:
+            logger.exception("Unexpected error sending web push")
+        return False, None
@@ -0,0 +1,553 @@
+"""
+QR Self Check-In Fast Path
+
+At a large training everyone scans the door QR code within a few minutes.
+``EventService.self_check_in`` spends a dozen round trips on every scan —
+the event, the member, the training-pipeline phase gate, the organization's
+timezone, the RSVP, a commit and refresh, the training session and an
+existing-record check, a second commit, then the audit entry — so a burst
+queues on the connection pool.
+
+The fast path splits that work in two:
+
+* a per-event **roster** (:class:`CheckInRoster`), loaded once per worker
+  when the QR display page opens (or on the first scan) and trusted for
+  ``ROSTER_TTL_SECONDS``: the event's check-in window, the organization's
+  timezone, the phase-gate warning of every member enrolled in the session's
+  program, and the session that training records are created from. Only
+  immutable copies are cached, never session-bound rows;
+* a per-process **writer** (:class:`CheckInWriter`) that records the scans
+  arriving together in one transaction — read the batch's RSVPs, upsert the
+  new check-ins, add training records, commit — then appends their audit
+  entries to the chain in one go and answers each waiting request.
+
+The response, ``ALREADY_CHECKED_IN`` handling, phase gate and early-arrival
+notice are the same as the regular path. Check-outs, and any scan the writer
+fails to record, go through ``EventService.self_check_in`` instead. Window
+changes (ending or cancelling the event) reach a worker's roster within
+``ROSTER_TTL_SECONDS``.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Dict, List, Mapping, Optional, Tuple
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import func, inspect, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.audit import audit_logger, log_audit_event
+from app.core.utils import generate_uuid
+from app.models.event import Event, EventRSVP, EventType, RSVPStatus
+from app.models.training import (
+    EnrollmentStatus,
+    ProgramEnrollment,
+    ProgramPhase,
+    TrainingRecord,
+    TrainingSession,
+)
+from app.models.user import User
+from app.services.event_service import PHASE_GATE_PREFIX, EventService
+from app.services.org_settings_cache import org_settings_cache
+
+# How long a worker trusts an event's roster before reloading it.
+ROSTER_TTL_SECONDS = 30.0
+
+# Most scans written in one transaction.
+MAX_BATCH_SIZE = 100
+
+# Check-in batches being written at once, each on its own pooled connection.
+MAX_IN_FLIGHT = 4
+
+
+def _detached_copy(row):
+    """A transient copy of an ORM row's column values, safe to share
+    between requests after the loading session is gone."""
+    mapper = inspect(type(row))
+    return type(row)(**{a.key: getattr(row, a.key) for a in mapper.column_attrs})
+
+
+@dataclass(frozen=True)
+class CheckInRoster:
+    """Everything a scan of one event needs that isn't the member's RSVP."""
+
+    event: Event
+    timezone: Optional[str]
+    phase_warnings: Mapping[str, str] = field(default_factory=dict)
+    # Set only for training events whose session auto-creates records.
+    training_session: Optional[TrainingSession] = None
+    loaded_at: float = 0.0
+
+
+async def load_roster(
+    db: AsyncSession, event_id: str, organization_id: str
+) -> Optional[CheckInRoster]:
+    """Load an event's roster, or None if the event is not in the org."""
+    event = (
+        await db.execute(
+            select(Event)
+            .where(Event.id == event_id)
+            .where(Event.organization_id == organization_id)
+        )
+    ).scalar_one_or_none()
+    if event is None:
+        return None
+
+    org = await org_settings_cache.get(db, organization_id)
+    training_session = (
+        await db.execute(
+            select(TrainingSession).where(TrainingSession.event_id == event_id)
+        )
+    ).scalar_one_or_none()
+
+    # Phase gate for every enrolled member at once, with the same rules as
+    # EventService._evaluate_session_phase_warning.
+    phase_warnings: Dict[str, str] = {}
+    if training_session and training_session.program_id and training_session.phase_id:
+        enrollments = (
+            await db.execute(
+                select(ProgramEnrollment.user_id, ProgramEnrollment.current_phase_id)
+                .where(ProgramEnrollment.program_id == training_session.program_id)
+                .where(ProgramEnrollment.status == EnrollmentStatus.ACTIVE)
+            )
+        ).all()
+        phase_ids = {training_session.phase_id} | {
+            phase_id for _, phase_id in enrollments if phase_id
+        }
+        phases = {
+            phase.id: phase
+            for phase in (
+                await db.execute(
+                    select(ProgramPhase).where(ProgramPhase.id.in_(phase_ids))
+                )
+            )
+            .scalars()
+            .all()
+        }
+        session_phase = phases.get(training_session.phase_id)
+        if session_phase is not None:
+            for user_id, current_phase_id in enrollments:
+                warning = EventService._phase_warning_message(
+                    session_phase, phases.get(current_phase_id)
+                )
+                if warning:
+                    phase_warnings[str(user_id)] = warning
+
+    creates_records = (
+        event.event_type == EventType.TRAINING
+        and training_session is not None
+        and training_session.auto_create_records
+    )
+    return CheckInRoster(
+        event=_detached_copy(event),
+        timezone=org.timezone if org else None,
+        phase_warnings=phase_warnings,
+        training_session=(
+            _detached_copy(training_session) if creates_records else None
+        ),
+        loaded_at=time.monotonic(),
+    )
+
+
+class RosterCache:
+    """Per-worker rosters, loaded once per event however many scans arrive
+    together."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], CheckInRoster] = {}
+        self._loading: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    async def get(
+        self, db: AsyncSession, event_id, organization_id
+    ) -> Optional[CheckInRoster]:
+        key = (str(event_id), str(organization_id))
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry.loaded_at < ROSTER_TTL_SECONDS:
+            return entry
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            roster = await load_roster(db, *key)
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; don't warn if none
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(roster)
+            if roster is not None:
+                self._entries[key] = roster
+            return roster
+        finally:
+            del self._loading[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@dataclass
+class _Scan:
+    roster: CheckInRoster
+    user_id: str
+    username: Optional[str]
+    at: datetime
+    done: asyncio.Future
+
+
+class CheckInWriter:
+    """Per-process writer for fast-path check-ins.
+
+    Scans are written in batches of whatever arrived since the last batch
+    started, up to ``MAX_IN_FLIGHT`` batches at a time: a lone scan is
+    written at once on its own, and under a burst the batches grow instead
+    of the queue of connections. Each committed batch's audit entries then
+    go to a single appender, which chains everything waiting onto the log
+    in one transaction (entries must be appended one transaction at a
+    time). A scan is answered once its audit entry is written, and a
+    member's repeat scan while the first is in progress waits for it.
+    """
+
+    def __init__(self) -> None:
+        self._queue: Optional[asyncio.Queue] = None
+        self._audit_queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._audit_task: Optional[asyncio.Task] = None
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._audit_queue = asyncio.Queue()
+            self._pending = {}
+            self._task = loop.create_task(self._loop())
+            self._audit_task = loop.create_task(self._audit_loop())
+            logger.info("QR check-in writer started")
+
+    async def stop(self) -> None:
+        """Record the scans already accepted, then stop."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._audit_queue.put_nowait(None)
+        await self._audit_task
+        self._task = self._audit_task = None
+
+    async def submit(
+        self, roster: CheckInRoster, user_id: str, username: Optional[str]
+    ) -> Tuple[EventRSVP, bool]:
+        """Record a check-in; returns the RSVP and whether the member was
+        already checked in."""
+        await self.start()
+        key = (str(roster.event.id), user_id)
+        pending = self._pending.get(key)
+        if pending is not None:
+            rsvp, _ = await asyncio.shield(pending)
+            return rsvp, True
+
+        done = asyncio.get_running_loop().create_future()
+        self._pending[key] = done
+        self._queue.put_nowait(
+            _Scan(roster, user_id, username, datetime.now(dt_timezone.utc), done)
+        )
+        try:
+            # Shielded: a client that hangs up doesn't unwind the batch.
+            return await asyncio.shield(done)
+        finally:
+            if self._pending.get(key) is done:
+                del self._pending[key]
+
+    async def _loop(self) -> None:
+        slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+        flushes: set = set()
+        stopping = False
+        while not stopping:
+            batch = [await self._queue.get()]
+            await slots.acquire()
+            # Everything that queued up while waiting for a slot goes too.
+            while len(batch) < MAX_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            stopping = None in batch
+            batch = [scan for scan in batch if scan is not None]
+            if not batch:
+                slots.release()
+                continue
+            task = asyncio.create_task(self._flush(batch))
+            flushes.add(task)
+            task.add_done_callback(flushes.discard)
+            task.add_done_callback(lambda _: slots.release())
+        await asyncio.gather(*flushes)
+
+    async def _flush(self, batch: List[_Scan]) -> None:
+        from app.core.database import async_session_factory
+
+        try:
+            async with async_session_factory() as db:
+                outcomes, audit_entries = await self._record(db, batch)
+                await db.commit()
+        except Exception as exc:
+            logger.warning(f"QR check-in batch of {len(batch)} failed: {exc!r}")
+            for scan in batch:
+                if not scan.done.done():
+                    scan.done.set_exception(exc)
+            return
+
+        if audit_entries:
+            appended = asyncio.get_running_loop().create_future()
+            self._audit_queue.put_nowait((audit_entries, appended))
+            await appended
+        for scan, outcome in zip(batch, outcomes):
+            if not scan.done.done():
+                scan.done.set_result(outcome)
+
+    async def _audit_loop(self) -> None:
+        """Append the audit entries of every batch committed meanwhile in
+        one transaction. As on the regular path, a failed append is logged
+        and doesn't undo the check-ins."""
+        from app.core.database import async_session_factory
+
+        stopping = False
+        while not stopping:
+            waiting = [await self._audit_queue.get()]
+            while not self._audit_queue.empty():
+                waiting.append(self._audit_queue.get_nowait())
+            stopping = None in waiting
+            waiting = [item for item in waiting if item is not None]
+            if not waiting:
+                continue
+            entries = [entry for batch_entries, _ in waiting for entry in batch_entries]
+            try:
+                async with async_session_factory() as db:
+                    await audit_logger.create_log_entries(db, entries)
+                    await db.commit()
+            except Exception as exc:
+                logger.error(
+                    f"Failed to append {len(entries)} check-in audit logs: {exc}"
+                )
+            for _, appended in waiting:
+                appended.set_result(None)
+
+    async def _record(
+        self, db: AsyncSession, batch: List[_Scan]
+    ) -> Tuple[List[Tuple[EventRSVP, bool]], List[dict]]:
+        """Write the batch's check-ins; returns each scan's outcome and the
+        audit entries to append for them."""
+        by_event: Dict[str, List[_Scan]] = defaultdict(list)
+        for scan in batch:
+            by_event[scan.roster.event.id].append(scan)
+
+        outcomes: Dict[int, Tuple[str, str, bool]] = {}
+        rsvps: Dict[Tuple[str, str], EventRSVP] = {}
+        audit_entries: List[dict] = []
+        for event_id, scans in by_event.items():
+            roster = scans[0].roster
+            user_ids = {scan.user_id for scan in scans}
+            checked_in = set(
+                (
+                    await db.execute(
+                        select(EventRSVP.user_id)
+                        .where(EventRSVP.event_id == event_id)
+                        .where(EventRSVP.user_id.in_(user_ids))
+                        .where(EventRSVP.checked_in.is_(True))
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+            new_scans = []
+            for scan in scans:
+                already = scan.user_id in checked_in
+                if not already:
+                    checked_in.add(scan.user_id)
+                    new_scans.append(scan)
+                outcomes[id(scan)] = (event_id, scan.user_id, already)
+
+            if new_scans:
+                await self._upsert(db, roster, new_scans)
+                audit_entries.extend(
+                    {
+                        "event_type": "event_checkin",
+                        "event_category": "events",
+                        "severity": "info",
+                        "event_data": {"event_id": event_id, "action": "self_checkin"},
+                        "user_id": scan.user_id,
+                        "username": scan.username,
+                        "organization_id": roster.event.organization_id,
+                    }
+                    for scan in new_scans
+                )
+                if roster.training_session is not None:
+                    await self._create_training_records(db, roster, new_scans)
+
+            result = await db.execute(
+                select(EventRSVP)
+                .where(EventRSVP.event_id == event_id)
+                .where(EventRSVP.user_id.in_(user_ids))
+                .execution_options(populate_existing=True)
+            )
+            for rsvp in result.scalars().all():
+                rsvps[(event_id, rsvp.user_id)] = rsvp
+
+        results = []
+        for scan in batch:
+            event_id, user_id, already = outcomes[id(scan)]
+            results.append((rsvps[(event_id, user_id)], already))
+        return results, audit_entries
+
+    @staticmethod
+    async def _upsert(
+        db: AsyncSession, roster: CheckInRoster, scans: List[_Scan]
+    ) -> None:
+        """Check the members in, creating their RSVP if they never made one.
+        A row checked in by a concurrent writer keeps its original time."""
+        stmt = mysql_insert(EventRSVP).values(
+            [
+                {
+                    "id": generate_uuid(),
+                    "organization_id": roster.event.organization_id,
+                    "event_id": roster.event.id,
+                    "user_id": scan.user_id,
+                    "status": RSVPStatus.GOING,
+                    "guest_count": 0,
+                    "responded_at": scan.at,
+                    "checked_in": True,
+                    "checked_in_at": scan.at,
+                }
+                for scan in scans
+            ]
+        )
+        # MySQL applies these left to right: the time is decided from the
+        # old checked_in before it is overwritten.
+        stmt = stmt.on_duplicate_key_update(
+            [
+                (
+                    "checked_in_at",
+                    func.if_(
+                        EventRSVP.checked_in,
+                        EventRSVP.checked_in_at,
+                        stmt.inserted.checked_in_at,
+                    ),
+                ),
+                ("checked_in", True),
+            ]
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    async def _create_training_records(
+        db: AsyncSession, roster: CheckInRoster, scans: List[_Scan]
+    ) -> None:
+        """Start a training record for each member who has none for this
+        session yet. A failure is logged and leaves the check-ins intact,
+        as on the regular path."""
+        session = roster.training_session
+        event = roster.event
+        try:
+            async with db.begin_nested():
+                existing = set(
+                    (
+                        await db.execute(
+                            select(TrainingRecord.user_id)
+                            .where(
+                                TrainingRecord.user_id.in_(
+                                    [scan.user_id for scan in scans]
+                                )
+                            )
+                            .where(TrainingRecord.course_name == session.course_name)
+                            .where(
+                                TrainingRecord.scheduled_date
+                                == event.start_datetime.date()
+                            )
+                        )
+                    )
+                    .scalars()
+                    .all()
+                )
+                db.add_all(
+                    EventService._check_in_training_record(
+                        session, event, scan.user_id, event.organization_id
+                    )
+                    for scan in scans
+                    if scan.user_id not in existing
+                )
+                await db.flush()
+        except Exception:
+            logger.opt(exception=True).error(
+                "Failed to auto-create training records for {} check-in(s) "
+                "at event {}. Check-ins succeeded but training credit was "
+                "not recorded.",
+                len(scans),
+                event.id,
+            )
+
+
+roster_cache = RosterCache()
+check_in_writer = CheckInWriter()
+
+
+async def self_check_in(
+    db: AsyncSession, event_id: UUID, user: User, override: bool = False
+) -> Tuple[Optional[EventRSVP], Optional[str], Optional[str]]:
+    """Check ``user`` in to an event; same contract as
+    ``EventService.self_check_in`` (check-in only), audit entry included."""
+    roster = await roster_cache.get(db, event_id, user.organization_id)
+    if roster is None:
+        return None, "Event not found", None
+    if roster.event.is_cancelled:
+        return None, "Event has been cancelled", None
+
+    if not override:
+        phase_warning = roster.phase_warnings.get(str(user.id))
+        if phase_warning:
+            return None, PHASE_GATE_PREFIX + phase_warning, None
+
+    now = datetime.now(dt_timezone.utc)
+    service = EventService(db)
+    is_valid, error_msg, notice = service._validate_check_in_window(
+        roster.event, now, roster.timezone
+    )
+    if not is_valid:
+        return None, error_msg, None
+
+    try:
+        rsvp, already = await check_in_writer.submit(
+            roster, str(user.id), user.username
+        )
+    except Exception:
+        # The batch failed; record this scan on its own the regular way.
+        rsvp, error, notice = await service.self_check_in(
+            event_id=event_id,
+            user_id=user.id,
+            organization_id=user.organization_id,
+            override=override,
+        )
+        if error is None:
+            await log_audit_event(
+                db=db,
+                event_type="event_checkin",
+                event_category="events",
+                severity="info",
+                event_data={"event_id": str(event_id), "action": "self_checkin"},
+                user_id=str(user.id),
+                username=user.username,
+            )
+        return rsvp, error, notice
+
+    if already:
+        return rsvp, "ALREADY_CHECKED_IN", None
+    return rsvp, None, notice
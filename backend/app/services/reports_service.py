@@ -34,6 +34,7 @@ from app.models.training import (
 )
 from app.models.user import User, UserStatus
 from app.services.call_tracking_service import CallTrackingService
+from app.services.compliance_status_service import ComplianceStatusService
 from app.utils.sql_ordering import nulls_last_asc
 
 
@@ -1104,29 +1105,20 @@ class ReportsService:
         users = users_result.scalars().all()
         rank_map = await self._get_rank_display_map(organization_id)
 
-        enrollments_result = await self.db.execute(
-            select(ProgramEnrollment)
-            .options(selectinload(ProgramEnrollment.requirement_progress))
-            .where(
-                ProgramEnrollment.organization_id == str(organization_id),
-                ProgramEnrollment.status.in_(
-                    [EnrollmentStatus.ACTIVE, EnrollmentStatus.COMPLETED]
-                ),
-            )
+        # Per-member statuses come from the persisted status table, the same
+        # evaluation the compliance matrix shows; only members invalidated
+        # since the last read are re-evaluated.
+        statuses = await ComplianceStatusService(self.db).get_statuses(
+            organization_id, [u.id for u in users], requirements
         )
-        enrollments = enrollments_result.scalars().unique().all()
-
-        user_completed: Dict[str, set] = {}
-        for enrollment in enrollments:
-            uid = str(enrollment.user_id)
-            if uid not in user_completed:
-                user_completed[uid] = set()
-            for rp in enrollment.requirement_progress or []:
-                if rp.status in (
-                    RequirementProgressStatus.COMPLETED,
-                    RequirementProgressStatus.VERIFIED,
-                ):
-                    user_completed[uid].add(str(rp.requirement_id))
+        user_completed: Dict[str, set] = {
+            uid: {
+                rid
+                for rid, status in by_req.items()
+                if status.status == TrainingStatus.COMPLETED.value
+            }
+            for uid, by_req in statuses.items()
+        }
 
         total_reqs = len(requirements)
         report_entries = []
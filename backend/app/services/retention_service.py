@@ -20,9 +20,11 @@ Platform-level classes (no organization column, e.g. blocked access
 attempts) are configured via environment settings, not org settings.
 """
 
+import asyncio
 import copy
+import time
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
@@ -30,7 +32,9 @@ from loguru import logger
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_manager
 from app.core.config import settings
+from app.models.analytics import AnalyticsEvent
 from app.models.email_template import MessageHistory
 from app.models.error_log import ErrorLog
 from app.models.event import EventExternalAttendee
@@ -42,6 +46,14 @@ from app.models.user import Organization
 
 _DELETE_BATCH_SIZE = 1000
 
+_CHECKPOINT_KEY = "retention:checkpoint:{}"
+_CHECKPOINT_TTL_SECONDS = 2 * 24 * 3600
+# A checkpoint older than this belongs to an abandoned run; start afresh.
+_RESUME_WINDOW = timedelta(hours=20)
+# Watermarks are written at most this often; a crash repeats at most this
+# much work, and deleting already-deleted rows is a no-op.
+_CHECKPOINT_INTERVAL_SECONDS = 2.0
+
 
 @dataclass(frozen=True)
 class RecordClass:
@@ -143,9 +155,125 @@ RECORD_CLASSES: list[RecordClass] = [
         min_days=30,
         row_filter=lambda m: m.is_practice.is_(True),
     ),
+    RecordClass(
+        key="analytics_events",
+        description=(
+            "Raw QR check-in analytics events (scans, check-ins, device "
+            "types). Check-in metrics are served from hourly/daily rollups, "
+            "so raw rows only back the analytics export once rolled up. Only "
+            "rows already folded into the rollups are swept, so metrics are "
+            "unaffected."
+        ),
+        model=AnalyticsEvent,
+        timestamp_attr="created_at",
+        default_days=90,
+        min_days=7,
+        row_filter=lambda m: m.rolled_up.is_(True),
+    ),
 ]
 
 
+@dataclass
+class _Sweep:
+    """One (record class, organization) unit of an enforcement run."""
+
+    key: str
+    model: type
+    timestamp_attr: str
+    cutoff: datetime
+    org_id: str | None
+    row_filter: Callable[[type], Any] | None = None
+
+
+class _RowBudget:
+    """Rows-per-second delete budget shared by concurrent class sweeps."""
+
+    def __init__(self, rows_per_second: int):
+        self.rate = max(0, int(rows_per_second or 0))
+        self._free_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def spend(self, rows: int) -> None:
+        if not self.rate:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._free_at)
+            self._free_at = start + rows / self.rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+@dataclass
+class _Checkpoint:
+    """Progress of an enforcement run, kept in Redis so a restart resumes.
+
+    Holds the run's start time (so cutoffs stay put across a resume), the
+    sweeps already finished, and the timestamp watermark reached by each
+    sweep in progress. Without Redis a run simply starts over, which is
+    safe — only rows already past their cutoff are ever deleted.
+    """
+
+    redis_key: str
+    started_at: datetime
+    resumed: bool = False
+    done: set[str] = field(default_factory=set)
+    watermarks: dict[str, str] = field(default_factory=dict)
+    _saved_at: float = 0.0
+
+    @classmethod
+    async def load(cls, only_class: str | None, now: datetime) -> "_Checkpoint":
+        redis_key = _CHECKPOINT_KEY.format(only_class or "all")
+        state = await cache_manager.get(redis_key)
+        if isinstance(state, dict):
+            try:
+                started_at = datetime.fromisoformat(state["started_at"])
+                if now - started_at < _RESUME_WINDOW:
+                    logger.info("Resuming interrupted retention run")
+                    return cls(
+                        redis_key,
+                        started_at,
+                        resumed=True,
+                        done=set(state.get("done", [])),
+                        watermarks=dict(state.get("watermarks", {})),
+                    )
+            except (KeyError, TypeError, ValueError):
+                pass
+        return cls(redis_key, now)
+
+    def watermark(self, key: str) -> datetime | None:
+        value = self.watermarks.get(key)
+        return datetime.fromisoformat(value) if value else None
+
+    async def advance(self, key: str, watermark: datetime | None) -> None:
+        if watermark is not None:
+            self.watermarks[key] = watermark.isoformat()
+        await self._save()
+
+    async def finish(self, key: str) -> None:
+        self.done.add(key)
+        self.watermarks.pop(key, None)
+        await self._save()
+
+    async def _save(self) -> None:
+        now = time.monotonic()
+        if now - self._saved_at < _CHECKPOINT_INTERVAL_SECONDS:
+            return
+        self._saved_at = now
+        await cache_manager.set(
+            self.redis_key,
+            {
+                "started_at": self.started_at.isoformat(),
+                "done": sorted(self.done),
+                "watermarks": self.watermarks,
+            },
+            ttl=_CHECKPOINT_TTL_SECONDS,
+        )
+
+    async def clear(self) -> None:
+        await cache_manager.delete(self.redis_key)
+
+
 class RetentionService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -221,6 +349,76 @@ class RetentionService:
 
     # ----- enforcement ---------------------------------------------------
 
+    def _plan(
+        self, orgs: list[Organization], only_class: str | None, now: datetime
+    ) -> dict[str, list[_Sweep]]:
+        """Sweeps grouped by record class, in org order."""
+        plan: dict[str, list[_Sweep]] = {}
+        for org in orgs:
+            config = self._org_config(org)
+            for rc in RECORD_CLASSES:
+                if only_class is not None and rc.key != only_class:
+                    continue
+                days = self._effective_days(config, rc)
+                if days is None:
+                    continue
+                # Defense in depth: a floor also applies at enforcement
+                # time, in case settings were edited outside the API.
+                plan.setdefault(rc.key, []).append(
+                    _Sweep(
+                        key=f"{org.id}:{rc.key}",
+                        model=rc.model,
+                        timestamp_attr=rc.timestamp_attr,
+                        cutoff=now - timedelta(days=days),
+                        org_id=org.id,
+                        row_filter=rc.row_filter,
+                    )
+                )
+
+        # Platform-level: blocked access attempts carry IP/user-agent PII
+        # and have no org column. Env-configured, 0/None disables.
+        platform_days = (
+            settings.RETENTION_BLOCKED_ATTEMPTS_DAYS if only_class is None else 0
+        )
+        if platform_days:
+            plan["blocked_access_attempts"] = [
+                _Sweep(
+                    key="platform:blocked_access_attempts",
+                    model=BlockedAccessAttempt,
+                    timestamp_attr="blocked_at",
+                    cutoff=now - timedelta(days=max(int(platform_days), 30)),
+                    org_id=None,
+                )
+            ]
+        return plan
+
+    @staticmethod
+    async def _delete_batch(
+        db: AsyncSession, sweep: _Sweep, watermark: datetime | None
+    ) -> tuple[int, datetime | None]:
+        """Delete the oldest expired batch at or after ``watermark``.
+
+        Walks the (organization_id, timestamp) index in timestamp order, so
+        each batch starts where the last ended instead of rescanning rows a
+        ``row_filter`` keeps. Returns the count and the new watermark.
+        """
+        model = sweep.model
+        ts_col = getattr(model, sweep.timestamp_attr)
+        query = select(model.id, ts_col).where(ts_col < sweep.cutoff)
+        if watermark is not None:
+            query = query.where(ts_col >= watermark)
+        if sweep.org_id is not None:
+            query = query.where(model.organization_id == sweep.org_id)
+        if sweep.row_filter is not None:
+            query = query.where(sweep.row_filter(model))
+        rows = (
+            await db.execute(query.order_by(ts_col).limit(_DELETE_BATCH_SIZE))
+        ).all()
+        if not rows:
+            return 0, watermark
+        await db.execute(delete(model).where(model.id.in_([row[0] for row in rows])))
+        return len(rows), rows[-1][1]
+
     async def _delete_expired(
         self,
         model: type,
@@ -231,72 +429,131 @@ class RetentionService:
     ) -> int:
         """Batch-delete expired rows (bounded batches, like the original
         message-history cleanup, to avoid long table locks)."""
-        ts_col = getattr(model, timestamp_attr)
-        deleted = 0
+        sweep = _Sweep("", model, timestamp_attr, cutoff, org_id, row_filter)
+        deleted, watermark = 0, None
         while True:
-            query = select(model.id).where(ts_col < cutoff).limit(_DELETE_BATCH_SIZE)
-            if org_id is not None:
-                query = query.where(model.organization_id == org_id)
-            if row_filter is not None:
-                query = query.where(row_filter(model))
-            ids = (await self.db.execute(query)).scalars().all()
-            if not ids:
-                break
-            await self.db.execute(delete(model).where(model.id.in_(ids)))
+            count, watermark = await self._delete_batch(self.db, sweep, watermark)
             await self.db.flush()
-            deleted += len(ids)
-            if len(ids) < _DELETE_BATCH_SIZE:
-                break
-        return deleted
+            deleted += count
+            if count < _DELETE_BATCH_SIZE:
+                return deleted
 
-    async def enforce(self, only_class: str | None = None) -> dict[str, Any]:
+    async def _run_class(
+        self,
+        class_key: str,
+        sweeps: list[_Sweep],
+        checkpoint: _Checkpoint,
+        budget: _RowBudget,
+        session_factory: Callable[[], AsyncSession] | None,
+        results: dict[str, Any],
+    ) -> None:
+        """Work through one record class's sweeps, org by org.
+
+        With a ``session_factory`` the class gets its own session and each
+        batch is committed, so locks are held for one batch at a time and an
+        interrupted run keeps what it deleted. Without one, batches are
+        flushed on the caller's session and the caller commits.
+        """
+        started = time.monotonic()
+        deleted_total = 0
+
+        async def sweep_all(db: AsyncSession) -> None:
+            nonlocal deleted_total
+            for sweep in sweeps:
+                if sweep.key in checkpoint.done:
+                    continue
+                watermark = checkpoint.watermark(sweep.key)
+                while True:
+                    count, watermark = await self._delete_batch(db, sweep, watermark)
+                    if session_factory is not None:
+                        await db.commit()
+                    else:
+                        await db.flush()
+                    if count:
+                        deleted_total += count
+                        results["deleted"][sweep.key] = (
+                            results["deleted"].get(sweep.key, 0) + count
+                        )
+                        await budget.spend(count)
+                    if count < _DELETE_BATCH_SIZE:
+                        break
+                    await checkpoint.advance(sweep.key, watermark)
+                await checkpoint.finish(sweep.key)
+
+        if session_factory is None:
+            await sweep_all(self.db)
+        else:
+            async with session_factory() as db:
+                await sweep_all(db)
+
+        elapsed = time.monotonic() - started
+        results["classes"][class_key] = {
+            "deleted": deleted_total,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(deleted_total / elapsed, 1) if elapsed else 0.0,
+        }
+
+    async def enforce(
+        self,
+        only_class: str | None = None,
+        *,
+        session_factory: Callable[[], AsyncSession] | None = None,
+        concurrency: int = 1,
+        max_rows_per_second: int = 0,
+    ) -> dict[str, Any]:
         """Apply every org's retention policy plus platform-level classes.
 
         ``only_class`` restricts the run to one record class — used by the
         legacy message_history_cleanup task so it honors per-org config
         instead of its original hardcoded 90 days.
+
+        With a ``session_factory``, up to ``concurrency`` record classes are
+        swept at once (each on its own session, committing per batch),
+        sharing a ``max_rows_per_second`` delete budget (0 = unbounded).
+        Progress is checkpointed in Redis, so a run that dies part-way
+        resumes where it stopped on the next invocation. Without a factory
+        classes run one after another on this service's session and the
+        caller commits, as before.
         """
-        now = datetime.now(UTC)
-        results: dict[str, Any] = {"orgs_processed": 0, "deleted": {}}
+        checkpoint = await _Checkpoint.load(only_class, datetime.now(UTC))
+        results: dict[str, Any] = {
+            "orgs_processed": 0,
+            "deleted": {},
+            "classes": {},
+            "resumed": checkpoint.resumed,
+        }
 
         orgs = (await self.db.execute(select(Organization))).scalars().all()
-        for org in orgs:
-            config = self._org_config(org)
-            for rc in RECORD_CLASSES:
-                if only_class is not None and rc.key != only_class:
-                    continue
-                days = self._effective_days(config, rc)
-                if days is None:
-                    continue
-                # Defense in depth: a floor also applies at enforcement
-                # time, in case settings were edited outside the API.
-                deleted = await self._delete_expired(
-                    rc.model,
-                    rc.timestamp_attr,
-                    now - timedelta(days=days),
-                    org.id,
-                    rc.row_filter,
+        results["orgs_processed"] = len(orgs)
+        plan = self._plan(list(orgs), only_class, checkpoint.started_at)
+
+        budget = _RowBudget(max_rows_per_second)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(class_key: str, sweeps: list[_Sweep]) -> None:
+            async with semaphore:
+                await self._run_class(
+                    class_key, sweeps, checkpoint, budget, session_factory, results
                 )
-                if deleted:
-                    key = f"{org.id}:{rc.key}"
-                    results["deleted"][key] = deleted
-            results["orgs_processed"] += 1
 
-        # Platform-level: blocked access attempts carry IP/user-agent PII
-        # and have no org column. Env-configured, 0/None disables.
-        platform_days = (
-            settings.RETENTION_BLOCKED_ATTEMPTS_DAYS if only_class is None else 0
-        )
-        if platform_days:
-            deleted = await self._delete_expired(
-                BlockedAccessAttempt,
-                "blocked_at",
-                now - timedelta(days=max(int(platform_days), 30)),
-                None,
+        if session_factory is None:
+            for class_key, sweeps in plan.items():
+                await run(class_key, sweeps)
+        else:
+            await asyncio.gather(
+                *(run(class_key, sweeps) for class_key, sweeps in plan.items())
             )
-            if deleted:
-                results["deleted"]["platform:blocked_access_attempts"] = deleted
+        await checkpoint.clear()
 
+        for class_key, stats in results["classes"].items():
+            if stats["deleted"]:
+                logger.info(
+                    "Retention {}: deleted {} rows in {}s ({} rows/s)",
+                    class_key,
+                    stats["deleted"],
+                    stats["seconds"],
+                    stats["rows_per_second"],
+                )
         total = sum(results["deleted"].values())
         if total:
             logger.info(
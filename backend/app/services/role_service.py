@@ -17,6 +17,7 @@ from sqlalchemy.orm import selectinload
 from app.core.audit import log_audit_event
 from app.core.permissions import (
     DEFAULT_ROLES,
+    clear_compiled_permissions,
     get_all_permissions,
     get_rank_default_permissions,
     permission_matches,
@@ -315,6 +316,10 @@ class RoleManagementService:
 
         await db.commit()
         await db.refresh(role)
+        if "permissions" in changes:
+            # Compiled sets are keyed by content, so none can go stale; this
+            # just drops the ones built from the old permission list.
+            clear_compiled_permissions()
 
         # Audit log
         if changes:
@@ -388,6 +393,7 @@ class RoleManagementService:
         # Delete role (cascade will remove user_roles entries)
         await db.delete(role)
         await db.commit()
+        clear_compiled_permissions()
 
         # Audit log
         await log_audit_event(
@@ -31,6 +31,9 @@ Recommended crontab (add to host or container cron):
 # Every 15 minutes — process delayed inventory change notifications
 */15 * * * * curl -s -X POST http://localhost:8000/api/v1/scheduled/run-task?task=inventory_notifications
 
+# Every 15 minutes — fold new QR check-in analytics events into hourly/daily rollups
+*/15 * * * * curl -s -X POST http://localhost:8000/api/v1/scheduled/run-task?task=analytics_rollup
+
 # Every 30 minutes — send event reminders
 */30 * * * * curl -s -X POST http://localhost:8000/api/v1/scheduled/run-task?task=event_reminders
 
@@ -67,12 +70,18 @@ Recommended crontab (add to host or container cron):
 # Weekly on Mondays at 7:15 AM — expiring supplies on apparatus + replacement stock
 15 7 * * 1 curl -s -X POST http://localhost:8000/api/v1/scheduled/run-task?task=supply_expiration_alerts
 
+# Daily at 1:30 AM — refresh persisted member x requirement compliance statuses
+30 1 * * * curl -s -X POST http://localhost:8000/api/v1/scheduled/run-task?task=compliance_status_reconcile
+
 # Daily at 6:30 AM — compliance auto-report generation (monthly on configured day, yearly on Jan 1)
 30 6 * * * curl -s -X POST http://localhost:8000/api/v1/scheduled/run-task?task=compliance_auto_reports
 
 # Daily at 3:00 AM — message history cleanup (delete records older than 90 days)
 0 3 * * * curl -s -X POST http://localhost:8000/api/v1/scheduled/run-task?task=message_history_cleanup
 
+# Daily at 3:15 AM — purge finished chat/webhook deliveries from the delivery outbox
+15 3 * * * curl -s -X POST http://localhost:8000/api/v1/scheduled/run-task?task=integration_delivery_cleanup
+
 # Daily at 7:00 AM — recurring event series end reminders (6 months prior)
 0 7 * * * curl -s -X POST http://localhost:8000/api/v1/scheduled/run-task?task=series_end_reminders
 
@@ -251,6 +260,12 @@ SCHEDULE = {
         "recommended_time": "*/15 * * * *",
         "cron": "*/15 * * * *",
     },
+    "analytics_rollup": {
+        "description": "Fold new QR check-in analytics events into the hourly/daily rollups read by the analytics metrics page",
+        "frequency": "every 15 minutes",
+        "recommended_time": "*/15 * * * *",
+        "cron": "*/15 * * * *",
+    },
     "storefront_payment_reminders": {
         "description": "Email members whose store orders still carry an unpaid balance past the configured grace period",
         "frequency": "daily",
@@ -281,6 +296,12 @@ SCHEDULE = {
         "recommended_time": "Monday 07:15",
         "cron": "15 7 * * 1",
     },
+    "compliance_status_reconcile": {
+        "description": "Re-evaluate every member against every active training requirement and refresh the persisted compliance-status table read by the compliance matrix, dashboard and reports",
+        "frequency": "daily",
+        "recommended_time": "01:30",
+        "cron": "30 1 * * *",
+    },
     "compliance_auto_reports": {
         "description": "Generate and email scheduled compliance reports (monthly on configured day, yearly on Jan 1)",
         "frequency": "daily",
@@ -293,6 +314,12 @@ SCHEDULE = {
         "recommended_time": "03:00",
         "cron": "0 3 * * *",
     },
+    "integration_delivery_cleanup": {
+        "description": "Delete chat/webhook delivery outbox rows delivered over 7 days ago or failed over 30 days ago",
+        "frequency": "daily",
+        "recommended_time": "03:15",
+        "cron": "15 3 * * *",
+    },
     "publish_scheduled_messages": {
         "description": "Publish and escalate department messages whose scheduled send time has arrived",
         "frequency": "every 15 minutes",
@@ -3235,12 +3262,15 @@ async def run_audit_log_archival(db: AsyncSession) -> Dict[str, Any]:
         # Enforce HIPAA_AUDIT_RETENTION_DAYS: export-and-purge rows past
         # retention. Checkpoint-aligned, integrity-gated, and attested so
         # the surviving chain still verifies (see archive_expired_logs).
+        # Committed one checkpoint range at a time, so a years-long backlog
+        # never holds its row locks in a single transaction.
         from app.core.config import settings
 
         retention = await audit_logger.archive_expired_logs(
             db,
             retention_days=settings.HIPAA_AUDIT_RETENTION_DAYS,
             archive_dir=settings.AUDIT_ARCHIVE_DIR,
+            commit_ranges=True,
         )
         results["purged_entries"] = retention["purged_entries"]
         results["archive_file"] = retention["archive_file"]
@@ -3266,6 +3296,7 @@ async def run_audit_log_archival(db: AsyncSession) -> Dict[str, Any]:
                     else None
                 ),
                 "archive_file": retention["archive_file"],
+                "archive_sha256": retention["archive_sha256"],
                 "errors_count": len(results["errors"]),
             },
         )
@@ -3474,11 +3505,18 @@ async def run_retention_enforcement(db: AsyncSession) -> Dict[str, Any]:
     app/services/retention_service.py; departments override per class via
     the organization retention-policy API. Message-history cleanup is one
     of the covered classes (default 90 days, preserving the original
-    hardcoded behavior).
+    hardcoded behavior). Classes are swept concurrently, each on its own
+    session, and the result reports rows deleted per second per class.
     """
+    from app.core.config import settings
+    from app.core.database import async_session_factory
     from app.services.retention_service import RetentionService
 
-    result = await RetentionService(db).enforce()
+    result = await RetentionService(db).enforce(
+        session_factory=async_session_factory,
+        concurrency=settings.RETENTION_CONCURRENCY,
+        max_rows_per_second=settings.RETENTION_MAX_ROWS_PER_SECOND,
+    )
     await db.commit()
     result["task"] = "retention_enforcement"
     return result
@@ -3504,6 +3542,15 @@ async def run_message_history_cleanup(db: AsyncSession) -> Dict[str, Any]:
     }
 
 
+async def run_integration_delivery_cleanup(db: AsyncSession) -> Dict[str, Any]:
+    """Purge finished rows from the chat/webhook delivery outbox."""
+    from app.services.integration_services.delivery_outbox import purge_finished
+
+    deleted = await purge_finished(db)
+    await db.commit()
+    return {"task": "integration_delivery_cleanup", "deleted": deleted}
+
+
 async def run_publish_scheduled_messages(db: AsyncSession) -> Dict[str, Any]:
     """
     Publish department messages whose scheduled send time has arrived.
@@ -4179,6 +4226,72 @@ async def run_compliance_auto_reports(db: AsyncSession) -> Dict[str, Any]:
     }
 
 
+async def run_compliance_status_reconcile(db: AsyncSession) -> Dict[str, Any]:
+    """Refresh every organization's persisted compliance statuses.
+
+    Statuses are date-dependent (windows and expiry roll over at midnight),
+    so this nightly pass re-evaluates every active member ahead of the
+    morning's first dashboard load, prunes rows for departed members and
+    retired requirements, and repairs anything changed outside the ORM
+    invalidation hook in compliance_status_service.
+    """
+    from app.services.compliance_status_service import ComplianceStatusService
+
+    org_result = await db.execute(select(Organization.id).where(Organization.active))
+    org_ids = [str(row) for row in org_result.scalars().all()]
+
+    service = ComplianceStatusService(db)
+    reconciled = 0
+    statuses = 0
+    for org_id in org_ids:
+        try:
+            result = await service.reconcile_organization(org_id)
+            # Commit per org so one org's failure can't discard the others.
+            await db.commit()
+            reconciled += 1
+            statuses += result["statuses"]
+        except Exception as e:
+            logger.warning(
+                "Compliance status reconcile failed for org {}: {}", org_id, e
+            )
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+    return {
+        "task": "compliance_status_reconcile",
+        "organizations": reconciled,
+        "statuses": statuses,
+    }
+
+
+# 200 x 5,000 events per run; a larger backlog drains over several runs.
+_ANALYTICS_ROLLUP_MAX_BATCHES = 200
+
+
+async def run_analytics_rollup(db: AsyncSession) -> Dict[str, Any]:
+    """Fold pending QR check-in analytics events into analytics_rollups.
+
+    Commits per batch, so an interrupted run keeps what it rolled up and the
+    next run resumes from the oldest pending row. A run stops after
+    ``_ANALYTICS_ROLLUP_MAX_BATCHES`` to stay inside its 15-minute slot.
+    """
+    from app.services.analytics_rollup_service import (
+        ROLLUP_BATCH_SIZE,
+        AnalyticsRollupService,
+    )
+
+    service = AnalyticsRollupService(db)
+    rolled = 0
+    for _ in range(_ANALYTICS_ROLLUP_MAX_BATCHES):
+        count = await service.roll_up_batch()
+        await db.commit()
+        rolled += count
+        if count < ROLLUP_BATCH_SIZE:
+            break
+    return {"task": "analytics_rollup", "events": rolled}
+
+
 async def run_series_end_reminders(db: AsyncSession) -> Dict[str, Any]:
     """
     Send email reminders 6 months before a recurring event series ends.
@@ -5083,7 +5196,10 @@ TASK_RUNNERS = {
     "nfpa_retirement_alerts": run_nfpa_retirement_alerts,
     "supply_expiration_alerts": run_supply_expiration_alerts,
     "compliance_auto_reports": run_compliance_auto_reports,
+    "compliance_status_reconcile": run_compliance_status_reconcile,
+    "analytics_rollup": run_analytics_rollup,
     "message_history_cleanup": run_message_history_cleanup,
+    "integration_delivery_cleanup": run_integration_delivery_cleanup,
     "publish_scheduled_messages": run_publish_scheduled_messages,
     "series_end_reminders": run_series_end_reminders,
     "rolling_recurrence_extend": run_rolling_recurrence_extend,
@@ -5116,6 +5232,7 @@ TASK_INTERVALS_SECONDS: Dict[str, int] = {
     "shift_auto_checkout": 900,
     "publish_scheduled_messages": 900,
     "storefront_window_lifecycle": 900,
+    "analytics_rollup": 900,
     # Every 30 minutes
     "event_reminders": 1800,
     "post_event_validation": 1800,
@@ -5132,7 +5249,9 @@ TASK_INTERVALS_SECONDS: Dict[str, int] = {
     "inventory_overdue_alerts": 86400,
     "storefront_payment_reminders": 86400,
     "compliance_auto_reports": 86400,
+    "compliance_status_reconcile": 86400,
     "message_history_cleanup": 86400,
+    "integration_delivery_cleanup": 86400,
     "series_end_reminders": 86400,
     "rolling_recurrence_extend": 86400,
     "trainee_report_escalation": 86400,
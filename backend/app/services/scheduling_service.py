@@ -55,6 +55,7 @@ from app.models.user import (
 from app.services.call_tracking_service import CallTrackingService
 from app.services.member_leave_service import MemberLeaveService
 from app.services.notifications_service import NotificationsService
+from app.services.org_settings_cache import DEFAULT_TIMEZONE, org_settings_cache
 from app.utils.apparatus_ref import (
     apparatus_ref_exists,
     resolve_apparatus_display_map,
@@ -1055,6 +1056,37 @@ class SchedulingService:
         )
         return list(result.scalars().all())
 
+    async def get_user_feed_version(
+        self, user: User, start_date: date, end_date: date
+    ) -> Tuple[Any, ...]:
+        """A cheap version stamp for ``get_shifts_for_user_feed``'s result.
+
+        One aggregate row over the same join: the row count catches added and
+        removed assignments, the newest timestamps catch edits to either the
+        shift or the assignment. Used as the feed's ETag and cache key, so
+        revalidating a subscription never loads the shifts themselves.
+        """
+        result = await self.db.execute(
+            select(
+                func.count(ShiftAssignment.id),
+                func.max(Shift.updated_at),
+                func.max(ShiftAssignment.updated_at),
+                func.max(ShiftAssignment.created_at),
+            )
+            .select_from(Shift)
+            .join(ShiftAssignment, ShiftAssignment.shift_id == Shift.id)
+            .where(ShiftAssignment.user_id == str(user.id))
+            .where(
+                ShiftAssignment.assignment_status.notin_(
+                    self.INACTIVE_ASSIGNMENT_STATUSES
+                )
+            )
+            .where(Shift.organization_id == str(user.organization_id))
+            .where(Shift.shift_date.between(start_date, end_date))
+            .where(Shift.status != ShiftStatus.CANCELLED)
+        )
+        return tuple(result.one())
+
     async def _user_in_org(self, user_id: UUID, organization_id: UUID) -> bool:
         """Return True if user_id belongs to the given organization.
 
@@ -2190,15 +2222,8 @@ class SchedulingService:
 
             # Fetch the organization timezone so template local times
             # are stored as proper UTC datetimes.
-            org_result = await self.db.execute(
-                select(Organization).where(Organization.id == str(organization_id))
-            )
-            org = org_result.scalar_one_or_none()
-            org_tz = (
-                ZoneInfo(org.timezone)
-                if org and org.timezone
-                else ZoneInfo("America/New_York")
-            )
+            org = await org_settings_cache.get(self.db, organization_id)
+            org_tz = org.zoneinfo if org else ZoneInfo(DEFAULT_TIMEZONE)
 
             config = pattern.schedule_config or {}
 
@@ -30,6 +30,7 @@ from app.models.training import (
 from app.models.user import Organization, User
 from app.services.driver_exception_service import DriverExceptionService
 from app.services.evoc_level_service import EvocLevelService
+from app.services.org_settings_cache import OrgSettings, org_settings_cache
 
 # Mapping from training program target_position values to the shift
 # position they unlock upon completion.
@@ -70,6 +71,10 @@ class ShiftEligibilityService:
         )
         return result.scalar_one_or_none()
 
+    async def _get_org_settings(self, organization_id: str) -> Optional[OrgSettings]:
+        """Cached, read-only settings for the eligibility checks."""
+        return await org_settings_cache.get(self.db, organization_id)
+
     def _get_scheduling_settings(self, org: Organization) -> dict:
         """Return the scheduling sub-dict from org.settings, or defaults."""
         return (org.settings or {}).get("scheduling", {})
@@ -189,7 +194,7 @@ class ShiftEligibilityService:
            defined positions (only return positions that are actually
            on the shift).
         """
-        org = await self._get_org(organization_id)
+        org = await self._get_org_settings(organization_id)
         if not org:
             return []
 
@@ -258,7 +263,7 @@ class ShiftEligibilityService:
         per-shift narrowing is deliberately not applied: this is the
         department-wide roster, not a roster for one shift.
         """
-        org = await self._get_org(organization_id)
+        org = await self._get_org_settings(organization_id)
         if not org:
             return {
                 "position": position,
@@ -724,7 +729,7 @@ class ShiftEligibilityService:
             }
         ]
 
-        org = await self._get_org(organization_id)
+        org = await self._get_org_settings(organization_id)
         if not org or not self.get_evoc_enforcement(org):
             return outcome
 
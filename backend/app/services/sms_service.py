@@ -5,10 +5,18 @@ Lightweight wrapper around Twilio for sending SMS notifications.
 Only sends if TWILIO_ENABLED is True and credentials are configured.
 """
 
+import asyncio
 from typing import List
 
 from loguru import logger
 
+from app.core.metrics import notifications_sent
+
+# Texts in flight at once in ``send_bulk_sms``. Twilio's REST client is
+# blocking, so each send occupies a worker thread; this keeps an urgent
+# roster-wide alert from monopolizing the default thread pool.
+SMS_SEND_CONCURRENCY = 8
+
 
 class SMSService:
     """Send SMS messages via Twilio."""
@@ -49,21 +57,36 @@ class SMSService:
             return False
 
         try:
-            message = client.messages.create(
+            # The Twilio client does blocking HTTP; keep it off the event loop.
+            message = await asyncio.to_thread(
+                client.messages.create,
                 body=body,
                 from_=self.from_number,
                 to=to_number,
             )
             logger.info(f"SMS sent to {to_number}: SID={message.sid}")
+            notifications_sent.inc(channel="sms", outcome="sent")
             return True
         except Exception as e:
             logger.error(f"Failed to send SMS to {to_number}: {e}")
+            notifications_sent.inc(channel="sms", outcome="failed")
             return False
 
-    async def send_bulk_sms(self, phone_numbers: List[str], body: str) -> int:
-        """Send the same SMS to multiple numbers. Returns count of successful sends."""
-        sent = 0
-        for number in phone_numbers:
-            if await self.send_sms(number, body):
-                sent += 1
-        return sent
+    async def send_bulk_sms(
+        self,
+        phone_numbers: List[str],
+        body: str,
+        concurrency: int = SMS_SEND_CONCURRENCY,
+    ) -> int:
+        """Send the same SMS to multiple numbers. Returns count of successful sends.
+
+        Up to ``concurrency`` sends are in flight at once.
+        """
+        gate = asyncio.Semaphore(max(1, concurrency))
+
+        async def _bounded(number: str) -> bool:
+            async with gate:
+                return await self.send_sms(number, body)
+
+        results = await asyncio.gather(*(_bounded(n) for n in phone_numbers))
+        return sum(1 for ok in results if ok)
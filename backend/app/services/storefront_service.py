@@ -11,6 +11,7 @@ time. The client never supplies a price — it names products, variants, and
 quantities only.
 """
 
+import asyncio
 import csv
 import io
 import re
@@ -24,6 +25,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.storage import get_storage
 from app.core.utils import generate_uuid
 from app.models.inventory import InventoryItem
 from app.models.notification import NotificationChannel
@@ -509,23 +511,35 @@ class StorefrontService:
         return set(result.scalars().all())
 
     @staticmethod
-    def resolve_image_url(product: StoreProduct, has_image: bool) -> Optional[str]:
+    def resolve_image_url(
+        product: StoreProduct, has_image: bool, size: Optional[str] = None
+    ) -> Optional[str]:
         """The URL a client should render for this product.
 
         An uploaded photo wins over an externally-hosted ``image_url``. The
         ``v=`` cache-buster is the row's update time, so replacing the photo
         invalidates whatever the browser cached without a no-store header.
+        ``size`` picks a rendition (``IMAGE_DERIVATIVES`` in
+        app/utils/image_processing.py); it has no effect on an external
+        ``image_url``.
         """
         if has_image:
             updated = _as_aware(product.updated_at)
             version = int(updated.timestamp()) if updated else 0
-            return f"/api/v1/store/products/{product.id}/image?v={version}"
+            url = f"/api/v1/store/products/{product.id}/image?v={version}"
+            if size and size != "full":
+                url += f"&size={size}"
+            return url
         return product.image_url
 
     async def get_product_image(
         self, product_id: str, organization_id: str
     ) -> Optional[StoreProductImage]:
-        """Fetch the stored photo bytes for one product, org-scoped."""
+        """Fetch the photo row for one product, org-scoped.
+
+        The legacy ``data`` column is deferred; use ``get_legacy_image_bytes``
+        for rows that have not been moved to object storage yet.
+        """
         result = await self.db.execute(
             select(StoreProductImage).where(
                 StoreProductImage.product_id == str(product_id),
@@ -534,6 +548,40 @@ class StorefrontService:
         )
         return result.scalar_one_or_none()
 
+    async def get_legacy_image_bytes(self, image: StoreProductImage) -> Optional[bytes]:
+        """Bytes of a photo still held in the database (pre-storage rows)."""
+        result = await self.db.execute(
+            select(StoreProductImage.data).where(StoreProductImage.id == image.id)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    def product_image_key(
+        organization_id: str, product_id: str, extension: str = "webp"
+    ) -> str:
+        """A fresh storage key for a product photo.
+
+        Unique per upload so a replaced photo never overwrites the object a
+        cached URL (or an in-flight download) still points at.
+        """
+        return (
+            f"store-product-images/{organization_id}/{product_id}/"
+            f"{generate_uuid()}.{extension}"
+        )
+
+    @staticmethod
+    def derivative_key(storage_key: str, size: str) -> str:
+        """Where the ``size`` rendition of the photo at ``storage_key`` lives.
+
+        ``full`` is the photo itself; the others sit beside it, e.g.
+        ``.../<uuid>.card.webp``, so replacing or deleting a photo finds them
+        without another lookup.
+        """
+        if size == "full":
+            return storage_key
+        stem, dot, ext = storage_key.rpartition(".")
+        return f"{stem}.{size}.{ext}" if dot else f"{storage_key}.{size}"
+
     async def set_product_image(
         self,
         product_id: str,
@@ -541,17 +589,43 @@ class StorefrontService:
         data: bytes,
         content_type: str,
         uploaded_by: Optional[str],
+        derivatives: Optional[Dict[str, bytes]] = None,
     ) -> StoreProductImage:
-        """Store (or replace) a product photo."""
+        """Store (or replace) a product photo in object storage.
+
+        ``data`` is the full-size photo; ``derivatives`` holds any smaller
+        renditions (thumbnail, card) to store beside it, in the same
+        ``content_type``, which also names the key's extension.
+        """
         product = await self.get_product(product_id, organization_id)
         if not product:
             raise ValueError("Product not found")
 
+        storage = get_storage()
+        key = self.product_image_key(
+            str(organization_id), product.id, content_type.rpartition("/")[2]
+        )
+        extra = {
+            name: blob for name, blob in (derivatives or {}).items() if name != "full"
+        }
+        new_keys = [key] + [self.derivative_key(key, name) for name in extra]
+        await asyncio.gather(
+            storage.put_bytes(key, data, content_type),
+            *(
+                storage.put_bytes(self.derivative_key(key, name), blob, content_type)
+                for name, blob in extra.items()
+            ),
+        )
+        derivative_sizes = {name: len(blob) for name, blob in extra.items()} or None
+
         existing = await self.get_product_image(product_id, organization_id)
+        previous_keys = self._stored_image_keys(existing)
         if existing is not None:
-            existing.data = data
+            existing.storage_key = key
+            existing.data = None
             existing.content_type = content_type
             existing.byte_size = len(data)
+            existing.derivatives = derivative_sizes
             existing.uploaded_by = uploaded_by
             image = existing
         else:
@@ -559,9 +633,11 @@ class StorefrontService:
                 id=generate_uuid(),
                 organization_id=str(organization_id),
                 product_id=product.id,
-                data=data,
+                storage_key=key,
+                data=None,
                 content_type=content_type,
                 byte_size=len(data),
+                derivatives=derivative_sizes,
                 uploaded_by=uploaded_by,
             )
             self.db.add(image)
@@ -569,8 +645,15 @@ class StorefrontService:
         # Touch the product so resolve_image_url's cache-buster advances and
         # clients stop serving the previous photo from cache.
         product.updated_at = _utcnow()
-        await self.db.commit()
+        try:
+            await self.db.commit()
+        except Exception:
+            for new_key in new_keys:
+                await self._delete_stored_image(new_key)
+            raise
         await self.db.refresh(image)
+        for previous_key in previous_keys:
+            await self._delete_stored_image(previous_key)
         return image
 
     async def delete_product_image(self, product_id: str, organization_id: str) -> None:
@@ -578,11 +661,33 @@ class StorefrontService:
         image = await self.get_product_image(product_id, organization_id)
         if image is None:
             return
+        stored_keys = self._stored_image_keys(image)
         await self.db.delete(image)
         product = await self.get_product(product_id, organization_id)
         if product is not None:
             product.updated_at = _utcnow()
         await self.db.commit()
+        for stored_key in stored_keys:
+            await self._delete_stored_image(stored_key)
+
+    @classmethod
+    def _stored_image_keys(cls, image: Optional[StoreProductImage]) -> List[str]:
+        """Every object in storage belonging to ``image``."""
+        if image is None or not image.storage_key:
+            return []
+        return [image.storage_key] + [
+            cls.derivative_key(image.storage_key, name)
+            for name in (image.derivatives or {})
+        ]
+
+    @staticmethod
+    async def _delete_stored_image(key: str) -> None:
+        # Best effort: the row is already gone or repointed, so a leftover
+        # object is only wasted space, never a dangling reference.
+        try:
+            await get_storage().delete(key)
+        except Exception as exc:
+            logger.warning(f"Failed to delete stored product image {key}: {exc}")
 
     # ==================================================================
     # Order windows
@@ -1043,7 +1148,7 @@ class StorefrontService:
                     "name": product.name,
                     "description": product.description,
                     "image_url": self.resolve_image_url(
-                        product, product.id in products_with_images
+                        product, product.id in products_with_images, size="card"
                     ),
                     "category": product.category,
                     "price": price,
@@ -2,7 +2,8 @@
 Training Compliance Utilities
 
 Shared functions for evaluating training requirement compliance.
-Used by both the dashboard admin-summary and the training compliance-matrix endpoints.
+The dashboard admin-summary and the training compliance-matrix endpoints read
+the persisted results (compliance_status_service), which evaluates pairs here.
 """
 
 import calendar
@@ -17,7 +18,6 @@ from app.models.compliance_config import ComplianceConfig, ComplianceProfile
 from app.models.training import (
     RequirementFrequency,
     RequirementType,
-    TrainingRecord,
     TrainingRequirement,
     TrainingStatus,
 )
@@ -28,7 +28,6 @@ from app.services.training_period import (
 )
 from app.services.training_waiver_service import (
     adjust_required,
-    fetch_org_waivers,
     get_rolling_period_months,
 )
 
@@ -572,16 +571,16 @@ def _find_matching_profile(
 
 def _evaluate_member_compliance(
     member_reqs: list,
-    member_records: list,
-    today: date,
-    waivers: list,
+    member_statuses: dict,
     compliant_threshold: float,
     at_risk_threshold: float,
     threshold_type: str,
-    org_include_current_month: bool = True,
 ) -> Tuple[str, float]:
     """Evaluate a member's compliance status against a set of requirements.
 
+    ``member_statuses`` maps requirement id to the member's persisted
+    ``RequirementStatus`` (see compliance_status_service).
+
     Returns (status, compliance_pct) where status is one of:
     "compliant", "at_risk", "non_compliant".
     """
@@ -590,14 +589,8 @@ def _evaluate_member_compliance(
 
     completed_count = 0
     for req in member_reqs:
-        req_status, _, _ = evaluate_member_requirement(
-            req,
-            member_records,
-            today,
-            waivers=waivers,
-            org_include_current_month=org_include_current_month,
-        )
-        if req_status == TrainingStatus.COMPLETED.value:
+        req_status = member_statuses.get(str(req.id))
+        if req_status and req_status.status == TrainingStatus.COMPLETED.value:
             completed_count += 1
 
     pct = round(completed_count / len(member_reqs) * 100, 1)
@@ -708,33 +701,16 @@ async def compute_org_compliance_pct(db: AsyncSession, org_id: str) -> float:
         at_risk_threshold = config.at_risk_threshold
         threshold_type = config.threshold_type or "percentage"
 
-    # Get all training records for these members
-    records_result = await db.execute(
-        select(TrainingRecord).where(
-            TrainingRecord.organization_id == org_id,
-            TrainingRecord.user_id.in_([m.id for m in members]),
-        )
-    )
-    all_records = records_result.scalars().all()
-
-    # Build lookup: user_id -> [records]
-    records_by_user: Dict[str, list] = {}
-    for r in all_records:
-        records_by_user.setdefault(r.user_id, []).append(r)
-
-    # Fetch waivers
-    waivers_by_user = await fetch_org_waivers(db, str(org_id))
+    # Per-member statuses come from the persisted status table; only members
+    # whose rows were invalidated since the last read are re-evaluated.
+    from app.services.compliance_status_service import ComplianceStatusService
 
-    # Org-wide evaluation-period default; per-requirement overrides are applied
-    # inside the evaluator. Config is already loaded above.
-    org_include_current = True if config is None else bool(config.include_current_month)
-    today = date.today()
+    statuses = await ComplianceStatusService(db).get_statuses(
+        org_id, [m.id for m in members], requirements
+    )
     compliant_count = 0
 
     for member in members:
-        member_records = records_by_user.get(member.id, [])
-        member_waivers = waivers_by_user.get(str(member.id), [])
-
         # Determine which requirements apply to this member
         member_reqs = list(requirements)  # default: all requirements
         member_compliant_threshold = compliant_threshold
@@ -757,13 +733,10 @@ async def compute_org_compliance_pct(db: AsyncSession, org_id: str) -> float:
 
         status, _ = _evaluate_member_compliance(
             member_reqs,
-            member_records,
-            today,
-            member_waivers,
+            statuses.get(str(member.id), {}),
             member_compliant_threshold,
             member_at_risk_threshold,
             threshold_type,
-            org_include_current_month=org_include_current,
         )
         if status == "compliant":
             compliant_count += 1
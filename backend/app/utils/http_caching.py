@@ -0,0 +1,100 @@
+"""Conditional-GET helpers: ETags, If-None-Match and If-Modified-Since.
+
+Endpoints compute a cheap *version stamp* for what they are about to serve —
+a content hash already on record, or a few aggregate columns — and ask
+``is_not_modified`` before loading or rendering the payload. A match is
+answered with ``not_modified_response`` (304, no body), so a revalidating
+client costs one small query instead of the full response.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def make_etag(*parts: Any) -> str:
+    """A strong, quoted ETag derived from the given version-stamp parts."""
+    digest = hashlib.sha256(
+        "\x1f".join("" if p is None else str(p) for p in parts).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an RFC 9110 HTTP-date (always GMT)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_list(header: str) -> Iterable[str]:
+    for tag in header.split(","):
+        tag = tag.strip()
+        # Weak comparison (RFC 9110 §13.1.2): W/"x" matches "x".
+        yield tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    request: Request,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """Whether the client's cached copy is still current.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only
+    consulted when the request carries no ``If-None-Match``.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return etag in _etag_list(if_none_match)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have whole-second resolution.
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def validator_headers(
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+    cache_control: Optional[str] = None,
+) -> dict[str, str]:
+    """The ETag/Last-Modified/Cache-Control headers for a response."""
+    headers: dict[str, str] = {}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def not_modified_response(
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+    cache_control: Optional[str] = None,
+) -> Response:
+    """A bodiless 304 carrying the same validators a 200 would."""
+    return Response(
+        status_code=304,
+        headers=validator_headers(etag, last_modified, cache_control),
+    )
@@ -1,9 +1,22 @@
-"""Image optimization utilities for uploaded images (#21)."""
+"""Image optimization utilities for uploaded images (#21).
 
+Decoding and re-encoding are CPU-bound and hold the GIL, so request handlers
+run them through ``run_image_task``, which hands the work to a small process
+pool (``IMAGE_PROCESS_WORKERS``) and keeps the event loop free while a phone
+photo is being resized. The functions here are plain top-level callables so
+they can be pickled to a worker.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
+from typing import Any, Callable, Optional, TypeVar
 
 from loguru import logger
-from PIL import Image
+from PIL import Image, features
 
 # Maximum dimensions for different image types
 IMAGE_SIZE_LIMITS = {
@@ -14,21 +27,29 @@ IMAGE_SIZE_LIMITS = {
 }
 MAX_INPUT_PIXELS = 25_000_000
 
+# Renditions produced by ``render_derivatives``, each bounded to fit the box:
+# list rows and avatars use the thumbnail, grid cards the card, and the
+# detail view / lightbox the full size.
+IMAGE_DERIVATIVES = {
+    "thumbnail": (200, 200),
+    "card": (600, 600),
+    "full": (1200, 1200),
+}
 
-def optimize_image(
-    file_bytes: bytes,
-    max_size: tuple[int, int] = (1920, 1080),
-    quality: int = 85,
-    output_format: str = "WEBP",
-) -> bytes:
-    """
-    Resize and compress an uploaded image.
+# Encodings renditions can be stored in (``IMAGE_DERIVATIVE_FORMAT``), as
+# (Pillow format, MIME type).
+DERIVATIVE_FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "avif": ("AVIF", "image/avif"),
+}
 
-    - Strips EXIF metadata (privacy)
-    - Converts to WebP for smaller file sizes
-    - Resizes to fit within max_size while preserving aspect ratio
-    - Rejects the upload if processing fails
-    """
+T = TypeVar("T")
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _open_verified(file_bytes: bytes) -> Image.Image:
+    """Decode an upload after the pixel-budget and integrity checks."""
     img = Image.open(BytesIO(file_bytes))
     if img.width * img.height > MAX_INPUT_PIXELS:
         raise Image.DecompressionBombError(
@@ -42,14 +63,35 @@ def optimize_image(
     # Convert RGBA to RGB for JPEG/WebP compatibility
     if img.mode in ("RGBA", "P"):
         img = img.convert("RGB")
+    return img
 
-    # Resize if larger than max dimensions (preserve aspect ratio)
-    img.thumbnail(max_size, Image.LANCZOS)
 
-    # Save optimized
+def _encode(img: Image.Image, output_format: str, quality: int) -> bytes:
     output = BytesIO()
     img.save(output, format=output_format, quality=quality, optimize=True)
-    optimized = output.getvalue()
+    return output.getvalue()
+
+
+def optimize_image(
+    file_bytes: bytes,
+    max_size: tuple[int, int] = (1920, 1080),
+    quality: int = 85,
+    output_format: str = "WEBP",
+) -> bytes:
+    """
+    Resize and compress an uploaded image.
+
+    - Strips EXIF metadata (privacy)
+    - Converts to WebP for smaller file sizes
+    - Resizes to fit within max_size while preserving aspect ratio
+    - Rejects the upload if processing fails
+    """
+    img = _open_verified(file_bytes)
+
+    # Resize if larger than max dimensions (preserve aspect ratio)
+    img.thumbnail(max_size, Image.LANCZOS)
+
+    optimized = _encode(img, output_format, quality)
 
     saved_pct = (1 - len(optimized) / len(file_bytes)) * 100 if file_bytes else 0
     logger.debug(
@@ -57,3 +99,96 @@ def optimize_image(
     )
 
     return optimized
+
+
+def render_derivatives(
+    file_bytes: bytes,
+    sizes: Optional[dict[str, tuple[int, int]]] = None,
+    quality: int = 82,
+    output_format: str = "WEBP",
+) -> dict[str, bytes]:
+    """Decode once and encode one rendition per entry in ``sizes``.
+
+    Same sanitizing as ``optimize_image`` (EXIF stripped, pixel budget,
+    integrity check). Renditions are produced largest first, each resampled
+    from the one before it rather than from the original, which is what keeps
+    three sizes close to the cost of one. ``derivative_format`` picks the
+    ``output_format`` the deployment is configured for.
+    """
+    sizes = sizes or IMAGE_DERIVATIVES
+    current = _open_verified(file_bytes)
+    renditions: dict[str, bytes] = {}
+    for name, box in sorted(
+        sizes.items(), key=lambda item: item[1][0] * item[1][1], reverse=True
+    ):
+        current = current.copy()
+        current.thumbnail(box, Image.LANCZOS)
+        renditions[name] = _encode(current, output_format, quality)
+    return renditions
+
+
+def derivative_format() -> tuple[str, str]:
+    """(Pillow format, MIME type) to encode renditions in.
+
+    Follows ``IMAGE_DERIVATIVE_FORMAT``. AVIF needs a Pillow with libavif
+    (bundled in the wheels since 11.2); without it, renditions are WebP.
+    """
+    from app.core.config import settings
+
+    name = settings.IMAGE_DERIVATIVE_FORMAT.lower()
+    if name == "avif" and not (
+        "avif" in features.modules and features.check_module("avif")
+    ):
+        logger.warning("IMAGE_DERIVATIVE_FORMAT=avif but Pillow lacks AVIF; using WebP")
+        name = "webp"
+    return DERIVATIVE_FORMATS.get(name, DERIVATIVE_FORMATS["webp"])
+
+
+def _get_executor(workers: int, max_tasks: int) -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn, not fork: the parent is a threaded asyncio server, and a
+        # forked child could inherit a lock held by some other thread.
+        # spawn also allows max_tasks_per_child, which recycles workers so
+        # a decoder leak cannot grow one for the life of the server.
+        _executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=max_tasks or None,
+        )
+    return _executor
+
+
+def shutdown_image_pool(wait: bool = True) -> None:
+    """Stop the worker processes (application shutdown, or after a crash)."""
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+async def run_image_task(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a CPU-bound image function off the event loop.
+
+    Uses the process pool when ``IMAGE_PROCESS_WORKERS`` is positive, and a
+    worker thread otherwise (0 suits tests and single-core hosts). ``fn`` and
+    its arguments must be picklable; exceptions it raises are re-raised here.
+    """
+    from app.core.config import settings
+
+    call = functools.partial(fn, *args, **kwargs)
+    if settings.IMAGE_PROCESS_WORKERS <= 0:
+        return await asyncio.to_thread(call)
+
+    executor = _get_executor(
+        settings.IMAGE_PROCESS_WORKERS, settings.IMAGE_WORKER_MAX_TASKS
+    )
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+    except BrokenProcessPool:
+        # A worker died mid-task (e.g. killed for memory on a hostile image).
+        # The pool is unusable from here on; drop it so the next upload gets
+        # a fresh one instead of failing until restart.
+        logger.warning("Image worker pool broke; restarting it")
+        shutdown_image_pool(wait=False)
+        raise
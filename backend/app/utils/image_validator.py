@@ -322,6 +322,35 @@ def get_image_validator() -> ImageValidator:
     return _validator_instance
 
 
+def _sanitize_logo(base64_data: str) -> str:
+    """Worker-side half of ``validate_logo_image_async`` (must be picklable)."""
+    clean_data, _metadata = get_image_validator().validate_and_process(
+        base64_data, enforce_square=False
+    )
+    return clean_data
+
+
+async def validate_logo_image_async(base64_data: Optional[str]) -> Optional[str]:
+    """``validate_logo_image`` with the Pillow work moved off the event loop.
+
+    Runs in the image worker pool (see ``app.utils.image_processing``); same
+    return value and HTTP errors as the synchronous version.
+    """
+    if not base64_data:
+        return None
+
+    from app.utils.image_processing import run_image_task
+
+    try:
+        return await run_image_task(_sanitize_logo, base64_data)
+    except ImageValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid image: {str(e)}")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Image processing failed: {str(e)}"
+        )
+
+
 # Convenience function for FastAPI endpoints
 def validate_logo_image(base64_data: Optional[str]) -> Optional[str]:
     """
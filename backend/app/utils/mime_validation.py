@@ -1,5 +1,8 @@
 """Fail-closed MIME detection for uploads with broad format allowlists."""
 
+# libmagic only needs the leading bytes; streaming callers keep this much.
+MIME_SNIFF_BYTES = 2048
+
 
 def detect_mime_type(content: bytes) -> str:
     """Return the libmagic MIME type or raise when validation is unavailable."""
@@ -7,4 +10,4 @@ def detect_mime_type(content: bytes) -> str:
         import magic
     except ImportError as exc:
         raise RuntimeError("File content validation is unavailable") from exc
-    return str(magic.from_buffer(content[:2048], mime=True))
+    return str(magic.from_buffer(content[:MIME_SNIFF_BYTES], mime=True))
@@ -11,8 +11,16 @@ supply names differ by whole words (size, sterility, packaging), not by typos,
 so token overlap separates real matches from near-misses far better than
 Levenshtein — which happily rates "Oxygen Mask Adult" and "Oxygen Mask
 Pediatric" as nearly identical.
+
+``best_matches`` scores every candidate and suits a one-off query. For many
+queries against one catalog — a 200-line checklist against a 10k-item
+inventory — build a ``NameIndex`` once: it normalizes each name a single
+time and keeps a token -> candidates postings index, so a query only scores
+the candidates it shares a token with. Both go through ``_score``, so the
+numbers are identical.
 """
 
+import heapq
 import re
 from typing import Dict, Iterable, List, Sequence, Tuple
 
@@ -21,6 +29,7 @@ __all__ = [
     "match_score",
     "confidence_for",
     "best_matches",
+    "NameIndex",
     "MIN_SUGGESTION_SCORE",
     "EXACT",
     "STRONG",
@@ -73,12 +82,15 @@ def match_score(a: str, b: str) -> float:
         return 1.0
 
     ta, tb = _tokens(na), _tokens(nb)
-    shared = ta & tb
+    return _score(len(ta & tb), len(ta), len(tb))
+
+
+def _score(shared: int, a_tokens: int, b_tokens: int) -> float:
+    """Token-overlap score from set sizes, for names that differ."""
     if not shared:
         return 0.0
-
-    jaccard = len(shared) / len(ta | tb)
-    if ta <= tb or tb <= ta:
+    jaccard = shared / (a_tokens + b_tokens - shared)
+    if shared == a_tokens or shared == b_tokens:
         return max(jaccard, _SUBSET_SCORE)
     return jaccard
 
@@ -112,6 +124,10 @@ def best_matches(
             scored.append((score, cname, cid))
 
     scored.sort(key=lambda row: (-row[0], row[1]))
+    return _ranked(scored[:limit])
+
+
+def _ranked(scored: Iterable[Tuple[float, str, str]]) -> List[Dict[str, object]]:
     return [
         {
             "id": cid,
@@ -119,10 +135,83 @@ def best_matches(
             "score": round(score, 4),
             "confidence": confidence_for(score),
         }
-        for score, cname, cid in scored[:limit]
+        for score, cname, cid in scored
     ]
 
 
+class NameIndex:
+    """A catalog of ``(id, name)`` pairs prepared for repeated ranking.
+
+    ``index.best_matches(query)`` returns exactly what
+    ``best_matches(query, candidates)`` would, in the same order, but only
+    scores candidates sharing a token with the query — every other candidate
+    scores 0.0 and can never reach a positive ``minimum``.
+    """
+
+    def __init__(self, candidates: Iterable[Tuple[str, str]]):
+        self._ids: List[str] = []
+        self._names: List[str] = []
+        self._normalized: List[str] = []
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        for position, (cid, cname) in enumerate(candidates):
+            normalized = normalize_name(cname)
+            tokens = _tokens(normalized)
+            self._ids.append(cid)
+            self._names.append(cname)
+            self._normalized.append(normalized)
+            self._sizes.append(len(tokens))
+            for token in tokens:
+                self._postings.setdefault(token, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def best_matches(
+        self,
+        query: str,
+        limit: int = 3,
+        minimum: float = MIN_SUGGESTION_SCORE,
+    ) -> List[Dict[str, object]]:
+        """Rank the catalog against ``query``; see ``best_matches``."""
+        normalized = normalize_name(query)
+        tokens = _tokens(normalized)
+
+        # Shared-token count per candidate, straight from the postings.
+        shared: Dict[int, int] = {}
+        if normalized:
+            for token in tokens:
+                for position in self._postings.get(token, ()):
+                    shared[position] = shared.get(position, 0) + 1
+
+        if minimum <= 0.0:
+            # Zero-score candidates qualify too; nothing can be skipped.
+            positions: Iterable[int] = range(len(self._ids))
+        else:
+            positions = shared.keys()
+
+        # Position breaks the last tie, as input order does in the stable
+        # sort ``best_matches`` uses.
+        scored: List[Tuple[float, str, int]] = []
+        for position in positions:
+            candidate = self._normalized[position]
+            if not normalized or not candidate:
+                score = 0.0
+            elif normalized == candidate:
+                score = 1.0
+            else:
+                score = _score(
+                    shared.get(position, 0), len(tokens), self._sizes[position]
+                )
+            if score >= minimum:
+                scored.append((score, self._names[position], position))
+
+        top = heapq.nsmallest(limit, scored, key=lambda row: (-row[0], *row[1:]))
+        return _ranked(
+            (score, cname, self._ids[position]) for score, cname, position in top
+        )
+
+
 def index_by_normalized(candidates: Iterable[Tuple[str, str]]) -> Dict[str, str]:
     """Map normalized name -> id, keeping the first id seen for each name.
 
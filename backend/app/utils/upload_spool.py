@@ -0,0 +1,127 @@
+"""Streaming uploads to disk with incremental size, hash and MIME checks.
+
+Stored uploads used to be read whole into memory, sniffed, then written out,
+so a handful of concurrent 50MB uploads held hundreds of MB per worker. The
+spool reads the request body in fixed-size chunks straight into a temporary
+file created next to its final destination, hashing and counting as it goes,
+and sniffs the MIME type from the first bytes only. Nothing larger than one
+chunk is ever held in memory.
+
+The temporary file lives in the destination directory so that ``commit`` is a
+same-filesystem ``os.replace`` — readers see either no file or the complete
+one, never a partial write. A spool that is not committed is removed when the
+``spool_upload`` block exits, including when validation raises.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from app.core.storage import StorageBackend, StoredObject
+from app.utils.mime_validation import MIME_SNIFF_BYTES, detect_mime_type
+from app.utils.upload_limits import AsyncUpload
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """The upload exceeded the caller's byte limit while spooling."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the {max_bytes}-byte limit")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class SpooledUpload:
+    """An upload fully written to a temporary file, not yet in place."""
+
+    temp_path: str
+    size: int
+    sha256: str
+    mime_type: str
+    head: bytes
+    committed_path: str | None = field(default=None)
+
+    async def commit(self, final_path: str) -> str:
+        """Atomically move the spooled file to ``final_path``."""
+        await asyncio.to_thread(os.replace, self.temp_path, final_path)
+        self.committed_path = final_path
+        return final_path
+
+    async def commit_to_storage(
+        self, storage: StorageBackend, key: str, content_type: str | None = None
+    ) -> StoredObject:
+        """Hand the spooled file to ``storage`` under ``key``.
+
+        Spool into ``storage.staging_dir(key)`` so the local backend can
+        rename rather than copy.
+        """
+        stored = await storage.put_file(key, self.temp_path, content_type)
+        self.committed_path = storage.local_path(key) or key
+        return stored
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@asynccontextmanager
+async def spool_upload(
+    upload: AsyncUpload,
+    directory: str,
+    max_bytes: int,
+    *,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> AsyncIterator[SpooledUpload]:
+    """Stream ``upload`` into ``directory`` and yield the spooled result.
+
+    Raises ``UploadTooLargeError`` as soon as more than ``max_bytes`` have
+    been received (the remainder of the body is never read), and
+    ``RuntimeError`` from ``detect_mime_type`` when libmagic is unavailable.
+    Callers validate ``mime_type``/``size`` and then ``await commit(path)``;
+    anything not committed is deleted on exit.
+    """
+    await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+    fd, temp_path = await asyncio.to_thread(
+        tempfile.mkstemp, prefix=".upload-", suffix=".part", dir=directory
+    )
+    fh = os.fdopen(fd, "wb")
+    digest = hashlib.sha256()
+    head = bytearray()
+    size = 0
+    spooled: SpooledUpload | None = None
+    try:
+        try:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                if len(head) < MIME_SNIFF_BYTES:
+                    head.extend(chunk[: MIME_SNIFF_BYTES - len(head)])
+                await asyncio.to_thread(fh.write, chunk)
+        finally:
+            await asyncio.to_thread(fh.close)
+
+        spooled = SpooledUpload(
+            temp_path=temp_path,
+            size=size,
+            sha256=digest.hexdigest(),
+            mime_type=detect_mime_type(bytes(head)),
+            head=bytes(head),
+        )
+        yield spooled
+    finally:
+        if spooled is None or spooled.committed_path is None:
+            await asyncio.to_thread(_remove_quietly, temp_path)
@@ -31,6 +31,7 @@ async def is_duplicate_webhook(scope: str, body: bytes) -> bool:
         body: Raw request body bytes (already signature-verified by the caller).
     """
     from app.core.cache import cache_manager
+    from app.core.redis_primitives import ReplayNonce, run_checks
 
     if not (cache_manager.is_connected and cache_manager.redis_client):
         # Fail open: without Redis we cannot dedup. Do not drop authentic,
@@ -38,13 +39,11 @@ async def is_duplicate_webhook(scope: str, body: bytes) -> bool:
         return False
 
     fingerprint = hashlib.sha256(scope.encode() + b"|" + body).hexdigest()
-    key = f"webhook_seen:{fingerprint}"
+    check = ReplayNonce(f"webhook_seen:{fingerprint}", WEBHOOK_DEDUP_TTL_SECONDS)
     try:
-        # SET NX EX is atomic: returns truthy only if the key was newly created.
-        added = await cache_manager.redis_client.set(
-            key, "1", nx=True, ex=WEBHOOK_DEDUP_TTL_SECONDS
-        )
-        return not added
+        # SET NX EX is atomic: only the first delivery creates the key.
+        (seen,) = await run_checks(cache_manager.redis_client, [check])
+        return check.denies(seen)
     except Exception as exc:
         logger.warning("Webhook replay check failed (allowing delivery): {}", exc)
         return False
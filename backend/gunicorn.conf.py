@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration for the optional preload-then-fork server mode.
+
+``uvicorn --workers N`` starts every worker as a fresh interpreter, so each
+one imports the whole application (routers, schemas, models) by itself and
+keeps a private copy of it. Here the master imports ``main`` once
+(``preload_app``), moves everything that import created out of the cyclic
+garbage collector's reach, and forks the workers, which then share those
+pages copy-on-write. Per-worker state — database pool, Redis, listeners,
+background loops — is still created by the FastAPI lifespan after the fork.
+
+Usage (from backend/):
+
+    gunicorn main:app -c gunicorn.conf.py
+
+Worker count comes from WEB_CONCURRENCY (Gunicorn's own variable). Measure
+the difference with ``python scripts/benchmark_cold_start.py --workers 4``.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '3001')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# The lifespan runs migrations before a worker's first heartbeat. With a
+# matching schema fingerprint that takes well under a second, but the first
+# boot of a release may apply migrations, so allow the same budget as the
+# container healthcheck's start period before Gunicorn recycles the worker.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "300"))
+graceful_timeout = 30
+
+
+def when_ready(server):
+    """Freeze the preloaded heap just before the workers are forked.
+
+    Collections in a worker would otherwise write GC bookkeeping into every
+    tracked object they visit, un-sharing the pages the preload was meant to
+    share.
+    """
+    gc.freeze()
+    server.log.info(
+        "Preloaded application; %d objects frozen for copy-on-write sharing",
+        gc.get_freeze_count(),
+    )
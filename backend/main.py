@@ -8,6 +8,7 @@ connects to the database, and configures routes.
 
 import os
 import signal
+import time
 from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timezone
 from typing import Optional
@@ -93,12 +94,25 @@ class StartupStatus:
         self.ready = False
         self.errors = []
         self.detailed_message = None
+        # Seconds spent in each phase (and in timed steps within a phase),
+        # in the order they ran.
+        self.phase_timings: dict[str, float] = {}
+        self._phase_started = time.perf_counter()
+
+    def _close_phase(self):
+        now = time.perf_counter()
+        self.phase_timings[self.phase] = round(
+            self.phase_timings.get(self.phase, 0.0) + now - self._phase_started, 3
+        )
+        self._phase_started = now
 
     def set_phase(
         self, phase: str, message: str, detailed_message: Optional[str] = None
     ):
         import os as _os
 
+        if phase != self.phase:
+            self._close_phase()
         self.phase = phase
         self.message = message
         self.detailed_message = detailed_message
@@ -111,7 +125,25 @@ class StartupStatus:
         self.message = f"Running migration {completed}/{total}: {current}"
         self.detailed_message = "Applying database schema changes to keep your data structure up to date. This may take a few minutes on first startup."
 
+    @contextmanager
+    def timed(self, step: str):
+        """Record how long a step inside the current phase takes."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_timings[f"{self.phase}.{step}"] = round(
+                time.perf_counter() - started, 3
+            )
+
     def set_ready(self):
+        import os as _os
+
+        self._close_phase()
+        logger.info(
+            f"Startup [worker {_os.getpid()}] ready; phase timings (s): "
+            + ", ".join(f"{k}={v}" for k, v in self.phase_timings.items())
+        )
         self.ready = True
         self.phase = "ready"
         self.message = "Server is ready"
@@ -145,6 +177,9 @@ class StartupStatus:
                 ),
             }
 
+        if self.phase_timings:
+            result["phase_timings"] = dict(self.phase_timings)
+
         if self.errors:
             result["errors"] = self.errors
 
@@ -990,23 +1025,80 @@ def run_migrations():
 
     _wait_for_mysql(engine, startup_status)
 
-    # Determine current database revision
-    current_rev = None
-    try:
-        with engine.connect() as conn:
-            result = conn.execute(
-                text("SELECT version_num FROM alembic_version LIMIT 1")
+    # Fingerprint of the schema this code expects (Alembic head + model
+    # metadata). When the database recorded the same fingerprint after its
+    # last verification, reflection and column repair have nothing to find.
+    expected_fingerprint = None
+    if settings.SCHEMA_FINGERPRINT_ENABLED:
+        from app.core.schema_fingerprint import (
+            compute_schema_fingerprint,
+            read_schema_fingerprint,
+            record_schema_fingerprint,
+        )
+
+        with startup_status.timed("fingerprint"):
+            _import_all_models()
+            from app.core.database import Base as _Base
+
+            expected_fingerprint = compute_schema_fingerprint(
+                _Base.metadata, head_revision
             )
-            row = result.fetchone()
-            if row:
-                current_rev = row[0]
-    except ProgrammingError:
-        logger.debug(
-            "Could not read alembic_version table (may not exist yet)", exc_info=True
+
+    def _read_schema_state():
+        """Return (alembic revision, stored fingerprint) from one connection."""
+        rev = None
+        stored = None
+        try:
+            with engine.connect() as conn:
+                row = conn.execute(
+                    text("SELECT version_num FROM alembic_version LIMIT 1")
+                ).fetchone()
+                if row:
+                    rev = row[0]
+                if expected_fingerprint:
+                    stored = read_schema_fingerprint(conn)
+        except ProgrammingError:
+            logger.debug(
+                "Could not read alembic_version table (may not exist yet)",
+                exc_info=True,
+            )
+        return rev, stored
+
+    def _schema_verified(rev, stored) -> bool:
+        return (
+            expected_fingerprint is not None
+            and rev == head_revision
+            and stored == expected_fingerprint
         )
 
-    # Fast exit: already at head - nothing to do
-    if current_rev == head_revision:
+    def _record_fingerprint():
+        if expected_fingerprint is None:
+            return
+        if record_schema_fingerprint(engine, head_revision, expected_fingerprint):
+            logger.info(f"Recorded schema fingerprint {expected_fingerprint[:12]}")
+        else:
+            logger.warning(
+                "Could not record the schema fingerprint; the next startup "
+                "will verify the schema again"
+            )
+
+    # Determine current database revision
+    current_rev, stored_fingerprint = _read_schema_state()
+
+    # Fastest exit: at head and the schema was verified against this code
+    if _schema_verified(current_rev, stored_fingerprint):
+        startup_status.migrations_completed = total_migrations
+        startup_status.set_phase("migrations", "Database schema is up to date")
+        logger.info(
+            f"Schema fingerprint matches (worker PID {os.getpid()}) - "
+            "skipping schema reflection and repair"
+        )
+        return
+
+    # Fast exit: already at head - nothing to do. With fingerprints enabled
+    # a mismatch at head means the models changed without a migration (or no
+    # fingerprint was recorded yet), so one elected worker verifies below.
+    if current_rev == head_revision and expected_fingerprint is None:
         startup_status.migrations_completed = total_migrations
         startup_status.set_phase("migrations", "Database schema is up to date")
         logger.info(f"Database schema is already up to date (worker PID {os.getpid()})")
@@ -1030,15 +1122,37 @@ def run_migrations():
 
     MIGRATION_LOCK_NAME = "the_logbook_migrations"
     MIGRATION_LOCK_TIMEOUT = 300  # seconds to wait for the lock
+    # With fingerprints, waiting workers poll in short lock waits and start
+    # as soon as the elected worker records the fingerprint, instead of each
+    # taking the lock in turn only to re-check the schema.
+    FINGERPRINT_POLL_SECONDS = 2
 
     lock_conn = engine.connect()
     try:
         startup_status.set_phase("migrations", "Acquiring migration lock...")
-        result = lock_conn.execute(
-            text("SELECT GET_LOCK(:name, :timeout)"),
-            {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT},
+        poll_seconds = (
+            FINGERPRINT_POLL_SECONDS if expected_fingerprint else MIGRATION_LOCK_TIMEOUT
         )
-        got_lock = result.scalar()
+        deadline = _time.monotonic() + MIGRATION_LOCK_TIMEOUT
+        with startup_status.timed("lock_wait"):
+            while True:
+                wait = max(1, min(poll_seconds, int(deadline - _time.monotonic())))
+                got_lock = lock_conn.execute(
+                    text("SELECT GET_LOCK(:name, :timeout)"),
+                    {"name": MIGRATION_LOCK_NAME, "timeout": wait},
+                ).scalar()
+                if got_lock or _time.monotonic() >= deadline:
+                    break
+                if _schema_verified(*_read_schema_state()):
+                    startup_status.migrations_completed = total_migrations
+                    startup_status.set_phase(
+                        "migrations", "Database schema is up to date"
+                    )
+                    logger.info(
+                        f"Elected worker verified the schema (worker PID "
+                        f"{os.getpid()}) - skipping migrations"
+                    )
+                    return
         if not got_lock:
             raise RuntimeError(
                 f"Could not acquire migration lock within {MIGRATION_LOCK_TIMEOUT}s. "
@@ -1051,19 +1165,39 @@ def run_migrations():
 
         # Re-check revision after acquiring lock - another worker may have
         # already completed migrations while we were waiting.
-        current_rev = None
-        try:
-            with engine.connect() as check_conn:
-                result = check_conn.execute(
-                    text("SELECT version_num FROM alembic_version LIMIT 1")
-                )
-                row = result.fetchone()
-                if row:
-                    current_rev = row[0]
-        except ProgrammingError:
-            logger.debug(
-                "Could not re-read alembic_version after acquiring lock", exc_info=True
+        current_rev, stored_fingerprint = _read_schema_state()
+
+        if _schema_verified(current_rev, stored_fingerprint):
+            startup_status.migrations_completed = total_migrations
+            startup_status.set_phase("migrations", "Database schema is up to date")
+            logger.info(
+                f"Schema fingerprint matches after acquiring lock (worker PID "
+                f"{os.getpid()}) - skipping migrations"
             )
+            return
+
+        if current_rev == head_revision and expected_fingerprint is not None:
+            # Elected to verify a schema that is at head but has no matching
+            # fingerprint: repair model columns, validate, then record it.
+            startup_status.migrations_completed = total_migrations
+            startup_status.set_phase("migrations", "Verifying database schema...")
+            with startup_status.timed("column_repair"):
+                try:
+                    _add_missing_model_columns(engine)
+                except Exception as col_err:
+                    logger.warning(f"Column repair check failed (non-fatal): {col_err}")
+                    return
+            with startup_status.timed("validation"):
+                schema_valid, schema_errors = validate_schema(engine)
+            if schema_valid:
+                _record_fingerprint()
+                startup_status.set_phase("migrations", "Database schema is up to date")
+            else:
+                logger.warning(
+                    "Schema validation at head found issues (non-fatal): "
+                    + "; ".join(schema_errors)
+                )
+            return
 
         if current_rev == head_revision:
             startup_status.migrations_completed = total_migrations
@@ -1104,7 +1238,10 @@ def run_migrations():
             max_attempts = 2
             for attempt in range(1, max_attempts + 1):
                 try:
-                    with timeout_context(3600, "Fast-path database initialization"):
+                    with (
+                        timeout_context(3600, "Fast-path database initialization"),
+                        startup_status.timed("fast_path_init"),
+                    ):
                         _fast_path_init(engine, alembic_cfg, base_dir, head_revision)
                     break  # Success
                 except Exception as init_error:
@@ -1126,7 +1263,8 @@ def run_migrations():
             startup_status.set_phase("migrations", "Validating database schema...")
 
             # Validate schema after fast-path init
-            schema_valid, schema_errors = validate_schema(engine)
+            with startup_status.timed("validation"):
+                schema_valid, schema_errors = validate_schema(engine)
 
             # Self-healing: if validation fails, attempt to repair missing tables
             # before giving up. This handles edge cases like partial create_all()
@@ -1149,6 +1287,7 @@ def run_migrations():
                 raise RuntimeError(error_msg)
 
             logger.info("Database schema validated successfully")
+            _record_fingerprint()
             startup_status.set_phase("migrations", "Database initialization complete")
             return
 
@@ -1160,7 +1299,10 @@ def run_migrations():
         schema_was_stamped = False
 
         try:
-            with timeout_context(1800, "Database migrations"):
+            with (
+                timeout_context(1800, "Database migrations"),
+                startup_status.timed("upgrade"),
+            ):
                 command.upgrade(alembic_cfg, head_revision)
 
             startup_status.migrations_completed = total_migrations
@@ -1220,7 +1362,8 @@ def run_migrations():
 
         # Validate schema after migrations
         startup_status.set_phase("migrations", "Validating database schema...")
-        schema_valid, schema_errors = validate_schema(engine)
+        with startup_status.timed("validation"):
+            schema_valid, schema_errors = validate_schema(engine)
 
         # Self-healing: attempt repair before crashing
         if not schema_valid:
@@ -1249,6 +1392,17 @@ def run_migrations():
             raise RuntimeError(error_msg)
         else:
             logger.info("Database schema validated successfully")
+            if expected_fingerprint is not None:
+                # The fingerprint vouches for model columns too, which
+                # migrations may not have added (see _add_missing_model_columns).
+                with startup_status.timed("column_repair"):
+                    try:
+                        _add_missing_model_columns(engine)
+                        _record_fingerprint()
+                    except Exception as col_err:
+                        logger.warning(
+                            f"Column repair check failed (non-fatal): {col_err}"
+                        )
     finally:
         # Always release the advisory lock, even on error
         try:
@@ -1518,6 +1672,29 @@ async def lifespan(app: FastAPI):
 
     await geoip_invalidation_listener.start()
 
+    # Start the org settings invalidation listener so a settings change made
+    # on any worker drops every worker's cached copy (after Redis is connected).
+    from app.services.org_settings_cache import org_settings_invalidation_listener
+
+    await org_settings_invalidation_listener.start()
+
+    # Push this worker's metrics to Redis so any worker can answer a scrape
+    # with the totals of all of them (METRICS_ENABLED only).
+    from app.core.metrics import metrics_flusher
+
+    await metrics_flusher.start()
+
+    # Send queued chat notifications and outbound webhooks (delivery outbox).
+    # Every worker runs one; they share the queue through row leases.
+    from app.services.integration_services.delivery_outbox import delivery_worker
+
+    await delivery_worker.start()
+
+    # Batched writer for QR self check-ins (app/services/qr_check_in_service.py).
+    from app.services.qr_check_in_service import check_in_writer
+
+    await check_in_writer.start()
+
     # Helper: use Redis SETNX to ensure a background task runs on only one worker.
     # Returns True if this worker should run the task.
     async def _try_claim_background_task(task_name: str, ttl: int = 300) -> bool:
@@ -1701,6 +1878,7 @@ async def lifespan(app: FastAPI):
         """Background loop that runs periodic tasks (shift reminders, event
         reminders, etc.) so they work out-of-the-box without external cron."""
         from app.core.database import async_session_factory
+        from app.core.metrics import scheduled_task_seconds
         from app.services.scheduled_tasks import TASK_INTERVALS_SECONDS, TASK_RUNNERS
 
         # Built from TASK_INTERVALS_SECONDS (the single source of truth in
@@ -1741,9 +1919,12 @@ async def lifespan(app: FastAPI):
                 if not runner:
                     continue
 
+                started = time.perf_counter()
+                outcome = "error"
                 try:
                     async with async_session_factory() as db:
                         result = await runner(db)
+                        outcome = "ok"
                         log_msg = (
                             f"Scheduled task '{task_name}' completed: " f"{result}"
                         )
@@ -1762,6 +1943,10 @@ async def lifespan(app: FastAPI):
                             logger.info(log_msg)
                 except Exception as e:
                     logger.error(f"Scheduled task '{task_name}' failed: {e}")
+                finally:
+                    scheduled_task_seconds.observe(
+                        time.perf_counter() - started, task=task_name, outcome=outcome
+                    )
 
                 entry[2] = now
 
@@ -1805,6 +1990,13 @@ async def lifespan(app: FastAPI):
             pass
     await ws_manager.stop_listener()
     await geoip_invalidation_listener.stop()
+    await org_settings_invalidation_listener.stop()
+    await metrics_flusher.stop()
+    await delivery_worker.stop()
+    await check_in_writer.stop()
+    from app.utils.image_processing import shutdown_image_pool
+
+    await asyncio.to_thread(shutdown_image_pool)
     await database_manager.disconnect()
     await cache_manager.disconnect()
     logger.info("Shutdown complete")
@@ -2005,6 +2197,18 @@ from app.core.security_middleware import (
 
 app.add_middleware(SecurityHeadersMiddleware)
 
+# Per-request query counts and N+1 detection. Inert unless
+# QUERY_PROFILER_ENABLED; sits inside IPLoggingMiddleware, which binds the
+# request id the profiles are tagged with.
+from app.core.query_profiler import QueryProfilerMiddleware
+
+app.add_middleware(QueryProfilerMiddleware)
+
+# Per-route latency histograms for GET /metrics. Inert unless METRICS_ENABLED.
+from app.core.metrics import MetricsMiddleware
+
+app.add_middleware(MetricsMiddleware)
+
 # Host-header allowlist: reject requests whose Host isn't in the configured
 # allowlist so Host-derived values (request.base_url used for emailed ballot
 # links, OAuth callback fallbacks, etc.) can't be poisoned by a spoofed Host.
@@ -2330,6 +2534,7 @@ async def health_check_detailed():
             "memory_percent": psutil.virtual_memory().percent,
             "disk_percent": psutil.disk_usage("/").percent,
         },
+        "startup_phase_timings": startup_status.phase_timings,
         "configuration": {
             "debug": settings.DEBUG,
             "enable_docs": settings.ENABLE_DOCS,
@@ -2339,6 +2544,34 @@ async def health_check_detailed():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Prometheus metrics, totalled across all workers when Redis is available.
+
+    Served only with METRICS_ENABLED; requires "Authorization: Bearer
+    <METRICS_TOKEN>" when a token is configured, and is not served in
+    production without one.
+    """
+    import hmac
+
+    from app.core.metrics import collect, registry, render
+
+    if not settings.METRICS_ENABLED or (
+        not settings.METRICS_TOKEN and settings.ENVIRONMENT == "production"
+    ):
+        return Response(status_code=404)
+    if settings.METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "")
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(supplied.encode(), expected.encode()):
+            return Response(status_code=401)
+    return Response(
+        content=render(registry, await collect()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
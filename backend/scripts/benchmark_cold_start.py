@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark worker cold start: import time and memory of ``import main``.
+
+Each run imports the application in a fresh interpreter — what every
+``uvicorn --workers N`` worker does on boot — and records
+
+  * wall-clock import time and peak RSS,
+  * which of the heavy optional libraries (``LAZY_IMPORTS``) got loaded;
+    these are meant to be imported on first use, so any hit is a regression,
+  * with ``--top``, the slowest modules by cumulative import time
+    (``python -X importtime``).
+
+``--budget-seconds`` / ``--budget-rss-mb`` turn the median into a pass/fail
+gate (exit status 1 when exceeded).
+
+``--workers N`` also compares memory per worker for the two server modes:
+spawned workers (each imports ``main`` itself; private RSS each) against
+preload-then-fork (``gunicorn.conf.py``: the parent imports once, freezes
+the heap and forks; reported as each child's unique set size, i.e. what it
+does not share). The fork comparison reads /proc and so is Linux-only.
+
+No database or Redis is contacted; only the import is measured.
+
+Usage:
+
+    cd backend
+    python scripts/benchmark_cold_start.py
+    python scripts/benchmark_cold_start.py --runs 5 --top 15
+    python scripts/benchmark_cold_start.py --workers 4
+    python scripts/benchmark_cold_start.py --budget-seconds 15 --budget-rss-mb 350
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Heavy libraries that only a few endpoints need. None of them may be
+# imported at application start; the code that uses them imports them
+# inside the function that needs them.
+LAZY_IMPORTS = (
+    "reportlab",  # PDF generators
+    "openpyxl",  # XLSX import/export
+    "docx",  # python-docx
+    "PIL",  # image re-encoding
+    "magic",  # MIME sniffing for uploads
+    "pywebpush",  # web push (pulls in aiohttp and requests)
+    "aiohttp",
+    "requests",
+    "twilio",
+    "boto3",
+    "azure.storage",
+    "google.cloud",
+    "googleapiclient",
+    "msal",
+    "stripe",
+)
+
+_CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import main  # noqa: F401
+elapsed = time.perf_counter() - started
+lazy = {lazy!r}
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [m for m in lazy if m in sys.modules],
+}}))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)")
+
+
+def cold_import() -> dict:
+    """Import ``main`` in a fresh interpreter and report the child's stats."""
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(lazy=LAZY_IMPORTS)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_modules(top: int) -> list[tuple[float, str]]:
+    """Modules by cumulative import time, slowest first."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            rows.append((int(match.group(1)) / 1e6, match.group(3)))
+    rows.sort(reverse=True)
+    return [r for r in rows if r[1] != "main"][:top]
+
+
+def _unique_mb(pid: int) -> float:
+    """Private (unshared) memory of a process from /proc/<pid>/smaps_rollup."""
+    private = 0
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                private += int(line.split()[1])
+    return private / 1024
+
+
+def forked_worker_mb(workers: int) -> list[float]:
+    """Preload ``main``, freeze the heap and fork ``workers`` children.
+
+    Each child runs a full collection (what a serving worker eventually does)
+    before its unshared memory is read, so the figure includes the pages GC
+    would dirty.
+    """
+    import gc
+
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+    import main  # noqa: F401
+
+    gc.freeze()
+    children = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - child process
+            os.close(read_fd)
+            gc.collect()
+            os.write(write_fd, b"1")
+            os.close(write_fd)
+            time.sleep(60)  # measured, then killed by the parent
+            os._exit(0)
+        os.close(write_fd)
+        os.read(read_fd, 1)
+        os.close(read_fd)
+        children.append(pid)
+    try:
+        return [_unique_mb(pid) for pid in children]
+    finally:
+        for pid in children:
+            os.kill(pid, 9)
+            os.waitpid(pid, 0)
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--budget-seconds", type=float, default=None)
+    parser.add_argument("--budget-rss-mb", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    results = [cold_import() for _ in range(args.runs)]
+    seconds = statistics.median(r["seconds"] for r in results)
+    rss = statistics.median(r["rss_mb"] for r in results)
+    loaded = sorted({m for r in results for m in r["loaded"]})
+
+    print(f"cold import of main ({args.runs} runs, median)")
+    print(f"  import time : {seconds:7.2f} s")
+    print(f"  peak RSS    : {rss:7.1f} MB")
+    print(f"  eager heavy : {', '.join(loaded) if loaded else 'none'}")
+
+    if args.top:
+        print(f"\nslowest {args.top} modules (cumulative)")
+        for took, name in slowest_modules(args.top):
+            print(f"  {took:7.3f} s  {name}")
+
+    if args.workers:
+        unique = forked_worker_mb(args.workers)
+        print(f"\n{args.workers} workers")
+        print(f"  spawned (uvicorn --workers) : {rss * args.workers:7.1f} MB")
+        print(
+            f"  preload + fork (gunicorn)   : {sum(unique):7.1f} MB unique "
+            f"+ {rss:.1f} MB shared"
+        )
+
+    failed = []
+    if args.budget_seconds is not None and seconds > args.budget_seconds:
+        failed.append(f"import time {seconds:.2f}s > {args.budget_seconds}s")
+    if args.budget_rss_mb is not None and rss > args.budget_rss_mb:
+        failed.append(f"RSS {rss:.1f}MB > {args.budget_rss_mb}MB")
+    if loaded:
+        failed.append(f"heavy libraries imported at start: {', '.join(loaded)}")
+    for reason in failed:
+        print(f"BUDGET EXCEEDED: {reason}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
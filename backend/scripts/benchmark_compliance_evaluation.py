@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark org-wide compliance evaluation: scalar vs. columnar batch.
+
+Builds a synthetic department (default 2,000 members x 60 requirements x 10
+years of training records), then times
+
+  * ``evaluate_member_requirement`` called once per member x requirement —
+    what every org-wide recompute did before the batch evaluator, and
+  * ``BatchComplianceEvaluator`` — column build plus one pass per
+    requirement over all members,
+
+and checks the two agree on every pair. No database; the records are plain
+objects shaped like ``TrainingRecord`` rows.
+
+The scalar pass is slow at full size, so by default it runs on a sample of
+members and is extrapolated; pass ``--scalar-sample 0`` to time all of them.
+
+Usage:
+
+    cd backend
+    python scripts/benchmark_compliance_evaluation.py
+    python scripts/benchmark_compliance_evaluation.py --members 500 --years 5
+    python scripts/benchmark_compliance_evaluation.py --scalar-sample 0
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.models.training import (  # noqa: E402
+    RequirementFrequency,
+    RequirementType,
+    TrainingStatus,
+    TrainingType,
+)
+from app.services.compliance_batch import BatchComplianceEvaluator  # noqa: E402
+from app.services.training_compliance import (  # noqa: E402
+    evaluate_member_requirement,
+)
+
+COURSE_NAMES = [
+    "CPR Refresher",
+    "Hazmat Operations",
+    "EVOC Driver",
+    "Ladder Operations",
+    "Vehicle Extrication",
+    "ICS-200",
+    "Rope Rescue",
+    "Pump Operations",
+]
+
+
+class _Record:
+    __slots__ = (
+        "user_id",
+        "status",
+        "completion_date",
+        "expiration_date",
+        "hours_completed",
+        "training_type",
+        "category_id",
+        "course_id",
+        "course_name",
+        "certification_number",
+    )
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+class _Requirement:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def _build(members: int, requirements: int, years: int, per_year: int, today):
+    rng = random.Random(1729)
+    types = list(TrainingType)
+    records_by_user = {}
+    first_day = today - timedelta(days=365 * years)
+    for m in range(members):
+        uid = f"user-{m:05d}"
+        rows = []
+        for _ in range(years * per_year):
+            completed = first_day + timedelta(days=rng.randrange(365 * years))
+            name = rng.choice(COURSE_NAMES)
+            rows.append(
+                _Record(
+                    user_id=uid,
+                    status=(
+                        TrainingStatus.COMPLETED
+                        if rng.random() < 0.93
+                        else TrainingStatus.IN_PROGRESS
+                    ),
+                    completion_date=completed,
+                    expiration_date=(
+                        completed + timedelta(days=730) if rng.random() < 0.3 else None
+                    ),
+                    hours_completed=rng.choice([0.5, 1, 1.5, 2, 3, 4, 8]),
+                    training_type=rng.choice(types),
+                    category_id=f"cat-{rng.randrange(6)}",
+                    course_id=f"course-{COURSE_NAMES.index(name)}",
+                    course_name=name,
+                    certification_number=None,
+                )
+            )
+        records_by_user[uid] = rows
+
+    reqs = []
+    req_types = [
+        RequirementType.HOURS,
+        RequirementType.HOURS,
+        RequirementType.COURSES,
+        RequirementType.CERTIFICATION,
+        RequirementType.SHIFTS,
+        RequirementType.SKILLS_EVALUATION,
+    ]
+    for i in range(requirements):
+        reqs.append(
+            _Requirement(
+                id=f"req-{i:03d}",
+                name=rng.choice(COURSE_NAMES).split()[0],
+                requirement_type=req_types[i % len(req_types)],
+                frequency=rng.choice(list(RequirementFrequency)),
+                training_type=rng.choice([None, *types]),
+                year=None,
+                due_date_type=None,
+                rolling_period_months=None,
+                required_hours=rng.choice([6, 12, 24, 36]),
+                required_shifts=rng.choice([2, 4, 12]),
+                required_calls=None,
+                required_courses=rng.sample(
+                    [f"course-{k}" for k in range(len(COURSE_NAMES))], 2
+                ),
+                category_ids=[f"cat-{rng.randrange(6)}"] if i % 5 == 0 else None,
+                registry_code=None,
+                recency_days=rng.choice([None, None, 730]),
+                include_current_month=None,
+                period_start_month=None,
+                period_end_month=None,
+            )
+        )
+    return records_by_user, reqs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--requirements", type=int, default=60)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--records-per-year", type=int, default=24)
+    parser.add_argument(
+        "--scalar-sample",
+        type=int,
+        default=200,
+        help="members to time the scalar evaluator on (0 = all)",
+    )
+    args = parser.parse_args()
+
+    today = date(2026, 6, 15)
+    records_by_user, reqs = _build(
+        args.members, args.requirements, args.years, args.records_per_year, today
+    )
+    total_records = sum(len(r) for r in records_by_user.values())
+    print(
+        f"{args.members} members x {len(reqs)} requirements, "
+        f"{total_records:,} records over {args.years} years"
+    )
+
+    started = time.perf_counter()
+    evaluator = BatchComplianceEvaluator(records_by_user)
+    built = time.perf_counter()
+    batch = {req.id: evaluator.evaluate(req, records_by_user, today) for req in reqs}
+    finished = time.perf_counter()
+    print(
+        f"batch:  {finished - started:8.2f}s  "
+        f"(columns {built - started:.2f}s, evaluate {finished - built:.2f}s)"
+    )
+
+    sample = list(records_by_user)
+    if args.scalar_sample:
+        sample = sample[: args.scalar_sample]
+    started = time.perf_counter()
+    mismatches = 0
+    for uid in sample:
+        records = records_by_user[uid]
+        for req in reqs:
+            result = evaluate_member_requirement(req, records, today)
+            mismatches += result != batch[req.id][uid]
+    elapsed = time.perf_counter() - started
+    scale = len(records_by_user) / len(sample)
+    label = "scalar:" if scale == 1 else f"scalar: (extrapolated from {len(sample)})"
+    print(f"{label} {elapsed * scale:8.2f}s")
+    print(f"pairs compared: {len(sample) * len(reqs):,}  mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark catalog reconciliation: ``best_matches`` per line vs. ``NameIndex``.
+
+Builds a synthetic inventory catalog (default 10,000 items) and a checklist
+of free-text lines (default 200) written the way rig checklists are — the
+catalog's words reordered, abbreviated or padded with sizes and packaging —
+then times
+
+  * ``best_matches`` called once per line, re-normalizing every catalog name
+    each time — what ``suggest_inventory_matches`` did before the index, and
+  * ``NameIndex`` — one build, then one postings lookup per line,
+
+and checks the two return identical suggestions for every line. No database.
+
+Usage:
+
+    cd backend
+    python scripts/benchmark_name_matching.py
+    python scripts/benchmark_name_matching.py --catalog 50000 --lines 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.name_matching import NameIndex, best_matches  # noqa: E402
+
+NOUNS = [
+    "gauze",
+    "bandage",
+    "tourniquet",
+    "splint",
+    "collar",
+    "mask",
+    "cannula",
+    "airway",
+    "glove",
+    "shears",
+    "dressing",
+    "tape",
+    "syringe",
+    "needle",
+    "catheter",
+    "blanket",
+    "cylinder",
+    "regulator",
+    "battery",
+    "flashlight",
+]
+QUALIFIERS = [
+    "adult",
+    "pediatric",
+    "infant",
+    "sterile",
+    "nitrile",
+    "trauma",
+    "oxygen",
+    "cervical",
+    "nasal",
+    "elastic",
+    "disposable",
+    "reusable",
+    "large",
+    "medium",
+    "small",
+]
+SIZES = ["4x4", "2x2", "6in", "3in", "10ml", "18g", "20g", "aa", "d", "xl"]
+PACKAGING = ["box", "case", "each", "pack", "roll", "kit"]
+
+
+def build_catalog(size: int, seed: int = 1729):
+    """``size`` ``(id, name)`` pairs, some sharing names, some blank."""
+    rng = random.Random(seed)
+    catalog = []
+    for i in range(size):
+        words = rng.sample(QUALIFIERS, rng.randint(0, 2)) + [rng.choice(NOUNS)]
+        if rng.random() < 0.6:
+            words.append(rng.choice(SIZES))
+        if rng.random() < 0.3:
+            words.append(rng.choice(PACKAGING))
+        name = " ".join(w.title() for w in words)
+        if rng.random() < 0.05:
+            name = name.replace(" ", ", ", 1)
+        catalog.append((f"item-{i:06d}", "" if rng.random() < 0.01 else name))
+    return catalog
+
+
+def build_lines(catalog, count: int, seed: int = 42):
+    """Checklist lines derived from catalog names, plus some with no match."""
+    rng = random.Random(seed)
+    named = [name for _, name in catalog if name]
+    lines = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.1:
+            lines.append(f"{rng.choice(['Spare', 'Misc'])} {rng.randint(1, 99)}")
+            continue
+        words = rng.choice(named).replace(",", "").split()
+        if roll < 0.4:
+            rng.shuffle(words)
+        elif roll < 0.7 and len(words) > 1:
+            words.pop(rng.randrange(len(words)))
+        elif roll < 0.85:
+            words.append(rng.choice(PACKAGING + SIZES))
+        lines.append(" ".join(words).lower() if rng.random() < 0.5 else " ".join(words))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--catalog", type=int, default=10000)
+    parser.add_argument("--lines", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=3)
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.catalog)
+    lines = build_lines(catalog, args.lines)
+    print(f"{len(lines)} checklist lines x {len(catalog):,} catalog items")
+
+    started = time.perf_counter()
+    scanned = [best_matches(line, catalog, limit=args.limit) for line in lines]
+    scan_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = NameIndex(catalog)
+    built = time.perf_counter()
+    indexed = [index.best_matches(line, limit=args.limit) for line in lines]
+    finished = time.perf_counter()
+
+    print(f"best_matches: {scan_elapsed:8.3f}s")
+    print(
+        f"NameIndex:    {finished - started:8.3f}s  "
+        f"(build {built - started:.3f}s, queries {finished - built:.3f}s)"
+    )
+    mismatches = sum(a != b for a, b in zip(scanned, indexed))
+    print(f"lines compared: {len(lines):,}  mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
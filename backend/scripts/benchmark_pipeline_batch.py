@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk advancement of a recruiting drive through its pipeline.
+
+``--prospects`` applicants start at the first stage of a five-stage
+pipeline (interest form, information session linked to the next business
+meeting, documents with a required photo ID, an automated welcome email,
+interview) and the whole cohort is advanced ``--stages`` times, for
+
+  * the batch processor (``app/services/membership_pipeline_batch.py``),
+    run for real against a simulated database;
+  * the per-prospect path (``_bulk_apply`` over ``advance_prospect``),
+    modelled as ``--per-prospect-round-trips`` sequential round trips per
+    prospect and stage, timed on ``--per-prospect-sample`` prospects and
+    extrapolated.
+
+The simulated database charges ``--latency-ms`` per round trip; statements,
+eager loads and commits each count as one. ``--missing-documents`` percent
+of the cohort never uploaded their photo ID and must be held back at the
+documents stage. Email delivery is excluded from both paths (the batch path
+queues it for after the response). The model flatters the per-prospect
+path: its gate lookups, event auto-links and inline emails are not counted.
+
+No database or running services are needed.
+
+Usage:
+
+    cd backend
+    python scripts/benchmark_pipeline_batch.py                      # 5,000 prospects, 3 stages
+    python scripts/benchmark_pipeline_batch.py --latency-ms 5
+    python scripts/benchmark_pipeline_batch.py --budget-seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy.dialects import mysql  # noqa: E402
+
+from app.models.event import Event, EventType  # noqa: E402
+from app.models.membership_pipeline import (  # noqa: E402
+    MembershipPipeline,
+    MembershipPipelineStep,
+    PipelineStepType,
+    ProspectiveMember,
+    ProspectStepProgress,
+    StepProgressStatus,
+)
+from app.services import membership_pipeline_batch as batch  # noqa: E402
+
+# Round trips of advance_prospect for one prospect through _bulk_apply: four
+# prospect loads of seven each (_bulk_apply's, advance_prospect's,
+# complete_step's locked read and its reload — the row plus six eager
+# loads), the progress, stage and activity writes, and the commit.
+PER_PROSPECT_ROUND_TRIPS = 33
+
+ORGANIZATION_ID = "bench-org"
+
+
+class _Result:
+    def __init__(self, rows=()):
+        self._rows = list(rows)
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class SimulatedDatabase:
+    """Just enough of MySQL for the batch processor: prospects (with their
+    pipelines and progress rows), uploaded documents, events and the rows
+    written, in memory; ``latency`` seconds per round trip. A write to the
+    table named by ``fail_on`` raises."""
+
+    def __init__(self, latency: float, prospects=(), documents=(), events=()):
+        self.latency = latency
+        self.prospects: dict[str, ProspectiveMember] = {str(p.id): p for p in prospects}
+        self.steps: dict[str, MembershipPipelineStep] = {
+            str(step.id): step
+            for p in self.prospects.values()
+            if p.pipeline is not None
+            for step in p.pipeline.steps
+        }
+        self.progress: dict[str, ProspectStepProgress] = {
+            str(row.id): row for p in self.prospects.values() for row in p.step_progress
+        }
+        self.documents: set[tuple[str, str, str]] = set(documents)
+        self.events: list[Event] = list(events)
+        self.links: set[tuple[str, str]] = set()
+        self.activity: list[dict] = []
+        self.fail_on: str | None = None
+        self.round_trips = 0
+        self.transactions = 0
+        self.rollbacks = 0
+
+    async def round_trip(self, count: int = 1) -> None:
+        for _ in range(count):
+            self.round_trips += 1
+            await asyncio.sleep(self.latency)
+
+    def session(self):
+        return _SimulatedSession(self)
+
+
+class _SimulatedSession:
+    def __init__(self, database: SimulatedDatabase):
+        self.database = database
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, stmt, rows=None):
+        database = self.database
+        await database.round_trip()
+        if (stmt.is_insert or stmt.is_update) and stmt.table.name == database.fail_on:
+            raise ConnectionError(f"lost connection writing {stmt.table.name}")
+        if stmt.is_insert:
+            self._insert(stmt.table.name, rows)
+            return _Result()
+        params = stmt.compile(dialect=mysql.dialect()).params
+        if stmt.is_update:
+            self._update(stmt.table.name, params)
+            return _Result()
+
+        # Each eager load is one more SELECT.
+        await database.round_trip(
+            sum(len(option.context) for option in stmt._with_options)
+        )
+        column = stmt.column_descriptions[0]
+        entity = column["entity"].__name__
+        if entity == "ProspectiveMember":
+            return _Result(
+                database.prospects[i]
+                for i in sorted(params["id_1"])
+                if i in database.prospects
+                and database.prospects[i].organization_id == params["organization_id_1"]
+            )
+        if entity == "MembershipPipelineStep":
+            return _Result(
+                database.steps[i] for i in params["id_1"] if i in database.steps
+            )
+        if entity == "ProspectDocument":
+            return _Result(
+                row
+                for row in database.documents
+                if row[0] in params["prospect_id_1"] and row[1] in params["step_id_1"]
+            )
+        if entity == "Event":
+            return _Result(
+                sorted(
+                    (
+                        event
+                        for event in database.events
+                        if event.organization_id == params["organization_id_1"]
+                        and event.event_type == params["event_type_1"]
+                        and not event.is_cancelled
+                    ),
+                    key=lambda event: event.start_datetime,
+                )[:1]
+            )
+        if entity == "ProspectEventLink":
+            return _Result(
+                prospect_id
+                for prospect_id, event_id in database.links
+                if event_id == params["event_id_1"]
+                and prospect_id in params["prospect_id_1"]
+            )
+        return _Result()  # ScreeningRecord: nobody has been screened
+
+    def _insert(self, table: str, rows: list[dict]) -> None:
+        database = self.database
+        if table == "prospect_step_progress":
+            for row in rows:
+                progress = ProspectStepProgress(**row)
+                database.progress[row["id"]] = progress
+                database.prospects[row["prospect_id"]].step_progress.append(progress)
+        elif table == "prospect_activity_log":
+            database.activity.extend(rows)
+        elif table == "prospect_event_links":
+            database.links.update((row["prospect_id"], row["event_id"]) for row in rows)
+
+    def _update(self, table: str, params: dict) -> None:
+        ids = params.pop("id_1")
+        if table == "prospect_step_progress":
+            rows = self.database.progress
+        else:
+            rows = self.database.prospects
+        for i in ids:
+            for key, value in params.items():
+                setattr(rows[i], key, value)
+
+    async def commit(self):
+        await self.database.round_trip()
+        self.database.transactions += 1
+
+    async def rollback(self):
+        await self.database.round_trip()
+        self.database.rollbacks += 1
+
+
+def build_pipeline() -> MembershipPipeline:
+    """The five-stage pipeline of the synthetic drive."""
+    stages = [
+        ("interest", "Interest form", PipelineStepType.CHECKBOX, {}),
+        (
+            "info-session",
+            "Information session",
+            PipelineStepType.MEETING,
+            {"linked_event_type": EventType.BUSINESS_MEETING.value},
+        ),
+        (
+            "documents",
+            "Documents",
+            PipelineStepType.DOCUMENT_UPLOAD,
+            {"required_document_types": ["Photo ID"]},
+        ),
+        (
+            "welcome",
+            "Welcome email",
+            PipelineStepType.AUTOMATED_EMAIL,
+            {"email_subject": "Welcome"},
+        ),
+        ("interview", "Interview", PipelineStepType.CHECKBOX, {}),
+    ]
+    pipeline = MembershipPipeline(
+        id="bench-pipeline",
+        organization_id=ORGANIZATION_ID,
+        name="Spring drive",
+        auto_transfer_on_approval=False,
+    )
+    pipeline.steps = [
+        MembershipPipelineStep(
+            id=step_id,
+            pipeline_id=pipeline.id,
+            name=name,
+            step_type=step_type,
+            config=config,
+            sort_order=order,
+            is_final_step=order == len(stages) - 1,
+            notify_prospect_on_completion=order == 0,
+        )
+        for order, (step_id, name, step_type, config) in enumerate(stages)
+    ]
+    return pipeline
+
+
+def build_drive(
+    latency: float, prospects: int, missing_documents: float = 0.0
+) -> SimulatedDatabase:
+    """A simulated database holding ``prospects`` applicants at the first
+    stage, all but ``missing_documents`` percent with a photo ID uploaded."""
+    pipeline = build_pipeline()
+    first = pipeline.steps[0]
+    cohort = []
+    for i in range(prospects):
+        prospect = ProspectiveMember(
+            id=f"prospect-{i:05d}",
+            organization_id=ORGANIZATION_ID,
+            pipeline_id=pipeline.id,
+            current_step_id=first.id,
+            first_name="Applicant",
+            last_name=str(i),
+            email=f"applicant{i}@example.com",
+        )
+        prospect.pipeline = pipeline
+        prospect.step_progress = [
+            ProspectStepProgress(
+                id=f"progress-{i:05d}",
+                prospect_id=prospect.id,
+                step_id=first.id,
+                status=StepProgressStatus.IN_PROGRESS,
+            )
+        ]
+        prospect.interviews = []
+        cohort.append(prospect)
+    held_back = int(prospects * missing_documents / 100)
+    documents = [
+        (prospect.id, "documents", "photo id") for prospect in cohort[held_back:]
+    ]
+    now = datetime.now(timezone.utc)
+    meeting = Event(
+        id="bench-meeting",
+        organization_id=ORGANIZATION_ID,
+        title="Monthly business meeting",
+        event_type=EventType.BUSINESS_MEETING,
+        start_datetime=now + timedelta(days=7),
+        end_datetime=now + timedelta(days=7, hours=2),
+        is_cancelled=False,
+    )
+    return SimulatedDatabase(latency, cohort, documents, [meeting])
+
+
+async def run_batch(
+    prospects: int, stages: int, latency: float, missing_documents: float = 0.0
+) -> tuple[float, SimulatedDatabase, batch.PipelineBatchProcessor]:
+    database = build_drive(latency, prospects, missing_documents)
+    processor = batch.PipelineBatchProcessor(database.session())
+    ids = list(database.prospects)
+    started = time.perf_counter()
+    for _ in range(stages):
+        await processor.advance(ids, ORGANIZATION_ID, "bench-coordinator")
+    return time.perf_counter() - started, database, processor
+
+
+async def run_per_prospect_model(
+    prospects: int, stages: int, latency: float, round_trips: int
+) -> tuple[float, SimulatedDatabase]:
+    database = SimulatedDatabase(latency)
+    started = time.perf_counter()
+    for _ in range(prospects * stages):
+        await database.round_trip(round_trips)
+        database.transactions += 1
+    return time.perf_counter() - started, database
+
+
+def _report(
+    name: str, elapsed: float, moves: int, database: SimulatedDatabase, note=""
+) -> None:
+    print(
+        f"{name:<13} {elapsed:8.2f}s  {moves / elapsed:8.0f} prospects/s  "
+        f"({database.transactions} transactions, "
+        f"{database.round_trips / moves:.2f} round trips/prospect){note}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Time advancing a recruiting drive through its pipeline."
+    )
+    parser.add_argument("--prospects", type=int, default=5000)
+    parser.add_argument(
+        "--stages", type=int, default=3, help="Times the cohort is advanced (max 4)"
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=1.0, help="Cost of one DB round trip"
+    )
+    parser.add_argument(
+        "--missing-documents",
+        type=float,
+        default=5.0,
+        help="Percent of the cohort without a photo ID",
+    )
+    parser.add_argument("--chunk", type=int, default=batch.CHUNK_SIZE)
+    parser.add_argument(
+        "--per-prospect-round-trips", type=int, default=PER_PROSPECT_ROUND_TRIPS
+    )
+    parser.add_argument("--per-prospect-sample", type=int, default=100)
+    parser.add_argument(
+        "--budget-seconds",
+        type=float,
+        default=None,
+        help="Exit 1 if the batch processor takes longer than this",
+    )
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+    stages = max(1, min(args.stages, 4))
+    batch.CHUNK_SIZE = args.chunk
+
+    print(
+        f"{args.prospects} prospects advanced {stages} stages, "
+        f"{args.latency_ms:g}ms per round trip, chunks of {args.chunk}"
+    )
+    elapsed, database, processor = asyncio.run(
+        run_batch(args.prospects, stages, latency, args.missing_documents)
+    )
+    moves = sum(row["action"] == "prospect_advanced" for row in database.activity)
+    _report(
+        "batch",
+        elapsed,
+        args.prospects * stages,
+        database,
+        f", {len(processor.notifications)} emails queued",
+    )
+    stages_reached = Counter(
+        database.steps[p.current_step_id].name for p in database.prospects.values()
+    )
+    print(
+        f"{'':<13} {moves} moves; now at "
+        + ", ".join(f"{name}: {n}" for name, n in stages_reached.items())
+    )
+
+    sample = min(args.per_prospect_sample, args.prospects)
+    sample_elapsed, sample_db = asyncio.run(
+        run_per_prospect_model(sample, stages, latency, args.per_prospect_round_trips)
+    )
+    scale = args.prospects / sample
+    sample_db.transactions = int(sample_db.transactions * scale)
+    sample_db.round_trips = int(sample_db.round_trips * scale)
+    _report(
+        "per prospect",
+        sample_elapsed * scale,
+        args.prospects * stages,
+        sample_db,
+        f", extrapolated from {sample}",
+    )
+
+    if args.budget_seconds is not None and elapsed > args.budget_seconds:
+        print(f"batch took {elapsed:.2f}s, over {args.budget_seconds:g}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Benchmark QR self check-in under a door-scan burst.
+
+``--members`` scans arrive at ``--rate`` per second (a training's crowd
+filing past the door QR code) and each one's latency is measured from
+arrival to response, for
+
+  * the fast path (``app/services/qr_check_in_service.py``): a warm roster
+    and the batching writer, run for real against a simulated database;
+  * the per-scan path (``EventService.self_check_in`` plus its audit entry),
+    modelled as ``--per-scan-round-trips`` sequential round trips holding
+    one pooled connection each.
+
+The simulated database charges ``--latency-ms`` per round trip and has
+``DB_POOL_MAX`` connections; statements, savepoints, inserts and commits
+each count as one. Authentication is excluded from both paths. The model
+flatters the per-scan path slightly: concurrent audit entries there contend
+for the chain head, which is not simulated.
+
+No database or running services are needed.
+
+Usage:
+
+    cd backend
+    python scripts/benchmark_qr_check_in.py                       # 300 scans at 50/s
+    python scripts/benchmark_qr_check_in.py --latency-ms 5 --rate 100
+    python scripts/benchmark_qr_check_in.py --budget-p99-ms 250
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy.dialects import mysql  # noqa: E402
+
+import app.core.database as database_module  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.models.event import Event, EventRSVP, EventType, RSVPStatus  # noqa: E402
+from app.services import qr_check_in_service as qr  # noqa: E402
+
+# Round trips of EventService.self_check_in for a non-training event plus
+# its audit entry: event, member, phase gate, timezone, RSVP, insert,
+# commit, refresh; savepoint, organization, chain head, insert, refresh,
+# release; the request's final commit.
+PER_SCAN_ROUND_TRIPS = 15
+
+
+class _Result:
+    def __init__(self, rows=()):
+        self._rows = list(rows)
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class SimulatedDatabase:
+    """Just enough of MySQL for the check-in writer: RSVP rows in a dict,
+    ``latency`` seconds per round trip, ``pool_size`` connections."""
+
+    def __init__(self, latency: float, pool_size: int):
+        self.latency = latency
+        self.pool = asyncio.Semaphore(pool_size)
+        self.rsvps: dict[tuple[str, str], datetime] = {}
+        self.audit_rows: list[dict] = []
+        self.round_trips = 0
+        self.transactions = 0
+
+    async def round_trip(self, count: int = 1) -> None:
+        for _ in range(count):
+            self.round_trips += 1
+            await asyncio.sleep(self.latency)
+
+    def session(self):
+        return _SimulatedSession(self)
+
+
+class _SimulatedSession:
+    def __init__(self, database: SimulatedDatabase):
+        self.database = database
+
+    async def __aenter__(self):
+        await self.database.pool.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.database.pool.release()
+        return False
+
+    async def execute(self, stmt, rows=None):
+        database = self.database
+        await database.round_trip()
+        if stmt.is_insert and stmt.table.name == "audit_logs":
+            database.audit_rows.extend(rows)
+            return _Result()
+        params = stmt.compile(dialect=mysql.dialect()).params
+        if stmt.is_insert:
+            for key, value in params.items():
+                if key.startswith("user_id_m"):
+                    at = params[key.replace("user_id", "checked_in_at")]
+                    database.rsvps.setdefault((params["event_id_m0"], value), at)
+            return _Result()
+
+        entity = stmt.column_descriptions[0]["name"]
+        if entity == "AuditLog":
+            return _Result()
+        event_id = params["event_id_1"]
+        user_ids = params["user_id_1"]
+        found = [u for u in user_ids if (event_id, u) in database.rsvps]
+        if entity == "user_id":
+            return _Result(found)
+        return _Result(
+            EventRSVP(
+                event_id=event_id,
+                user_id=user_id,
+                status=RSVPStatus.GOING,
+                checked_in=True,
+                checked_in_at=database.rsvps[(event_id, user_id)],
+            )
+            for user_id in found
+        )
+
+    def begin_nested(self):
+        return _Savepoint(self.database)
+
+    async def commit(self):
+        await self.database.round_trip()
+        self.database.transactions += 1
+
+
+class _Savepoint:
+    def __init__(self, database: SimulatedDatabase):
+        self.database = database
+
+    async def __aenter__(self):
+        await self.database.round_trip()
+
+    async def __aexit__(self, *exc_info):
+        await self.database.round_trip()
+        return False
+
+
+def _roster(now: datetime) -> qr.CheckInRoster:
+    event = Event(
+        id="bench-event",
+        organization_id="bench-org",
+        title="Burst drill",
+        event_type=EventType.TRAINING,
+        start_datetime=now - timedelta(minutes=5),
+        end_datetime=now + timedelta(hours=2),
+        is_cancelled=False,
+    )
+    return qr.CheckInRoster(event=event, timezone=None, loaded_at=time.monotonic())
+
+
+async def _burst(members: int, rate: float, scan) -> list[float]:
+    """Start ``scan(i)`` at ``i / rate`` seconds; return each latency."""
+    started = time.perf_counter()
+
+    async def one(i: int) -> float:
+        await asyncio.sleep(max(0.0, started + i / rate - time.perf_counter()))
+        arrived = time.perf_counter()
+        await scan(i)
+        return time.perf_counter() - arrived
+
+    return list(await asyncio.gather(*(one(i) for i in range(members))))
+
+
+async def run_fast_path(
+    members: int, rate: float, latency: float, pool_size: int
+) -> tuple[list[float], SimulatedDatabase]:
+    database = SimulatedDatabase(latency, pool_size)
+    roster = _roster(datetime.now(timezone.utc))
+    writer = qr.CheckInWriter()
+
+    async def load_roster(db, event_id, organization_id):
+        return roster
+
+    async def scan(i: int) -> None:
+        user = SimpleNamespace(
+            id=f"member-{i}", organization_id="bench-org", username=f"m{i}"
+        )
+        rsvp, error, _ = await qr.self_check_in(None, roster.event.id, user)
+        if error is not None:
+            raise RuntimeError(f"check-in refused: {error}")
+
+    with patch.object(qr, "load_roster", load_roster), patch.object(
+        qr, "roster_cache", qr.RosterCache()
+    ), patch.object(qr, "check_in_writer", writer), patch.object(
+        database_module, "async_session_factory", database.session
+    ):
+        await writer.start()
+        try:
+            latencies = await _burst(members, rate, scan)
+        finally:
+            await writer.stop()
+    return latencies, database
+
+
+async def run_per_scan_model(
+    members: int, rate: float, latency: float, pool_size: int, round_trips: int
+) -> tuple[list[float], SimulatedDatabase]:
+    database = SimulatedDatabase(latency, pool_size)
+
+    async def scan(i: int) -> None:
+        async with database.session():
+            await database.round_trip(round_trips)
+        database.transactions += 1
+
+    return await _burst(members, rate, scan), database
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _report(name: str, latencies: list[float], database: SimulatedDatabase) -> None:
+    p50, p95, p99 = (percentile(latencies, p) * 1000 for p in (50, 95, 99))
+    print(
+        f"{name:<10} p50 {p50:7.1f}ms  p95 {p95:7.1f}ms  p99 {p99:7.1f}ms  "
+        f"max {max(latencies) * 1000:7.1f}ms  "
+        f"({database.transactions} transactions, "
+        f"{database.round_trips / len(latencies):.1f} round trips/scan)"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Time QR self check-in under a burst of door scans."
+    )
+    parser.add_argument("--members", type=int, default=300)
+    parser.add_argument("--rate", type=float, default=50.0, help="Scans per second")
+    parser.add_argument(
+        "--latency-ms", type=float, default=2.0, help="Cost of one DB round trip"
+    )
+    parser.add_argument("--pool-size", type=int, default=settings.DB_POOL_MAX)
+    parser.add_argument(
+        "--per-scan-round-trips", type=int, default=PER_SCAN_ROUND_TRIPS
+    )
+    parser.add_argument(
+        "--budget-p99-ms",
+        type=float,
+        default=None,
+        help="Exit 1 if the fast path's p99 exceeds this",
+    )
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    print(
+        f"{args.members} scans at {args.rate:g}/s, {args.latency_ms:g}ms per "
+        f"round trip, pool of {args.pool_size}"
+    )
+    fast, fast_db = asyncio.run(
+        run_fast_path(args.members, args.rate, latency, args.pool_size)
+    )
+    _report("fast path", fast, fast_db)
+    per_scan, per_scan_db = asyncio.run(
+        run_per_scan_model(
+            args.members,
+            args.rate,
+            latency,
+            args.pool_size,
+            args.per_scan_round_trips,
+        )
+    )
+    _report("per scan", per_scan, per_scan_db)
+
+    if args.budget_p99_ms is not None:
+        p99 = percentile(fast, 99) * 1000
+        if p99 > args.budget_p99_ms:
+            print(f"fast-path p99 {p99:.1f}ms exceeds {args.budget_p99_ms:g}ms")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
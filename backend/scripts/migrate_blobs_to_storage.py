@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Move product photos stored as MySQL BLOBs into object storage.
+
+Before the storage layer (app/core/storage.py), every storefront product photo
+lived in ``store_product_images.data`` — a MEDIUMBLOB that bloats the
+database, its backups, and the InnoDB buffer pool. New uploads go straight to
+the configured backend; this script moves the rows written before that.
+
+Each row is copied to the backend under a fresh key, then repointed
+(``storage_key`` set, ``data`` cleared) and committed in batches, so it is
+safe to interrupt and re-run: rows already moved are skipped.
+
+    # Show how many rows (and bytes) would move:
+    docker exec -it intranet-backend python scripts/migrate_blobs_to_storage.py
+
+    # Move them:
+    docker exec -it intranet-backend python scripts/migrate_blobs_to_storage.py --apply
+
+MySQL does not hand the freed pages back to the filesystem on its own; run
+``OPTIMIZE TABLE store_product_images`` afterwards to shrink the table file.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import func, select  # noqa: E402
+
+from app.core.database import async_session_factory, database_manager  # noqa: E402
+from app.core.storage import get_storage  # noqa: E402
+from app.models.storefront import StoreProductImage  # noqa: E402
+from app.services.storefront_service import StorefrontService  # noqa: E402
+
+_PENDING = StoreProductImage.storage_key.is_(None) & StoreProductImage.data.isnot(None)
+
+
+async def _run(apply: bool, batch_size: int) -> int:
+    storage = get_storage()
+    async with async_session_factory() as db:
+        count, total_bytes = (
+            await db.execute(
+                select(
+                    func.count(StoreProductImage.id),
+                    func.coalesce(func.sum(func.length(StoreProductImage.data)), 0),
+                ).where(_PENDING)
+            )
+        ).one()
+        print(f"Storage backend     : {storage.name}")
+        print(f"Photos still in DB  : {count}")
+        print(f"Bytes to move       : {total_bytes}")
+        if not count:
+            print("\nNothing to migrate.")
+            return 0
+        if not apply:
+            print("\nRun again with --apply to move them.")
+            return 0
+
+        moved = 0
+        while True:
+            rows = (
+                await db.execute(
+                    select(
+                        StoreProductImage.id,
+                        StoreProductImage.organization_id,
+                        StoreProductImage.product_id,
+                        StoreProductImage.content_type,
+                        StoreProductImage.data,
+                    )
+                    .where(_PENDING)
+                    .order_by(StoreProductImage.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                break
+            for row in rows:
+                key = StorefrontService.product_image_key(
+                    row.organization_id, row.product_id
+                )
+                await storage.put_bytes(key, row.data, row.content_type)
+                image = await db.get(StoreProductImage, row.id)
+                image.storage_key = key
+                image.data = None
+                image.byte_size = len(row.data)
+            await db.commit()
+            moved += len(rows)
+            print(f"  moved {moved}/{count}")
+
+        print(f"\nMoved {moved} photo(s) to {storage.name} storage.")
+        print("Run OPTIMIZE TABLE store_product_images to reclaim the space.")
+        return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Move product photo BLOBs out of MySQL into object storage."
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Copy and repoint the rows (default: report only)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50,
+        help="Rows per commit (default: 50)",
+    )
+    args = parser.parse_args()
+
+    async def _main() -> int:
+        await database_manager.connect()
+        try:
+            return await _run(args.apply, args.batch_size)
+        finally:
+            await database_manager.disconnect()
+
+    return asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
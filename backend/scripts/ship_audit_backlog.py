@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Drain a backlog of unshipped audit rows to the off-host collector.
+
+The scheduled shipping task sends at most a few thousand rows per 30-minute
+run, which is right for steady state but takes days to catch up after
+shipping is first enabled on an old install or the collector has been down
+for a while. This runs the same pipeline in catch-up mode — no per-run batch
+cap, batches growing up to AUDIT_SHIP_MAX_BATCH_SIZE while the collector keeps
+up — until the backlog is drained or the maintenance window closes. The
+watermark is committed per acknowledged batch, so it can be stopped and
+re-run at any point. The scheduled task may run alongside it: the watermark
+is only ever raised, never moved back, but rows both runs read are sent
+twice, so the collector must de-duplicate on row id.
+
+    # Report the backlog only:
+    docker exec -it intranet-backend python scripts/ship_audit_backlog.py --dry-run
+
+    # Ship for at most 90 minutes:
+    docker exec -it intranet-backend python scripts/ship_audit_backlog.py --minutes 90
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import func, select  # noqa: E402
+
+from app.core.database import async_session_factory, database_manager  # noqa: E402
+from app.models.audit import AuditLog, AuditShipState  # noqa: E402
+from app.services.audit_ship_service import ship_new_audit_logs  # noqa: E402
+
+
+async def _backlog(db) -> int:
+    watermark = (
+        await db.execute(select(AuditShipState.last_shipped_id).limit(1))
+    ).scalar() or 0
+    return (
+        await db.execute(
+            select(func.count()).select_from(AuditLog).where(AuditLog.id > watermark)
+        )
+    ).scalar() or 0
+
+
+async def _run(minutes: float, dry_run: bool) -> int:
+    async with async_session_factory() as db:
+        pending = await _backlog(db)
+        print(f"Unshipped audit rows: {pending:,}")
+        if dry_run or not pending:
+            return 0
+
+        started = time.monotonic()
+        result = await ship_new_audit_logs(
+            db, catch_up=True, deadline_seconds=minutes * 60
+        )
+        elapsed = time.monotonic() - started
+        shipped = result["shipped_entries"]
+
+        if result["skipped_reason"]:
+            print(f"Skipped: {result['skipped_reason']}")
+            return 1
+        print(
+            f"Shipped {shipped:,} rows in {result['batches']:,} batches "
+            f"({elapsed:.0f}s, {shipped / max(elapsed, 1e-9):,.0f} rows/s, "
+            f"final batch size {result['batch_size']})"
+        )
+        if result["error"]:
+            print(f"Stopped: {result['error']}")
+            return 1
+        remaining = await _backlog(db)
+        print(f"Still unshipped: {remaining:,}")
+        return 0 if not remaining else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Drain unshipped audit rows to the off-host collector."
+    )
+    parser.add_argument(
+        "--minutes",
+        type=float,
+        default=60.0,
+        help="Stop starting new batches after this long (default: 60)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report how many rows are waiting to be shipped",
+    )
+    args = parser.parse_args()
+
+    async def _main() -> int:
+        await database_manager.connect()
+        try:
+            return await _run(args.minutes, args.dry_run)
+        finally:
+            await database_manager.disconnect()
+
+    return asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
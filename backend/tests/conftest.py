@@ -12,6 +12,9 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import configure_mappers
 
+# @pytest.mark.query_budget — see tests/query_budget.py.
+pytest_plugins = ["tests.query_budget"]
+
 # PyJWT >= 2.13 rejects empty HMAC signing keys. Outside production the
 # app's Settings allow an unset SECRET_KEY (startup validation enforces it
 # in production), so give the test process a deterministic key BEFORE any
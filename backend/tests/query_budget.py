@@ -0,0 +1,81 @@
+"""
+Query budget pytest plugin (loaded from conftest.py).
+
+Fails a test whose requests issue more queries than allowed, using the
+request profiler in app/core/query_profiler.py::
+
+    @pytest.mark.query_budget(6)
+    async def test_member_list(client): ...
+
+    @pytest.mark.query_budget({"GET /api/v1/users": 4, "*": 10})
+    async def test_member_pages(client): ...
+
+An integer caps every request the test makes; a mapping caps each
+``METHOD /route/template`` it names, with ``"*"`` for the rest. A test that
+makes no HTTP request — a service called directly — is held to the budget
+as a whole (``"*"`` for a mapping). Queries issued by fixtures are not
+counted.
+"""
+
+from typing import Dict, List, Optional, Union
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from app.core.query_profiler import QueryProfile, install_query_profiler, query_profiler
+
+Budget = Union[int, Dict[str, int]]
+
+
+def _limit(budget: Budget, route: str) -> Optional[int]:
+    if isinstance(budget, int):
+        return budget
+    return budget.get(route, budget.get("*"))
+
+
+def budget_violations(budget: Budget, captured: List[QueryProfile]) -> List[str]:
+    """Describe each profile in *captured* that exceeds *budget*.
+
+    ``captured[0]`` is the test body itself; it is only checked when no
+    request was captured.
+    """
+    block, requests = captured[0], captured[1:]
+    violations = []
+    for profile in requests or [block]:
+        limit = _limit(budget, profile.label)
+        if limit is None or profile.count <= limit:
+            continue
+        repeated = ", ".join(
+            f"{n}x {shape[:80]!r}" for shape, n in profile.shapes.most_common(3)
+        )
+        violations.append(
+            f"{profile.label}: {profile.count} queries > budget {limit} "
+            f"(most repeated: {repeated})"
+        )
+    return violations
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(limit): fail when a request (or the test body, if it "
+        "makes none) issues more queries than limit; an int or a mapping of "
+        "'METHOD /route' to limit",
+    )
+    # Class-level hooks: every engine, including the one the session fixture
+    # creates later. They do nothing outside a profile.
+    install_query_profiler(Engine)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    budget = marker.args[0]
+    with query_profiler.capture() as captured:
+        result = yield
+    violations = budget_violations(budget, captured)
+    if violations:
+        pytest.fail("Query budget exceeded:\n  " + "\n  ".join(violations), False)
+    return result
@@ -0,0 +1,276 @@
+"""Tests for analytics ingestion and rollups
+(app/services/analytics_rollup_service.py).
+
+Covers the ordered scan -> check-in pairing, folding raw rows into hourly and
+daily buckets, batch ingestion with client timestamps, the additive upsert
+that rolls a batch up exactly once, metrics that merge rollups with pending
+raw rows counted in SQL (pairing only recent pending check-ins), and the retention class that prunes only rolled-up rows. DB is
+mocked; no MySQL.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import mysql
+
+from app.models.analytics import AnalyticsEvent
+from app.services.analytics_rollup_service import (
+    AnalyticsRollupService,
+    fold,
+    pair_check_ins,
+)
+from app.services.retention_service import RECORD_CLASSES
+
+T0 = datetime(2026, 9, 1, 18, 0, tzinfo=timezone.utc)
+
+_ids = iter(range(1, 1_000_000))
+
+
+def _row(event_type, seconds=0, user="u1", event="e1", device="mobile", **extra):
+    return SimpleNamespace(
+        id=f"row-{next(_ids)}",
+        organization_id="org1",
+        event_id=event,
+        user_id=user,
+        event_type=event_type,
+        device_type=device,
+        event_metadata=extra.get("metadata", {}),
+        created_at=T0 + timedelta(seconds=seconds),
+    )
+
+
+def _rows(rows):
+    return MagicMock(all=MagicMock(return_value=list(rows)))
+
+
+class TestPairCheckIns:
+    def test_check_in_pairs_with_the_latest_earlier_scan(self):
+        first = _row("qr_scan", 0)
+        second = _row("qr_scan", 30)
+        check_in = _row("check_in_success", 45)
+
+        assert pair_check_ins([check_in, second, first]) == {check_in.id: 15.0}
+
+    def test_a_scan_is_claimed_by_one_check_in_only(self):
+        scan = _row("qr_scan", 0)
+        first = _row("check_in_success", 10)
+        repeat = _row("check_in_success", 20)
+
+        assert pair_check_ins([scan, first, repeat]) == {first.id: 10.0}
+
+    def test_members_and_events_are_paired_separately(self):
+        scan = _row("qr_scan", 0, user="u1")
+        other_member = _row("check_in_success", 5, user="u2")
+        other_event = _row("check_in_success", 5, event="e2")
+
+        assert pair_check_ins([scan, other_member, other_event]) == {}
+
+    def test_same_instant_and_stale_scans_do_not_pair(self):
+        simultaneous = [_row("qr_scan", 0), _row("check_in_success", 0)]
+        stale = [_row("qr_scan", 0), _row("check_in_success", 25 * 3600)]
+
+        assert pair_check_ins(simultaneous) == {}
+        assert pair_check_ins(stale) == {}
+
+    def test_naive_timestamps_from_column_selects_are_utc(self):
+        scan = _row("qr_scan", 0)
+        scan.created_at = scan.created_at.replace(tzinfo=None)
+        check_in = _row("check_in_success", 8)
+
+        assert pair_check_ins([scan, check_in]) == {check_in.id: 8.0}
+
+
+class TestFold:
+    def test_each_row_lands_in_an_hour_and_a_day_bucket(self):
+        failure = _row(
+            "check_in_failure",
+            3600 + 5,
+            device=None,
+            metadata={"error_reason": "expired_qr"},
+        )
+        check_in = _row("check_in_success", 60)
+
+        totals = fold([failure, check_in], {check_in.id: 12.5})
+
+        day = datetime(2026, 9, 1, tzinfo=timezone.utc)
+        failed = ("e1", "check_in_failure", "", "expired_qr")
+        succeeded = ("e1", "check_in_success", "mobile", "")
+        assert totals == {
+            ("org1", "hour", T0 + timedelta(hours=1), *failed): [1, 0, 0.0],
+            ("org1", "day", day, *failed): [1, 0, 0.0],
+            ("org1", "hour", T0, *succeeded): [1, 1, 12.5],
+            ("org1", "day", day, *succeeded): [1, 1, 12.5],
+        }
+
+
+class TestRecord:
+    async def test_batch_is_one_insert_with_clamped_client_times(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+        now = T0
+
+        count = await AnalyticsRollupService(db).record(
+            "org1",
+            "u1",
+            [
+                {
+                    "event_type": "qr_scan",
+                    "event_id": "e1",
+                    "metadata": {"deviceType": "tablet"},
+                    "occurred_at": now - timedelta(seconds=40),
+                },
+                {"event_type": "qr_view", "event_id": "e1", "metadata": None},
+                {
+                    "event_type": "qr_print",
+                    "event_id": "e1",
+                    "metadata": {},
+                    "occurred_at": now + timedelta(days=3),
+                },
+                {
+                    "event_type": "qr_print",
+                    "event_id": "e1",
+                    "metadata": {},
+                    "occurred_at": now - timedelta(days=3),
+                },
+            ],
+            now=now,
+        )
+
+        assert count == 4
+        db.execute.assert_awaited_once()
+        stmt, rows = db.execute.await_args.args
+        assert stmt.table.name == "analytics_events"
+        assert [r["created_at"] for r in rows] == [
+            now - timedelta(seconds=40),
+            now,
+            now,
+            now - timedelta(hours=24),
+        ]
+        assert rows[0]["device_type"] == "tablet"
+        assert rows[1]["metadata"] == {}
+
+
+class TestRollUpBatch:
+    async def test_upserts_additively_and_marks_the_rows(self):
+        scan = _row("qr_scan", 0)
+        check_in = _row("check_in_success", 20)
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                _rows([scan, check_in]),  # pending batch
+                _rows([scan, check_in]),  # pairing history
+                MagicMock(),  # upsert
+                MagicMock(),  # mark rolled up
+            ]
+        )
+
+        rolled = await AnalyticsRollupService(db).roll_up_batch(limit=10)
+
+        assert rolled == 2
+        select_stmt = db.execute.await_args_list[0].args[0]
+        assert "SKIP LOCKED" in str(select_stmt.compile(dialect=mysql.dialect()))
+
+        upsert, values = db.execute.await_args_list[2].args
+        sql = str(upsert.compile(dialect=mysql.dialect()))
+        assert (
+            "event_count = (analytics_rollups.event_count + VALUES(event_count))" in sql
+        )
+        hourly = {
+            v["event_type"]: (v["event_count"], v["check_in_pairs"])
+            for v in values
+            if v["granularity"] == "hour"
+        }
+        assert hourly == {"qr_scan": (1, 0), "check_in_success": (1, 1)}
+
+        mark = db.execute.await_args_list[3].args[0]
+        assert mark.compile().params["rolled_up"] is True
+
+    async def test_nothing_pending_writes_nothing(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_rows([]))
+
+        assert await AnalyticsRollupService(db).roll_up_batch() == 0
+        db.execute.assert_awaited_once()
+
+
+class TestMetrics:
+    async def test_rollups_and_pending_rows_are_combined(self):
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                _rows(
+                    [
+                        ("qr_scan", "mobile", "", 4, 0, 0.0),
+                        ("check_in_success", "mobile", "", 3, 2, 50.0),
+                        ("check_in_failure", "desktop", "expired_qr", 1, 0, 0.0),
+                    ]
+                ),
+                _rows([(18, 7), (19, 1)]),
+                _rows([("qr_scan", None, "", 20, 1)]),  # pending, grouped
+                _rows([]),  # recent pending check-ins
+            ]
+        )
+
+        metrics = await AnalyticsRollupService(db).metrics("org1", "e1", now=T0)
+
+        assert metrics["total_scans"] == 5
+        assert metrics["successful_check_ins"] == 3
+        assert metrics["failed_check_ins"] == 1
+        assert metrics["success_rate"] == 75.0
+        assert metrics["avg_time_to_check_in"] == 25.0
+        assert metrics["device_breakdown"] == {
+            "mobile": 7,
+            "desktop": 1,
+            "unknown": 1,
+        }
+        assert metrics["error_breakdown"] == {"expired_qr": 1}
+        counts = {h["hour"]: h["count"] for h in metrics["hourly_activity"]}
+        assert counts[18] == 7
+        assert counts[19] == 1
+        assert counts[20] == 1
+        assert len(counts) == 24
+
+    async def test_pending_rows_are_counted_in_sql_and_recent_ones_paired(self):
+        scan = _row("qr_scan", 0)
+        check_in = _row("check_in_success", 40)
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                _rows([]),  # daily rollups
+                _rows([]),  # hourly rollups
+                _rows(
+                    [
+                        ("qr_scan", "mobile", "", 18, 1),
+                        ("check_in_success", "mobile", "", 18, 1),
+                        ("check_in_failure", "mobile", "bad_token", 18, 2),
+                    ]
+                ),
+                _rows([check_in]),  # recent pending check-ins
+                _rows([scan, check_in]),  # pairing history
+            ]
+        )
+
+        metrics = await AnalyticsRollupService(db).metrics(
+            "org1", now=T0 + timedelta(hours=1)
+        )
+
+        grouped = str(
+            db.execute.await_args_list[2].args[0].compile(dialect=mysql.dialect())
+        )
+        assert "GROUP BY" in grouped
+        assert "SELECT analytics_events.metadata" not in grouped
+        recent = db.execute.await_args_list[3].args[0].compile(dialect=mysql.dialect())
+        assert "LIMIT" in str(recent)
+        assert T0 - timedelta(hours=23) in recent.params.values()
+        assert metrics["failed_check_ins"] == 2
+        assert metrics["error_breakdown"] == {"bad_token": 2}
+        assert metrics["avg_time_to_check_in"] == 40.0
+        assert metrics["hourly_activity"][18]["count"] == 4
+
+
+def test_retention_sweeps_only_rolled_up_events():
+    rc = next(rc for rc in RECORD_CLASSES if rc.key == "analytics_events")
+
+    assert rc.model is AnalyticsEvent
+    assert "rolled_up" in str(rc.row_filter(AnalyticsEvent))
@@ -2,10 +2,14 @@
 
 Covers the safety properties of ``AuditLogger.archive_expired_logs``:
 checkpoint-aligned purging, JSONL export, attested chain-head hand-off so
-the surviving chain verifies, and rejection of unsanctioned head deletions.
+the surviving chain verifies, and rejection of unsanctioned head deletions;
+and, without a database, the streaming export (paged reads, multi-member
+gzip, bounded delete chunks, one verified and attested range at a time,
+archives named after and holding only the ranges actually purged).
 """
 
 import gzip
+import hashlib
 import os
 import stat
 from datetime import UTC, datetime, timedelta
@@ -14,6 +18,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from sqlalchemy import delete, func, select
+from sqlalchemy.sql.dml import Delete
 
 from app.core import audit as audit_module
 from app.core.audit import AuditLogger, audit_logger
@@ -113,7 +118,8 @@ class TestArchiveFileHardening:
                     MagicMock(scalar_one_or_none=MagicMock(return_value=rows[0])),
                     _scalars_result([checkpoint]),
                     MagicMock(scalar=MagicMock(return_value=old_ts)),
-                    _scalars_result(rows),
+                    MagicMock(all=MagicMock(return_value=rows)),
+                    MagicMock(all=MagicMock(return_value=[])),
                     MagicMock(),  # DELETE
                 ]
             ),
@@ -139,6 +145,187 @@ class TestArchiveFileHardening:
             assert len(fh.read().splitlines()) == 2
 
 
+class _FakeAuditDB:
+    """Just enough of a session for the archival queries: audit rows held in
+    a dict, checkpoints in a list, every DELETE and page read recorded."""
+
+    def __init__(self, rows, checkpoints, newest_ts):
+        self.rows = {row.id: row for row in rows}
+        self.checkpoints = checkpoints
+        self.newest_ts = newest_ts
+        self.deletes = []
+        self.pages = []
+        self.commit = AsyncMock()
+        self.flush = AsyncMock()
+
+    async def execute(self, stmt):
+        params = stmt.compile().params
+        if isinstance(stmt, Delete):
+            low, high = params["id_1"], params["id_2"]
+            self.deletes.append((low, high))
+            for i in [i for i in self.rows if low < i <= high]:
+                del self.rows[i]
+            return MagicMock()
+        sql = str(stmt)
+        if "audit_log_checkpoints" in sql:
+            return MagicMock(
+                scalars=MagicMock(
+                    return_value=MagicMock(
+                        all=MagicMock(return_value=list(self.checkpoints))
+                    )
+                )
+            )
+        if "max(" in sql:
+            return MagicMock(scalar=MagicMock(return_value=self.newest_ts))
+        if "id_1" not in params:
+            head = self.rows[min(self.rows)] if self.rows else None
+            return MagicMock(scalar_one_or_none=MagicMock(return_value=head))
+        after, last, limit = params["id_1"], params["id_2"], params["param_1"]
+        page = sorted(
+            (r for i, r in self.rows.items() if after < i <= last),
+            key=lambda r: r.id,
+        )[:limit]
+        self.pages.append([r.id for r in page])
+        return MagicMock(all=MagicMock(return_value=page))
+
+
+class TestStreamingArchive:
+    """Pure unit tests — no DB."""
+
+    @pytest.fixture(autouse=True)
+    def _small_batches(self, monkeypatch):
+        monkeypatch.setattr(audit_module.settings, "AUDIT_LOG_SIGNING_KEY", "key-A")
+        monkeypatch.setattr(audit_module, "_ARCHIVE_PAGE_SIZE", 2)
+        monkeypatch.setattr(audit_module, "_ARCHIVE_DELETE_CHUNK", 2)
+
+    @staticmethod
+    def _setup(verified=lambda end_id: True):
+        old_ts = datetime.now(UTC) - timedelta(days=3650)
+        rows = [TestArchiveFileHardening._row(i, old_ts) for i in range(1, 8)]
+        checkpoints = [
+            SimpleNamespace(
+                first_log_id=first,
+                last_log_id=last,
+                archived_at=None,
+                last_log_hash=None,
+                archive_attestation=None,
+            )
+            for first, last in [(1, 5), (6, 7)]
+        ]
+        db = _FakeAuditDB(rows, checkpoints, old_ts)
+        service = AuditLogger()
+        verified_heads = []
+
+        async def verify(db_, end_id=None):
+            verified_heads.append(min(db.rows))
+            return {"verified": verified(end_id)}
+
+        service.verify_integrity = verify
+        return service, db, checkpoints, verified_heads
+
+    async def test_ranges_stream_into_one_multi_member_archive(self, tmp_path):
+        service, db, checkpoints, verified_heads = self._setup()
+
+        result = await service.archive_expired_logs(
+            db,
+            retention_days=_PURGE_ALL,
+            archive_dir=str(tmp_path),
+            commit_ranges=True,
+        )
+
+        assert result["purged_entries"] == 7
+        assert (result["purge_start_id"], result["purge_end_id"]) == (1, 7)
+        assert db.rows == {}
+        # Paged reads and bounded deletes, never the whole range at once.
+        assert db.pages == [[1, 2], [3, 4], [5], [], [6, 7], []]
+        assert db.deletes == [(0, 2), (2, 4), (4, 5), (5, 7)]
+        # Each range is verified as the chain head after the previous one
+        # was purged, and committed on its own.
+        assert verified_heads == [1, 6]
+        assert db.commit.await_count == 2
+
+        with open(result["archive_file"], "rb") as fh:
+            raw = fh.read()
+        assert hashlib.sha256(raw).hexdigest() == result["archive_sha256"]
+        assert raw.count(b"\x1f\x8b\x08") >= 4  # one gzip member per page
+        with gzip.open(result["archive_file"], "rt", encoding="utf-8") as fh:
+            ids = [int(line.split('"id": ')[1].split(",")[0]) for line in fh]
+        assert ids == list(range(1, 8))
+
+        for cp, last in zip(checkpoints, [5, 7]):
+            assert cp.archived_at is not None
+            assert cp.last_log_hash == f"{last:02x}" * 32
+            assert cp.archive_attestation == AuditLogger.compute_archive_attestation(
+                cp.first_log_id, cp.last_log_id, cp.last_log_hash
+            )
+
+    async def test_range_failing_verification_stops_the_purge(self, tmp_path):
+        service, db, checkpoints, _ = self._setup(verified=lambda end_id: end_id < 7)
+
+        result = await service.archive_expired_logs(
+            db, retention_days=_PURGE_ALL, archive_dir=str(tmp_path)
+        )
+
+        assert result["purged_entries"] == 5
+        assert result["purge_end_id"] == 5
+        assert result["skipped_reason"] == (
+            "integrity verification failed - refusing to purge"
+        )
+        assert sorted(db.rows) == [6, 7]
+        assert checkpoints[1].archived_at is None
+        with gzip.open(result["archive_file"], "rt", encoding="utf-8") as fh:
+            assert len(fh.read().splitlines()) == 5
+        db.commit.assert_not_awaited()
+
+    async def test_archive_is_named_after_the_last_purged_range(self, tmp_path):
+        service, db, _, _ = self._setup(verified=lambda end_id: end_id < 7)
+
+        result = await service.archive_expired_logs(
+            db, retention_days=_PURGE_ALL, archive_dir=str(tmp_path)
+        )
+
+        name = os.path.basename(result["archive_file"])
+        assert name.startswith("audit_archive_000000000001-000000000005_")
+        assert os.listdir(tmp_path) == [name]
+
+    async def test_failed_range_is_cut_from_the_committed_archive(self, tmp_path):
+        service, db, _, _ = self._setup()
+        execute = db.execute
+
+        async def fail_second_range_delete(stmt):
+            if isinstance(stmt, Delete) and stmt.compile().params["id_1"] >= 5:
+                raise RuntimeError("lock wait timeout")
+            return await execute(stmt)
+
+        db.execute = fail_second_range_delete
+
+        with pytest.raises(RuntimeError, match="lock wait timeout"):
+            await service.archive_expired_logs(
+                db,
+                retention_days=_PURGE_ALL,
+                archive_dir=str(tmp_path),
+                commit_ranges=True,
+            )
+
+        (name,) = os.listdir(tmp_path)
+        assert name.startswith("audit_archive_000000000001-000000000005_")
+        with gzip.open(tmp_path / name, "rt", encoding="utf-8") as fh:
+            assert len(fh.read().splitlines()) == 5
+        assert sorted(db.rows) == [6, 7]
+
+    async def test_nothing_verified_leaves_no_archive(self, tmp_path):
+        service, db, _, _ = self._setup(verified=lambda end_id: False)
+
+        result = await service.archive_expired_logs(
+            db, retention_days=_PURGE_ALL, archive_dir=str(tmp_path)
+        )
+
+        assert result["purged_entries"] == 0
+        assert result["archive_file"] is None
+        assert os.listdir(tmp_path) == []
+        assert len(db.rows) == 7
+
+
 @pytest.mark.integration
 class TestArchiveExpiredLogs:
     async def test_purge_is_checkpoint_aligned_and_chain_survives(
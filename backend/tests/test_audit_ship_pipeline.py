@@ -0,0 +1,233 @@
+"""Unit tests for the pipelined audit-shipping loop (no database).
+
+A local collector stand-in (``httpx.MockTransport`` with per-batch latency)
+checks that several batches are in flight at once while the watermark still
+advances strictly in id order and never moves back behind a concurrent
+run, that a failed batch stops the watermark before it, gzip bodies and
+their signature, latency-driven batch sizing, and catch-up mode draining a
+backlog past the scheduled-run cap.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import hmac
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+import app.services.audit_ship_service as audit_ship_module
+from app.core.config import settings
+from app.services.audit_ship_service import _BatchSizer, ship_new_audit_logs
+
+pytestmark = pytest.mark.unit
+
+_URL = "https://collector.example/ingest"
+
+
+class _FakeDB:
+    """Audit rows ``1..total`` served by ``id > cursor LIMIT n``; the
+    watermark UPDATE honours its ``last_shipped_id <`` guard and every
+    commit records the watermark it made durable."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.state = SimpleNamespace(id=1, last_shipped_id=0, last_shipped_at=None)
+        self.committed: list[int] = []
+        self.limits: list[int] = []
+        self.commit = AsyncMock(
+            side_effect=lambda: self.committed.append(self.state.last_shipped_id)
+        )
+
+    async def execute(self, stmt):
+        params = stmt.compile().params
+        result = MagicMock()
+        if stmt.is_dml:
+            if self.state.last_shipped_id < params["last_shipped_id_1"]:
+                self.state.last_shipped_id = params["last_shipped_id"]
+            return result
+        if "id_1" not in params:
+            result.scalar_one_or_none.return_value = self.state
+            return result
+        cursor, limit = params["id_1"], params["param_1"]
+        self.limits.append(limit)
+        ids = range(cursor + 1, min(cursor + limit, self.total) + 1)
+        result.scalars.return_value.all.return_value = [
+            SimpleNamespace(id=i) for i in ids
+        ]
+        return result
+
+
+class _Collector:
+    """Collector stand-in: sleeps ``latency(first_id)`` per request and
+    tracks how many requests overlap."""
+
+    def __init__(self, latency=lambda first_id: 0.0, status=lambda first_id: 200):
+        self.latency = latency
+        self.status = status
+        self.requests: list[httpx.Request] = []
+        self.active = 0
+        self.peak = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        first_id = int(request.headers["X-Logbook-First-Id"])
+        self.requests.append(request)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.latency(first_id))
+        finally:
+            self.active -= 1
+        return httpx.Response(self.status(first_id))
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+
+@pytest.fixture(autouse=True)
+def _shipping_env(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_SHIP_WEBHOOK_URL", _URL)
+    monkeypatch.setattr(settings, "AUDIT_SHIP_BATCH_SIZE", 10)
+    monkeypatch.setattr(settings, "AUDIT_SHIP_MAX_BATCH_SIZE", 80)
+    monkeypatch.setattr(settings, "AUDIT_SHIP_MAX_IN_FLIGHT", 4)
+    monkeypatch.setattr(settings, "AUDIT_SHIP_COMPRESS", False)
+    monkeypatch.setattr(settings, "AUDIT_SHIP_TARGET_LATENCY_SECONDS", 1.0)
+    monkeypatch.setattr(audit_ship_module, "assert_outbound_url_safe", MagicMock())
+    monkeypatch.setattr(
+        audit_ship_module, "_get_audit_signing_key", lambda: "unit-test-key"
+    )
+    monkeypatch.setattr(
+        audit_ship_module.audit_logger, "serialize_row", lambda row: {"id": row.id}
+    )
+
+
+class TestPipelinedDelivery:
+    async def test_batches_overlap_but_watermark_advances_in_order(self):
+        db = _FakeDB(total=100)
+        # Earlier batches are the slowest, so later ones are acknowledged
+        # by the collector first.
+        collector = _Collector(latency=lambda first_id: 0.05 - first_id / 4000)
+
+        result = await ship_new_audit_logs(db, client=collector.client())
+
+        assert result["error"] is None
+        assert (result["shipped_entries"], result["batches"]) == (100, 10)
+        assert collector.peak == 4
+        assert db.committed == list(range(10, 101, 10))
+        assert db.state.last_shipped_id == 100
+
+    async def test_concurrent_run_ahead_is_never_moved_back(self):
+        db = _FakeDB(total=100)
+        record = db.commit.side_effect
+
+        def other_run_commits():
+            # A concurrent catch-up run has already shipped through id 60.
+            db.state.last_shipped_id = max(db.state.last_shipped_id, 60)
+            record()
+
+        db.commit.side_effect = other_run_commits
+
+        result = await ship_new_audit_logs(db, client=_Collector().client())
+
+        assert result["error"] is None
+        assert db.committed == [60] * 6 + [70, 80, 90, 100]
+
+    async def test_failed_batch_holds_the_watermark_before_it(self):
+        db = _FakeDB(total=100)
+        collector = _Collector(
+            latency=lambda first_id: 0.01,
+            status=lambda first_id: 503 if first_id == 31 else 200,
+        )
+
+        result = await ship_new_audit_logs(db, client=collector.client())
+
+        assert result["error"] == "collector returned HTTP 503"
+        assert result["shipped_entries"] == 30
+        assert db.committed == [10, 20, 30]
+        # Nothing past the failed batch was started beyond the pipeline.
+        assert len(collector.requests) <= 3 + 4
+
+    async def test_transport_error_cancels_in_flight_batches(self):
+        db = _FakeDB(total=100)
+
+        async def handle(request):
+            if request.headers["X-Logbook-First-Id"] == "11":
+                raise httpx.ConnectError("collector down")
+            await asyncio.sleep(0.05)
+            return httpx.Response(200)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+
+        result = await ship_new_audit_logs(db, client=client)
+
+        assert result["error"] == "delivery failed: ConnectError"
+        assert db.committed == [10]
+
+    async def test_gzip_body_is_signed_as_sent(self, monkeypatch):
+        monkeypatch.setattr(settings, "AUDIT_SHIP_COMPRESS", True)
+        db = _FakeDB(total=3)
+        collector = _Collector()
+
+        await ship_new_audit_logs(db, client=collector.client())
+
+        (request,) = collector.requests
+        assert request.headers["Content-Encoding"] == "gzip"
+        body = request.content
+        lines = gzip.decompress(body).decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+        expected = hmac.new(b"unit-test-key", body, hashlib.sha256).hexdigest()
+        assert request.headers["X-Logbook-Signature"] == f"sha256={expected}"
+
+
+class TestBatchSizing:
+    def test_slow_responses_halve_and_quick_full_ones_double(self):
+        sizer = _BatchSizer(400, ceiling=1000, target_latency=2.0)
+
+        sizer.observe(3.0, full=True)
+        assert sizer.size == 200
+        sizer.observe(1.5, full=True)  # within target: hold
+        assert sizer.size == 200
+        sizer.observe(0.1, full=False)  # quick but the backlog ran out
+        assert sizer.size == 200
+        for _ in range(5):
+            sizer.observe(0.1, full=True)
+        assert sizer.size == 1000
+        for _ in range(10):
+            sizer.observe(5.0, full=True)
+        assert sizer.size == 50
+
+    async def test_scheduled_run_is_capped_and_never_grows(self):
+        db = _FakeDB(total=1000)
+
+        result = await ship_new_audit_logs(db, client=_Collector().client())
+
+        assert result["batches"] == audit_ship_module._MAX_BATCHES_PER_RUN
+        assert set(db.limits) == {10}
+
+    async def test_catch_up_drains_the_backlog_with_growing_batches(self):
+        db = _FakeDB(total=5000)
+
+        result = await ship_new_audit_logs(
+            db, client=_Collector().client(), catch_up=True
+        )
+
+        assert result["error"] is None
+        assert result["shipped_entries"] == 5000
+        assert db.state.last_shipped_id == 5000
+        assert max(db.limits) == 80
+        assert result["batches"] < 5000 / 10
+
+    async def test_catch_up_deadline_stops_new_batches(self):
+        db = _FakeDB(total=5000)
+        collector = _Collector(latency=lambda first_id: 0.02)
+
+        result = await ship_new_audit_logs(
+            db, client=collector.client(), catch_up=True, deadline_seconds=0.05
+        )
+
+        assert 0 < result["shipped_entries"] < 5000
+        assert db.state.last_shipped_id == result["shipped_entries"]
+        assert len(collector.requests) == result["batches"]
@@ -83,13 +83,22 @@ def _batch_result(rows):
 
 def _fake_db(state, batches):
     """AsyncSession stand-in: first execute() returns the ship state, then
-    each subsequent call returns the next batch of rows."""
+    each subsequent SELECT returns the next batch of rows; the watermark
+    UPDATE is applied to ``state`` under its ``last_shipped_id <`` guard."""
     state_result = MagicMock()
     state_result.scalar_one_or_none.return_value = state
+    selects = iter([state_result] + [_batch_result(rows) for rows in batches])
+
+    async def execute(stmt):
+        if not stmt.is_dml:
+            return next(selects)
+        params = stmt.compile().params
+        if state.last_shipped_id < params["last_shipped_id_1"]:
+            state.last_shipped_id = params["last_shipped_id"]
+        return MagicMock()
+
     db = MagicMock()
-    db.execute = AsyncMock(
-        side_effect=[state_result] + [_batch_result(rows) for rows in batches]
-    )
+    db.execute = AsyncMock(side_effect=execute)
     db.commit = AsyncMock()
     return db
 
@@ -131,7 +140,7 @@ class TestShipValidatesOncePerRunOffLoop:
 
         monkeypatch.setattr(audit_ship_module.asyncio, "to_thread", fake_to_thread)
 
-        state = SimpleNamespace(last_shipped_id=0, last_shipped_at=None)
+        state = SimpleNamespace(id=1, last_shipped_id=0, last_shipped_at=None)
         rows = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
         db = _fake_db(state, [[rows[0]], [rows[1]], []])
         client, captured = _collector()
@@ -144,8 +153,9 @@ class TestShipValidatesOncePerRunOffLoop:
         assert len(captured) == 2
         # One validation for the whole run — not one per batch — and it went
         # through asyncio.to_thread so the blocking DNS stays off the loop.
+        # The other worker-thread calls encode the two batches.
         guard.assert_called_once_with(_URL, allow_private=False)
-        assert to_thread_funcs == [guard]
+        assert to_thread_funcs == [guard] + [audit_ship_module._encode] * 2
         assert state.last_shipped_id == 2
         assert db.commit.await_count == 2
 
@@ -155,7 +165,7 @@ class TestShipValidatesOncePerRunOffLoop:
         guard = MagicMock()
         monkeypatch.setattr(audit_ship_module, "assert_outbound_url_safe", guard)
 
-        state = SimpleNamespace(last_shipped_id=0, last_shipped_at=None)
+        state = SimpleNamespace(id=1, last_shipped_id=0, last_shipped_at=None)
         db = _fake_db(state, [[SimpleNamespace(id=1)], []])
         client, captured = _collector()
 
@@ -171,7 +181,7 @@ class TestShipValidatesOncePerRunOffLoop:
         guard = MagicMock(side_effect=ValueError("private/internal IP address"))
         monkeypatch.setattr(audit_ship_module, "assert_outbound_url_safe", guard)
 
-        state = SimpleNamespace(last_shipped_id=0, last_shipped_at=None)
+        state = SimpleNamespace(id=1, last_shipped_id=0, last_shipped_at=None)
         db = _fake_db(state, [[SimpleNamespace(id=1)], []])
         client, captured = _collector()
 
@@ -0,0 +1,36 @@
+"""
+Cold-start import budget (scripts/benchmark_cold_start.py).
+
+Every worker imports ``main`` on boot. The heavy optional libraries — PDF and
+spreadsheet generators, image codecs, web push, cloud SDKs — are only needed
+by a handful of endpoints and must be imported on first use, not at start.
+The check runs in a fresh interpreter because this test session has usually
+imported them already.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from scripts.benchmark_cold_start import BACKEND_DIR, LAZY_IMPORTS
+
+_PROBE = (
+    "import json, sys\n"
+    "import main  # noqa: F401\n"
+    f"print(json.dumps([m for m in {LAZY_IMPORTS!r} if m in sys.modules]))\n"
+)
+
+
+def test_importing_the_app_loads_no_heavy_optional_library():
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND_DIR,
+        env=dict(os.environ),
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=300,
+    )
+
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,111 @@
+"""
+Tests for compiled permission sets
+(app/core/permissions.py :: PermissionSet / compile_permissions).
+
+A compiled set must answer ``permission_matches`` exactly as the plain set
+of the same names does — for every registered permission, under exact
+grants, module wildcards and ``"*"``, and for names outside the registry.
+Compiled sets are shared per combination of position permission lists and
+rank, so an edited position compiles afresh.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.dependencies import _collect_user_permissions
+from app.core import permissions
+from app.core.permissions import (
+    PermissionSet,
+    clear_compiled_permissions,
+    compile_permissions,
+    get_all_permissions,
+    get_rank_default_permissions,
+    permission_matches,
+)
+
+REQUIRED = get_all_permissions() + [
+    "users.not_registered",
+    "unregistered.view",
+    "settings.*",
+    "admin",
+]
+
+GRANTS = [
+    set(),
+    {"*"},
+    {"users.view", "events.manage"},
+    {"users.*", "settings.edit"},
+    {"organization.*"},
+    {"unregistered.*", "legacy_flag"},
+    {"admin"},
+]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_compiled_permissions()
+    yield
+    clear_compiled_permissions()
+
+
+@pytest.mark.parametrize("granted", GRANTS, ids=lambda g: ",".join(sorted(g)))
+def test_matches_the_plain_set(granted):
+    compiled = PermissionSet(granted)
+
+    for required in REQUIRED:
+        assert permission_matches(required, compiled) is permission_matches(
+            required, granted
+        ), required
+
+
+def test_behaves_as_a_set():
+    compiled = PermissionSet(["users.view", "users.view", "events.view"])
+
+    assert compiled == {"users.view", "events.view"}
+    assert "users.view" in compiled
+    assert sorted(compiled) == ["events.view", "users.view"]
+
+
+def test_combines_positions_and_rank():
+    compiled = compile_permissions(
+        [["users.view"], None, ["events.manage"]], "fire_chief"
+    )
+
+    assert compiled == {"users.view", "events.manage"} | set(
+        get_rank_default_permissions("fire_chief")
+    )
+
+
+def test_same_positions_and_rank_share_one_set():
+    first = compile_permissions([["users.view"], ["events.view"]], None)
+
+    assert compile_permissions([["users.view"], ["events.view"]], None) is first
+    assert compile_permissions([["users.view"]], None) is not first
+
+
+def test_edited_position_compiles_afresh():
+    position = SimpleNamespace(permissions=["users.view"])
+    user = SimpleNamespace(positions=[position], rank=None)
+    assert not permission_matches("users.edit", _collect_user_permissions(user))
+
+    position.permissions = ["users.view", "users.edit"]
+
+    assert permission_matches("users.edit", _collect_user_permissions(user))
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(permissions, "_MAX_COMPILED", 5)
+
+    for i in range(20):
+        compile_permissions([[f"custom.perm_{i}"]], None)
+
+    assert len(permissions._compiled) == 5
+
+
+def test_clear_drops_compiled_sets():
+    first = compile_permissions([["users.view"]], None)
+
+    clear_compiled_permissions()
+
+    assert compile_permissions([["users.view"]], None) is not first
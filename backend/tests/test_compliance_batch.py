@@ -0,0 +1,224 @@
+"""Parity tests for the columnar batch evaluator
+(app/services/compliance_batch.py).
+
+``BatchComplianceEvaluator`` must return exactly what
+``evaluate_member_requirement`` returns for every member, so most checks
+here are Hypothesis properties over random records, requirements, waivers
+and evaluation dates. No database.
+"""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+from app.models.training import (
+    RequirementFrequency,
+    RequirementType,
+    TrainingStatus,
+    TrainingType,
+)
+from app.services.compliance_batch import BatchComplianceEvaluator
+from app.services.training_compliance import evaluate_member_requirement
+from app.services.training_waiver_service import WaiverPeriod
+
+TODAY = date(2026, 6, 15)
+
+_dates = st.dates(min_value=date(2021, 1, 1), max_value=date(2027, 12, 31))
+_training_types = st.sampled_from([None, *TrainingType])
+_course_names = st.sampled_from(
+    [None, "CPR Refresher", "Hazmat Operations", "EVOC Driver", "cpr for providers"]
+)
+
+
+@st.composite
+def _records(draw):
+    return SimpleNamespace(
+        status=draw(
+            st.sampled_from(
+                [
+                    TrainingStatus.COMPLETED,
+                    TrainingStatus.COMPLETED,
+                    TrainingStatus.IN_PROGRESS,
+                    TrainingStatus.SCHEDULED,
+                ]
+            )
+        ),
+        completion_date=draw(st.none() | _dates),
+        expiration_date=draw(st.none() | _dates),
+        hours_completed=draw(
+            st.sampled_from([None, 0, 0.1, 0.2, 0.3, 0.7, 1, 1.5, 2.25, 4.0, 8])
+        ),
+        training_type=draw(_training_types),
+        category_id=draw(st.sampled_from([None, "cat-a", "cat-b"])),
+        course_id=draw(st.sampled_from([None, "course-1", "course-2", "course-3"])),
+        course_name=draw(_course_names),
+        certification_number=draw(st.sampled_from([None, "NREMT-0042", "FF2-77"])),
+    )
+
+
+@st.composite
+def _requirements(draw):
+    rolling = draw(st.booleans())
+    custom_window = draw(st.booleans())
+    return SimpleNamespace(
+        id="req-1",
+        name=draw(st.sampled_from([None, "CPR", "Hazmat", "Ladder"])),
+        requirement_type=draw(st.sampled_from(list(RequirementType))),
+        frequency=draw(st.sampled_from(list(RequirementFrequency))),
+        training_type=draw(_training_types),
+        year=draw(st.sampled_from([None, 2025, 2026])),
+        due_date_type=SimpleNamespace(value="rolling") if rolling else None,
+        rolling_period_months=draw(st.sampled_from([None, 6, 12, 24])),
+        required_hours=draw(st.sampled_from([None, 0, 0.3, 0.6, 1.0, 2, 6.25, 24])),
+        required_shifts=draw(st.sampled_from([None, 0, 1, 2, 4])),
+        required_calls=draw(st.sampled_from([None, 0, 1, 3])),
+        required_courses=draw(
+            st.sampled_from(
+                [None, [], ["course-1"], ["course-1", "course-2"], ["course-9"]]
+            )
+        ),
+        category_ids=draw(st.sampled_from([None, [], ["cat-a"], ["cat-a", "cat-b"]])),
+        registry_code=draw(st.sampled_from([None, "nremt"])),
+        recency_days=draw(st.sampled_from([None, 0, 90, 365, 1000])),
+        include_current_month=draw(st.sampled_from([None, True, False])),
+        period_start_month=11 if custom_window else None,
+        period_start_day=1 if custom_window else None,
+        period_end_month=draw(st.sampled_from([1, 6])) if custom_window else None,
+        period_end_day=None,
+    )
+
+
+@st.composite
+def _waivers(draw):
+    start = draw(_dates)
+    return WaiverPeriod(
+        start_date=start,
+        end_date=start + timedelta(days=draw(st.integers(0, 400))),
+        requirement_ids=draw(st.sampled_from([None, ["req-1"], ["req-2"]])),
+    )
+
+
+_members = st.dictionaries(
+    st.sampled_from(["u1", "u2", "u3", "u4"]),
+    st.lists(_records(), max_size=12),
+    min_size=1,
+)
+
+
+def _scalar(req, records_by_user, today, waivers_by_user, include_current):
+    return {
+        uid: evaluate_member_requirement(
+            req,
+            records,
+            today,
+            waivers=waivers_by_user.get(uid),
+            org_include_current_month=include_current,
+        )
+        for uid, records in records_by_user.items()
+    }
+
+
+@settings(max_examples=400, suppress_health_check=[HealthCheck.too_slow])
+@given(
+    req=_requirements(),
+    records_by_user=_members,
+    waivers=st.dictionaries(
+        st.sampled_from(["u1", "u2"]), st.lists(_waivers(), max_size=3)
+    ),
+    today=st.dates(min_value=date(2024, 1, 1), max_value=date(2027, 6, 30)),
+    include_current=st.booleans(),
+)
+def test_batch_matches_scalar_evaluator(
+    req, records_by_user, waivers, today, include_current
+):
+    evaluator = BatchComplianceEvaluator(records_by_user)
+
+    batch = evaluator.evaluate(
+        req,
+        list(records_by_user),
+        today,
+        waivers_by_user=waivers,
+        org_include_current_month=include_current,
+    )
+
+    assert batch == _scalar(req, records_by_user, today, waivers, include_current)
+
+
+@settings(max_examples=100)
+@given(req=_requirements(), records_by_user=_members)
+def test_members_without_records_match_scalar(req, records_by_user):
+    evaluator = BatchComplianceEvaluator(records_by_user)
+
+    assert evaluator.evaluate(req, ["nobody"], TODAY) == {
+        "nobody": evaluate_member_requirement(req, [], TODAY)
+    }
+
+
+def _record(completion, expires=None, hours=1.0):
+    return SimpleNamespace(
+        status=TrainingStatus.COMPLETED,
+        completion_date=completion,
+        expiration_date=expires,
+        hours_completed=hours,
+        training_type=TrainingType.CERTIFICATION,
+        category_id=None,
+        course_id=None,
+        course_name="CPR Refresher",
+        certification_number=None,
+    )
+
+
+def _req(**kwargs):
+    defaults = dict(
+        id="req-1",
+        name="CPR",
+        requirement_type=RequirementType.CERTIFICATION,
+        frequency=RequirementFrequency.ANNUAL,
+        training_type=TrainingType.CERTIFICATION,
+        year=None,
+        due_date_type=None,
+        rolling_period_months=None,
+        required_hours=None,
+        required_courses=None,
+        category_ids=None,
+        registry_code=None,
+        recency_days=None,
+        include_current_month=None,
+        period_start_month=None,
+        period_end_month=None,
+    )
+    defaults.update(kwargs)
+    return SimpleNamespace(**defaults)
+
+
+def test_same_day_completions_resolve_to_the_first_record():
+    # Two completions on one day: max() keeps the first, whose expiry has lapsed.
+    records = [
+        _record(date(2026, 3, 1), expires=date(2026, 5, 1)),
+        _record(date(2026, 3, 1), expires=date(2028, 3, 1)),
+    ]
+    req = _req()
+
+    result = BatchComplianceEvaluator({"u1": records}).evaluate(req, ["u1"], TODAY)
+
+    assert result["u1"] == ("expired", "2026-03-01", "2026-05-01")
+    assert result["u1"] == evaluate_member_requirement(req, records, TODAY)
+
+
+def test_hour_totals_on_the_threshold_are_summed_in_input_order():
+    # The 2025 record falls outside the 2026 window, so the prefix-sum total
+    # is (99.9 + 0.1 + 0.2) - 99.9 = 0.29999999999999716, just under the
+    # bar, while the scalar evaluator sums 0.1 + 0.2 = 0.30000000000000004.
+    records = [
+        _record(date(2025, 6, 1), hours=99.9),
+        _record(date(2026, 1, 5), hours=0.1),
+        _record(date(2026, 2, 5), hours=0.2),
+    ]
+    req = _req(requirement_type=RequirementType.HOURS, required_hours=0.3)
+
+    result = BatchComplianceEvaluator({"u1": records}).evaluate(req, ["u1"], TODAY)
+
+    assert result["u1"] == evaluate_member_requirement(req, records, TODAY)
+    assert result["u1"][0] == "completed"
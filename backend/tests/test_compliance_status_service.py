@@ -0,0 +1,371 @@
+"""Tests for the persisted member x requirement compliance statuses
+(app/services/compliance_status_service.py).
+
+Covers reading fresh rows without re-evaluating, recomputing only the stale
+pairs, the upsert payload, the after-flush generation bump, a write landing
+in the middle of a read and the org-level percentage built from persisted
+statuses. DB is mocked; no MySQL.
+"""
+
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.dialects import mysql
+
+from app.models.compliance_config import ComplianceConfig
+from app.models.training import (
+    MemberComplianceGeneration,
+    MemberRequirementStatus,
+    TrainingRecord,
+    TrainingRequirement,
+    TrainingStatus,
+)
+from app.services import compliance_status_service as status_module
+from app.services.compliance_status_service import (
+    ComplianceStatusService,
+    RequirementStatus,
+    _invalidate_compliance_statuses,
+)
+from app.services.training_compliance import _evaluate_member_compliance
+
+TODAY = date(2026, 6, 15)
+
+
+def _req(rid, **kwargs):
+    defaults = {
+        "id": rid,
+        "name": f"Requirement {rid}",
+        "requirement_type": SimpleNamespace(value="hours"),
+        "training_type": None,
+        "frequency": SimpleNamespace(value="annual"),
+        "year": None,
+        "due_date_type": None,
+        "rolling_period_months": None,
+        "required_hours": 10.0,
+        "category_ids": None,
+        "include_current_month": None,
+        "period_start_month": None,
+        "period_start_day": None,
+        "period_end_month": None,
+        "period_end_day": None,
+        "recency_months": None,
+    }
+    defaults.update(kwargs)
+    return SimpleNamespace(**defaults)
+
+
+def _rows(*rows):
+    return MagicMock(all=MagicMock(return_value=list(rows)))
+
+
+def _status_row(
+    uid, rid, status="completed", completed=None, expires=None, generation=0
+):
+    return SimpleNamespace(
+        user_id=uid,
+        requirement_id=rid,
+        status=status,
+        completion_date=completed,
+        expiration_date=expires,
+        generation=generation,
+    )
+
+
+def _generation(uid, generation):
+    return SimpleNamespace(user_id=uid, generation=generation)
+
+
+def _record(uid, hours=12.0):
+    return SimpleNamespace(
+        user_id=uid,
+        status=TrainingStatus.COMPLETED,
+        completion_date=date(2026, 2, 10),
+        expiration_date=None,
+        hours_completed=hours,
+        training_type=None,
+        category_id=None,
+    )
+
+
+class TestGetStatuses:
+    async def test_fresh_rows_are_served_without_reevaluating(self):
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                _rows(_generation("u1", 2)),
+                _rows(
+                    _status_row("u1", "r1", completed=date(2026, 3, 1), generation=2),
+                    _status_row("u1", "r2", status="not_started", generation=2),
+                ),
+            ]
+        )
+        service = ComplianceStatusService(db)
+        service._recompute = AsyncMock()
+
+        statuses = await service.get_statuses(
+            "org1", ["u1"], [_req("r1"), _req("r2")], today=TODAY
+        )
+
+        service._recompute.assert_not_awaited()
+        assert statuses == {
+            "u1": {
+                "r1": RequirementStatus("completed", "2026-03-01", None),
+                "r2": RequirementStatus("not_started"),
+            }
+        }
+
+    async def test_only_missing_pairs_are_recomputed(self):
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                _rows(),
+                _rows(
+                    _status_row("u1", "r1"),
+                    _status_row("u1", "r2"),
+                    _status_row("u2", "r1"),
+                ),
+            ]
+        )
+        service = ComplianceStatusService(db)
+        service._recompute = AsyncMock(
+            return_value={"u2": {"r2": RequirementStatus("in_progress")}}
+        )
+        r1, r2 = _req("r1"), _req("r2")
+
+        statuses = await service.get_statuses(
+            "org1", ["u1", "u2"], [r1, r2], today=TODAY
+        )
+
+        service._recompute.assert_awaited_once_with("org1", {"u2": [r2]}, TODAY, {})
+        assert statuses["u2"]["r2"].status == "in_progress"
+        assert statuses["u1"]["r2"].status == "completed"
+
+    async def test_rows_behind_the_members_generation_are_recomputed(self):
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                _rows(_generation("u1", 3)),
+                _rows(_status_row("u1", "r1", generation=2)),
+            ]
+        )
+        service = ComplianceStatusService(db)
+        service._recompute = AsyncMock(
+            return_value={"u1": {"r1": RequirementStatus("in_progress")}}
+        )
+        r1 = _req("r1")
+
+        statuses = await service.get_statuses("org1", ["u1"], [r1], today=TODAY)
+
+        service._recompute.assert_awaited_once_with(
+            "org1", {"u1": [r1]}, TODAY, {"u1": 3}
+        )
+        assert statuses["u1"]["r1"].status == "in_progress"
+
+    async def test_nothing_to_read_without_requirements(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        statuses = await ComplianceStatusService(db).get_statuses(
+            "org1", ["u1"], [], today=TODAY
+        )
+
+        assert statuses == {"u1": {}}
+        db.execute.assert_not_awaited()
+
+
+class TestRecompute:
+    async def test_evaluates_and_upserts_each_pair(self):
+        record = _record("u1")
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                MagicMock(
+                    scalars=MagicMock(
+                        return_value=MagicMock(all=MagicMock(return_value=[record]))
+                    )
+                ),
+                MagicMock(),  # upsert
+            ]
+        )
+        req = _req("r1")
+
+        with (
+            patch.object(
+                status_module, "fetch_user_waivers", AsyncMock(return_value=[])
+            ),
+            patch.object(
+                status_module,
+                "get_org_include_current_month",
+                AsyncMock(return_value=True),
+            ),
+        ):
+            fresh = await ComplianceStatusService(db)._recompute(
+                "org1", {"u1": [req]}, TODAY, {"u1": 3}
+            )
+
+        assert fresh == {"u1": {"r1": RequirementStatus("completed", "2026-02-10")}}
+        stmt, rows = db.execute.await_args_list[-1].args
+        assert "ON DUPLICATE KEY UPDATE" in str(stmt.compile(dialect=mysql.dialect()))
+        assert rows == [
+            {
+                "organization_id": "org1",
+                "user_id": "u1",
+                "requirement_id": "r1",
+                "status": "completed",
+                "completion_date": date(2026, 2, 10),
+                "expiration_date": None,
+                "window_start": date(2026, 1, 1),
+                "window_end": date(2026, 12, 31),
+                "evaluated_for": TODAY,
+                "generation": 3,
+            }
+        ]
+
+
+class TestInvalidation:
+    def _flush(self, new=(), dirty=(), deleted=()):
+        session = MagicMock()
+        session.new, session.dirty, session.deleted = set(new), set(dirty), set(deleted)
+        _invalidate_compliance_statuses(session, None)
+        return session.connection.return_value.execute
+
+    def _bumped(self, execute):
+        (stmt,) = execute.call_args.args
+        compiled = stmt.compile(dialect=mysql.dialect())
+        assert str(compiled).startswith("INSERT INTO member_compliance_generations")
+        assert "generation = (member_compliance_generations.generation + " in str(
+            compiled
+        )
+        return [v for v in compiled.params.values() if isinstance(v, list)]
+
+    def test_record_change_bumps_that_member(self):
+        execute = self._flush(new=[TrainingRecord(user_id="u1")])
+
+        assert self._bumped(execute) == [["u1"]]
+
+    def test_requirement_edit_bumps_the_organizations_members(self):
+        requirement = TrainingRequirement(id="r1", organization_id="org1")
+
+        execute = self._flush(dirty=[requirement])
+
+        assert self._bumped(execute) == [["org1"]]
+
+    def test_new_requirement_has_nothing_to_invalidate(self):
+        execute = self._flush(new=[TrainingRequirement(id="r1")])
+
+        execute.assert_not_called()
+
+    def test_config_change_bumps_the_organizations_members(self):
+        execute = self._flush(dirty=[ComplianceConfig(organization_id="org1")])
+
+        assert self._bumped(execute) == [["org1"]]
+
+
+class _InterleavedDB:
+    """The tables a read touches, with a writer's flush landing mid-read.
+
+    Once armed, the writer adds a record and runs the real invalidation hook
+    right after the reader has loaded its records — after the reader has
+    captured the member's generation, before it upserts.
+    """
+
+    def __init__(self):
+        self.info: dict = {}
+        self.generations: dict = {}
+        self.statuses: dict = {}
+        self.records: list = []
+        self.write_during_next_read = False
+
+    async def execute(self, stmt, params=None):
+        if params is not None:  # the status upsert
+            for row in params:
+                self.statuses[(row["user_id"], row["requirement_id"])] = row
+            return MagicMock()
+        (table,) = stmt.get_final_froms()
+        if table is MemberComplianceGeneration.__table__:
+            return _rows(*(_generation(*item) for item in self.generations.items()))
+        if table is MemberRequirementStatus.__table__:
+            return _rows(
+                *(
+                    _status_row(
+                        row["user_id"],
+                        row["requirement_id"],
+                        row["status"],
+                        generation=row["generation"],
+                    )
+                    for row in self.statuses.values()
+                )
+            )
+        snapshot = list(self.records)
+        if self.write_during_next_read:
+            self.write_during_next_read = False
+            self._write(_record("u1"))
+        return MagicMock(
+            scalars=MagicMock(
+                return_value=MagicMock(all=MagicMock(return_value=snapshot))
+            )
+        )
+
+    def _write(self, record):
+        self.records.append(record)
+        session = MagicMock(new={TrainingRecord(user_id=record.user_id)})
+        session.dirty, session.deleted = set(), set()
+        _invalidate_compliance_statuses(session, None)
+        (stmt,) = session.connection.return_value.execute.call_args.args
+        for uid in stmt.compile(dialect=mysql.dialect()).params["id_1"]:
+            self.generations[uid] = self.generations.get(uid, 0) + 1
+
+
+class TestWriteDuringRead:
+    async def test_status_computed_before_a_write_is_not_served(self):
+        db = _InterleavedDB()
+        service = ComplianceStatusService(db)
+        req = _req("r1")
+        db.write_during_next_read = True
+
+        with (
+            patch.object(
+                status_module, "fetch_user_waivers", AsyncMock(return_value=[])
+            ),
+            patch.object(
+                status_module,
+                "get_org_include_current_month",
+                AsyncMock(return_value=True),
+            ),
+        ):
+            racing = await service.get_statuses("org1", ["u1"], [req], today=TODAY)
+            after = await service.get_statuses("org1", ["u1"], [req], today=TODAY)
+            service._recompute = AsyncMock()
+            cached = await service.get_statuses("org1", ["u1"], [req], today=TODAY)
+
+        # The racing read evaluated the pre-write records and persisted that
+        # at the generation it started from.
+        assert racing["u1"]["r1"].status == "not_started"
+        assert db.generations == {"u1": 1}
+        # The next read sees the row is behind and re-evaluates.
+        assert after["u1"]["r1"] == RequirementStatus("completed", "2026-02-10")
+        assert db.statuses[("u1", "r1")]["generation"] == 1
+        service._recompute.assert_not_awaited()
+        assert cached["u1"]["r1"].status == "completed"
+
+
+class TestMemberComplianceFromStatuses:
+    def test_counts_completed_statuses(self):
+        reqs = [_req("r1"), _req("r2")]
+        statuses = {
+            "r1": RequirementStatus("completed"),
+            "r2": RequirementStatus("in_progress"),
+        }
+
+        assert _evaluate_member_compliance(
+            reqs, statuses, 100.0, 50.0, "percentage"
+        ) == ("at_risk", 50.0)
+        assert _evaluate_member_compliance(
+            reqs[:1], statuses, 100.0, 50.0, "percentage"
+        ) == ("compliant", 100.0)
+
+    def test_missing_status_counts_as_incomplete(self):
+        assert _evaluate_member_compliance(
+            [_req("r1")], {}, 100.0, 75.0, "all_required"
+        ) == ("non_compliant", 0.0)
@@ -0,0 +1,232 @@
+"""Tests for the concurrent, cached dashboard aggregates
+(app/services/dashboard_summary_service.py).
+
+Covers running sections on their own sessions in parallel, isolating a
+failing section, serving and storing the per-organization cache under its
+generation, and the flush/commit hooks that invalidate it. Sessions and
+Redis are mocked; no MySQL.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from functools import partial
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.training import TrainingRecord
+from app.models.user import User, UserStatus
+from app.services import dashboard_summary_service as summary_module
+from app.services.dashboard_summary_service import (
+    DashboardSummaryService,
+    _bump_dashboard_generations,
+    _collect_dashboard_changes,
+)
+
+
+def _session_factory(sessions: list):
+    def factory():
+        db = MagicMock()
+        db.commit = AsyncMock()
+        sessions.append(db)
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=db)
+        context.__aexit__ = AsyncMock(return_value=False)
+        return context
+
+    return factory
+
+
+def _sections(**overrides):
+    queries = {
+        "member_counts": AsyncMock(return_value=(40, 31)),
+        "compute_org_compliance_pct": AsyncMock(return_value=87.549),
+        "activity_counts": AsyncMock(return_value=(3, 42.5, 150.0, 2)),
+        "action_item_counts": AsyncMock(return_value=(1, 6)),
+    }
+    queries.update(overrides)
+    return patch.multiple(summary_module, **queries)
+
+
+def _cache(store=None):
+    store = {} if store is None else store
+
+    async def get(key):
+        return store.get(key)
+
+    async def set_(key, value, ttl=None):
+        store[key] = value
+        return True
+
+    mocks = {"get": AsyncMock(side_effect=get), "set": AsyncMock(side_effect=set_)}
+    return _Patched(patch.multiple(summary_module.cache_manager, **mocks), mocks)
+
+
+class _Patched:
+    """``patch.multiple`` that hands back the mocks it installed."""
+
+    def __init__(self, patcher, mocks):
+        self.patcher, self.mocks = patcher, mocks
+
+    def __enter__(self):
+        self.patcher.__enter__()
+        return self.mocks
+
+    def __exit__(self, *exc_info):
+        return self.patcher.__exit__(*exc_info)
+
+
+class TestAdminSummary:
+    async def test_sections_run_on_separate_sessions(self):
+        sessions = []
+        with _sections(), _cache() as cache:
+            summary = await DashboardSummaryService(
+                _session_factory(sessions)
+            ).admin_summary("org1")
+
+        assert summary == {
+            "active_members": 31,
+            "inactive_members": 9,
+            "total_members": 40,
+            "training_completion_pct": 87.5,
+            "upcoming_events_count": 3,
+            "overdue_action_items": 1,
+            "open_action_items": 6,
+            "recent_training_hours": 42.5,
+            "recent_admin_hours": 2.5,
+            "pending_admin_hours_approvals": 2,
+        }
+        assert len(sessions) == 4
+        assert all(db.commit.await_count == 1 for db in sessions)
+        cache["set"].assert_awaited_once()
+        assert cache["set"].await_args.args[0] == "dashboard:org1:0:admin-summary"
+
+    async def test_sections_overlap(self):
+        started = asyncio.Event()
+        running = 0
+        peak = 0
+
+        async def slow(result, *_):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            if running == 4:
+                started.set()
+            await asyncio.wait_for(started.wait(), timeout=1)
+            running -= 1
+            return result
+
+        sections = _sections(
+            member_counts=partial(slow, (1, 1)),
+            compute_org_compliance_pct=partial(slow, 100.0),
+            activity_counts=partial(slow, (0, 0, 0, 0)),
+            action_item_counts=partial(slow, (0, 0)),
+        )
+        with sections, _cache():
+            await DashboardSummaryService(_session_factory([])).admin_summary("org1")
+
+        assert peak == 4
+
+    async def test_failed_section_reports_zeros_and_is_not_cached(self):
+        failing = AsyncMock(side_effect=RuntimeError("table missing"))
+        with _sections(action_item_counts=failing), _cache() as cache:
+            summary = await DashboardSummaryService(_session_factory([])).admin_summary(
+                "org1"
+            )
+
+        assert summary["total_members"] == 40
+        assert summary["overdue_action_items"] == 0
+        assert summary["open_action_items"] == 0
+        cache["set"].assert_not_awaited()
+
+    async def test_cached_payload_is_served_for_the_current_generation(self):
+        store = {
+            "dashboard:org1:gen": 3,
+            "dashboard:org1:3:admin-summary": {"total_members": 12},
+            "dashboard:org1:2:admin-summary": {"total_members": 99},
+        }
+        sessions = []
+        with _sections(), _cache(store):
+            summary = await DashboardSummaryService(
+                _session_factory(sessions)
+            ).admin_summary("org1")
+
+        assert summary == {"total_members": 12}
+        assert sessions == []
+
+
+class TestWidgets:
+    async def test_only_permitted_sections_are_computed(self):
+        widget_service = MagicMock()
+        widget_service.finance = AsyncMock(return_value={"cash_in": 5})
+        widget_service.community = AsyncMock(return_value={"public_events": 2})
+        with (
+            patch.object(
+                summary_module,
+                "DashboardWidgetService",
+                MagicMock(return_value=widget_service),
+            ),
+            _cache() as cache,
+        ):
+            widgets = await DashboardSummaryService(_session_factory([])).widgets(
+                "org1", "month", ["community"]
+            )
+
+        assert widgets == {
+            "finance": None,
+            "fundraising": None,
+            "community": {"public_events": 2},
+        }
+        widget_service.finance.assert_not_awaited()
+        assert (
+            cache["set"].await_args.args[0]
+            == "dashboard:org1:0:widgets:community:month"
+        )
+
+
+class TestInvalidation:
+    def _flush(self, new=(), dirty=(), deleted=()):
+        session = MagicMock()
+        session.new, session.dirty, session.deleted = set(new), set(dirty), set(deleted)
+        session.info = {}
+        _collect_dashboard_changes(session, None)
+        return session
+
+    def _member(self):
+        user = User()
+        set_committed_value(user, "organization_id", "org1")
+        set_committed_value(user, "status", UserStatus.ACTIVE)
+        return user
+
+    def test_training_record_marks_its_organization(self):
+        session = self._flush(new=[TrainingRecord(organization_id="org1")])
+
+        assert session.info["dashboard_stale_orgs"] == {"org1"}
+
+    def test_member_status_change_marks_its_organization(self):
+        user = self._member()
+        user.status = UserStatus.INACTIVE
+
+        session = self._flush(dirty=[user])
+
+        assert session.info["dashboard_stale_orgs"] == {"org1"}
+
+    def test_login_leaves_the_cache_alone(self):
+        user = self._member()
+        user.last_login_at = datetime.now(timezone.utc)
+
+        session = self._flush(dirty=[user])
+
+        assert "dashboard_stale_orgs" not in session.info
+
+    async def test_commit_bumps_the_generation(self):
+        session = MagicMock()
+        session.info = {"dashboard_stale_orgs": {"org1", "org2"}}
+        invalidate = AsyncMock()
+
+        with patch.object(summary_module, "invalidate_dashboard_cache", invalidate):
+            _bump_dashboard_generations(session)
+            await asyncio.gather(*summary_module._pending_bumps)
+
+        invalidate.assert_awaited_once_with({"org1", "org2"})
+        assert session.info == {}
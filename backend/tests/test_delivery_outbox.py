@@ -0,0 +1,252 @@
+"""
+Tests for the chat/webhook delivery outbox
+(app/services/integration_services/delivery_outbox.py).
+
+Covers formatting queued messages for each platform and for generic
+webhooks, queuing only for integrations that accept the message, the
+outcome of a send (delivered, retried with backoff, failed for good), one
+pooled client per destination host, caching the SSRF check per host, and a
+worker pass claiming, sending and committing a batch. Sessions and HTTP are
+mocked; no MySQL or network.
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.models.integration import IntegrationDelivery
+from app.services.integration_services import delivery_outbox as outbox
+from app.services.integration_services.delivery_outbox import (
+    DELIVERED,
+    FAILED,
+    MAX_ATTEMPTS,
+    PENDING,
+    DeliveryWorker,
+    enqueue_notification,
+    retry_delay,
+)
+from app.services.integration_services.notification_dispatch import (
+    build_notification_request,
+    build_summary_request,
+)
+
+
+def _integration(itype, url="https://hooks.example.com/T0/secret", **config):
+    integration = MagicMock(id=f"{itype}-1", integration_type=itype, enabled=True)
+    integration.config = config
+    secrets = {"webhook_url": url, "url": url, "secret": "s3"}
+    integration.get_secret = MagicMock(side_effect=secrets.get)
+    return integration
+
+
+def _delivery(integration, kind="event", attempts=1, **payload):
+    return IntegrationDelivery(
+        id="d1",
+        organization_id="org1",
+        integration_id=integration.id,
+        integration_type=integration.integration_type,
+        kind=kind,
+        payload=payload or {"title": "Drill Night"},
+        status=PENDING,
+        attempts=attempts,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def http():
+    """Pooled clients handed out by the worker, in creation order."""
+    clients = []
+
+    def create():
+        client = MagicMock(aclose=AsyncMock())
+        client.post = AsyncMock(return_value=httpx.Response(200))
+        clients.append(client)
+        return client
+
+    with patch.object(outbox, "create_integration_client", side_effect=create), patch(
+        "app.services.integration_services.delivery_outbox.assert_outbound_url_safe"
+    ) as check:
+        yield clients, check
+
+
+class TestRequests:
+    def test_each_platform_gets_its_body(self):
+        slack = build_notification_request(_integration("slack"), "event", {})
+        discord = build_summary_request(_integration("discord"), "12 shifts", "x")
+        teams = build_summary_request(_integration("microsoft-teams"), "T", "M")
+
+        assert "blocks" in json.loads(slack.content)
+        assert json.loads(discord.content) == {"content": "**12 shifts**\nx"}
+        assert discord.ok_statuses == (200, 204)
+        assert json.loads(teams.content)["type"] == "message"
+
+    def test_generic_webhook_is_signed_and_filtered(self):
+        request = build_notification_request(
+            _integration("generic-webhook"), "shift", {"type": "A"}
+        )
+        filtered = _integration("generic-webhook", event_types=["event.created"])
+
+        assert json.loads(request.content)["event_type"] == "shift.created"
+        assert request.headers["X-Webhook-Signature"].startswith("sha256=")
+        assert build_notification_request(filtered, "shift", {}) is None
+        assert build_summary_request(filtered, "T", "M") is None
+
+    async def test_only_accepting_integrations_are_queued(self):
+        integrations = [
+            _integration("slack"),
+            _integration("discord", url=""),
+            _integration("generic-webhook", event_types=["shift.created"]),
+        ]
+        db = MagicMock()
+        db.execute = AsyncMock(
+            return_value=MagicMock(
+                scalars=MagicMock(
+                    return_value=MagicMock(all=MagicMock(return_value=integrations))
+                )
+            )
+        )
+        start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+        queued = await enqueue_notification(db, "org1", "event", {"start": start})
+
+        assert queued == 1
+        (row,), _ = db.add.call_args
+        assert row.integration_id == "slack-1"
+        assert row.status == PENDING
+        assert row.payload == {"start": "2026-10-01 00:00:00+00:00"}
+
+
+class TestDeliver:
+    async def test_success_marks_delivered(self, http):
+        integration = _integration("slack")
+        delivery = _delivery(integration)
+
+        await DeliveryWorker()._deliver(delivery, integration)
+
+        assert delivery.status == DELIVERED
+        assert delivery.delivered_at is not None
+
+    async def test_server_error_is_retried_later(self, http):
+        clients, _ = http
+        integration = _integration("slack")
+        delivery = _delivery(integration, attempts=2)
+        worker = DeliveryWorker()
+        await worker._client(integration.get_secret("webhook_url"))
+        clients[0].post.return_value = httpx.Response(503)
+
+        await worker._deliver(delivery, integration)
+
+        assert delivery.status == PENDING
+        assert delivery.last_error == "HTTP 503"
+        assert delivery.next_attempt_at > datetime.now(timezone.utc)
+
+    @pytest.mark.parametrize(
+        ("status", "attempts"), [(404, 1), (503, MAX_ATTEMPTS), (None, MAX_ATTEMPTS)]
+    )
+    async def test_permanent_errors_and_exhausted_retries_fail(
+        self, http, status, attempts
+    ):
+        clients, _ = http
+        integration = _integration("slack")
+        delivery = _delivery(integration, attempts=attempts)
+        worker = DeliveryWorker()
+        await worker._client(integration.get_secret("webhook_url"))
+        if status is None:
+            clients[0].post.side_effect = httpx.ConnectTimeout("timed out")
+        else:
+            clients[0].post.return_value = httpx.Response(status)
+
+        await worker._deliver(delivery, integration)
+
+        assert delivery.status == FAILED
+
+    async def test_disabled_integration_is_dropped(self, http):
+        clients, _ = http
+        integration = _integration("slack")
+        integration.enabled = False
+        delivery = _delivery(integration)
+
+        await DeliveryWorker()._deliver(delivery, integration)
+
+        assert delivery.status == FAILED
+        assert clients == []
+
+    async def test_clients_and_url_checks_are_shared_per_host(self, http):
+        clients, check = http
+        worker = DeliveryWorker()
+        slack, other = _integration("slack"), _integration("discord")
+        teams = _integration("microsoft-teams", url="https://outlook.office.com/w")
+
+        for integration in (slack, other, teams, slack):
+            await worker._deliver(_delivery(integration), integration)
+
+        assert len(clients) == 2
+        assert check.call_count == 2
+
+    async def test_evicted_clients_close_after_the_batch(self, http, monkeypatch):
+        clients, _ = http
+        monkeypatch.setattr(outbox, "_MAX_CLIENTS", 2)
+        worker = DeliveryWorker()
+
+        await worker._client("https://a.example.com/hook")
+        await worker._client("https://b.example.com/hook")
+        await worker._client("https://a.example.com/hook")
+        await worker._client("https://c.example.com/hook")
+
+        # b was least recently used; it is retired but not closed mid-batch.
+        assert list(worker._clients.values()) == [clients[0], clients[2]]
+        clients[1].aclose.assert_not_awaited()
+        await worker._close_retired()
+        clients[1].aclose.assert_awaited_once()
+        clients[0].aclose.assert_not_awaited()
+
+    async def test_unsafe_destination_is_not_contacted(self, http):
+        clients, check = http
+        check.side_effect = ValueError("resolves to 10.0.0.1")
+        integration = _integration("slack")
+        delivery = _delivery(integration)
+
+        await DeliveryWorker()._deliver(delivery, integration)
+
+        assert clients == []
+        assert delivery.status == PENDING
+        assert delivery.last_error == "destination failed safety validation"
+
+
+class TestWorker:
+    def test_backoff_doubles_up_to_the_cap(self):
+        assert 30 <= retry_delay(1) <= 36
+        assert 60 <= retry_delay(2) <= 72
+        assert retry_delay(30) <= outbox.MAX_BACKOFF_SECONDS * 1.2
+
+    async def test_pass_claims_sends_and_commits(self, http):
+        clients, _ = http
+        integration = _integration("slack")
+        delivery = _delivery(integration, attempts=0)
+
+        def scalars(rows):
+            return MagicMock(
+                scalars=MagicMock(
+                    return_value=MagicMock(all=MagicMock(return_value=rows))
+                )
+            )
+
+        db = MagicMock(commit=AsyncMock())
+        db.execute = AsyncMock(
+            side_effect=[scalars([delivery]), scalars([integration])]
+        )
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=db)
+        session.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.core.database.async_session_factory", return_value=session):
+            assert await DeliveryWorker().run_once() == 1
+
+        assert delivery.attempts == 1
+        assert delivery.status == DELIVERED
+        assert db.commit.await_count == 2
+        clients[0].post.assert_awaited_once()
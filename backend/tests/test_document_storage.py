@@ -0,0 +1,133 @@
+"""Documents through object storage (no DB).
+
+Uploads are written through the storage backend and record their key,
+downloads stream from it under the same folder access rule as a by-id
+fetch, and deletes remove the stored object — or, for a document uploaded
+before object storage, its local file.
+"""
+
+import io
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+import app.api.v1.endpoints.documents as documents_endpoint
+import app.services.documents_service as documents_service
+from app.api.v1.endpoints.documents import download_document, upload_document
+from app.core.storage import LocalStorageBackend
+from app.services.documents_service import DocumentsService
+
+ORG_ID = str(uuid4())
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(str(tmp_path))
+    monkeypatch.setattr(documents_endpoint, "get_storage", lambda: backend)
+    monkeypatch.setattr(documents_service, "get_storage", lambda: backend)
+    monkeypatch.setitem(
+        sys.modules,
+        "magic",
+        SimpleNamespace(from_buffer=lambda content, mime: "application/pdf"),
+    )
+    return backend
+
+
+def _user():
+    return SimpleNamespace(id=str(uuid4()), organization_id=ORG_ID, username="chief")
+
+
+async def test_upload_writes_through_storage(storage, tmp_path):
+    created = {}
+
+    async def create_document(organization_id, doc_data, uploaded_by):
+        created.update(doc_data)
+        return SimpleNamespace(**doc_data)
+
+    with patch.object(
+        DocumentsService, "create_document", side_effect=create_document
+    ), patch.object(
+        DocumentsService, "attach_document_names", AsyncMock()
+    ), patch.object(
+        documents_endpoint, "log_audit_event", AsyncMock()
+    ):
+        await upload_document(
+            UploadFile(io.BytesIO(b"%PDF-1.7"), filename="bylaws.pdf"),
+            "Bylaws",
+            None,
+            None,
+            None,
+            MagicMock(),
+            _user(),
+        )
+
+    key = created["storage_key"]
+    assert key.startswith(f"documents/{ORG_ID}/")
+    assert key.endswith(".pdf")
+    assert await storage.read_bytes(key) == b"%PDF-1.7"
+    assert created["file_path"] == str(tmp_path / key)
+    assert created["file_type"] == "application/pdf"
+
+
+async def test_download_streams_the_stored_object(storage):
+    await storage.put_bytes(f"documents/{ORG_ID}/a.pdf", b"%PDF-1.7")
+    document = SimpleNamespace(
+        name="Bylaws",
+        file_name="Règlement.pdf",
+        file_type="application/pdf",
+        storage_key=f"documents/{ORG_ID}/a.pdf",
+        file_path=None,
+    )
+    request = SimpleNamespace(headers={})
+
+    with patch.object(
+        DocumentsService, "get_document_by_id", AsyncMock(return_value=document)
+    ), patch.object(
+        DocumentsService, "can_access_document", AsyncMock(return_value=True)
+    ):
+        response = await download_document(uuid4(), request, MagicMock(), _user())
+
+    assert response.media_type == "application/pdf"
+    assert "filename*=UTF-8''R%C3%A8glement.pdf" in (
+        response.headers["content-disposition"]
+    )
+
+
+async def test_download_hides_inaccessible_documents(storage):
+    document = SimpleNamespace(storage_key="documents/x.pdf")
+
+    with patch.object(
+        DocumentsService, "get_document_by_id", AsyncMock(return_value=document)
+    ), patch.object(
+        DocumentsService, "can_access_document", AsyncMock(return_value=False)
+    ), pytest.raises(
+        HTTPException
+    ) as exc_info:
+        await download_document(uuid4(), SimpleNamespace(headers={}), None, _user())
+
+    assert exc_info.value.status_code == 404
+
+
+async def test_delete_removes_the_stored_object_or_legacy_file(storage, tmp_path):
+    key = f"documents/{ORG_ID}/a.pdf"
+    await storage.put_bytes(key, b"pdf")
+    legacy = tmp_path / "legacy.pdf"
+    legacy.write_bytes(b"pdf")
+
+    for storage_key, file_path in ((key, str(tmp_path / key)), (None, str(legacy))):
+        document = SimpleNamespace(storage_key=storage_key, file_path=file_path)
+        service = DocumentsService(
+            SimpleNamespace(delete=AsyncMock(), commit=AsyncMock())
+        )
+        with patch.object(
+            service, "get_document_by_id", AsyncMock(return_value=document)
+        ):
+            assert await service.delete_document(uuid4(), ORG_ID) is True
+
+    assert await storage.stat(key) is None
+    assert not legacy.exists()
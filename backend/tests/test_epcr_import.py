@@ -0,0 +1,268 @@
+"""
+Tests for the streaming ePCR import
+(app/services/integration_services/epcr_import_service.py).
+
+Covers reading CSV and NEMSIS XML incrementally from a stream (memory stays
+flat on a generated export far larger than one report), the defusedxml
+protection surviving the switch to iterparse, attaching runs to the one
+shift on duty at dispatch, resolving crew names to members, the
+``ON DUPLICATE KEY UPDATE`` batch write, and the background job's progress
+and temp-file cleanup, and the bounded in-process progress fallback.
+Sessions are mocked; no MySQL or Redis.
+"""
+
+import io
+import os
+import tracemalloc
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from defusedxml import EntitiesForbidden
+from sqlalchemy.dialects import mysql
+
+from app.services.integration_services import epcr_import_service as epcr
+from app.services.integration_services.epcr_import_service import (
+    ImportProgress,
+    ParseStats,
+    ShiftCallImporter,
+    get_import_progress,
+    iter_csv_records,
+    iter_nemsis_records,
+    run_import_job,
+    save_progress,
+)
+
+_PCR = """  <PatientCareReport>
+    <eResponse><eResponse.03>R-{n}</eResponse.03></eResponse>
+    <eTimes><eTimes.01>2026-03-01T14:30:00Z</eTimes.01></eTimes>
+    <ePatient><ePatient.15>{padding}</ePatient.15></ePatient>
+  </PatientCareReport>
+"""
+
+
+class _GeneratedStream(io.RawIOBase):
+    """A read-only stream produced chunk by chunk, never held whole."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            self._pending = next(self._chunks, b"")
+            if not self._pending:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _nemsis_export(
+    reports, padding="x" * 400, namespace=' xmlns="http://www.nemsis.org"'
+):
+    yield f"<EMSDataSet{namespace}><Header>\n".encode()
+    for n in range(reports):
+        yield _PCR.format(n=n, padding=padding).encode()
+    yield b"</Header></EMSDataSet>\n"
+
+
+class TestStreamingParsers:
+    def test_csv_is_read_incrementally(self):
+        def rows():
+            yield b"\xef\xbb\xbfRun Number,Type\n"
+            yield b",medical\n"
+            for n in range(2000):
+                yield f"R-{n},medical\n".encode()
+
+        stats = ParseStats()
+        stream = io.BufferedReader(_GeneratedStream(rows()))
+
+        records = iter_csv_records(stream, {"Run Number": "incident_number"}, stats)
+
+        assert next(records) == {"incident_number": "R-0"}
+        assert sum(1 for _ in records) == 1999
+        assert (stats.parsed, stats.skipped) == (2000, 1)
+        assert not stream.closed
+
+    @pytest.mark.parametrize("namespace", [' xmlns="http://www.nemsis.org"', ""])
+    def test_nemsis_reports_are_found_at_any_depth(self, namespace):
+        stream = _GeneratedStream(_nemsis_export(3, namespace=namespace))
+
+        records = list(iter_nemsis_records(stream))
+
+        assert [r["incident_number"] for r in records] == ["R-0", "R-1", "R-2"]
+        assert "padding" not in str(records)
+
+    def test_nemsis_memory_stays_flat(self):
+        # ~4MB of XML; a retained tree would hold several times that.
+        stream = _GeneratedStream(_nemsis_export(8000))
+
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_nemsis_records(stream))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert count == 8000
+        assert peak < 1024 * 1024
+
+    def test_entity_expansion_is_still_rejected(self):
+        xml = b"""<?xml version="1.0"?>
+<!DOCTYPE lolz [<!ENTITY lol "lol"><!ENTITY lol2 "&lol;&lol;&lol;">]>
+<EMSDataSet><PatientCareReport><eResponse>
+<eResponse.03>&lol2;</eResponse.03></eResponse></PatientCareReport></EMSDataSet>"""
+
+        with pytest.raises(EntitiesForbidden):
+            list(iter_nemsis_records(io.BytesIO(xml)))
+
+
+def _result(rows):
+    return MagicMock(all=MagicMock(return_value=rows))
+
+
+def _importer(shifts, members=()):
+    db = MagicMock()
+    db.scalar = AsyncMock(return_value="America/New_York")
+    db.execute = AsyncMock(side_effect=[_result(list(members)), _result(shifts), None])
+    return ShiftCallImporter(db, "org1"), db
+
+
+def _at(hour, minute=0):
+    return datetime(2026, 3, 1, hour, minute, tzinfo=timezone.utc)
+
+
+class TestShiftCallImporter:
+    async def test_runs_attach_to_the_single_covering_shift(self):
+        shifts = [
+            # MySQL hands DATETIMEs back naive (UTC).
+            (_at(6).replace(tzinfo=None), _at(18).replace(tzinfo=None), "day"),
+            (_at(18), None, "night"),
+            (_at(20), _at(22), "detail"),
+        ]
+        importer, db = _importer(shifts)
+        await importer.prepare()
+
+        written, unmatched = await importer.write(
+            [
+                {"incident_number": "A", "dispatched_at": "2026-03-01T14:30:00Z"},
+                # Naive: the organization's zone (EST) -> 19:00 UTC.
+                {"incident_number": "B", "dispatched_at": "2026-03-01T14:00:00"},
+                {"incident_number": "C", "dispatched_at": "2026-03-01T21:00:00Z"},
+                {"incident_number": "D", "dispatched_at": "2026-03-01T01:00:00Z"},
+                {"incident_number": "E"},
+            ]
+        )
+
+        assert (written, unmatched) == (2, 3)
+        stmt, rows = db.execute.await_args_list[-1].args
+        assert [(r["external_id"], r["shift_id"]) for r in rows] == [
+            ("A", "day"),
+            ("B", "night"),
+        ]
+        assert rows[1]["dispatched_at"] == _at(19)
+        sql = str(stmt.compile(dialect=mysql.dialect()))
+        assert "ON DUPLICATE KEY UPDATE" in sql
+
+    async def test_crew_names_resolve_only_when_unambiguous(self):
+        members = [
+            ("u1", "Jane", "Smith"),
+            ("u2", "John", "Smith"),
+            ("u3", "Ana", "Diaz"),
+        ]
+        importer, db = _importer([(_at(6), _at(18), "day")], members)
+        await importer.prepare()
+
+        await importer.write(
+            [
+                {
+                    "incident_number": "A",
+                    "dispatched_at": "2026-03-01T10:00:00Z",
+                    "responding_members": ["Jane Smith", "Smith, J", "Diaz, A"],
+                }
+            ]
+        )
+
+        _, rows = db.execute.await_args_list[-1].args
+        assert rows[0]["responding_members"] == ["u1", "u3"]
+
+
+class TestImportJob:
+    async def test_job_reports_progress_and_removes_the_file(self, tmp_path):
+        path = tmp_path / "upload.import"
+        path.write_bytes(b"".join(_nemsis_export(5)))
+        progress = ImportProgress("job1", "org1", "int1", "nemsis_xml")
+        batches, snapshots = [], []
+
+        class Importer:
+            def __init__(self, db, organization_id, match_members):
+                pass
+
+            async def prepare(self):
+                pass
+
+            async def write(self, records):
+                batches.append(len(records))
+                return len(records) - 1, 1
+
+        async def save(p):
+            snapshots.append((p.status, p.records_imported))
+
+        db = MagicMock(commit=AsyncMock(), get=AsyncMock(return_value=None))
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=db)
+        session.__aexit__ = AsyncMock(return_value=False)
+
+        with patch.object(epcr, "ShiftCallImporter", Importer), patch.object(
+            epcr, "IMPORT_BATCH_SIZE", 2
+        ), patch.object(epcr, "save_progress", save), patch(
+            "app.core.database.async_session_factory", return_value=session
+        ):
+            await run_import_job(progress, str(path), {})
+
+        assert batches == [2, 2, 1]
+        assert snapshots[-1] == ("completed", 2)
+        assert ("running", 1) in snapshots
+        assert progress.records_unmatched == 3
+        assert progress.bytes_read == progress.bytes_total > 0
+        assert not os.path.exists(path)
+
+    async def test_failed_job_does_not_expose_file_content(self, tmp_path):
+        path = tmp_path / "upload.import"
+        path.write_bytes(b"<EMSDataSet><PatientCareReport>Jane Doe")
+        progress = ImportProgress("job2", "org1", "int1", "nemsis_xml")
+
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=MagicMock())
+        session.__aexit__ = AsyncMock(return_value=False)
+        with patch.object(ShiftCallImporter, "prepare", AsyncMock()), patch.object(
+            epcr, "save_progress", AsyncMock()
+        ), patch("app.core.database.async_session_factory", return_value=session):
+            await run_import_job(progress, str(path), {})
+
+        assert progress.status == "failed"
+        assert progress.error == "ParseError"
+        assert not os.path.exists(path)
+
+    async def test_local_progress_keeps_only_the_most_recent_jobs(self, monkeypatch):
+        monkeypatch.setattr(epcr, "_local_progress", {})
+        monkeypatch.setattr(epcr, "_LOCAL_PROGRESS_MAX", 3)
+        monkeypatch.setattr(epcr.cache_manager, "set", AsyncMock())
+        monkeypatch.setattr(epcr.cache_manager, "get", AsyncMock(return_value=None))
+        jobs = [ImportProgress(f"job{i}", "org1", "int1", "csv") for i in range(5)]
+
+        for job in jobs[:3]:
+            await save_progress(job)
+        jobs[0].status = "running"
+        await save_progress(jobs[0])  # re-saved, so no longer the oldest
+        for job in jobs[3:]:
+            await save_progress(job)
+
+        assert list(epcr._local_progress) == ["job0", "job3", "job4"]
+        assert (await get_import_progress("job0", "org1"))["status"] == "running"
+        assert await get_import_progress("job1", "org1") is None
@@ -0,0 +1,86 @@
+"""Event attachment content types (no DB).
+
+The type an attachment is served with comes from the uploaded bytes, not
+the client's claim: an upload claiming ``text/html`` is stored with its
+sniffed type, and a row that recorded a claimed type outside the upload
+allow-list is served as a plain download.
+"""
+
+import io
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+import app.api.v1.endpoints.events as events_endpoint
+from app.api.v1.endpoints.events import (
+    download_event_attachment,
+    upload_event_attachment,
+)
+from app.core.storage import LocalStorageBackend
+
+ORG_ID = str(uuid4())
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(str(tmp_path))
+    monkeypatch.setattr(events_endpoint, "get_storage", lambda: backend)
+    monkeypatch.setitem(
+        sys.modules,
+        "magic",
+        SimpleNamespace(from_buffer=lambda content, mime: "application/pdf"),
+    )
+    return backend
+
+
+def _db(event):
+    result = MagicMock(scalar_one_or_none=MagicMock(return_value=event))
+    return SimpleNamespace(execute=AsyncMock(return_value=result), commit=AsyncMock())
+
+
+def _event(attachments=None):
+    return SimpleNamespace(
+        id=str(uuid4()), organization_id=ORG_ID, attachments=attachments
+    )
+
+
+def _user():
+    return SimpleNamespace(id=str(uuid4()), organization_id=ORG_ID)
+
+
+async def test_upload_records_the_sniffed_type(storage):
+    event = _event()
+    upload = UploadFile(
+        io.BytesIO(b"%PDF-1.7 <script>"),
+        filename="agenda.pdf",
+        headers=Headers({"content-type": "text/html"}),
+    )
+
+    response = await upload_event_attachment(uuid4(), upload, None, _db(event), _user())
+
+    assert response.attachment["file_type"] == "application/pdf"
+
+
+async def test_claimed_types_outside_the_allow_list_are_downloads(storage):
+    await storage.put_bytes("events/a.pdf", b"<html>")
+    event = _event(
+        [
+            {
+                "id": "att-1",
+                "file_name": "a.pdf",
+                "storage_key": "events/a.pdf",
+                "file_type": "text/html",
+            }
+        ]
+    )
+    request = SimpleNamespace(headers={})
+
+    response = await download_event_attachment(
+        uuid4(), "att-1", request, _db(event), _user()
+    )
+
+    assert response.media_type == "application/octet-stream"
@@ -0,0 +1,110 @@
+"""Tests for conditional-GET handling (ETag / If-None-Match / If-Modified-Since)."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from starlette.requests import Request
+
+import app.api.public.calendar as calendar_endpoint
+from app.utils.http_caching import (
+    http_date,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
+
+STAMP = datetime(2026, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def _request(**headers) -> Request:
+    raw = [
+        (k.replace("_", "-").lower().encode(), v.encode()) for k, v in headers.items()
+    ]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+def test_etag_is_stable_and_quoted():
+    assert make_etag("a", 1, None) == make_etag("a", 1, None)
+    assert make_etag("a", 1) != make_etag("a", 2)
+    assert make_etag("x").startswith('"')
+    assert make_etag("x").endswith('"')
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"zzz", "abc"', True),
+        ("*", True),
+        ('"zzz"', False),
+    ],
+)
+def test_if_none_match(header, expected):
+    assert is_not_modified(_request(if_none_match=header), '"abc"') is expected
+
+
+def test_if_modified_since_uses_whole_seconds():
+    request = _request(if_modified_since=http_date(STAMP))
+    assert is_not_modified(request, last_modified=STAMP)
+    later = STAMP.replace(second=16)
+    assert not is_not_modified(request, last_modified=later)
+
+
+def test_if_none_match_takes_precedence_over_date():
+    request = _request(if_none_match='"other"', if_modified_since=http_date(STAMP))
+    assert not is_not_modified(request, '"abc"', STAMP)
+
+
+def test_not_modified_response_has_no_body():
+    response = not_modified_response('"abc"', STAMP, "private")
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == '"abc"'
+
+
+class TestCalendarFeed:
+    @pytest.fixture
+    def service(self, monkeypatch):
+        user = SimpleNamespace(id="u1", organization_id="o1")
+        service = SimpleNamespace(
+            get_user_by_calendar_token=AsyncMock(return_value=user),
+            get_user_feed_version=AsyncMock(return_value=(2, STAMP, STAMP, STAMP)),
+            get_shifts_for_user_feed=AsyncMock(return_value=[]),
+        )
+        monkeypatch.setattr(calendar_endpoint, "SchedulingService", lambda db: service)
+        return service
+
+    @staticmethod
+    def _db():
+        org = SimpleNamespace(id="org-1", name="Station 1", timezone="UTC", settings={})
+        result = MagicMock(scalar_one_or_none=MagicMock(return_value=org))
+        return SimpleNamespace(execute=AsyncMock(return_value=result))
+
+    async def test_revalidation_skips_loading_shifts(self, service):
+        token = "t" * 40
+        first = await calendar_endpoint.get_personal_calendar_feed(
+            token, _request(), self._db()
+        )
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        second = await calendar_endpoint.get_personal_calendar_feed(
+            token, _request(if_none_match=etag), self._db()
+        )
+        assert second.status_code == 304
+        assert service.get_shifts_for_user_feed.await_count == 1
+
+    async def test_shift_change_changes_the_etag(self, service):
+        token = "t" * 40
+        first = await calendar_endpoint.get_personal_calendar_feed(
+            token, _request(), self._db()
+        )
+        service.get_user_feed_version.return_value = (3, STAMP, STAMP, STAMP)
+        second = await calendar_endpoint.get_personal_calendar_feed(
+            token, _request(if_none_match=first.headers["etag"]), self._db()
+        )
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
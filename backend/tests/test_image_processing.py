@@ -1,11 +1,19 @@
-"""Security regression tests for the shared image optimizer."""
+"""Tests for the shared image optimizer and derivative pipeline."""
 
 from io import BytesIO
 
 import pytest
-from PIL import Image, UnidentifiedImageError
+from PIL import Image, UnidentifiedImageError, features
 
-from app.utils.image_processing import MAX_INPUT_PIXELS, optimize_image
+from app.core.config import settings
+from app.utils.image_processing import (
+    MAX_INPUT_PIXELS,
+    derivative_format,
+    optimize_image,
+    render_derivatives,
+    run_image_task,
+    shutdown_image_pool,
+)
 
 
 def test_optimizer_reencodes_and_bounds_dimensions():
@@ -35,3 +43,72 @@ def test_optimizer_rejects_images_over_pixel_budget(monkeypatch):
         optimize_image(source.getvalue())
 
     assert MAX_INPUT_PIXELS > 99
+
+
+def _png(size):
+    source = BytesIO()
+    Image.new("RGBA", size, color=(0, 128, 255, 255)).save(source, format="PNG")
+    return source.getvalue()
+
+
+def test_derivatives_fit_each_box_from_one_decode():
+    result = render_derivatives(
+        _png((1600, 800)),
+        {"thumbnail": (200, 200), "card": (600, 600), "full": (1200, 1200)},
+    )
+
+    sizes = {name: Image.open(BytesIO(blob)).size for name, blob in result.items()}
+    assert sizes == {"full": (1200, 600), "card": (600, 300), "thumbnail": (200, 100)}
+    assert {Image.open(BytesIO(b)).format for b in result.values()} == {"WEBP"}
+
+
+def test_derivatives_never_upscale_small_images():
+    result = render_derivatives(_png((120, 80)))
+    assert {Image.open(BytesIO(b)).size for b in result.values()} == {(120, 80)}
+
+
+def test_derivatives_apply_the_same_rejections():
+    with pytest.raises(UnidentifiedImageError):
+        render_derivatives(b"\x89PNG\r\n\x1a\nnot-an-image")
+
+
+@pytest.mark.skipif(
+    "avif" not in features.modules or not features.check_module("avif"),
+    reason="Pillow built without libavif",
+)
+def test_derivatives_encode_avif_when_configured(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_DERIVATIVE_FORMAT", "avif")
+
+    output_format, media_type = derivative_format()
+    result = render_derivatives(_png((900, 900)), output_format=output_format)
+
+    assert media_type == "image/avif"
+    assert {Image.open(BytesIO(b)).format for b in result.values()} == {"AVIF"}
+
+
+def test_avif_falls_back_to_webp_without_libavif(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_DERIVATIVE_FORMAT", "avif")
+    monkeypatch.setattr(features, "check_module", lambda name: False)
+
+    assert derivative_format() == ("WEBP", "image/webp")
+
+
+async def test_image_task_runs_on_a_thread_when_the_pool_is_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_PROCESS_WORKERS", 0)
+
+    result = await run_image_task(optimize_image, _png((40, 40)), max_size=(10, 10))
+
+    assert Image.open(BytesIO(result)).size == (10, 10)
+
+
+async def test_image_task_runs_in_a_worker_process(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_PROCESS_WORKERS", 1)
+    try:
+        result = await run_image_task(render_derivatives, _png((900, 900)))
+        assert Image.open(BytesIO(result["card"])).size == (600, 600)
+
+        # Worker exceptions surface in the caller as the original type.
+        with pytest.raises(UnidentifiedImageError):
+            await run_image_task(optimize_image, b"\x89PNG\r\n\x1a\nnope")
+    finally:
+        shutdown_image_pool()
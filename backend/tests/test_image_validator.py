@@ -20,6 +20,7 @@ from app.utils.image_validator import (
     ImageValidator,
     get_image_validator,
     validate_logo_image,
+    validate_logo_image_async,
 )
 
 
@@ -172,5 +173,15 @@ class TestConvenienceHelpers:
         assert exc_info.value.status_code == 400
         assert "Invalid image" in str(exc_info.value.detail)
 
+    async def test_async_variant_sanitizes_off_the_event_loop(self, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "IMAGE_PROCESS_WORKERS", 0)
+        result = await validate_logo_image_async(_png_b64())
+        assert result.startswith("data:image/png;base64,")
+        with pytest.raises(HTTPException) as exc_info:
+            await validate_logo_image_async(_encoded_b64("GIF"))
+        assert exc_info.value.status_code == 400
+
     def test_get_image_validator_is_singleton(self):
         assert get_image_validator() is get_image_validator()
@@ -44,9 +44,19 @@ class TestIntegrationCatalogHonesty:
             for entry in integrations_endpoint.INTEGRATION_CATALOG
         }
         # None of these has an import/export route on the integrations
-        # router — it exposes only list/get/connect/disconnect/patch/test.
-        for itype in ("nfirs-export", "nemsis-export", "epcr-import", "csv-import"):
+        # router — only the ePCR import has one (POST /{id}/epcr-import).
+        for itype in ("nfirs-export", "nemsis-export", "csv-import"):
             assert catalog[itype]["status"] == "coming_soon", (
                 f"{itype} is advertised as available but has no route to "
                 "actually move data"
             )
+
+    def test_epcr_import_is_available_because_it_has_a_route(self):
+        catalog = {
+            entry["integration_type"]: entry
+            for entry in integrations_endpoint.INTEGRATION_CATALOG
+        }
+        paths = {route.path for route in integrations_endpoint.router.routes}
+
+        assert catalog["epcr-import"]["status"] == "available"
+        assert "/{integration_id}/epcr-import" in paths
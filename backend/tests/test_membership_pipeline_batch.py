@@ -0,0 +1,247 @@
+"""Unit tests for batch pipeline advancement (no database).
+
+Runs the batch processor against the simulated database of
+scripts/benchmark_pipeline_batch.py: outcomes itemized in input order with
+the single path's messages, stage gates graded from evidence loaded once
+per chunk, one transaction per chunk, emails queued rather than sent,
+meeting stages auto-linked with one event lookup, auto-transfer final
+stages left to the per-prospect path, and a failed chunk reported without
+aborting the rest. Queued emails are delivered through the same helpers
+the per-prospect path uses.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import app.core.database as database_module
+from app.services import membership_pipeline_batch as batch
+from app.services.membership_pipeline_service import MembershipPipelineService
+from scripts.benchmark_pipeline_batch import ORGANIZATION_ID, build_drive, run_batch
+
+pytestmark = pytest.mark.unit
+
+
+def _drive(prospects=5, missing_documents=0.0):
+    database = build_drive(0, prospects, missing_documents)
+    return database, batch.PipelineBatchProcessor(database.session())
+
+
+async def _advance(processor, ids, **kwargs):
+    return await processor.advance(ids, ORGANIZATION_ID, "coordinator", **kwargs)
+
+
+class TestAdvance:
+    async def test_moves_the_cohort_in_one_transaction(self):
+        database, processor = _drive()
+        ids = list(database.prospects)
+
+        results = await _advance(processor, ids, notes="Spring intake")
+
+        assert [r["prospect_id"] for r in results] == ids
+        assert all(r["succeeded"] for r in results)
+        assert results[0]["name"] == "Applicant 0"
+        assert {p.current_step_id for p in database.prospects.values()} == {
+            "info-session"
+        }
+        assert database.transactions == 1
+        completed = database.progress["progress-00000"]
+        assert completed.status.value == "completed"
+        assert completed.completed_by == "coordinator"
+        assert completed.notes == "Spring intake"
+        actions = [row["action"] for row in database.activity]
+        assert actions.count("step_completed") == 5
+        assert actions.count("prospect_advanced") == 5
+
+    async def test_unknown_hidden_and_foreign_prospects_are_not_found(self):
+        database, processor = _drive(prospects=3)
+        database.prospects["prospect-00002"].organization_id = "other-org"
+
+        results = await _advance(
+            processor,
+            ["missing", "prospect-00000", "prospect-00001", "prospect-00002"],
+            exclude_prospect_ids=["prospect-00001"],
+        )
+
+        assert [(r["succeeded"], r["error"]) for r in results] == [
+            (False, "Prospect not found"),
+            (True, None),
+            (False, "Prospect not found"),
+            (False, "Prospect not found"),
+        ]
+        assert database.prospects["prospect-00001"].current_step_id == "interest"
+
+    async def test_gate_and_final_stage_refusals_are_itemized(self):
+        database, processor = _drive(prospects=4, missing_documents=50)
+        ids = list(database.prospects)
+        for _ in range(2):
+            await _advance(processor, ids)
+        database.prospects["prospect-00003"].current_step_id = "interview"
+        queries = database.round_trips
+
+        results = await _advance(processor, ids)
+
+        assert [r["error"] for r in results] == [
+            "Missing required documents: Photo ID.",
+            "Missing required documents: Photo ID.",
+            None,
+            "Prospect is already at the final stage",
+        ]
+        assert database.prospects["prospect-00000"].current_step_id == "documents"
+        # Load (row + four eager loads), one document query, the writes, commit.
+        assert database.round_trips - queries < 15
+
+    async def test_chunks_commit_separately(self, monkeypatch):
+        monkeypatch.setattr(batch, "CHUNK_SIZE", 2)
+        database, processor = _drive(prospects=5)
+
+        await _advance(processor, list(database.prospects))
+
+        assert database.transactions == 3
+
+    async def test_emails_are_queued_not_sent(self):
+        database, processor = _drive(prospects=2)
+        ids = list(database.prospects)
+        with patch.object(
+            MembershipPipelineService, "_send_step_completion_notification"
+        ) as completion, patch.object(
+            MembershipPipelineService, "_send_stage_email"
+        ) as stage_email:
+            for _ in range(3):
+                await _advance(processor, ids)
+
+        completion.assert_not_called()
+        stage_email.assert_not_called()
+        assert processor.notifications == [
+            batch.PipelineNotification(
+                batch.STEP_COMPLETED, "prospect-00000", "interest"
+            ),
+            batch.PipelineNotification(
+                batch.STEP_COMPLETED, "prospect-00001", "interest"
+            ),
+            batch.PipelineNotification(batch.STAGE_EMAIL, "prospect-00000", "welcome"),
+            batch.PipelineNotification(batch.STAGE_EMAIL, "prospect-00001", "welcome"),
+        ]
+
+    async def test_meeting_stage_is_linked_once_per_prospect(self):
+        database, processor = _drive(prospects=3)
+        database.links.add(("prospect-00000", "bench-meeting"))
+
+        await _advance(processor, list(database.prospects))
+
+        assert database.links == {
+            (f"prospect-0000{i}", "bench-meeting") for i in range(3)
+        }
+        linked = [
+            row["prospect_id"]
+            for row in database.activity
+            if row["action"] == "event_auto_linked"
+        ]
+        assert linked == ["prospect-00001", "prospect-00002"]
+
+    async def test_auto_transfer_final_stage_goes_through_the_single_path(self):
+        database, processor = _drive(prospects=2)
+        pipeline = database.prospects["prospect-00000"].pipeline
+        pipeline.auto_transfer_on_approval = True
+        pipeline.steps[0].is_final_step = True
+        transferred = [
+            {
+                "prospect_id": "prospect-00001",
+                "name": "Applicant 1",
+                "succeeded": True,
+                "error": None,
+            }
+        ]
+        with patch.object(
+            processor.service, "_bulk_apply", AsyncMock(return_value=transferred)
+        ) as bulk_apply:
+            results = await _advance(processor, ["prospect-00001", "missing"])
+
+        assert bulk_apply.await_args.args[:2] == (["prospect-00001"], ORGANIZATION_ID)
+        assert results[0] is transferred[0]
+        assert results[1]["error"] == "Prospect not found"
+        assert database.activity == []
+
+    async def test_failed_chunk_is_reported_and_the_next_proceeds(self, monkeypatch):
+        monkeypatch.setattr(batch, "CHUNK_SIZE", 2)
+        database, processor = _drive(prospects=4)
+        # The first chunk's first write fails; the connection then recovers.
+        database.fail_on = "prospect_step_progress"
+        rollback = processor.db.rollback
+
+        async def recover():
+            database.fail_on = None
+            await rollback()
+
+        processor.db.rollback = recover
+
+        results = await _advance(processor, list(database.prospects))
+
+        assert [r["error"] for r in results] == [
+            "Action failed",
+            "Action failed",
+            None,
+            None,
+        ]
+        assert results[0]["name"] == "Applicant 0"
+        assert database.rollbacks == 1
+        assert database.prospects["prospect-00000"].current_step_id == "interest"
+        assert processor.notifications[0].prospect_id == "prospect-00002"
+
+
+class TestDeliverNotifications:
+    async def test_dispatches_through_the_single_path_helpers(self):
+        database, _ = _drive(prospects=2)
+        notifications = [
+            batch.PipelineNotification(
+                batch.STEP_COMPLETED, "prospect-00000", "interest"
+            ),
+            batch.PipelineNotification(batch.STAGE_EMAIL, "prospect-00001", "welcome"),
+            batch.PipelineNotification(batch.STAGE_EMAIL, "deleted", "welcome"),
+        ]
+        with patch.object(
+            MembershipPipelineService,
+            "_send_step_completion_notification",
+            AsyncMock(return_value=True),
+        ) as completion, patch.object(
+            MembershipPipelineService,
+            "_send_stage_email",
+            AsyncMock(return_value=False),
+        ) as stage_email:
+            sent = await batch.deliver_pipeline_notifications(
+                database.session(), ORGANIZATION_ID, notifications
+            )
+
+        assert sent == 1
+        assert completion.await_args.args[0].id == "prospect-00000"
+        assert completion.await_args.args[1].id == "interest"
+        assert stage_email.await_args.args[0].id == "prospect-00001"
+        assert database.transactions == 1
+
+    async def test_background_entrypoint_never_raises(self):
+        database, _ = _drive(prospects=1)
+        notifications = [
+            batch.PipelineNotification(
+                batch.STEP_COMPLETED, "prospect-00000", "interest"
+            )
+        ]
+        with patch.object(
+            database_module, "async_session_factory", database.session
+        ), patch.object(
+            MembershipPipelineService,
+            "_send_step_completion_notification",
+            AsyncMock(side_effect=RuntimeError("smtp down")),
+        ):
+            await batch.send_pipeline_notifications(ORGANIZATION_ID, notifications)
+
+
+async def test_drive_advances_in_few_round_trips():
+    elapsed, database, processor = await run_batch(
+        prospects=600, stages=3, latency=0, missing_documents=5
+    )
+
+    assert database.transactions == 6
+    assert database.round_trips / (600 * 3) < 0.1
+    stages = [p.current_step_id for p in database.prospects.values()]
+    assert stages.count("documents") == 30
+    assert stages.count("welcome") == 570
@@ -1,14 +1,18 @@
 """Tests for department message delivery/escalation
 (app/services/message_delivery_service.py).
 
-Covers channel routing by priority/ack and the in-app fan-out. DB and the
-email/SMS services are mocked; no MySQL, no network.
+Covers channel routing by priority/ack, the batched in-app fan-out and the
+recorded delivery progress. DB and the email/SMS/push services are mocked; no
+MySQL, no network.
 """
 
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from sqlalchemy.sql.dml import Insert
+
+from app.services import message_delivery_service as delivery_module
 from app.services.consent_service import ConsentService
 from app.services.message_delivery_service import MessageDeliveryService
 from app.services.messaging_service import MessagingService
@@ -56,11 +60,20 @@ def _db():
 def _patch_recipients(recipients):
     return patch.object(
         MessagingService,
-        "_targeted_users",
+        "_targeted_recipients",
         new=AsyncMock(return_value=recipients),
     )
 
 
+def _inserted_rows(db):
+    """In-app rows passed to multi-row INSERTs, one list per statement."""
+    return [
+        c.args[1]
+        for c in db.execute.await_args_list
+        if len(c.args) == 2 and isinstance(c.args[0], Insert)
+    ]
+
+
 def _patch_sms_consent(*consented_ids):
     """Pretend the given member ids granted SMS consent (TCPA gate).
 
@@ -81,16 +94,31 @@ class TestInAppFanOut:
         svc = MessageDeliveryService(db)
         with _patch_recipients(recipients):
             await svc.deliver(_msg(posted_by="author"))
-        # The author is excluded; the other two each get an in-app row.
-        assert db.add.call_count == 2
+        # The author is excluded; the other two go out in one INSERT.
+        batches = _inserted_rows(db)
+        assert len(batches) == 1
+        assert [row["recipient_id"] for row in batches[0]] == ["u1", "u2"]
+        assert batches[0][0]["notification_metadata"]["message_id"] == "m1"
+        db.add.assert_not_called()
         db.commit.assert_awaited()
 
+    async def test_large_rosters_are_inserted_in_chunks(self):
+        db = _db()
+        svc = MessageDeliveryService(db)
+        recipients = [_user(f"u{i}") for i in range(5)]
+        with _patch_recipients(recipients), patch.object(
+            delivery_module, "_IN_APP_INSERT_CHUNK", 2
+        ):
+            await svc.deliver(_msg())
+        assert [len(b) for b in _inserted_rows(db)] == [2, 2, 1]
+
     async def test_no_recipients_is_a_noop(self):
         db = _db()
         svc = MessageDeliveryService(db)
         # Only the author is targeted -> nobody left after excluding them.
         with _patch_recipients([_user("author")]):
             await svc.deliver(_msg(posted_by="author"))
+        assert _inserted_rows(db) == []
         db.add.assert_not_called()
 
     async def test_deliver_never_raises_on_targeting_failure(self):
@@ -100,20 +128,57 @@ class TestInAppFanOut:
         svc = MessageDeliveryService(db)
         with patch.object(
             MessagingService,
-            "_targeted_users",
+            "_targeted_recipients",
             new=AsyncMock(side_effect=RuntimeError("boom")),
         ):
             # Must not raise.
             await svc.deliver(_msg())
 
 
+class TestDeliveryProgress:
+    async def test_final_progress_records_per_channel_counts(self):
+        db = _db()
+        svc = MessageDeliveryService(db)
+        svc._record_progress = AsyncMock()
+        svc._send_email = AsyncMock(return_value=(2, 0))
+        svc._sms_numbers = AsyncMock(return_value=["+15551234567"])
+        svc._send_sms = AsyncMock(return_value=1)
+        svc._push_subscriptions = AsyncMock(return_value=[])
+        recipients = [_user("u1", email="a@fd.co"), _user("u2", email="b@fd.co")]
+        with _patch_recipients(recipients):
+            await svc.deliver(_msg(priority="urgent"))
+
+        progress = svc._record_progress.await_args.args[1]
+        assert progress["state"] == "delivered"
+        assert progress["recipients"] == 2
+        assert progress["in_app"] == 2
+        assert progress["email"] == {"sent": 2, "failed": 0}
+        assert progress["sms"] == {"numbers": 1, "sent": 1}
+        assert progress["push"] is None
+        assert progress["completed_at"]
+
+    async def test_failure_is_recorded_not_raised(self):
+        db = _db()
+        svc = MessageDeliveryService(db)
+        svc._record_progress = AsyncMock()
+        with patch.object(
+            MessagingService,
+            "_targeted_recipients",
+            new=AsyncMock(side_effect=RuntimeError("boom")),
+        ):
+            await svc.deliver(_msg())
+        assert svc._record_progress.await_args.args[1]["state"] == "failed"
+
+
 class TestChannelRouting:
     async def _route(self, message):
         db = _db()
         svc = MessageDeliveryService(db)
-        svc._create_in_app = AsyncMock()
-        svc._send_email = AsyncMock()
-        svc._send_sms = AsyncMock()
+        svc._create_in_app = AsyncMock(return_value=1)
+        svc._send_email = AsyncMock(return_value=(1, 0))
+        svc._sms_numbers = AsyncMock(return_value=["+15551234567"])
+        svc._send_sms = AsyncMock(return_value=1)
+        svc._push_subscriptions = AsyncMock(return_value=[])
         with _patch_recipients([_user("u1", email="a@b.co", mobile="+15551234567")]):
             await svc.deliver(message)
         return svc
@@ -124,17 +189,34 @@ class TestChannelRouting:
         svc = await self._route(_msg(priority="normal"))
         svc._create_in_app.assert_awaited_once()
         svc._send_email.assert_awaited_once()
-        svc._send_sms.assert_not_awaited()
+        svc._sms_numbers.assert_not_awaited()
+        assert svc._send_sms.await_args.args[1] == []
 
     async def test_ack_required_escalates_email_only(self):
         svc = await self._route(_msg(priority="normal", requires_ack=True))
         svc._send_email.assert_awaited_once()
-        svc._send_sms.assert_not_awaited()
+        svc._sms_numbers.assert_not_awaited()
+        assert svc._send_sms.await_args.args[1] == []
 
     async def test_urgent_escalates_both_email_and_sms(self):
         svc = await self._route(_msg(priority="urgent"))
         svc._send_email.assert_awaited_once()
-        svc._send_sms.assert_awaited_once()
+        svc._sms_numbers.assert_awaited_once()
+        assert svc._send_sms.await_args.args[1] == ["+15551234567"]
+
+    async def test_stale_push_endpoints_are_pruned_after_the_sends(self):
+        db = _db()
+        svc = MessageDeliveryService(db)
+        svc._send_email = AsyncMock(return_value=None)
+        svc._push_subscriptions = AsyncMock(return_value=["sub"])
+        svc._send_push = AsyncMock(return_value=(0, ["hash-gone"]))
+        prune = AsyncMock()
+        with _patch_recipients([_user("u1")]), patch(
+            "app.services.push_service.PushService.prune_stale", new=prune
+        ):
+            await svc.deliver(_msg())
+        svc._send_push.assert_awaited_once_with(_msg(), ["sub"])
+        prune.assert_awaited_once_with(["hash-gone"])
 
     async def test_member_without_sms_consent_is_still_emailed(self):
         # The invariant that makes consent enforcement safe: suppressing a
@@ -197,10 +279,9 @@ class TestSmsGating:
         svc = MessageDeliveryService(db)
         fake_sms = MagicMock()
         fake_sms.enabled = False
-        fake_sms.send_bulk_sms = AsyncMock()
         with patch("app.services.sms_service.SMSService", return_value=fake_sms):
-            await svc._send_sms(_msg(priority="urgent"), recipients, org=None)
-        fake_sms.send_bulk_sms.assert_not_awaited()
+            numbers = await svc._sms_numbers(_msg(priority="urgent"), recipients)
+        assert numbers == []
 
     async def test_sms_uses_mobile_then_phone_for_opted_in_members(self):
         db = _db()
@@ -213,17 +294,10 @@ class TestSmsGating:
         svc = MessageDeliveryService(db)
         fake_sms = MagicMock()
         fake_sms.enabled = True
-        fake_sms.send_bulk_sms = AsyncMock(return_value=2)
         with patch(
             "app.services.sms_service.SMSService", return_value=fake_sms
         ), _patch_sms_consent("u1", "u2", "u3", "u4"):
-            await svc._send_sms(
-                _msg(priority="urgent"),
-                recipients,
-                org=SimpleNamespace(name="FD"),
-            )
-        fake_sms.send_bulk_sms.assert_awaited_once()
-        numbers = fake_sms.send_bulk_sms.await_args.args[0]
+            numbers = await svc._sms_numbers(_msg(priority="urgent"), recipients)
         assert numbers == ["+1555mobile", "+1555phone"]
 
     async def test_sms_requires_consent_even_when_the_channel_is_on(self):
@@ -238,16 +312,10 @@ class TestSmsGating:
         svc = MessageDeliveryService(db)
         fake_sms = MagicMock()
         fake_sms.enabled = True
-        fake_sms.send_bulk_sms = AsyncMock(return_value=1)
         with patch(
             "app.services.sms_service.SMSService", return_value=fake_sms
         ), _patch_sms_consent("u1"):
-            await svc._send_sms(
-                _msg(priority="urgent"),
-                recipients,
-                org=SimpleNamespace(name="FD"),
-            )
-        numbers = fake_sms.send_bulk_sms.await_args.args[0]
+            numbers = await svc._sms_numbers(_msg(priority="urgent"), recipients)
         assert numbers == ["+1555consented"]
 
     async def test_no_consent_means_no_sms_at_all(self):
@@ -258,16 +326,26 @@ class TestSmsGating:
         svc = MessageDeliveryService(db)
         fake_sms = MagicMock()
         fake_sms.enabled = True
-        fake_sms.send_bulk_sms = AsyncMock()
         with patch(
             "app.services.sms_service.SMSService", return_value=fake_sms
         ), _patch_sms_consent():
-            await svc._send_sms(
+            numbers = await svc._sms_numbers(_msg(priority="urgent"), recipients)
+        assert numbers == []
+
+    async def test_send_texts_the_resolved_numbers_in_one_bulk_call(self):
+        svc = MessageDeliveryService(_db())
+        fake_sms = MagicMock()
+        fake_sms.send_bulk_sms = AsyncMock(return_value=2)
+        with patch("app.services.sms_service.SMSService", return_value=fake_sms):
+            sent = await svc._send_sms(
                 _msg(priority="urgent"),
-                recipients,
+                ["+1555a", "+1555b"],
                 org=SimpleNamespace(name="FD"),
             )
-        fake_sms.send_bulk_sms.assert_not_awaited()
+        assert sent == 2
+        numbers, body = fake_sms.send_bulk_sms.await_args.args
+        assert numbers == ["+1555a", "+1555b"]
+        assert body == "FD URGENT: Roof collapse drill"
 
 
 class TestEscalationRateLimit:
@@ -303,14 +381,17 @@ class TestEscalationRateLimit:
         recipients = [_user("u1", mobile="+15551234567")]
         fake_sms = MagicMock()
         fake_sms.enabled = True
-        fake_sms.send_bulk_sms = AsyncMock()
         svc = MessageDeliveryService(db)
         with patch(
             "app.core.security.is_rate_limited", new=AsyncMock(return_value=True)
-        ), patch("app.services.sms_service.SMSService", return_value=fake_sms):
-            await svc._send_sms(_msg(priority="urgent"), recipients, org=None)
+        ), patch(
+            "app.services.sms_service.SMSService", return_value=fake_sms
+        ), _patch_sms_consent(
+            "u1"
+        ):
+            numbers = await svc._sms_numbers(_msg(priority="urgent"), recipients)
 
-        fake_sms.send_bulk_sms.assert_not_awaited()
+        assert numbers == []
 
 
 class TestPublishScheduledMessages:
@@ -108,6 +108,63 @@ class TestTargetedUsers:
         assert "users.deleted_at IS NULL" in sql
 
 
+class TestTargetedRecipients:
+    def _row(self, uid, status="active", email=None):
+        return SimpleNamespace(
+            id=uid,
+            email=email,
+            mobile=None,
+            phone=None,
+            notification_preferences=None,
+            status=SimpleNamespace(value=status),
+        )
+
+    async def test_selects_columns_and_skips_role_query_when_not_role_targeted(
+        self,
+    ):
+        db = MagicMock()
+        users = MagicMock(
+            all=MagicMock(return_value=[self._row("u1", email="a@fd.org")])
+        )
+        db.execute = AsyncMock(return_value=users)
+
+        recipients = await MessagingService(db)._targeted_recipients(
+            _msg(target_type="all"), "org-1"
+        )
+
+        assert [(r.id, r.email) for r in recipients] == [("u1", "a@fd.org")]
+        # One round trip, and it selects columns rather than User entities.
+        assert db.execute.await_count == 1
+        sql = str(db.execute.await_args.args[0])
+        assert "users.email" in sql
+        assert "users.deleted_at IS NULL" in sql
+
+    async def test_role_targeting_matches_targeted_users(self):
+        # Same audience as the ORM path: id match and legacy name fallback.
+        db = MagicMock()
+        users = MagicMock(
+            all=MagicMock(
+                return_value=[self._row("u1"), self._row("u2"), self._row("u3")]
+            )
+        )
+        roles = MagicMock(
+            all=MagicMock(
+                return_value=[
+                    ("u1", "role-chief", "Chief"),
+                    ("u2", "role-ff", "officer"),
+                    ("u3", "role-ff", "Firefighter"),
+                ]
+            )
+        )
+        db.execute = AsyncMock(side_effect=[users, roles])
+
+        recipients = await MessagingService(db)._targeted_recipients(
+            _msg(target_type="roles", roles=["role-chief", "officer"]), "org-1"
+        )
+
+        assert [r.id for r in recipients] == ["u1", "u2"]
+
+
 class TestUnreadCount:
     def _user(self, roles=("officer",), status="active"):
         return SimpleNamespace(
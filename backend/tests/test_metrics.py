@@ -0,0 +1,213 @@
+"""
+Tests for the Prometheus metrics subsystem (app/core/metrics.py) and the
+``/metrics`` endpoint in main.py.
+
+Covers cumulative histogram buckets and the text exposition format, summing
+counters and gauges that several workers flushed to Redis, keeping counts a
+failed flush did not deliver, latency per route template, and the endpoint's
+enable/token gate. Redis is an in-memory stand-in; no server.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI
+
+import main
+from app.core import metrics as metrics_module
+from app.core.metrics import MetricsFlusher, MetricsMiddleware, MetricsRegistry, render
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self.redis, self.ops = redis, []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.ops.append((name, args, kwargs))
+
+    async def execute(self):
+        if self.redis.fail:
+            raise ConnectionError("redis down")
+        for name, args, kwargs in self.ops:
+            getattr(self.redis, "_" + name)(*args, **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class _Redis:
+    """Just enough of redis.asyncio.Redis for the flusher and collector."""
+
+    def __init__(self):
+        self.hashes, self.fail = {}, False
+
+    async def ping(self):
+        return True
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    def _hincrbyfloat(self, key, field, amount):
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = float(bucket.get(field, 0)) + amount
+
+    def _delete(self, key):
+        self.hashes.pop(key, None)
+
+    def _hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def _expire(self, key, seconds):
+        pass
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def scan_iter(self, match, count=None):
+        for key in list(self.hashes):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+
+def _registry(gauge=0):
+    registry = MetricsRegistry()
+    latency = registry.histogram("req_seconds", "Latency.", (0.05, 2.5))
+    sent = registry.counter("sent_total", "Sends.")
+    registry.gauge("open", "Open things.", lambda: [({}, gauge)])
+    return registry, latency, sent
+
+
+def _redis_patch(redis):
+    return patch.multiple(
+        metrics_module.cache_manager, _connected=True, redis_client=redis
+    )
+
+
+class TestExposition:
+    def test_histogram_buckets_are_cumulative(self):
+        registry, latency, sent = _registry()
+        latency.observe(0.03, route="/a")
+        latency.observe(2, route="/a")
+        sent.inc(3, channel="sms")
+
+        text = render(registry, registry.snapshot())
+
+        assert "# TYPE req_seconds histogram" in text
+        lines = [line for line in text.splitlines() if line.startswith("req_")]
+        assert lines == [
+            'req_seconds_bucket{route="/a",le="0.05"} 1',
+            'req_seconds_bucket{route="/a",le="2.5"} 2',
+            'req_seconds_bucket{route="/a",le="+Inf"} 2',
+            'req_seconds_count{route="/a"} 2',
+            'req_seconds_sum{route="/a"} 2.03',
+        ]
+        assert 'sent_total{channel="sms"} 3' in text
+
+    def test_label_values_are_escaped(self):
+        registry, _, sent = _registry()
+        sent.inc(channel='a"b\\c')
+
+        assert 'sent_total{channel="a\\"b\\\\c"} 1' in render(
+            registry, registry.snapshot()
+        )
+
+
+class TestCrossWorker:
+    async def test_workers_counters_and_gauges_are_summed(self):
+        redis = _Redis()
+        first, _, first_sent = _registry(gauge=2)
+        second, _, second_sent = _registry(gauge=5)
+        first_sent.inc(channel="email")
+        second_sent.inc(4, channel="email")
+        workers = [MetricsFlusher(first), MetricsFlusher(second)]
+        workers[1].worker = "other-host:1"
+
+        with _redis_patch(redis), patch.object(
+            metrics_module.settings, "METRICS_ENABLED", True
+        ), patch.object(metrics_module, "metrics_flusher", workers[0]):
+            await workers[1].flush()
+            first_sent.inc(channel="email")
+            series = await metrics_module.collect()
+
+        assert series[("sent_total", "", (("channel", "email"),))] == 6
+        assert series[("open", "", ())] == 7
+
+    async def test_failed_flush_keeps_the_counts(self):
+        redis = _Redis()
+        registry, _, sent = _registry()
+        flusher = MetricsFlusher(registry)
+        sent.inc(2)
+
+        with _redis_patch(redis):
+            redis.fail = True
+            await flusher.flush()
+            redis.fail = False
+            await flusher.flush()
+            await flusher.flush()
+
+        assert redis.hashes["metrics:series"] == {'["sent_total", "", []]': 2.0}
+
+
+class TestMiddleware:
+    async def test_latency_is_recorded_per_route_template(self):
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            return {}
+
+        registry, latency, _ = _registry()
+        transport = httpx.ASGITransport(app=MetricsMiddleware(app))
+        with patch.object(
+            metrics_module, "http_request_seconds", latency
+        ), patch.object(metrics_module.settings, "METRICS_ENABLED", True):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                await client.get("/items/1")
+                await client.get("/items/2")
+                await client.get("/nope")
+
+        counts = {
+            labels: value
+            for (family, suffix, labels), value in registry.snapshot().items()
+            if suffix == "_count"
+        }
+        assert counts == {
+            (("method", "GET"), ("route", "/items/{item_id}"), ("status", "2xx")): 2,
+            (("method", "GET"), ("route", "<unmatched>"), ("status", "4xx")): 1,
+        }
+
+
+class TestEndpoint:
+    async def _scrape(self, authorization="", **overrides):
+        request = SimpleNamespace(headers={"authorization": authorization})
+        values = {
+            "METRICS_ENABLED": True,
+            "METRICS_TOKEN": "",
+            "ENVIRONMENT": "development",
+            **overrides,
+        }
+        with patch.multiple(main.settings, **values):
+            return await main.metrics(request)
+
+    async def test_disabled_is_not_found(self):
+        assert (await self._scrape(METRICS_ENABLED=False)).status_code == 404
+
+    async def test_production_requires_a_token(self):
+        response = await self._scrape(ENVIRONMENT="production")
+
+        assert response.status_code == 404
+
+    async def test_token_is_checked(self):
+        assert (await self._scrape("Bearer no", METRICS_TOKEN="s3")).status_code == 401
+
+        response = await self._scrape("Bearer s3", METRICS_TOKEN="s3")
+
+        assert response.status_code == 200
+        assert response.media_type.startswith("text/plain; version=0.0.4")
+        assert b"# TYPE websocket_connections gauge" in response.body
@@ -0,0 +1,68 @@
+"""
+Parity of ``NameIndex`` (app/utils/name_matching.py) with ``best_matches``.
+
+The index exists only to make catalog reconciliation cheaper; the review
+screen must not see a single score, order or tie-break change. The synthetic
+catalog and checklist come from scripts/benchmark_name_matching.py, which
+also times the two.
+"""
+
+import pytest
+
+from app.utils import name_matching
+from app.utils.name_matching import NameIndex, best_matches, normalize_name
+from scripts.benchmark_name_matching import build_catalog, build_lines
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return build_catalog(3000)
+
+
+class TestParity:
+    def test_synthetic_checklist_matches_exactly(self, catalog):
+        index = NameIndex(catalog)
+
+        for line in build_lines(catalog, 150):
+            assert index.best_matches(line, limit=5) == best_matches(
+                line, catalog, limit=5
+            ), line
+
+    @pytest.mark.parametrize("minimum", [0.0, 0.2, 0.75, 1.0])
+    def test_thresholds_match(self, catalog, minimum):
+        index = NameIndex(catalog)
+
+        for line in build_lines(catalog, 40, seed=7):
+            assert index.best_matches(line, limit=10, minimum=minimum) == best_matches(
+                line, catalog, limit=10, minimum=minimum
+            )
+
+    def test_ties_keep_input_order(self):
+        catalog = [("b", "Trauma Shears"), ("a", "Trauma Shears"), ("c", "")]
+        index = NameIndex(catalog)
+
+        for query in ("trauma shears", "", "Shears"):
+            assert index.best_matches(query, minimum=0.0) == best_matches(
+                query, catalog, minimum=0.0
+            )
+        assert [r["id"] for r in index.best_matches("Trauma Shears")] == ["b", "a"]
+
+
+class TestCandidateGeneration:
+    def test_only_candidates_sharing_a_token_are_scored(self, catalog, monkeypatch):
+        calls = []
+        real = name_matching._score
+        monkeypatch.setattr(
+            name_matching, "_score", lambda *a: calls.append(a) or real(*a)
+        )
+        index = NameIndex(catalog)
+
+        index.best_matches("Cervical Collar Adult")
+
+        sharing = sum(
+            1
+            for _, name in catalog
+            if {"cervical", "collar", "adult"} & set(normalize_name(name).split())
+        )
+        assert 0 < len(calls) <= sharing < len(catalog)
+        assert index.best_matches("Spare 12") == []
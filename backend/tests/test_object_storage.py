@@ -0,0 +1,195 @@
+"""Tests for the object storage layer (local backend and an S3 stand-in)."""
+
+import io
+
+import pytest
+
+from app.core import storage as storage_module
+from app.core.storage import (
+    LocalStorageBackend,
+    S3StorageBackend,
+    content_disposition,
+    parse_byte_range,
+    stored_object_response,
+    validate_key,
+)
+
+
+class FakeS3Client:
+    """Just enough of boto3's S3 client, backed by a dict."""
+
+    def __init__(self):
+        self.objects: dict[tuple[str, str], tuple[bytes, str | None]] = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.objects[(Bucket, Key)] = (bytes(Body), ContentType)
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None):
+        with open(Filename, "rb") as fh:
+            self.objects[(Bucket, Key)] = (
+                fh.read(),
+                (ExtraArgs or {}).get("ContentType"),
+            )
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            exc = Exception("not found")
+            exc.response = {"Error": {"Code": "404"}}
+            raise exc
+        data, content_type = self.objects[(Bucket, Key)]
+        return {"ContentLength": len(data), "ContentType": content_type}
+
+    def get_object(self, Bucket, Key, Range=None):
+        data, _ = self.objects[(Bucket, Key)]
+        if Range:
+            first, _, last = Range[len("bytes=") :].partition("-")
+            data = data[int(first) : int(last) + 1 if last else None]
+        return {"Body": io.BytesIO(data)}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def generate_presigned_url(self, op, Params, ExpiresIn):
+        return f"https://s3.test/{Params['Bucket']}/{Params['Key']}?ttl={ExpiresIn}"
+
+
+async def _body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+@pytest.mark.parametrize("key", ["", "../etc/passwd", "a//b", "a/./b", "/abs", "a/b c"])
+def test_validate_key_rejects_unsafe_keys(key):
+    with pytest.raises(ValueError, match="Invalid storage key"):
+        validate_key(key)
+
+
+def test_parse_byte_range():
+    assert parse_byte_range(None, 10) is None
+    assert parse_byte_range("bytes=0-4", 10) == (0, 4)
+    assert parse_byte_range("bytes=5-", 10) == (5, 9)
+    assert parse_byte_range("bytes=-3", 10) == (7, 9)
+    assert parse_byte_range("bytes=2-99", 10) == (2, 9)
+    assert parse_byte_range("bytes=0-1,4-5", 10) is None
+    with pytest.raises(ValueError, match="Unsatisfiable range"):
+        parse_byte_range("bytes=10-", 10)
+    with pytest.raises(ValueError, match="Unsatisfiable range"):
+        parse_byte_range("bytes=-0", 10)
+
+
+@pytest.mark.parametrize(
+    "header",
+    ["bytes=abc", "bytes=-", "bytes=5-2", "bytes=+1-4", "bytes=1-2-3", "items=0-4"],
+)
+def test_parse_byte_range_ignores_malformed_headers(header):
+    assert parse_byte_range(header, 10) is None
+
+
+async def test_local_backend_round_trip(tmp_path):
+    backend = LocalStorageBackend(str(tmp_path))
+    source = tmp_path / "spool.part"
+    source.write_bytes(b"0123456789")
+
+    obj = await backend.put_file("docs/org/a.pdf", str(source))
+    assert obj.size == 10
+    assert not source.exists()
+    assert backend.local_path("docs/org/a.pdf") == str(tmp_path / "docs/org/a.pdf")
+
+    chunks = [c async for c in backend.iter_range("docs/org/a.pdf", 2, 6, 2)]
+    assert b"".join(chunks) == b"23456"
+
+    await backend.delete("docs/org/a.pdf")
+    await backend.delete("docs/org/a.pdf")
+    assert await backend.stat("docs/org/a.pdf") is None
+
+
+async def test_s3_backend_against_stand_in(tmp_path):
+    client = FakeS3Client()
+    backend = S3StorageBackend("bucket", client=client, prefix="logbook")
+
+    await backend.put_bytes("img/1.webp", b"webp-bytes", "image/webp")
+    assert ("bucket", "logbook/img/1.webp") in client.objects
+    obj = await backend.stat("img/1.webp")
+    assert obj.size == 10
+    assert obj.content_type == "image/webp"
+    assert await backend.stat("img/missing.webp") is None
+    assert b"".join([c async for c in backend.iter_range("img/1.webp", 5)]) == b"bytes"
+
+    source = tmp_path / "upload.part"
+    source.write_bytes(b"pdf")
+    await backend.put_file("docs/a.pdf", str(source), "application/pdf")
+    assert not source.exists()
+    assert await backend.read_bytes("docs/a.pdf") == b"pdf"
+
+
+async def test_response_serves_ranges(tmp_path):
+    backend = LocalStorageBackend(str(tmp_path))
+    await backend.put_bytes("a/b.bin", b"abcdefghij")
+
+    full = await stored_object_response(backend, "a/b.bin", media_type="x/y")
+    assert full.status_code == 200
+    assert full.headers["content-length"] == "10"
+    assert await _body(full) == b"abcdefghij"
+
+    partial = await stored_object_response(
+        backend, "a/b.bin", media_type="x/y", range_header="bytes=3-5"
+    )
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == "bytes 3-5/10"
+    assert await _body(partial) == b"def"
+
+    unsatisfiable = await stored_object_response(
+        backend, "a/b.bin", media_type="x/y", range_header="bytes=50-"
+    )
+    assert unsatisfiable.status_code == 416
+
+    malformed = await stored_object_response(
+        backend, "a/b.bin", media_type="x/y", range_header="bytes=x-y"
+    )
+    assert malformed.status_code == 200
+    assert await _body(malformed) == b"abcdefghij"
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("report.pdf", 'attachment; filename="report.pdf"'),
+        (
+            "Café menu.pdf",
+            'attachment; filename="Cafe menu.pdf"; '
+            "filename*=UTF-8''Caf%C3%A9%20menu.pdf",
+        ),
+        (
+            "議事録.docx",
+            'attachment; filename="___.docx"; '
+            "filename*=UTF-8''%E8%AD%B0%E4%BA%8B%E9%8C%B2.docx",
+        ),
+        ('a"b\r\nSet-Cookie: x.pdf', 'attachment; filename="abSet-Cookie: x.pdf"'),
+    ],
+)
+def test_content_disposition(filename, expected):
+    assert content_disposition(filename) == expected
+
+
+async def test_response_serves_non_latin1_filenames(tmp_path):
+    backend = LocalStorageBackend(str(tmp_path))
+    await backend.put_bytes("a/b.pdf", b"pdf")
+
+    response = await stored_object_response(
+        backend, "a/b.pdf", media_type="application/pdf", filename="議事録.pdf"
+    )
+
+    assert response.headers["content-disposition"].endswith(
+        "filename*=UTF-8''%E8%AD%B0%E4%BA%8B%E9%8C%B2.pdf"
+    )
+
+
+async def test_response_redirects_to_presigned_url(monkeypatch):
+    monkeypatch.setattr(
+        storage_module.settings, "STORAGE_PRESIGNED_DOWNLOADS", True, raising=False
+    )
+    backend = S3StorageBackend("bucket", client=FakeS3Client())
+    response = await stored_object_response(
+        backend, "a/b.pdf", media_type="application/pdf", filename="b.pdf"
+    )
+    assert response.status_code == 307
+    assert response.headers["location"].startswith("https://s3.test/bucket/a/b.pdf")
@@ -0,0 +1,247 @@
+"""Tests for the per-organization settings cache
+(app/services/org_settings_cache.py).
+
+Covers the parsed settings view, reading through the in-process and Redis
+layers under the organization's generation, not repopulating a copy that was
+invalidated mid-load, the flush/commit hooks that invalidate on every worker,
+and decrypting the email section once per change. The session and Redis are
+mocked; no MySQL.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.user import Organization
+from app.services import org_settings_cache as cache_module
+from app.services.org_settings_cache import (
+    OrgSettings,
+    OrgSettingsCache,
+    _collect_org_settings_changes,
+    _invalidate_org_settings,
+    invalidate_org_settings,
+)
+
+
+def _org(**settings):
+    return SimpleNamespace(
+        id="org1", name="Station 1", timezone="America/Chicago", settings=settings
+    )
+
+
+def _db(org):
+    db = MagicMock()
+    result = MagicMock(scalar_one_or_none=MagicMock(return_value=org))
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+def _redis(store):
+    async def get(key):
+        return store.get(key)
+
+    async def set_(key, value, ttl=None):
+        store[key] = value
+        return True
+
+    manager = cache_module.cache_manager
+    return patch.multiple(
+        manager,
+        _connected=True,
+        redis_client=MagicMock(),
+        get=AsyncMock(side_effect=get),
+        set=AsyncMock(side_effect=set_),
+    )
+
+
+class TestOrgSettings:
+    def test_malformed_section_reads_as_empty(self):
+        org = OrgSettings.from_organization(_org(security="on", scheduling={"a": 1}))
+
+        assert org.section("security") == {}
+        assert org.section("scheduling") == {"a": 1}
+        assert org.mfa_required is False
+
+    def test_mfa_requirement_and_timezone(self):
+        org = OrgSettings.from_organization(_org(security={"mfa_required": True}))
+
+        assert org.mfa_required is True
+        assert org.zoneinfo.key == "America/Chicago"
+        assert OrgSettings("org2", None, None).zoneinfo.key == "America/New_York"
+
+    def test_snapshot_is_detached_from_the_row(self):
+        row = _org(scheduling={"open_positions": ["driver"]})
+        org = OrgSettings.from_organization(row)
+
+        row.settings["scheduling"]["open_positions"].append("officer")
+
+        assert org.section("scheduling") == {"open_positions": ["driver"]}
+
+
+class TestGet:
+    async def test_without_redis_every_lookup_reads_the_database(self):
+        cache, db = OrgSettingsCache(), _db(_org())
+
+        await cache.get(db, "org1")
+        await cache.get(db, "org1")
+
+        assert db.execute.await_count == 2
+
+    async def test_miss_loads_once_and_stores_under_the_generation(self):
+        store = {"org_settings:org1:gen": 4}
+        cache, db = OrgSettingsCache(), _db(_org(security={"mfa_required": True}))
+
+        with _redis(store):
+            first = await cache.get(db, "org1")
+            second = await cache.get(db, "org1")
+
+        assert first is second
+        assert first.version == 4
+        assert first.mfa_required
+        assert db.execute.await_count == 1
+        assert store["org_settings:org1:4"]["timezone"] == "America/Chicago"
+
+    async def test_replica_reads_are_not_cached(self):
+        store = {"org_settings:org1:gen": 4}
+        cache, db = OrgSettingsCache(), _db(_org())
+        db.info = {"read_replica": True}
+
+        with _redis(store):
+            await cache.get(db, "org1")
+            await cache.get(db, "org1")
+
+        assert db.execute.await_count == 2
+        assert "org_settings:org1:4" not in store
+
+    async def test_cached_payload_is_served_for_the_current_generation(self):
+        store = {
+            "org_settings:org1:gen": 2,
+            "org_settings:org1:2": {"name": "New", "timezone": None, "settings": {}},
+            "org_settings:org1:1": {"name": "Old", "timezone": None, "settings": {}},
+        }
+        cache, db = OrgSettingsCache(), _db(None)
+
+        with _redis(store):
+            org = await cache.get(db, "org1")
+
+        assert org.name == "New"
+        db.execute.assert_not_awaited()
+
+    async def test_recheck_reuses_the_copy_while_the_generation_holds(self):
+        store = {"org_settings:org1:gen": 1}
+        cache, db = OrgSettingsCache(), _db(_org())
+
+        with _redis(store), patch.object(cache_module, "_LOCAL_RECHECK_SECONDS", 0):
+            first = await cache.get(db, "org1")
+            store.pop("org_settings:org1:1")
+            second = await cache.get(db, "org1")
+            store["org_settings:org1:gen"] = 2
+            third = await cache.get(db, "org1")
+
+        assert first is second
+        assert third.version == 2
+        assert db.execute.await_count == 2
+
+    async def test_invalidation_during_a_load_is_not_overwritten(self):
+        cache = OrgSettingsCache()
+        db = _db(_org())
+        result = db.execute.return_value
+
+        async def execute(statement):
+            cache.forget(["org1"])
+            return result
+
+        db.execute = AsyncMock(side_effect=execute)
+
+        with _redis({}):
+            await cache.get(db, "org1")
+
+        assert "org1" not in cache._local
+
+
+class TestInvalidation:
+    def _flush(self, dirty=(), deleted=()):
+        session = MagicMock()
+        session.dirty, session.deleted = set(dirty), set(deleted)
+        session.info = {}
+        _collect_org_settings_changes(session, None)
+        return session
+
+    def _organization(self):
+        org = Organization()
+        set_committed_value(org, "id", "org1")
+        set_committed_value(org, "name", "Station 1")
+        set_committed_value(org, "settings", {})
+        return org
+
+    def test_settings_change_marks_the_organization(self):
+        org = self._organization()
+        org.settings = {"security": {"mfa_required": True}}
+
+        session = self._flush(dirty=[org])
+
+        assert session.info["org_settings_stale"] == {"org1"}
+
+    def test_unrelated_column_leaves_the_cache_alone(self):
+        org = self._organization()
+        org.description = "Volunteer company"
+
+        session = self._flush(dirty=[org])
+
+        assert "org_settings_stale" not in session.info
+
+    async def test_commit_forgets_locally_and_invalidates_every_worker(self):
+        session = MagicMock()
+        session.info = {"org_settings_stale": {"org1"}}
+        invalidate = AsyncMock()
+        local = OrgSettingsCache()
+        local._local["org1"] = (float("inf"), OrgSettings("org1", None, None))
+
+        with (
+            patch.object(cache_module, "invalidate_org_settings", invalidate),
+            patch.object(cache_module, "org_settings_cache", local),
+        ):
+            _invalidate_org_settings(session)
+            await asyncio.gather(*cache_module._pending_invalidations)
+
+        assert local._local == {}
+        invalidate.assert_awaited_once_with({"org1"})
+        assert session.info == {}
+
+    async def test_invalidation_bumps_generations_and_publishes(self):
+        pipe = MagicMock()
+        pipe.execute = AsyncMock()
+        client = MagicMock()
+        client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+        client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch.multiple(
+            cache_module.cache_manager, _connected=True, redis_client=client
+        ):
+            await invalidate_org_settings({"org2", "org1"})
+
+        assert [c.args[0] for c in pipe.incr.call_args_list] == [
+            "org_settings:org1:gen",
+            "org_settings:org2:gen",
+        ]
+        pipe.publish.assert_called_once_with("org_settings:invalidate", "org1,org2")
+
+
+class TestEmailServiceConfig:
+    def test_secrets_are_decrypted_once_per_change(self):
+        cache = OrgSettingsCache()
+        org = _org(email_service={"enabled": True, "smtp_password": "enc:x"})
+
+        with patch(
+            "app.schemas.organization.decrypt_settings_secrets",
+            side_effect=lambda s: {"email_service": {"smtp_password": "secret"}},
+        ) as decrypt:
+            first = cache.email_service_config(org)
+            cache.email_service_config(org)
+            org.settings["email_service"] = {"enabled": False}
+            cache.email_service_config(org)
+
+        assert first == {"smtp_password": "secret"}
+        assert decrypt.call_count == 2
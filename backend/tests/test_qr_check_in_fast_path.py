@@ -0,0 +1,287 @@
+"""Unit tests for the QR self check-in fast path (no database).
+
+Covers the roster (phase warnings for every enrolled member, cached rows
+detached from the loading session), the roster cache loading once per
+event however many scans arrive together, the gates applied before a scan
+reaches the writer, and the writer against the simulated database of
+scripts/benchmark_qr_check_in.py: a burst written in few transactions, its
+audit entries chained in order, repeat scans answered as already checked
+in, the upsert keeping an earlier check-in time, and the fallback to the
+regular path when a batch fails.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.dialects import mysql
+
+import app.core.database as database_module
+from app.models.event import Event, EventType
+from app.models.training import ProgramPhase, TrainingSession
+from app.services import qr_check_in_service as qr
+from app.services.event_service import PHASE_GATE_PREFIX
+from scripts.benchmark_qr_check_in import (
+    SimulatedDatabase,
+    percentile,
+    run_fast_path,
+)
+
+pytestmark = pytest.mark.unit
+
+NOW = datetime.now(timezone.utc)
+
+
+def _event(**overrides):
+    fields = dict(
+        id="event-1",
+        organization_id="org-1",
+        title="Hose drill",
+        event_type=EventType.TRAINING,
+        start_datetime=NOW - timedelta(minutes=5),
+        end_datetime=NOW + timedelta(hours=2),
+        is_cancelled=False,
+    )
+    fields.update(overrides)
+    return Event(**fields)
+
+
+def _roster(event=None, **overrides):
+    return qr.CheckInRoster(
+        event=event or _event(),
+        timezone=None,
+        loaded_at=qr.time.monotonic(),
+        **overrides,
+    )
+
+
+def _user(user_id="member-1"):
+    return SimpleNamespace(id=user_id, organization_id="org-1", username=user_id)
+
+
+def _result(scalar=None, rows=None, scalars=None):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = scalar
+    result.all.return_value = rows or []
+    result.scalars.return_value.all.return_value = scalars or []
+    return result
+
+
+@pytest.fixture
+def simulated_db():
+    database = SimulatedDatabase(latency=0.001, pool_size=10)
+    with patch.object(database_module, "async_session_factory", database.session):
+        yield database
+
+
+@pytest.fixture
+async def writer(simulated_db):
+    writer = qr.CheckInWriter()
+    await writer.start()
+    yield writer
+    await writer.stop()
+
+
+class TestRoster:
+    async def test_phase_warnings_for_every_enrolled_member(self):
+        phase_1 = ProgramPhase(id="p1", phase_number=1, name="Recruit")
+        phase_2 = ProgramPhase(id="p2", phase_number=2, name="Probationary")
+        session = TrainingSession(
+            id="s1",
+            event_id="event-1",
+            program_id="prog-1",
+            phase_id="p2",
+            course_name="Hose drill",
+            auto_create_records=True,
+        )
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                _result(scalar=_event()),
+                _result(scalar=session),
+                _result(rows=[("behind", "p1"), ("level", "p2"), ("new", None)]),
+                _result(scalars=[phase_1, phase_2]),
+            ]
+        )
+
+        with patch.object(
+            qr.org_settings_cache,
+            "get",
+            AsyncMock(return_value=SimpleNamespace(timezone="America/Chicago")),
+        ):
+            roster = await qr.load_roster(db, "event-1", "org-1")
+
+        assert set(roster.phase_warnings) == {"behind", "new"}
+        assert "currently in Phase 1 (Recruit)" in roster.phase_warnings["behind"]
+        assert "an earlier phase" in roster.phase_warnings["new"]
+        assert roster.timezone == "America/Chicago"
+        # Cached rows are copies no session will ever refresh or expire.
+        assert inspect(roster.event).transient
+        assert roster.training_session.course_name == "Hose drill"
+        assert inspect(roster.training_session).transient
+
+    async def test_unknown_event_has_no_roster(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result(scalar=None))
+
+        assert await qr.load_roster(db, "missing", "org-1") is None
+
+
+class TestRosterCache:
+    async def test_scans_arriving_together_load_the_roster_once(self):
+        loads = 0
+
+        async def load(db, event_id, organization_id):
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.01)
+            return _roster()
+
+        cache = qr.RosterCache()
+        with patch.object(qr, "load_roster", load):
+            rosters = await asyncio.gather(
+                *(cache.get(None, "event-1", "org-1") for _ in range(20))
+            )
+            assert loads == 1
+            assert all(r is rosters[0] for r in rosters)
+
+            with patch.object(qr, "ROSTER_TTL_SECONDS", 0):
+                await cache.get(None, "event-1", "org-1")
+            assert loads == 2
+
+    async def test_a_failed_load_reaches_every_waiter_and_is_retried(self):
+        load = AsyncMock(side_effect=[ConnectionError("db down"), _roster()])
+
+        async def slow_load(db, event_id, organization_id):
+            await asyncio.sleep(0.01)
+            return await load(db, event_id, organization_id)
+
+        cache = qr.RosterCache()
+        with patch.object(qr, "load_roster", slow_load):
+            results = await asyncio.gather(
+                *(cache.get(None, "event-1", "org-1") for _ in range(3)),
+                return_exceptions=True,
+            )
+            assert all(isinstance(r, ConnectionError) for r in results)
+            assert await cache.get(None, "event-1", "org-1") is not None
+
+
+class TestGates:
+    async def _check_in(self, roster, user=None, override=False):
+        writer = MagicMock(submit=AsyncMock())
+        with patch.object(
+            qr.roster_cache, "get", AsyncMock(return_value=roster)
+        ), patch.object(qr, "check_in_writer", writer):
+            result = await qr.self_check_in(
+                MagicMock(), "event-1", user or _user(), override=override
+            )
+        return result, writer.submit
+
+    async def test_cancelled_event(self):
+        (_, error, _), submit = await self._check_in(_roster(_event(is_cancelled=True)))
+        assert error == "Event has been cancelled"
+        submit.assert_not_awaited()
+
+    async def test_phase_gate_unless_overridden(self):
+        roster = _roster(phase_warnings={"member-1": "Ahead of your phase."})
+
+        (_, error, _), submit = await self._check_in(roster)
+        assert error == PHASE_GATE_PREFIX + "Ahead of your phase."
+        submit.assert_not_awaited()
+
+        submit_result = (MagicMock(), False)
+        writer = MagicMock(submit=AsyncMock(return_value=submit_result))
+        with patch.object(
+            qr.roster_cache, "get", AsyncMock(return_value=roster)
+        ), patch.object(qr, "check_in_writer", writer):
+            _, error, _ = await qr.self_check_in(
+                MagicMock(), "event-1", _user(), override=True
+            )
+        assert error is None
+
+    async def test_closed_window(self):
+        event = _event(
+            start_datetime=NOW - timedelta(hours=3),
+            end_datetime=NOW - timedelta(hours=2),
+        )
+        (_, error, _), submit = await self._check_in(_roster(event))
+        assert error.startswith("Check-in")
+        submit.assert_not_awaited()
+
+
+class TestCheckInWriter:
+    async def test_burst_is_written_in_few_transactions(self, writer, simulated_db):
+        roster = _roster()
+
+        results = await asyncio.gather(
+            *(writer.submit(roster, f"member-{i}", f"m{i}") for i in range(60))
+        )
+
+        assert [already for _, already in results] == [False] * 60
+        assert all(rsvp.checked_in for rsvp, _ in results)
+        assert len(simulated_db.rsvps) == 60
+        assert simulated_db.transactions < 30
+        # One audit entry per check-in, chained in order.
+        rows = simulated_db.audit_rows
+        assert sorted(row["user_id"] for row in rows) == sorted(
+            f"member-{i}" for i in range(60)
+        )
+        for previous, row in zip(rows, rows[1:]):
+            assert row["previous_hash"] == previous["current_hash"]
+
+    async def test_repeat_scans_are_already_checked_in(self, writer, simulated_db):
+        roster = _roster()
+
+        first, repeat = await asyncio.gather(
+            writer.submit(roster, "member-1", "m1"),
+            writer.submit(roster, "member-1", "m1"),
+        )
+        later = await writer.submit(roster, "member-1", "m1")
+
+        assert (first[1], repeat[1], later[1]) == (False, True, True)
+        assert len(simulated_db.audit_rows) == 1
+
+    async def test_upsert_keeps_an_earlier_check_in_time(self):
+        db = MagicMock(execute=AsyncMock())
+        scan = qr._Scan(_roster(), "member-1", "m1", NOW, None)
+
+        await qr.CheckInWriter._upsert(db, scan.roster, [scan])
+
+        sql = str(db.execute.await_args.args[0].compile(dialect=mysql.dialect()))
+        update = sql.split("ON DUPLICATE KEY UPDATE")[1]
+        assert update.strip().startswith(
+            "checked_in_at = if(event_rsvps.checked_in, event_rsvps.checked_in_at"
+        )
+        assert update.index("checked_in_at") < update.index("checked_in = ")
+
+    async def test_failed_batch_falls_back_to_the_regular_path(self):
+        rsvp = MagicMock()
+        writer = MagicMock(submit=AsyncMock(side_effect=ConnectionError("lost")))
+        regular = AsyncMock(return_value=(rsvp, None, None))
+        audit = AsyncMock()
+
+        with patch.object(
+            qr.roster_cache, "get", AsyncMock(return_value=_roster())
+        ), patch.object(qr, "check_in_writer", writer), patch.object(
+            qr.EventService, "self_check_in", regular
+        ), patch.object(
+            qr, "log_audit_event", audit
+        ):
+            result = await qr.self_check_in(MagicMock(), "event-1", _user())
+
+        assert result == (rsvp, None, None)
+        regular.assert_awaited_once()
+        assert audit.await_args.kwargs["event_type"] == "event_checkin"
+
+
+async def test_burst_latency_stays_bounded():
+    latencies, database = await run_fast_path(
+        members=100, rate=200.0, latency=0.001, pool_size=10
+    )
+
+    assert len(database.rsvps) == 100
+    assert database.transactions < 200
+    assert percentile(latencies, 99) < 1.0
@@ -0,0 +1,154 @@
+"""
+Tests for the request-scoped query profiler (app/core/query_profiler.py) and
+the query budget plugin (tests/query_budget.py).
+
+Covers statement shapes that ignore IN-list and VALUES lengths, charging
+queries to the active profile only, N+1 detection, the middleware's
+per-route aggregates and response headers, and budget checks. Queries run on
+an in-memory SQLite engine; no MySQL.
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core import query_profiler as profiler_module
+from app.core.query_profiler import (
+    QueryProfile,
+    QueryProfiler,
+    QueryProfilerMiddleware,
+    install_query_profiler,
+    statement_shape,
+)
+from tests.query_budget import budget_violations
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    install_query_profiler(engine)
+    yield engine
+    engine.dispose()
+
+
+def _select_one(engine, times=1):
+    with engine.connect() as conn:
+        for _ in range(times):
+            conn.execute(text("SELECT 1"))
+
+
+class TestStatementShape:
+    def test_in_list_length_is_ignored(self):
+        assert statement_shape(
+            "SELECT * FROM users WHERE id IN (%s, %s)"
+        ) == statement_shape("SELECT *\n  FROM users WHERE id IN (%s,%s,%s)")
+
+    def test_multi_row_values_collapse(self):
+        assert statement_shape(
+            "INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)"
+        ) == statement_shape("INSERT INTO t (a, b) VALUES (%s, %s)")
+
+
+class TestProfile:
+    def test_only_queries_inside_a_profile_are_charged(self, engine):
+        profiler = QueryProfiler()
+
+        _select_one(engine)
+        with profiler.profile("block") as profile:
+            _select_one(engine, times=3)
+        _select_one(engine)
+
+        assert profile.count == 3
+        assert profile.seconds > 0
+
+    def test_repeated_selects_are_n_plus_one(self):
+        profile = QueryProfile("GET /x")
+        for _ in range(5):
+            profile.record("SELECT * FROM users WHERE id = %s", 0.001)
+        for _ in range(5):
+            profile.record("UPDATE users SET x = %s WHERE id = %s", 0.001)
+
+        assert profile.n_plus_one(threshold=5) == {
+            "SELECT * FROM users WHERE id = %s": 5
+        }
+        assert profile.n_plus_one(threshold=6) == {}
+
+
+class TestMiddleware:
+    def _client(self, engine):
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        def item(item_id: int):
+            _select_one(engine, times=item_id)
+            return {}
+
+        wrapped = QueryProfilerMiddleware(app)
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=wrapped), base_url="http://test"
+        )
+
+    async def test_requests_fold_into_route_aggregates(self, engine, monkeypatch):
+        profiler = QueryProfiler()
+        profiler.enabled = True
+        monkeypatch.setattr(profiler_module, "query_profiler", profiler)
+
+        async with self._client(engine) as client:
+            response = await client.get("/items/6")
+            await client.get("/items/2")
+
+        assert response.headers["x-db-query-count"] == "6"
+        assert response.headers["x-db-n-plus-one"] == "1"
+        (route,) = profiler.snapshot()["routes"]
+        assert route["route"] == "GET /items/{item_id}"
+        assert route["requests"] == 2
+        assert route["max_queries"] == 6
+        assert route["n_plus_one_requests"] == 1
+        assert route["n_plus_one_suspects"] == [
+            {"statement": "SELECT 1", "max_repeats": 6}
+        ]
+
+    async def test_disabled_profiler_adds_nothing(self, engine, monkeypatch):
+        profiler = QueryProfiler()
+        profiler.enabled = False
+        monkeypatch.setattr(profiler_module, "query_profiler", profiler)
+
+        async with self._client(engine) as client:
+            response = await client.get("/items/1")
+
+        assert "x-db-query-count" not in response.headers
+        assert profiler.snapshot()["routes"] == []
+
+
+class TestQueryBudget:
+    def _profile(self, label, count):
+        profile = QueryProfile(label)
+        for _ in range(count):
+            profile.record("SELECT 1", 0.0)
+        return profile
+
+    def test_each_request_is_held_to_its_route_budget(self):
+        captured = [
+            self._profile("<block>", 0),
+            self._profile("GET /users", 5),
+            self._profile("GET /roles", 9),
+        ]
+
+        violations = budget_violations({"GET /users": 4, "*": 10}, captured)
+
+        assert len(violations) == 1
+        assert violations[0].startswith("GET /users: 5 queries > budget 4")
+
+    def test_test_body_is_checked_when_no_request_was_made(self):
+        assert budget_violations(2, [self._profile("<block>", 3)])
+        assert not budget_violations(3, [self._profile("<block>", 3)])
+
+    @pytest.mark.query_budget(2)
+    def test_marker_counts_the_test_body(self, engine):
+        _select_one(engine, times=2)
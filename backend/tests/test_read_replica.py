@@ -0,0 +1,161 @@
+"""
+Tests for read-replica routing in app/core/database.py.
+
+Covers read sessions going to the replica only while its lag is within
+DB_REPLICA_MAX_LAG_SECONDS, falling back to the primary when it lags, has
+stopped replicating, cannot be checked or drops a connection, rate-limiting
+the lag check, reading the lag from MySQL, and never committing (and
+marking read-only) a read session. Engines and sessions are stand-ins; no MySQL.
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from app.core import database as database_module
+from app.core.database import DatabaseManager
+
+
+def _factory(name):
+    sessions = []
+
+    @asynccontextmanager
+    async def factory():
+        session = MagicMock(name=name, rollback=AsyncMock(), close=AsyncMock())
+        session.commit = AsyncMock()
+        session.info = {}
+        sessions.append(session)
+        yield session
+
+    factory.sessions = sessions
+    return factory
+
+
+def _engine(dialect="sqlite"):
+    conn = SimpleNamespace(dialect=SimpleNamespace(name=dialect))
+
+    @asynccontextmanager
+    async def connect():
+        yield conn
+
+    return SimpleNamespace(connect=connect)
+
+
+def _manager(lag=0.0):
+    manager = DatabaseManager()
+    manager.session_factory = _factory("primary")
+    manager.read_session_factory = _factory("replica")
+    manager.read_engine = _engine()
+    lag_check = AsyncMock(return_value=lag)
+    manager._replica_lag = lag_check
+    return manager, lag_check
+
+
+async def _read(manager):
+    """Open and close one read session, as a request would."""
+    sessions = manager.get_read_session()
+    session = await sessions.__anext__()
+    await sessions.aclose()
+    return session
+
+
+class TestRouting:
+    async def test_without_a_replica_reads_use_the_primary(self):
+        manager, _ = _manager()
+        manager.read_engine = manager.read_session_factory = None
+
+        session = await _read(manager)
+
+        assert session in manager.session_factory.sessions
+
+    async def test_fresh_replica_serves_reads(self):
+        manager, _ = _manager(lag=1.0)
+
+        session = await _read(manager)
+
+        assert session in manager.read_session_factory.sessions
+
+    @pytest.mark.parametrize("lag", [30.0, None])
+    async def test_lagging_or_stopped_replica_falls_back(self, lag):
+        manager, _ = _manager(lag=lag)
+
+        session = await _read(manager)
+
+        assert session in manager.session_factory.sessions
+
+    async def test_failed_check_falls_back(self):
+        manager, lag_check = _manager()
+        lag_check.side_effect = OSError("connection refused")
+
+        session = await _read(manager)
+
+        assert session in manager.session_factory.sessions
+
+    async def test_lag_is_checked_once_per_interval(self):
+        manager, lag_check = _manager()
+
+        await _read(manager)
+        await _read(manager)
+        manager._replica_checked_until = 0.0
+        await _read(manager)
+
+        assert lag_check.await_count == 2
+
+    async def test_dropped_replica_connection_routes_to_primary(self):
+        manager, _ = _manager()
+        error = OperationalError("SELECT 1", {}, Exception("Lost connection"))
+
+        sessions = manager.get_read_session()
+        await sessions.__anext__()
+        with pytest.raises(OperationalError):
+            await sessions.athrow(error)
+
+        assert await _read(manager) in manager.session_factory.sessions
+
+    async def test_read_sessions_are_never_committed(self):
+        manager, _ = _manager()
+
+        session = await _read(manager)
+
+        session.commit.assert_not_awaited()
+        session.rollback.assert_awaited_once()
+
+    @pytest.mark.parametrize("replica", [True, False])
+    async def test_read_sessions_are_marked_read_only(self, replica):
+        manager, _ = _manager(lag=0.0 if replica else None)
+
+        session = await _read(manager)
+
+        assert session.info["read_only"] is True
+
+
+class TestReplicaLag:
+    async def test_mysql_lag_is_read_from_replica_status(self):
+        def result(row):
+            return MagicMock(
+                mappings=MagicMock(
+                    return_value=MagicMock(first=MagicMock(return_value=row))
+                )
+            )
+
+        conn = SimpleNamespace(
+            dialect=SimpleNamespace(name="mysql"),
+            execute=AsyncMock(
+                side_effect=[
+                    ProgrammingError("SHOW REPLICA STATUS", {}, Exception("syntax")),
+                    result({"Seconds_Behind_Master": 12}),
+                ]
+            ),
+        )
+
+        assert await DatabaseManager()._replica_lag(conn) == 12.0
+
+    def test_replica_url_only_when_configured(self):
+        settings = database_module.settings
+        with patch.object(settings, "DB_REPLICA_HOST", ""):
+            assert settings.DATABASE_REPLICA_URL is None
+        with patch.object(settings, "DB_REPLICA_HOST", "replica"):
+            assert "@replica:" in settings.DATABASE_REPLICA_URL
@@ -0,0 +1,197 @@
+"""Unit tests for the Redis check primitives (no Redis server).
+
+A recording pipeline stands in for redis-py's: it checks that every check
+made together goes out in one pipeline as EVALSHA, that a NOSCRIPT reply
+re-runs just those checks with EVAL, and that the rate-limit, daily-cap and
+webhook-replay helpers each cost a single round trip. The in-process token
+bucket is checked for shedding, refill and its key bound.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import NoScriptError, ResponseError
+
+from app.core import redis_primitives
+from app.core.cache import cache_manager
+from app.core.redis_primitives import (
+    FixedWindowCounter,
+    LocalTokenBucket,
+    ReplayNonce,
+    SlidingWindow,
+    run_checks,
+)
+from app.core.security import is_rate_limited
+from app.core.security_middleware import daily_cap_exceeded
+from app.utils.webhook_replay import is_duplicate_webhook
+
+pytestmark = pytest.mark.unit
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def evalsha(self, sha, numkeys, key, *args):
+        self.commands.append(("evalsha", sha, key, args))
+
+    def eval(self, source, numkeys, key, *args):
+        self.commands.append(("eval", source, key, args))
+
+    async def execute(self, raise_on_error=True):
+        self.redis.round_trips.append(self.commands)
+        return [self.redis.reply(*command) for command in self.commands]
+
+
+class _Redis:
+    """Replies from ``replies`` (keyed by Redis key) after ``loaded`` holds
+    the script; every pipeline execution is one round trip."""
+
+    def __init__(self, replies, loaded=True):
+        self.replies = replies
+        self.loaded = loaded
+        self.round_trips = []
+        self.transactions = []
+
+    def pipeline(self, transaction=True):
+        self.transactions.append(transaction)
+        return _Pipeline(self)
+
+    def reply(self, kind, script, key, args):
+        if kind == "evalsha" and not self.loaded:
+            return NoScriptError("NOSCRIPT No matching script.")
+        return self.replies[key]
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    def install(replies, loaded=True):
+        client = _Redis(replies, loaded)
+        monkeypatch.setattr(cache_manager, "redis_client", client)
+        monkeypatch.setattr(cache_manager, "_connected", True)
+        return client
+
+    return install
+
+
+class TestRunChecks:
+    async def test_checks_share_one_pipeline(self):
+        client = _Redis({"a": 3, "b": 7, "c": 0})
+        checks = [
+            SlidingWindow("a", limit=5, window_seconds=60),
+            FixedWindowCounter("b", limit=5, ttl_seconds=86400),
+            ReplayNonce("c", ttl_seconds=600),
+        ]
+
+        results = await run_checks(client, checks)
+
+        assert results == [3, 7, 0]
+        assert [check.denies(r) for check, r in zip(checks, results)] == [
+            False,
+            True,
+            False,
+        ]
+        (commands,) = client.round_trips
+        assert [(kind, sha) for kind, sha, _, _ in commands] == [
+            ("evalsha", check.script.sha) for check in checks
+        ]
+        assert client.transactions == [False]
+
+    async def test_noscript_reruns_only_those_checks_with_eval(self):
+        client = _Redis({"a": 1, "b": 2}, loaded=False)
+
+        results = await run_checks(
+            client,
+            [FixedWindowCounter("a", 5, 60), FixedWindowCounter("b", 5, 60)],
+        )
+
+        assert results == [1, 2]
+        first, retry = client.round_trips
+        assert [kind for kind, *_ in retry] == ["eval", "eval"]
+        assert retry[0][1] == FixedWindowCounter.script.source
+
+    async def test_redis_errors_are_raised(self):
+        client = _Redis({"a": ResponseError("WRONGTYPE")})
+
+        with pytest.raises(ResponseError):
+            await run_checks(client, [SlidingWindow("a", 5, 60)])
+
+    def test_sliding_window_members_are_unique(self):
+        check = SlidingWindow("a", 5, 60)
+
+        assert check.args(1.5)[2] != check.args(1.5)[2]
+
+
+class TestHelpers:
+    async def test_daily_cap_is_one_round_trip(self, redis):
+        client = redis({"daily_cap:pub_form:x:" + _today(): 11})
+
+        assert await daily_cap_exceeded("pub_form:x", 10) is True
+        (commands,) = client.round_trips
+        assert commands[0][3] == (93600,)
+
+    async def test_webhook_replay(self, redis):
+        client = redis({})
+        client.reply = lambda kind, script, key, args: int(key in seen)
+        seen = set()
+
+        assert await is_duplicate_webhook("sf:1", b"{}") is False
+        seen.add(client.round_trips[0][0][2])
+        assert await is_duplicate_webhook("sf:1", b"{}") is True
+
+    async def test_rate_limit_counts_before_this_request(self, redis):
+        redis({"rate_limit:login:ip": 4})
+
+        assert await is_rate_limited("login:ip", limit=5, window_seconds=60) is False
+        redis({"rate_limit:login:ip": 5})
+        assert await is_rate_limited("login:ip", limit=5, window_seconds=60) is True
+
+    async def test_flood_is_shed_before_redis(self, redis, monkeypatch):
+        monkeypatch.setattr(redis_primitives, "local_token_bucket", LocalTokenBucket())
+        monkeypatch.setattr(
+            "app.core.security.settings.RATE_LIMIT_LOCAL_BURST_FACTOR", 2.0
+        )
+        client = redis({"rate_limit:flood": 99})
+
+        results = [
+            await is_rate_limited("flood", limit=5, window_seconds=60)
+            for _ in range(15)
+        ]
+
+        assert all(results)
+        assert len(client.round_trips) == 10  # then the bucket is empty
+
+
+def _today():
+    return datetime.now(timezone.utc).strftime("%Y%m%d")
+
+
+class TestLocalTokenBucket:
+    def test_refills_at_the_limit_rate(self):
+        bucket = LocalTokenBucket()
+
+        with patch.object(redis_primitives.time, "monotonic") as monotonic:
+            monotonic.return_value = 100.0
+            assert all(bucket.allow("k", 3, 60, 1.0) for _ in range(3))
+            assert bucket.allow("k", 3, 60, 1.0) is False
+            monotonic.return_value = 120.0  # one token back
+            assert bucket.allow("k", 3, 60, 1.0) is True
+            assert bucket.allow("k", 3, 60, 1.0) is False
+
+    def test_zero_factor_disables(self):
+        bucket = LocalTokenBucket()
+
+        assert all(bucket.allow("k", 1, 60, 0) for _ in range(100))
+
+    def test_key_count_is_bounded(self, monkeypatch):
+        bucket = LocalTokenBucket()
+        monkeypatch.setattr(LocalTokenBucket, "_MAX_KEYS", 10)
+
+        for i in range(25):
+            bucket.allow(f"ip-{i}", 5, 60, 2.0)
+
+        assert len(bucket._buckets) == 10
+        assert "ip-24" in bucket._buckets
+        assert "ip-0" not in bucket._buckets
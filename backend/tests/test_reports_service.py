@@ -4,12 +4,21 @@ Tests for the Reports Service
 Unit tests for report generation logic.
 """
 
+from contextlib import asynccontextmanager
 from datetime import date
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
-
+from sqlalchemy.sql.dml import Insert
+
+from app.core.database import DatabaseManager
+from app.services import compliance_status_service as status_module
+from app.services.compliance_status_service import (
+    ComplianceStatusService,
+    RequirementStatus,
+)
 from app.services.reports_service import ReportsService
 
 
@@ -17,6 +26,7 @@ from app.services.reports_service import ReportsService
 def mock_db_session():
     """Create a mock async session for reports tests."""
     session = AsyncMock()
+    session.info = {}
     return session
 
 
@@ -229,18 +239,13 @@ class TestComplianceStatusReport:
         mock_result = MagicMock()
         mock_result.scalars.return_value.all.return_value = []
 
-        mock_unique_result = MagicMock()
-        mock_unique_result.scalars.return_value.unique.return_value.all.return_value = (
-            []
-        )
-
         # rank_map query returns iterable of rows
         mock_rank_result = MagicMock()
         mock_rank_result.__iter__ = MagicMock(return_value=iter([]))
 
-        # Call order: requirements, users, rank_map, enrollments
+        # Call order: requirements, users, rank_map (no statuses to read)
         service.db.execute = AsyncMock(
-            side_effect=[mock_result, mock_result, mock_rank_result, mock_unique_result]
+            side_effect=[mock_result, mock_result, mock_rank_result]
         )
 
         result = await service._generate_compliance_status(org_id)
@@ -248,3 +253,109 @@ class TestComplianceStatusReport:
         assert result["report_type"] == "compliance_status"
         assert result["total_members"] == 0
         assert result["fully_compliant_count"] == 0
+
+    async def test_reads_persisted_statuses(self, service, org_id):
+        reqs = [
+            SimpleNamespace(id="r1", name="Pump Ops"),
+            SimpleNamespace(id="r2", name="HazMat"),
+        ]
+        users = [
+            SimpleNamespace(
+                id="u1", first_name="Ada", last_name="Ng", username="ada", rank=None
+            ),
+            SimpleNamespace(
+                id="u2", first_name="Bo", last_name="Li", username="bo", rank=None
+            ),
+        ]
+        mock_rank_result = MagicMock()
+        mock_rank_result.__iter__ = MagicMock(return_value=iter([]))
+        service.db.execute = AsyncMock(
+            side_effect=[_scalars_all(reqs), _scalars_all(users), mock_rank_result]
+        )
+        statuses = {
+            "u1": {
+                "r1": RequirementStatus("completed"),
+                "r2": RequirementStatus("completed"),
+            },
+            "u2": {
+                "r1": RequirementStatus("expired"),
+                "r2": RequirementStatus("completed"),
+            },
+        }
+
+        with patch.object(
+            ComplianceStatusService,
+            "get_statuses",
+            AsyncMock(return_value=statuses),
+        ) as get_statuses:
+            result = await service._generate_compliance_status(org_id)
+
+        get_statuses.assert_awaited_once_with(org_id, ["u1", "u2"], reqs)
+        assert result["fully_compliant_count"] == 1
+        assert result["partially_compliant_count"] == 1
+        assert result["entries"][0]["member_id"] == "u2"
+        assert result["entries"][0]["overdue_items"] == ["Pump Ops"]
+        assert result["overall_compliance_rate"] == 75.0
+
+    async def test_read_session_evaluates_without_writing(self, org_id):
+        """The /generate route runs on get_read_db: a replica must not be
+        written to, and a primary read session is rolled back anyway."""
+        req = SimpleNamespace(
+            id="r1",
+            name="Pump Ops",
+            requirement_type=SimpleNamespace(value="hours"),
+            training_type=None,
+            frequency=SimpleNamespace(value="annual"),
+            year=None,
+            due_date_type=None,
+            rolling_period_months=None,
+            required_hours=10.0,
+            category_ids=None,
+            include_current_month=None,
+            period_start_month=None,
+            period_start_day=None,
+            period_end_month=None,
+            period_end_day=None,
+            recency_months=None,
+        )
+        user = SimpleNamespace(
+            id="u1", first_name="Ada", last_name="Ng", username="ada", rank=None
+        )
+        mock_rank_result = MagicMock()
+        mock_rank_result.__iter__ = MagicMock(return_value=iter([]))
+        no_rows = MagicMock(all=MagicMock(return_value=[]))
+        session = MagicMock(info={}, rollback=AsyncMock(), close=AsyncMock())
+        session.execute = AsyncMock(
+            side_effect=[
+                _scalars_all([req]),  # requirements
+                _scalars_all([user]),  # members
+                mock_rank_result,
+                no_rows,  # generations
+                no_rows,  # persisted statuses
+                _scalars_all([]),  # training records
+            ]
+        )
+
+        @asynccontextmanager
+        async def factory():
+            yield session
+
+        manager = DatabaseManager()
+        manager.session_factory = factory
+        sessions = manager.get_read_session()
+        db = await sessions.__anext__()
+        with patch.object(
+            status_module, "fetch_user_waivers", AsyncMock(return_value=[])
+        ), patch.object(
+            status_module,
+            "get_org_include_current_month",
+            AsyncMock(return_value=True),
+        ):
+            result = await ReportsService(db)._generate_compliance_status(org_id)
+        await sessions.aclose()
+
+        assert result["non_compliant_count"] == 1
+        assert result["entries"][0]["overdue_items"] == ["Pump Ops"]
+        assert not any(
+            isinstance(call.args[0], Insert) for call in session.execute.await_args_list
+        )
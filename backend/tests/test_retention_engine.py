@@ -0,0 +1,223 @@
+"""
+Retention enforcement engine (app/services/retention_service.py) without a
+database.
+
+Covers planning one sweep per (record class, organization) with floors
+applied, the keyset batch query on the timestamp index, sweeping classes
+concurrently on their own sessions within the concurrency limit, the shared
+rows-per-second budget, per-class deletion rates, and resuming an
+interrupted run from its checkpoint. The DB-backed behaviour (which rows
+are deleted) is covered by test_retention_service.py.
+"""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import mysql
+
+from app.models.email_template import MessageHistory
+from app.models.user import Organization
+from app.services import retention_service as retention
+from app.services.retention_service import (
+    RetentionService,
+    _RowBudget,
+    _Sweep,
+)
+
+
+def _org(org_id, retention_config=None):
+    org = Organization(id=org_id, name=org_id, slug=org_id)
+    org.settings = {"retention": retention_config or {}}
+    return org
+
+
+def _service(orgs):
+    db = MagicMock()
+    db.execute = AsyncMock(
+        return_value=MagicMock(
+            scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=orgs)))
+        )
+    )
+    return RetentionService(db)
+
+
+class _Cache:
+    """Stand-in for cache_manager's get/set/delete."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.store[key] = value
+        return True
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+        return True
+
+
+@pytest.fixture
+def cache():
+    fake = _Cache()
+    with patch.multiple(
+        retention.cache_manager, get=fake.get, set=fake.set, delete=fake.delete
+    ), patch.object(retention, "_CHECKPOINT_INTERVAL_SECONDS", 0):
+        yield fake
+
+
+def _sessions():
+    """A session factory whose sessions are recorded in creation order."""
+    made = []
+
+    def factory():
+        db = MagicMock(commit=AsyncMock(), flush=AsyncMock())
+        made.append(db)
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=db)
+        session.__aexit__ = AsyncMock(return_value=False)
+        return session
+
+    return factory, made
+
+
+class TestPlan:
+    def test_one_sweep_per_class_and_org_with_floors(self):
+        now = datetime(2026, 10, 1, tzinfo=UTC)
+        orgs = [_org("a", {"message_history": 1}), _org("b", {"error_logs": None})]
+
+        with patch.object(retention.settings, "RETENTION_BLOCKED_ATTEMPTS_DAYS", 7):
+            plan = RetentionService(MagicMock())._plan(orgs, None, now)
+
+        assert [s.key for s in plan["message_history"]] == [
+            "a:message_history",
+            "b:message_history",
+        ]
+        # 1 day is floored to the class minimum of 30.
+        assert plan["message_history"][0].cutoff == now - timedelta(days=30)
+        assert [s.key for s in plan["error_logs"]] == ["a:error_logs"]
+        assert "notification_logs" not in plan  # keep-forever default
+        (platform,) = plan["blocked_access_attempts"]
+        assert platform.cutoff == now - timedelta(days=30)
+
+    async def test_batch_walks_the_timestamp_index_from_the_watermark(self):
+        cutoff = datetime(2026, 1, 1, tzinfo=UTC)
+        watermark = datetime(2025, 6, 1)
+        ts = datetime(2025, 7, 1)
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[MagicMock(all=MagicMock(return_value=[("x", ts)])), None]
+        )
+        sweep = _Sweep("o:m", MessageHistory, "sent_at", cutoff, "o")
+
+        count, new_watermark = await RetentionService._delete_batch(
+            db, sweep, watermark
+        )
+
+        select_sql = str(
+            db.execute.await_args_list[0].args[0].compile(dialect=mysql.dialect())
+        )
+        assert "message_history.sent_at >= " in select_sql
+        assert "ORDER BY message_history.sent_at" in select_sql
+        assert (count, new_watermark) == (1, ts)
+
+
+class TestConcurrentEnforcement:
+    async def test_classes_run_concurrently_on_their_own_sessions(self, cache):
+        orgs = [_org("a", {"notification_logs": 365}), _org("b")]
+        running, peak, calls = 0, 0, {}
+
+        async def fake_batch(db, sweep, watermark):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            calls[sweep.key] = calls.get(sweep.key, 0) + 1
+            full = sweep.key == "a:message_history" and calls[sweep.key] < 3
+            count = retention._DELETE_BATCH_SIZE if full else 5
+            return count, datetime(2025, 1, calls[sweep.key])
+
+        factory, sessions = _sessions()
+        with patch.object(
+            RetentionService, "_delete_batch", staticmethod(fake_batch)
+        ), patch.object(retention.settings, "RETENTION_BLOCKED_ATTEMPTS_DAYS", 0):
+            result = await _service(orgs).enforce(
+                session_factory=factory, concurrency=2
+            )
+
+        assert peak == 2
+        assert len(sessions) == len(result["classes"])
+        assert calls["a:message_history"] == 3
+        assert result["deleted"]["a:message_history"] == 2 * 1000 + 5
+        stats = result["classes"]["message_history"]
+        assert stats["deleted"] == 2010
+        assert stats["rows_per_second"] > 0
+        assert sum(s.commit.await_count for s in sessions) == sum(calls.values())
+        assert cache.store == {}
+
+    async def test_interrupted_run_resumes_from_its_checkpoint(self, cache):
+        orgs = [_org("a"), _org("b")]
+        seen = []
+
+        async def failing_batch(db, sweep, watermark):
+            seen.append((sweep.key, watermark))
+            if len(seen) == 1:
+                return retention._DELETE_BATCH_SIZE, datetime(2025, 3, 1)
+            raise ConnectionError("lost connection")
+
+        factory, _ = _sessions()
+        with patch.object(
+            RetentionService, "_delete_batch", staticmethod(failing_batch)
+        ):
+            with pytest.raises(ConnectionError):
+                await _service(orgs).enforce(
+                    only_class="message_history", session_factory=factory
+                )
+        (state,) = cache.store.values()
+        assert state["watermarks"] == {"a:message_history": "2025-03-01T00:00:00"}
+
+        seen.clear()
+
+        async def finishing_batch(db, sweep, watermark):
+            seen.append((sweep.key, watermark))
+            return 3, watermark
+
+        with patch.object(
+            RetentionService, "_delete_batch", staticmethod(finishing_batch)
+        ):
+            result = await _service(orgs).enforce(
+                only_class="message_history", session_factory=factory
+            )
+
+        assert result["resumed"] is True
+        assert seen[0] == ("a:message_history", datetime(2025, 3, 1))
+        assert cache.store == {}
+
+
+class TestRowBudget:
+    async def test_deletes_are_paced_across_workers(self):
+        budget = _RowBudget(1000)
+        delays = []
+
+        async def sleep(seconds):
+            delays.append(round(seconds, 2))
+
+        with patch.object(retention.asyncio, "sleep", sleep), patch.object(
+            retention.time, "monotonic", return_value=100.0
+        ):
+            await budget.spend(500)
+            await budget.spend(500)
+            await budget.spend(1000)
+
+        assert delays == [0.5, 1.0]
+
+    async def test_zero_is_unbounded(self):
+        with patch.object(retention.asyncio, "sleep") as sleep:
+            await _RowBudget(0).spend(10**6)
+
+        sleep.assert_not_called()
@@ -0,0 +1,186 @@
+"""
+Tests for the startup schema fingerprint (app/core/schema_fingerprint.py) and
+the fast path it gives ``run_migrations`` in main.py.
+
+Covers a fingerprint that is stable across processes but moves with any DDL
+or head change, skipping reflection and repair when the stored fingerprint
+matches, electing one worker to verify a mismatched schema while the others
+wait for its fingerprint, and per-phase timings on the startup status. The
+engine is mocked; no MySQL.
+"""
+
+import json
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.exc import ProgrammingError
+
+import app.models  # noqa: F401 - populates Base.metadata
+import main
+from app.core.database import Base
+from app.core.schema_fingerprint import (
+    compute_schema_fingerprint,
+    describe_metadata,
+    read_schema_fingerprint,
+)
+
+
+def _table(*columns):
+    metadata = MetaData()
+    Table("widgets", metadata, Column("id", Integer, primary_key=True), *columns)
+    return metadata
+
+
+class TestComputeSchemaFingerprint:
+    def test_description_has_no_object_addresses(self):
+        payload = json.dumps(describe_metadata(Base.metadata), default=str)
+
+        assert " at 0x" not in payload
+
+    def test_column_order_does_not_matter(self):
+        a = _table(Column("name", String(50)), Column("size", Integer))
+        b = _table(Column("size", Integer), Column("name", String(50)))
+
+        assert compute_schema_fingerprint(a, "h1") == compute_schema_fingerprint(
+            b, "h1"
+        )
+
+    def test_ddl_and_head_changes_move_the_fingerprint(self):
+        base = compute_schema_fingerprint(_table(Column("name", String(50))), "h1")
+
+        assert base != compute_schema_fingerprint(
+            _table(Column("name", String(80))), "h1"
+        )
+        assert base != compute_schema_fingerprint(
+            _table(Column("name", String(50), nullable=False)), "h1"
+        )
+        assert base != compute_schema_fingerprint(
+            _table(Column("name", String(50))), "h2"
+        )
+
+    def test_missing_table_reads_as_no_fingerprint(self):
+        conn = MagicMock()
+        conn.execute.side_effect = ProgrammingError("SELECT", {}, Exception("1146"))
+
+        assert read_schema_fingerprint(conn) is None
+
+
+def _engine(states):
+    """
+    Engine whose connections answer the alembic_version / fingerprint reads
+    from ``states`` (one (revision, fingerprint) pair per read) and whose
+    GET_LOCK answers come from the ``lock`` list on the returned engine.
+    """
+    engine = MagicMock()
+    engine.lock = []
+    reads = iter(states)
+
+    def execute(statement, params=None):
+        sql = str(statement)
+        result = MagicMock()
+        if "alembic_version" in sql:
+            state = next(reads)
+            engine.current = state
+            result.fetchone.return_value = (state[0],)
+        elif "schema_fingerprint" in sql:
+            result.scalar.return_value = engine.current[1]
+        elif "GET_LOCK" in sql:
+            result.scalar.return_value = engine.lock.pop(0)
+        return result
+
+    engine.connect.side_effect = lambda: _Conn(execute)
+    return engine
+
+
+class _Conn:
+    """Connection usable both as a context manager and a held lock handle."""
+
+    def __init__(self, execute):
+        self.execute = MagicMock(side_effect=execute)
+        self.close = MagicMock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+@contextmanager
+def _migrations(engine, head):
+    with (
+        patch("sqlalchemy.create_engine", return_value=engine),
+        patch.object(main, "_wait_for_mysql"),
+        patch.object(main, "_cleanup_duplicate_revisions"),
+        patch("alembic.script.ScriptDirectory.get_current_head", return_value=head),
+        patch.object(main, "_add_missing_model_columns") as repair,
+        patch.object(main, "validate_schema", return_value=(True, [])) as validate,
+        patch(
+            "app.core.schema_fingerprint.record_schema_fingerprint",
+            return_value=True,
+        ) as record,
+    ):
+        yield repair, validate, record
+
+
+def _expected(head):
+    return compute_schema_fingerprint(Base.metadata, head)
+
+
+class TestRunMigrationsFingerprint:
+    def test_matching_fingerprint_skips_reflection_and_the_lock(self):
+        engine = _engine([("head1", _expected("head1"))])
+
+        with _migrations(engine, "head1") as (repair, validate, record):
+            main.run_migrations()
+
+        repair.assert_not_called()
+        validate.assert_not_called()
+        record.assert_not_called()
+        assert engine.connect.call_count == 1
+
+    def test_elected_worker_verifies_and_records_at_head(self):
+        engine = _engine([("head1", None), ("head1", None)])
+        engine.lock = [1]
+
+        with _migrations(engine, "head1") as (repair, validate, record):
+            main.run_migrations()
+
+        repair.assert_called_once()
+        validate.assert_called_once()
+        record.assert_called_once_with(engine, "head1", _expected("head1"))
+
+    def test_waiting_worker_starts_once_the_fingerprint_appears(self):
+        engine = _engine(
+            [("head1", None), ("head1", None), ("head1", _expected("head1"))]
+        )
+        engine.lock = [0, 0]
+
+        with _migrations(engine, "head1") as (repair, validate, record):
+            main.run_migrations()
+
+        repair.assert_not_called()
+        record.assert_not_called()
+        assert engine.lock == []
+
+
+class TestStartupPhaseTimings:
+    def test_phases_and_steps_are_timed(self):
+        status = main.StartupStatus()
+
+        status.set_phase("database", "Connecting...")
+        status.set_phase("migrations", "Migrating...")
+        with status.timed("fingerprint"):
+            pass
+        status.set_phase("migrations", "Still migrating...")
+        status.set_ready()
+
+        timings = status.to_dict()["phase_timings"]
+        assert list(timings) == [
+            "initializing",
+            "database",
+            "migrations.fingerprint",
+            "migrations",
+        ]
+        assert all(seconds >= 0 for seconds in timings.values())
@@ -16,6 +16,7 @@ from unittest.mock import AsyncMock
 import pytest
 from sqlalchemy import select
 
+from app.core.storage import LocalStorageBackend
 from app.models.notification import NotificationChannel, NotificationLog
 from app.models.storefront import (
     StoreFulfillmentMethod,
@@ -1164,7 +1165,15 @@ class TestOrgIsolation:
 
 
 class TestProductImages:
-    async def test_stores_and_replaces_a_photo(self, db_session):
+    @pytest.fixture(autouse=True)
+    def storage(self, tmp_path, monkeypatch):
+        backend = LocalStorageBackend(str(tmp_path))
+        monkeypatch.setattr(
+            "app.services.storefront_service.get_storage", lambda: backend
+        )
+        return backend
+
+    async def test_stores_and_replaces_a_photo(self, db_session, storage):
         org = await _make_org(db_session)
         service = StorefrontService(db_session)
         product = await _make_product(db_session, org)
@@ -1173,14 +1182,17 @@ class TestProductImages:
             product.id, org.id, b"first-bytes", "image/webp", None
         )
         stored = await service.get_product_image(product.id, org.id)
-        assert stored.data == b"first-bytes"
+        first_key = stored.storage_key
+        assert await storage.read_bytes(first_key) == b"first-bytes"
         assert stored.byte_size == len(b"first-bytes")
 
         await service.set_product_image(
             product.id, org.id, b"second", "image/webp", None
         )
         replaced = await service.get_product_image(product.id, org.id)
-        assert replaced.data == b"second"
+        assert replaced.storage_key != first_key
+        assert await storage.read_bytes(replaced.storage_key) == b"second"
+        assert await storage.stat(first_key) is None
 
     async def test_photos_are_org_scoped(self, db_session):
         service = StorefrontService(db_session)
@@ -1209,7 +1221,9 @@ class TestProductImages:
         found = await service.products_with_images(org.id, [with_photo.id, without.id])
         assert found == {with_photo.id}
 
-    async def test_deleting_a_photo_falls_back_to_the_external_url(self, db_session):
+    async def test_deleting_a_photo_falls_back_to_the_external_url(
+        self, db_session, storage
+    ):
         org = await _make_org(db_session)
         service = StorefrontService(db_session)
         product = await _make_product(
@@ -1222,12 +1236,65 @@ class TestProductImages:
             f"/api/v1/store/products/{product.id}/image"
         )
 
+        key = (await service.get_product_image(product.id, org.id)).storage_key
         await service.delete_product_image(product.id, org.id)
         assert await service.get_product_image(product.id, org.id) is None
+        assert await storage.stat(key) is None
         assert (
             service.resolve_image_url(product, False) == "https://example.org/shirt.png"
         )
 
+    async def test_renditions_are_stored_beside_the_photo_and_removed_with_it(
+        self, db_session, storage
+    ):
+        org = await _make_org(db_session)
+        service = StorefrontService(db_session)
+        product = await _make_product(db_session, org)
+
+        await service.set_product_image(
+            product.id,
+            org.id,
+            b"full",
+            "image/webp",
+            None,
+            derivatives={"thumbnail": b"t", "card": b"card"},
+        )
+        image = await service.get_product_image(product.id, org.id)
+        assert image.derivatives == {"thumbnail": 1, "card": 4}
+        card_key = service.derivative_key(image.storage_key, "card")
+        assert await storage.read_bytes(card_key) == b"card"
+        assert "size=card" in service.resolve_image_url(product, True, size="card")
+
+        await service.delete_product_image(product.id, org.id)
+        assert await storage.stat(card_key) is None
+
+    async def test_storage_keys_carry_the_encoded_format(self, db_session, storage):
+        org = await _make_org(db_session)
+        service = StorefrontService(db_session)
+        product = await _make_product(db_session, org)
+
+        await service.set_product_image(
+            product.id,
+            org.id,
+            b"full",
+            "image/avif",
+            None,
+            derivatives={"card": b"card"},
+        )
+
+        image = await service.get_product_image(product.id, org.id)
+        assert image.storage_key.endswith(".avif")
+        assert image.content_type == "image/avif"
+        assert service.derivative_key(image.storage_key, "card").endswith(".card.avif")
+
+    def test_derivative_keys_sit_beside_the_full_photo(self):
+        key = "store-product-images/o/p/abc.webp"
+        assert StorefrontService.derivative_key(key, "full") == key
+        assert (
+            StorefrontService.derivative_key(key, "thumbnail")
+            == "store-product-images/o/p/abc.thumbnail.webp"
+        )
+
 
 class TestVendorOrderTotals:
     """The quartermaster's actual question: how many of each size do I buy?"""
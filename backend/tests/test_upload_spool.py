@@ -0,0 +1,74 @@
+"""Tests for streaming uploads to disk."""
+
+import hashlib
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.upload_spool import UploadTooLargeError, spool_upload
+
+
+class ChunkedUpload:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.offset = 0
+        self.requested_sizes: list[int] = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.requested_sizes.append(size)
+        chunk = self.content[self.offset : self.offset + size]
+        self.offset += len(chunk)
+        return chunk
+
+
+@pytest.fixture(autouse=True)
+def fake_magic(monkeypatch):
+    seen: list[bytes] = []
+
+    def from_buffer(content, mime):
+        seen.append(content)
+        return "application/pdf" if content.startswith(b"%PDF") else "text/plain"
+
+    monkeypatch.setitem(sys.modules, "magic", SimpleNamespace(from_buffer=from_buffer))
+    return seen
+
+
+async def test_spool_hashes_and_sniffs_incrementally(tmp_path, fake_magic):
+    content = b"%PDF-1.7" + b"x" * 10_000
+    upload = ChunkedUpload(content)
+
+    async with spool_upload(upload, str(tmp_path), 20_000, chunk_size=1024) as sp:
+        assert sp.size == len(content)
+        assert sp.sha256 == hashlib.sha256(content).hexdigest()
+        assert sp.mime_type == "application/pdf"
+        final = await sp.commit(str(tmp_path / "doc.pdf"))
+
+    assert set(upload.requested_sizes) == {1024}
+    assert fake_magic == [content[:2048]]
+    with open(final, "rb") as fh:
+        assert fh.read() == content
+    assert os.listdir(tmp_path) == ["doc.pdf"]
+
+
+async def _spool_and_reject(directory):
+    async with spool_upload(ChunkedUpload(b"hello"), str(directory), 100):
+        assert len(os.listdir(directory)) == 1
+        raise RuntimeError("rejected")
+
+
+async def test_uncommitted_spool_is_removed(tmp_path):
+    with pytest.raises(RuntimeError, match="rejected"):
+        await _spool_and_reject(tmp_path)
+    assert os.listdir(tmp_path) == []
+
+
+async def test_oversized_upload_stops_reading_and_cleans_up(tmp_path):
+    upload = ChunkedUpload(b"x" * 5000)
+    spool = spool_upload(upload, str(tmp_path), 2000, chunk_size=1000)
+    # Entering fails: an oversized upload is never yielded.
+    with pytest.raises(UploadTooLargeError, match="2000-byte limit"):
+        await spool.__aenter__()
+    assert upload.offset == 3000
+    assert os.listdir(tmp_path) == []
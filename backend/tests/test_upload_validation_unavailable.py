@@ -0,0 +1,62 @@
+"""Uploads without libmagic (no DB).
+
+Content sniffing needs libmagic; where it is missing, the document and
+prospect-document uploads answer 503 ``UPLD_VALIDATION_UNAVAILABLE`` like
+the event attachment and ePCR uploads, rather than a 500, and keep nothing.
+"""
+
+import io
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from starlette.datastructures import UploadFile
+
+import app.api.v1.endpoints.documents as documents_endpoint
+import app.api.v1.endpoints.membership_pipeline as pipeline_endpoint
+from app.api.v1.endpoints.documents import upload_document
+from app.api.v1.endpoints.membership_pipeline import add_prospect_document
+from app.core.error_codes import CodedHTTPException, ErrorCode
+from app.core.storage import LocalStorageBackend
+
+
+@pytest.fixture(autouse=True)
+def _no_libmagic(monkeypatch):
+    # A None entry makes ``import magic`` raise ImportError.
+    monkeypatch.setitem(sys.modules, "magic", None)
+
+
+def _user():
+    return SimpleNamespace(id=str(uuid4()), organization_id=str(uuid4()))
+
+
+def _upload():
+    return UploadFile(io.BytesIO(b"%PDF-1.7"), filename="form.pdf")
+
+
+async def test_document_upload_is_unavailable(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(str(tmp_path))
+    monkeypatch.setattr(documents_endpoint, "get_storage", lambda: backend)
+
+    with pytest.raises(CodedHTTPException) as exc_info:
+        await upload_document(_upload(), "Form", None, None, None, MagicMock(), _user())
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.error_code == ErrorCode.UPLD_VALIDATION_UNAVAILABLE
+    assert not [files for _, _, files in os.walk(tmp_path) if files]
+
+
+async def test_prospect_document_upload_is_unavailable(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_endpoint, "PROSPECT_DOCUMENT_DIR", str(tmp_path))
+
+    with pytest.raises(CodedHTTPException) as exc_info:
+        await add_prospect_document(
+            uuid4(), _upload(), "application", None, MagicMock(), _user()
+        )
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.error_code == ErrorCode.UPLD_VALIDATION_UNAVAILABLE
+    assert not [files for _, _, files in os.walk(tmp_path) if files]
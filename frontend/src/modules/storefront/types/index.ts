@@ -341,6 +341,7 @@ export interface StoreProduct {
   sortOrder: number;
   internalNotes?: string | null;
   hasImage: boolean;
+  thumbnailUrl?: string | null;
   variants: StoreProductVariant[];
   createdAt?: string | null;
   updatedAt?: string | null;
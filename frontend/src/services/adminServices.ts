@@ -173,6 +173,17 @@ export const analyticsApiService = {
     await api.post('/analytics/track', data);
   },
 
+  async trackEvents(
+    events: Array<{
+      event_type: string;
+      event_id: string;
+      metadata: Record<string, unknown>;
+      occurred_at: string;
+    }>
+  ): Promise<void> {
+    await api.post('/analytics/track/batch', { events });
+  },
+
   async getMetrics(eventId?: string): Promise<AnalyticsMetrics> {
     const response = await api.get<AnalyticsMetrics>('/analytics/metrics', {
       params: eventId ? { event_id: eventId } : undefined,
@@ -8,8 +8,10 @@
  * - Device types
  * - Error rates
  *
- * Events are persisted to the backend API and metrics are fetched from there.
- * A local buffer is kept for immediate UI responsiveness.
+ * Events are buffered locally and posted to the backend in batches (every
+ * few seconds, when the buffer fills, or when the page is hidden); each
+ * carries the time it happened so time-to-check-in survives the buffering.
+ * Metrics are fetched from the backend.
  */
 
 import { analyticsApiService, type AnalyticsMetrics } from './api';
@@ -59,7 +61,28 @@ function mapApiMetrics(data: AnalyticsMetrics): QRCodeMetrics {
   };
 }
 
+const FLUSH_INTERVAL_MS = 5000;
+const MAX_BUFFERED_EVENTS = 20;
+
+interface BufferedEvent {
+  event_type: string;
+  event_id: string;
+  metadata: Record<string, unknown>;
+  occurred_at: string;
+}
+
 class AnalyticsService {
+  private buffer: BufferedEvent[] = [];
+  private flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+  constructor() {
+    if (typeof document !== 'undefined') {
+      document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') void this.flush();
+      });
+    }
+  }
+
   /**
    * Track a QR code scan
    */
@@ -114,24 +137,42 @@ class AnalyticsService {
   }
 
   /**
-   * Generic event tracking - sends to backend
+   * Generic event tracking - buffers for the next batch sent to the backend
    */
   private trackEvent(
     eventType: AnalyticsEvent['eventType'],
     eventId: string,
-    userId: string | undefined,
+    _userId: string | undefined,
     metadata: Record<string, unknown>
   ): void {
-    void analyticsApiService
-      .trackEvent({
-        event_type: eventType,
-        event_id: eventId,
-        user_id: userId,
-        metadata,
-      })
-      .catch(() => {
-        // Silently fail - analytics should not block the user
-      });
+    this.buffer.push({
+      event_type: eventType,
+      event_id: eventId,
+      metadata,
+      occurred_at: new Date().toISOString(),
+    });
+    if (this.buffer.length >= MAX_BUFFERED_EVENTS) {
+      void this.flush();
+    } else if (!this.flushTimer) {
+      this.flushTimer = setTimeout(() => void this.flush(), FLUSH_INTERVAL_MS);
+    }
+  }
+
+  /**
+   * Send every buffered event in one request
+   */
+  async flush(): Promise<void> {
+    if (this.flushTimer) {
+      clearTimeout(this.flushTimer);
+      this.flushTimer = null;
+    }
+    const events = this.buffer.splice(0, this.buffer.length);
+    if (events.length === 0) return;
+    try {
+      await analyticsApiService.trackEvents(events);
+    } catch {
+      // Silently fail - analytics should not block the user
+    }
   }
 
   /**
@@ -73,6 +73,10 @@ export const documentsService = {
     await api.delete(`/documents/${documentId}`);
   },
 
+  getDownloadUrl(documentId: string): string {
+    return `/api/v1/documents/${documentId}/download`;
+  },
+
   async getSummary(): Promise<DocumentsSummary> {
     const response = await api.get<DocumentsSummary>('/documents/stats/summary');
     return response.data;